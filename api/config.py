@@ -20,6 +20,28 @@ class Settings(BaseSettings):
         description="PostgreSQL connection string (optional for Phase 1)"
     )
 
+    # Connection pool (PostgreSQL; SQLite ignores sizing)
+    db_pool_size: int = Field(
+        default=10,
+        description="Persistent connections kept per engine"
+    )
+    db_max_overflow: int = Field(
+        default=20,
+        description="Extra connections allowed above pool size under burst load"
+    )
+    db_pool_timeout: int = Field(
+        default=10,
+        description="Seconds to wait for a pooled connection before failing"
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        description="Recycle connections older than this many seconds"
+    )
+    db_statement_cache_size: int = Field(
+        default=500,
+        description="asyncpg prepared statement cache size per connection"
+    )
+
     # Redis Cache
     redis_url: str = Field(
         default="redis://localhost:6379",
@@ -48,6 +70,12 @@ class Settings(BaseSettings):
         description="Directory containing CSV data files"
     )
 
+    # Instrumentation (timers, counters, cache hit rates) exposed at /metrics
+    metrics_enabled: bool = Field(
+        default=False,
+        description="Record pipeline instrumentation and serve it in Prometheus format"
+    )
+
     # Cache TTL (Time To Live)
     cache_ttl_seconds: int = Field(
         default=3600,
@@ -1,66 +1,380 @@
-"""Redis caching utilities"""
+"""
+Redis caching utilities
 
-import redis.asyncio as redis
+Layout:
+- L1: small in-process LRU (short TTL) in front of the shared store
+- L2: Redis, or a local in-memory store while Redis is unreachable (Redis is
+  pinged again after a growing backoff)
+- Week-scoped keys carry a per-week version; invalidating a week bumps the
+  version (one INCR) instead of scanning the keyspace
+- cache_get_or_compute adds probabilistic early refresh plus lock-based
+  single-flight so an expiring hot key is recomputed once, not per worker
+"""
+
+import asyncio
+import inspect
 import json
-import os
-from typing import Optional
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Union
 import logging
 
+import redis.asyncio as redis
+
+from api.config import settings
+from scripts.analysis import instrumentation
+
 logger = logging.getLogger(__name__)
 
-# Initialize Redis client
+# L1 sizing: entries are whole serialized payloads, so keep the count small
+L1_MAX_ENTRIES = 256
+L1_TTL_SECONDS = 15
+
+# Single-flight lock on misses
+LOCK_TTL_MS = 60_000
+LOCK_POLL_SECONDS = 0.05
+
+# Backoff between Redis reconnect attempts while on the local store
+REDIS_RETRY_MIN_SECONDS = 5
+REDIS_RETRY_MAX_SECONDS = 300
+
+# XFetch early-refresh aggressiveness (1.0 = standard; higher refreshes earlier)
+EARLY_REFRESH_BETA = 1.0
+
+
+class LocalStore:
+    """In-memory stand-in for the Redis commands this module uses."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[str, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def setex(self, key: str, expire: int, value: str):
+        self._data[key] = (value, time.time() + expire)
+
+    async def set(self, key: str, value: str, nx: bool = False, px: Optional[int] = None) -> bool:
+        if nx and self._live(key) is not None:
+            return False
+        self._data[key] = (value, time.time() + px / 1000 if px else None)
+        return True
+
+    async def incr(self, key: str) -> int:
+        value = int(self._live(key) or 0) + 1
+        self._data[key] = (str(value), None)
+        return value
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(k, None) is not None for k in keys)
+
+    async def ping(self) -> bool:
+        return True
+
+
+class L1Cache:
+    """Tiny LRU with per-entry expiry for hot keys in this process."""
+
+    def __init__(self, max_entries: int = L1_MAX_ENTRIES, ttl: float = L1_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (value, time.time() + min(ttl or self.ttl, self.ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+# Initialize Redis client (connection is checked lazily on first use)
 try:
     redis_client = redis.from_url(
-        os.getenv("REDIS_URL", "redis://localhost:6379"),
+        settings.redis_url,
         encoding="utf-8",
-        decode_responses=True
+        decode_responses=True,
+        socket_connect_timeout=1,
     )
     logger.info("✓ Redis client initialized")
 except Exception as e:
-    logger.warning(f"Redis connection failed: {e}. Caching disabled.")
+    logger.warning(f"Redis connection failed: {e}. Using local cache store.")
     redis_client = None
 
+l1_cache = L1Cache()
+_local_store = LocalStore()
+_store = None
+_inflight: dict[str, asyncio.Future] = {}
+# Redis reconnect backoff: next ping time (monotonic) and current delay
+_redis_retry_at = 0.0
+_redis_retry_delay = REDIS_RETRY_MIN_SECONDS
+
+
+async def get_store():
+    """Redis once it answers a ping; the process-local store while it doesn't."""
+    global _store, _redis_retry_at, _redis_retry_delay
+    if _store is not None:
+        return _store
+    if redis_client is None:
+        _store = _local_store
+        return _store
+    if time.monotonic() < _redis_retry_at:
+        return _local_store
+    try:
+        await redis_client.ping()
+    except Exception as e:
+        logger.warning(f"Redis unavailable ({e}). Using local cache store; retrying in {_redis_retry_delay}s.")
+        _redis_retry_at = time.monotonic() + _redis_retry_delay
+        _redis_retry_delay = min(_redis_retry_delay * 2, REDIS_RETRY_MAX_SECONDS)
+        return _local_store
+    if _redis_retry_at:
+        logger.info("✓ Redis reachable again; leaving local cache store")
+        # Week versions cached while on the local store don't apply to Redis
+        l1_cache.clear()
+    _store = redis_client
+    return _store
+
+
+def use_local_store():
+    """Force the in-memory store (tests, or deployments without Redis)."""
+    global _store
+    _store = LocalStore()
+    l1_cache.clear()
+    _inflight.clear()
 
-async def cache_get(key: str) -> Optional[str]:
+
+# --- Week versioning ---
+
+def _version_key(week: int) -> str:
+    return f"cache_version:week_{week}"
+
+
+async def get_week_version(week: int) -> int:
+    """Current cache version for a week (L1-cached briefly)."""
+    vkey = _version_key(week)
+    cached = l1_cache.get(vkey)
+    if cached is not None:
+        return cached
+    try:
+        store = await get_store()
+        version = int(await store.get(vkey) or 0)
+    except Exception as e:
+        logger.warning(f"Cache version read error: {e}")
+        version = 0
+    l1_cache.set(vkey, version)
+    return version
+
+
+async def versioned_key(key: str, week: Optional[int] = None) -> str:
+    """Prefix a key with its week version so a week bump orphans old entries."""
+    if week is None:
+        return key
+    return f"v{await get_week_version(week)}:week_{week}:{key}"
+
+
+# --- Basic get/set ---
+
+async def cache_get(key: str, week: Optional[int] = None) -> Optional[str]:
     """Get value from cache"""
-    if not redis_client:
-        return None
+    full_key = await versioned_key(key, week)
+    value = l1_cache.get(full_key)
+    if value is not None:
+        return value
     try:
-        return await redis_client.get(key)
+        store = await get_store()
+        value = await store.get(full_key)
     except Exception as e:
         logger.warning(f"Cache get error: {e}")
         return None
+    if value is not None:
+        l1_cache.set(full_key, value)
+    return value
 
 
-async def cache_set(key: str, value: str, expire: int = 3600):
+async def cache_set(key: str, value: str, expire: int = 3600, week: Optional[int] = None):
     """Set value in cache with expiration (default 1 hour)"""
-    if not redis_client:
-        return
+    full_key = await versioned_key(key, week)
+    l1_cache.set(full_key, value, ttl=expire)
     try:
-        await redis_client.setex(key, expire, value)
+        store = await get_store()
+        await store.setex(full_key, expire, value)
     except Exception as e:
         logger.warning(f"Cache set error: {e}")
 
 
-async def cache_delete(key: str):
+async def cache_delete(key: str, week: Optional[int] = None):
     """Delete key from cache"""
-    if not redis_client:
-        return
+    full_key = await versioned_key(key, week)
+    l1_cache.delete(full_key)
     try:
-        await redis_client.delete(key)
+        store = await get_store()
+        await store.delete(full_key)
     except Exception as e:
         logger.warning(f"Cache delete error: {e}")
 
 
 async def cache_invalidate_week(week: int):
-    """Invalidate all cache entries for a given week"""
-    if not redis_client:
-        return
+    """Invalidate all cache entries for a given week (O(1) version bump)"""
     try:
-        pattern = f"*week_{week}*"
-        keys = await redis_client.keys(pattern)
-        if keys:
-            await redis_client.delete(*keys)
-            logger.info(f"Invalidated {len(keys)} cache entries for week {week}")
+        store = await get_store()
+        version = await store.incr(_version_key(week))
+        l1_cache.set(_version_key(week), int(version))
+        logger.info(f"Invalidated cache for week {week} (now version {version})")
     except Exception as e:
         logger.warning(f"Cache invalidation error: {e}")
+
+
+# --- Stampede-protected read-through ---
+
+def _should_refresh_early(envelope: dict) -> bool:
+    """XFetch: refresh with rising probability as expiry approaches."""
+    delta = envelope.get("d", 0.0)
+    expires_at = envelope.get("x", 0.0)
+    if delta <= 0:
+        return False
+    return time.time() - delta * EARLY_REFRESH_BETA * math.log(random.random() or 1e-12) >= expires_at
+
+
+async def _run_compute(compute: Callable[[], Union[str, Awaitable[str]]]) -> tuple[str, float]:
+    start = time.perf_counter()
+    value = compute()
+    if inspect.isawaitable(value):
+        value = await value
+    return value, time.perf_counter() - start
+
+
+async def cache_get_or_compute(
+    key: str,
+    compute: Callable[[], Union[str, Awaitable[str]]],
+    expire: int = 3600,
+    week: Optional[int] = None,
+) -> str:
+    """
+    Read-through cache for expensive string payloads.
+
+    Concurrent callers in this process share one computation; across
+    processes a short Redis lock lets one worker recompute while the others
+    wait for its result. Hits near expiry are refreshed early with
+    probability growing as the TTL runs out (XFetch).
+    """
+    full_key = await versioned_key(key, week)
+
+    envelope = l1_cache.get(full_key)
+    if envelope is not None:
+        instrumentation.cache_hit('api_l1')
+    else:
+        instrumentation.cache_miss('api_l1')
+        try:
+            store = await get_store()
+            raw = await store.get(full_key)
+            envelope = json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            envelope = None
+        if envelope is not None:
+            l1_cache.set(full_key, envelope, ttl=max(envelope["x"] - time.time(), 0))
+
+    if envelope is not None and not _should_refresh_early(envelope):
+        instrumentation.cache_hit('api')
+        return envelope["v"]
+    instrumentation.cache_miss('api')
+
+    # In-process single-flight
+    while (pending := _inflight.get(full_key)) is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The leader was cancelled, not us: take over (or wait on whoever did)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[full_key] = future
+    try:
+        value = await _compute_with_lock(full_key, compute, expire, stale=envelope)
+        future.set_result(value)
+        return value
+    except Exception as e:
+        future.set_exception(e)
+        # Nobody else awaited it; retrieve so asyncio doesn't warn
+        future.exception()
+        raise
+    finally:
+        # Cancelled (or interrupted): release waiters so they don't hang
+        if not future.done():
+            future.cancel()
+        if _inflight.get(full_key) is future:
+            del _inflight[full_key]
+
+
+async def _compute_with_lock(full_key: str, compute, expire: int, stale: Optional[dict]) -> str:
+    """Cross-process single-flight: one lock holder computes, others wait."""
+    lock_key = f"lock:{full_key}"
+    token = uuid.uuid4().hex
+    try:
+        store = await get_store()
+        acquired = await store.set(lock_key, token, nx=True, px=LOCK_TTL_MS)
+    except Exception as e:
+        logger.warning(f"Cache lock error: {e}")
+        store, acquired = None, True
+
+    if not acquired:
+        # Serve stale data during an early refresh someone else is doing
+        if stale is not None:
+            return stale["v"]
+        deadline = time.time() + LOCK_TTL_MS / 1000
+        while time.time() < deadline:
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            raw = await store.get(full_key)
+            if raw:
+                envelope = json.loads(raw)
+                l1_cache.set(full_key, envelope, ttl=max(envelope["x"] - time.time(), 0))
+                return envelope["v"]
+        logger.warning(f"Cache lock wait timed out for {full_key}; computing")
+
+    try:
+        value, duration = await _run_compute(compute)
+        envelope = {"v": value, "d": duration, "x": time.time() + expire}
+        l1_cache.set(full_key, envelope, ttl=expire)
+        if store is not None:
+            try:
+                await store.setex(full_key, expire, json.dumps(envelope))
+            except Exception as e:
+                logger.warning(f"Cache set error: {e}")
+        return value
+    finally:
+        if store is not None and acquired:
+            try:
+                if await store.get(lock_key) == token:
+                    await store.delete(lock_key)
+            except Exception as e:
+                logger.warning(f"Cache unlock error: {e}")
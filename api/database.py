@@ -8,6 +8,7 @@ import json
 from datetime import datetime, timezone
 from typing import List, Optional, Any
 from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, ForeignKey, JSON, DateTime, Text, Index, Enum
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
 from api.config import settings
@@ -24,14 +25,54 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
 
 print(f"Connecting to database: {DATABASE_URL.split('@')[-1] if '@' in DATABASE_URL else DATABASE_URL}")
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# Explicit pool sizing for PostgreSQL; pre-ping drops connections the server closed
+pool_args = {} if IS_SQLITE else {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+}
+
 # Create engine
 # check_same_thread=False is needed for SQLite with FastAPI
-connect_args = {"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True, **pool_args)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str) -> str:
+    """Map the sync URL onto its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# Async engine for read-heavy routes (feed, props, odds, players)
+ASYNC_DATABASE_URL = _async_database_url(DATABASE_URL)
+async_connect_args = {} if IS_SQLITE else {
+    "statement_cache_size": settings.db_statement_cache_size,
+}
+try:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=async_connect_args,
+        pool_pre_ping=True,
+        **pool_args,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+except ImportError as e:
+    print(f"Async database driver unavailable ({e}); async routes disabled")
+    async_engine = None
+    AsyncSessionLocal = None
+
 # Base class for models
 Base = declarative_base()
 
@@ -327,6 +368,24 @@ class LineMovement(Base):
     )
 
 
+class Game(Base):
+    """NFL game from the odds events feed with consensus spread/total."""
+    __tablename__ = "games"
+
+    id = Column(String, primary_key=True)  # The Odds API event id
+    week = Column(Integer, nullable=False, index=True)
+    home_team = Column(String, nullable=False)  # Team abbreviation
+    away_team = Column(String, nullable=False)
+    commence_time = Column(DateTime, nullable=True)
+    spread = Column(Float, nullable=True)  # Home spread (negative = home favored)
+    total = Column(Float, nullable=True)   # Game over/under
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index('idx_game_week_home', 'week', 'home_team'),
+    )
+
+
 # --- Dependency ---
 
 def get_db():
@@ -337,6 +396,13 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Generator for async database session (for read-heavy FastAPI routes)"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database driver not installed (asyncpg / aiosqlite)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """Create tables if they don't exist"""
     Base.metadata.create_all(bind=engine)
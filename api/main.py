@@ -2,9 +2,11 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from api.routers import props, parlays, results, auth, players, odds, bets, dfs, fantasy, feed
 from api.config import settings
 from api.database import init_db
+from scripts.analysis import instrumentation
 import logging
 
 # Configure logging
@@ -139,6 +141,15 @@ async def health():
     }
 
 
+# Only served when METRICS_ENABLED is set (404 otherwise)
+if settings.metrics_enabled:
+    @app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+    async def metrics():
+        """Pipeline timers, counters and cache hit rates (Prometheus text format)"""
+        return PlainTextResponse(instrumentation.report().prometheus(),
+                                 media_type="text/plain; version=0.0.4")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
@@ -147,6 +158,9 @@ async def startup_event():
     logger.info("=" * 70)
     # Initialize database tables (creates new Sprint 1 tables if they don't exist)
     init_db()
+    if settings.metrics_enabled:
+        instrumentation.enable()
+        logger.info("Instrumentation enabled: metrics at /metrics")
     logger.info("Docs available at /docs")
     logger.info("=" * 70)
 
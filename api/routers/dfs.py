@@ -6,7 +6,7 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from api.database import get_db
 from api.dependencies import get_api_key
-from api.services.dfs_service import dfs_service
+from api.services.dfs_service import MAX_SLIP_SIZE, dfs_service
 
 router = APIRouter()
 
@@ -72,14 +72,17 @@ async def optimize_flex(
 async def get_suggestions(
     week: int = Query(..., ge=1, le=18),
     platform: str = Query("prizepicks"),
-    slip_size: int = Query(5, ge=2, le=8),
+    slip_size: int = Query(5, ge=2, le=MAX_SLIP_SIZE),
     count: int = Query(3, ge=1, le=5),
+    play_type: str = Query("best", pattern="^(best|power|flex)$"),
+    max_overlap: int = Query(2, ge=0, le=MAX_SLIP_SIZE - 1),
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key),
 ):
-    """Get auto-generated optimal DFS slip suggestions."""
+    """Get auto-generated optimal DFS slip suggestions ranked by expected payout."""
     return dfs_service.generate_suggestions(
         db, week, platform=platform, slip_size=slip_size, count=count,
+        play_type=play_type, max_overlap=max_overlap,
     )
 
 
@@ -28,12 +28,15 @@ class TradeAnalyzeRequest(BaseModel):
     week: int
     weeks_remaining: int = 4
     scoring: str = "ppr"
+    roster_player_ids: Optional[list[int]] = None
 
 
 class OptimizeLineupRequest(BaseModel):
     player_ids: list[int]
     week: int
     scoring: str = "ppr"
+    roster_slots: Optional[list[str]] = None
+    risk_aversion: float = 0.0
 
 
 # --- Sleeper Endpoints ---
@@ -233,11 +236,14 @@ async def get_matchup(
 
     db.commit()
 
-    user_projections = fantasy_service.get_roster_projections(db, user_player_ids, week, scoring)
-    opp_projections = fantasy_service.get_roster_projections(db, opp_player_ids, week, scoring)
+    lineups = fantasy_service.optimize_lineups(
+        db, {"user": user_player_ids, "opponent": opp_player_ids}, week, scoring
+    )
+    user_lineup = lineups["user"]["lineup"]
+    opp_lineup = lineups["opponent"]["lineup"]
 
-    user_total = sum(p["fantasy_points"] for p in user_projections[:9])  # Top 9 = starters
-    opp_total = sum(p["fantasy_points"] for p in opp_projections[:9])
+    user_total = lineups["user"]["projected_total"]
+    opp_total = lineups["opponent"]["projected_total"]
 
     # Win probability estimate (simple normal approximation)
     diff = user_total - opp_total
@@ -248,12 +254,12 @@ async def get_matchup(
         "user": {
             "roster_id": roster_id,
             "projected_total": round(user_total, 1),
-            "players": user_projections[:9],
+            "players": user_lineup,
         },
         "opponent": {
             "roster_id": opponent.get("roster_id") if opponent else None,
             "projected_total": round(opp_total, 1),
-            "players": opp_projections[:9],
+            "players": opp_lineup,
         },
         "win_probability": round(win_prob, 1),
         "margin": round(diff, 1),
@@ -305,6 +311,7 @@ async def analyze_trade(
         week=req.week,
         weeks_remaining=req.weeks_remaining,
         scoring=req.scoring,
+        roster_player_ids=req.roster_player_ids,
     )
     return result
 
@@ -316,17 +323,52 @@ async def optimize_lineup(
 ):
     """
     Suggest optimal lineup from available roster players.
-    Fills QB/RB/RB/WR/WR/TE/FLEX/K/DEF by highest projected points.
+    Exact assignment over QB/RB/RB/WR/WR/TE/FLEX/K/DEF (or custom slots).
+    risk_aversion > 0 favors high-confidence projections over raw points.
     """
     result = fantasy_service.optimize_lineup(
         db,
         player_ids=req.player_ids,
         week=req.week,
         scoring=req.scoring,
+        roster_slots=req.roster_slots,
+        risk_aversion=req.risk_aversion,
     )
     return result
 
 
+@router.get("/optimize-league/{league_id}")
+async def optimize_league_lineups(
+    league_id: str,
+    week: int = Query(17),
+    scoring: str = Query("ppr"),
+    risk_aversion: float = Query(0.0, ge=0.0, le=1.0),
+    db: Session = Depends(get_db),
+):
+    """
+    Optimal lineups for every roster in a Sleeper league in one call.
+    Keyed by Sleeper roster_id.
+    """
+    all_rosters = await sleeper_service.get_rosters(league_id)
+    sleeper_players = await sleeper_service.get_all_players()
+
+    rosters = {}
+    for r in all_rosters:
+        mapped_ids = []
+        for sid in (r.get("players") or []):
+            player = sleeper_service.map_sleeper_player_to_db(db, str(sid), sleeper_players)
+            if player:
+                mapped_ids.append(player.id)
+        rosters[r.get("roster_id")] = mapped_ids
+
+    db.commit()
+
+    lineups = fantasy_service.optimize_lineups(
+        db, rosters, week, scoring, risk_aversion=risk_aversion
+    )
+    return {"league_id": league_id, "week": week, "lineups": lineups}
+
+
 def _detect_scoring(league: dict) -> str:
     """Detect scoring type from Sleeper league settings."""
     settings = league.get("scoring_settings", {})
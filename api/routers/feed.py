@@ -3,36 +3,43 @@ Feed Router — Unified home feed aggregating top picks from all three pillars.
 """
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from api.database import get_db, Player, PlayerProjection
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.database import get_async_db, Player, PlayerProjection
 from api.services.player_intel_service import player_intel_service
 from api.services.game_service import game_service
 
 router = APIRouter()
 
 
+def _top_projections(week: int, limit: int, min_confidence: float = None):
+    """Projection+player rows for a week, highest confidence first."""
+    stmt = select(PlayerProjection, Player).join(
+        Player, Player.id == PlayerProjection.player_id
+    ).where(
+        PlayerProjection.week == week,
+        PlayerProjection.confidence.isnot(None),
+    )
+    if min_confidence is not None:
+        stmt = stmt.where(PlayerProjection.confidence >= min_confidence)
+    return stmt.order_by(PlayerProjection.confidence.desc()).limit(limit)
+
+
 @router.get("/home")
-def get_home_feed(
+async def get_home_feed(
     week: int = Query(17),
     limit: int = Query(5),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Aggregated home feed with top picks across all pillars.
     Returns: top prop edges, best DFS picks, fantasy alerts, game slate.
     """
     # --- Top Prop Edges ---
-    top_props = db.query(PlayerProjection).filter(
-        PlayerProjection.week == week,
-        PlayerProjection.confidence.isnot(None),
-        PlayerProjection.confidence >= 60,
-    ).order_by(PlayerProjection.confidence.desc()).limit(limit).all()
+    top_props = (await db.execute(_top_projections(week, limit, 60))).all()
 
     prop_edges = []
-    for p in top_props:
-        player = db.query(Player).filter(Player.id == p.player_id).first()
-        if not player:
-            continue
+    for p, player in top_props:
         prop_edges.append({
             "player_id": player.id,
             "player_name": player.name,
@@ -48,16 +55,12 @@ def get_home_feed(
         })
 
     # --- Best DFS Picks (highest confidence with varied teams) ---
-    dfs_query = db.query(PlayerProjection).filter(
-        PlayerProjection.week == week,
-        PlayerProjection.confidence.isnot(None),
-    ).order_by(PlayerProjection.confidence.desc()).limit(limit * 3).all()
+    dfs_query = (await db.execute(_top_projections(week, limit * 3))).all()
 
     dfs_picks = []
     seen_teams = set()
-    for p in dfs_query:
-        player = db.query(Player).filter(Player.id == p.player_id).first()
-        if not player or player.team in seen_teams:
+    for p, player in dfs_query:
+        if player.team in seen_teams:
             continue
         seen_teams.add(player.team)
         dfs_picks.append({
@@ -75,16 +78,9 @@ def get_home_feed(
 
     # --- Fantasy Alerts (players with big edges = start candidates) ---
     fantasy_alerts = []
-    big_edges = db.query(PlayerProjection).filter(
-        PlayerProjection.week == week,
-        PlayerProjection.confidence.isnot(None),
-        PlayerProjection.confidence >= 65,
-    ).order_by(PlayerProjection.confidence.desc()).limit(limit).all()
+    big_edges = (await db.execute(_top_projections(week, limit, 65))).all()
 
-    for p in big_edges:
-        player = db.query(Player).filter(Player.id == p.player_id).first()
-        if not player:
-            continue
+    for p, player in big_edges:
         alert_type = "start" if p.direction == "OVER" else "sit"
         fantasy_alerts.append({
             "player_id": player.id,
@@ -97,7 +93,7 @@ def get_home_feed(
         })
 
     # --- Game Slate ---
-    slate = game_service.get_week_slate(db, week)
+    slate = await game_service.get_cached_week_slate(db, week)
 
     return {
         "week": week,
@@ -127,13 +123,13 @@ def get_home_feed(
 
 
 @router.get("/player-intel/{player_id}")
-def get_player_intelligence(
+async def get_player_intelligence(
     player_id: int,
     week: int = Query(17),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Full player intelligence card data."""
-    intel = player_intel_service.get_full_intelligence(db, player_id, week)
+    intel = await db.run_sync(player_intel_service.get_full_intelligence, player_id, week)
     if not intel:
         return {"error": "Player not found"}
     return intel
@@ -3,8 +3,9 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from api.database import get_db, User
+from api.database import get_async_db, get_db, User
 from api.services.odds_service import odds_service
 from api.core.jwt_auth import get_current_user
 
@@ -52,6 +53,7 @@ class LineMovementEntry(BaseModel):
 class FetchSummaryResponse(BaseModel):
     events: int
     total_odds: int
+    games: int = 0
 
 
 # --- Endpoints ---
@@ -60,10 +62,10 @@ class FetchSummaryResponse(BaseModel):
 async def get_player_odds(
     player_id: int,
     week: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get all book odds for a player."""
-    odds = odds_service.get_player_odds(db, player_id, week=week)
+    odds = await db.run_sync(odds_service.get_player_odds, player_id, week=week)
     results = []
     for o in odds:
         results.append(BookOddsResponse(
@@ -85,10 +87,10 @@ async def get_best_prices(
     player_id: int = Query(...),
     stat_type: str = Query(...),
     week: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Find the best over/under prices across all books for a player prop."""
-    result = odds_service.get_best_prices(db, player_id, stat_type, week)
+    result = await db.run_sync(odds_service.get_best_prices, player_id, stat_type, week)
     return result
 
 
@@ -97,10 +99,10 @@ async def get_line_movement(
     player_id: int,
     stat_type: str = Query(...),
     week: int = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get line movement history for a player prop."""
-    return odds_service.get_line_movement(db, player_id, stat_type, week)
+    return await db.run_sync(odds_service.get_line_movement, player_id, stat_type, week)
 
 
 @router.post("/fetch-week", response_model=FetchSummaryResponse)
@@ -3,11 +3,12 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from api.database import get_db
+from api.database import get_async_db, get_db
 from api.services.player_service import player_service
 from api.core.jwt_auth import get_current_user, get_optional_user
-from api.database import User
+from api.database import Player, User
 
 router = APIRouter()
 
@@ -55,17 +56,17 @@ async def search_players(
     position: Optional[str] = None,
     team: Optional[str] = None,
     limit: int = Query(20, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Search players by name. No auth required."""
-    players = player_service.search(db, q, position=position, team=team, limit=limit)
+    players = await player_service.search_async(db, q, position=position, team=team, limit=limit)
     return players
 
 
 @router.get("/{player_id}", response_model=PlayerResponse)
-async def get_player(player_id: int, db: Session = Depends(get_db)):
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get player details by ID."""
-    player = player_service.get_by_id(db, player_id)
+    player = await db.get(Player, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
@@ -75,13 +76,13 @@ async def get_player(player_id: int, db: Session = Depends(get_db)):
 async def get_player_projections(
     player_id: int,
     week: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get projections for a player, optionally filtered by week."""
-    player = player_service.get_by_id(db, player_id)
+    player = await db.get(Player, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
-    projections = player_service.get_projections(db, player_id, week=week)
+    projections = await player_service.get_projections_async(db, player_id, week=week)
     return projections
 
 
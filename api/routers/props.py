@@ -1,13 +1,13 @@
 """Props analysis API endpoints"""
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from api.dependencies import get_api_key
 from api.services.analysis_service import AnalysisService
 from api.services.edge_service import edge_service
 from api.schemas.props import PropAnalysisResponse
 from api.schemas.line_adjustment import LineAdjustmentRequest, LineAdjustmentResponse
-from api.database import get_db
+from api.database import get_async_db
 from typing import List, Optional
 import logging
 
@@ -212,13 +212,13 @@ async def edge_finder(
     min_edge: float = Query(2.0, description="Minimum edge percentage"),
     min_confidence: float = Query(55.0, description="Minimum engine confidence"),
     limit: int = Query(30, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Depends(get_api_key),
 ):
     """Find the biggest edges between engine confidence and market odds."""
     try:
-        edges = edge_service.find_edges(
-            db, week,
+        edges = await db.run_sync(
+            edge_service.find_edges, week,
             min_edge=min_edge,
             min_confidence=min_confidence,
             limit=limit,
@@ -4,7 +4,7 @@ from scripts.analysis.orchestrator import PropAnalyzer
 from scripts.analysis.data_loader import NFLDataLoader
 from scripts.analysis.models import PropAnalysis
 from api.schemas.props import PropAnalysisResponse
-from api.core.cache import cache_get, cache_set
+from api.core.cache import cache_get_or_compute
 from api.config import settings
 from typing import List, Optional
 import logging
@@ -46,23 +46,12 @@ class AnalysisService:
         Analyze props with filters using EXISTING analysis engine.
         pure wrapper around PropAnalyzer.
         """
-        # Check cache first (include preferred_book in key since it affects dedup)
+        # Check cache first (include preferred_book in key since it affects dedup).
+        # Keys are week-versioned, so cache_invalidate_week(week) drops them all.
         book_suffix = f"_book_{preferred_book}" if preferred_book else ""
         cache_key = f"props_week_{week}_conf_{min_confidence}{book_suffix}"
-        cached_data = await cache_get(cache_key)
 
-        analyses_responses = []
-
-        if cached_data:
-            logger.info(f"✓ Cache HIT for week {week}, min_confidence {min_confidence}")
-            try:
-                # Deserialize cached JSON list of dicts into Pydantic models
-                analyses_responses = [PropAnalysisResponse(**item) for item in json.loads(cached_data)]
-            except Exception as e:
-                logger.error(f"Cache deserialization failed: {e}")
-                cached_data = None # Force re-analysis
-
-        if not cached_data:
+        def compute() -> str:
             logger.info(f"Cache MISS - analyzing props for week {week}...")
 
             # Load data using EXISTING loader (preferred_book controls deduplication)
@@ -74,12 +63,16 @@ class AnalysisService:
             analyses = self.analyzer.analyze_all_props(context, min_confidence=min_confidence)
 
             # Convert to responses
-            analyses_responses = [self._to_response(a) for a in analyses]
+            responses = [self._to_response(a) for a in analyses]
+            logger.info(f"✓ Cached {len(responses)} props for week {week}")
+            return json.dumps([r.model_dump() for r in responses])
+
+        cached_data = await cache_get_or_compute(
+            cache_key, compute, expire=settings.cache_ttl_seconds, week=week
+        )
 
-            # Cache the responses
-            cache_data = json.dumps([r.model_dump() for r in analyses_responses])
-            await cache_set(cache_key, cache_data, expire=settings.cache_ttl_seconds)
-            logger.info(f"✓ Cached {len(analyses_responses)} props for week {week}")
+        # Deserialize cached JSON list of dicts into Pydantic models
+        analyses_responses = [PropAnalysisResponse(**item) for item in json.loads(cached_data)]
 
         # --- Filtering ---
         filtered = analyses_responses
@@ -260,20 +253,17 @@ class AnalysisService:
             return []
 
         # Filter by player and stat_type
-        from scripts.analysis.data_loader import normalize_name
-        target_name = normalize_name(player_name)
+        from scripts.analysis.player_identity import player_id
+        target_id = player_id(player_name)
         
         results = []
         
         for _, row in df.iterrows():
-            # Handle variable column names
+            # Handle variable column names; IDs already fold suffixes
+            # ("Patrick Mahomes II" vs "Patrick Mahomes") and aliases
             p_name = row.get('player_name') or row.get('description')
-            row_player = normalize_name(str(p_name or ''))
-            
-            if not row_player or target_name not in row_player: 
-                # Use "in" check for "Patrick Mahomes II" vs "Patrick Mahomes"
-                if row_player not in target_name: 
-                     continue
+            if not p_name or player_id(str(p_name)) != target_id:
+                continue
                 
             s_type = row.get('stat_type') or row.get('market')
             row_stat = str(s_type or '')
@@ -38,6 +38,48 @@ PLATFORM_STAT_MAP = {
 # Positions that can be designated as flex
 FLEX_ELIGIBLE = {"RB", "WR", "TE"}
 
+# Payout multipliers by slip size → {correct picks: multiplier}
+PLATFORM_PAYOUTS = {
+    "prizepicks": {
+        "power": {
+            2: {2: 3.0},
+            3: {3: 5.0},
+            4: {4: 10.0},
+            5: {5: 20.0},
+            6: {6: 37.5},
+        },
+        "flex": {
+            3: {3: 2.25, 2: 1.25},
+            4: {4: 5.0, 3: 1.5},
+            5: {5: 10.0, 4: 2.0, 3: 0.4},
+            6: {6: 25.0, 5: 2.0, 4: 0.4},
+        },
+    },
+    "underdog": {
+        "power": {
+            2: {2: 3.0},
+            3: {3: 6.0},
+            4: {4: 10.0},
+            5: {5: 20.0},
+            6: {6: 35.0},
+        },
+        "flex": {
+            3: {3: 3.25, 2: 1.09},
+            4: {4: 6.0, 3: 1.5},
+            5: {5: 10.0, 4: 2.5},
+            6: {6: 25.0, 5: 2.6, 4: 0.25},
+        },
+    },
+}
+
+# Largest slip any payout table covers (the API's slip_size bound)
+MAX_SLIP_SIZE = max(size for platform in PLATFORM_PAYOUTS.values()
+                    for table in platform.values() for size in table)
+
+# Slip search tuning
+SEARCH_BEAM_WIDTH = 64
+DEFAULT_MAX_OVERLAP = 2
+
 
 class DFSService:
     """DFS slip building, correlation scoring, and optimization."""
@@ -64,9 +106,21 @@ class DFSService:
         projections = q.all()
         stat_map = PLATFORM_STAT_MAP.get(platform.lower(), PLATFORM_STAT_MAP["prizepicks"])
 
+        # Load players and book odds for the whole week up front
+        player_ids = {proj.player_id for proj in projections}
+        players = {
+            p.id: p for p in db.query(Player).filter(Player.id.in_(player_ids)).all()
+        } if player_ids else {}
+        odds_by_key: dict[tuple, list] = {}
+        if player_ids:
+            for o in db.query(BookOdds).filter(
+                BookOdds.week == week, BookOdds.player_id.in_(player_ids)
+            ).all():
+                odds_by_key.setdefault((o.player_id, o.stat_type), []).append(o)
+
         results = []
         for proj in projections:
-            player = db.query(Player).filter(Player.id == proj.player_id).first()
+            player = players.get(proj.player_id)
             if not player:
                 continue
             if position and player.position != position.upper():
@@ -75,11 +129,7 @@ class DFSService:
             platform_stat = stat_map.get(proj.stat_type, proj.stat_type)
 
             # Get consensus line from book odds
-            consensus_odds = db.query(BookOdds).filter(
-                BookOdds.player_id == proj.player_id,
-                BookOdds.stat_type == proj.stat_type,
-                BookOdds.week == week,
-            ).all()
+            consensus_odds = odds_by_key.get((proj.player_id, proj.stat_type), [])
 
             sportsbook_consensus = None
             if consensus_odds:
@@ -114,25 +164,7 @@ class DFSService:
         Returns total penalty, per-pair warnings, and overall risk level.
         """
         # Convert picks to PropAnalysis objects for the CorrelationAnalyzer
-        analyses = []
-        for pick in picks:
-            prop = PlayerProp(
-                player_name=pick.get("player_name", ""),
-                team=pick.get("team", ""),
-                opponent="",
-                position=pick.get("position", ""),
-                stat_type=pick.get("stat_type", ""),
-                line=pick.get("line", 0),
-            )
-            analysis = PropAnalysis(
-                prop=prop,
-                final_confidence=int(pick.get("confidence", 50)),
-                recommendation="",
-                rationale=[],
-                agent_breakdown=pick.get("agent_breakdown", {}),
-                edge_explanation="",
-            )
-            analyses.append(analysis)
+        analyses = [self._pick_to_analysis(pick) for pick in picks]
 
         if len(analyses) < 2:
             return {
@@ -221,11 +253,15 @@ class DFSService:
         platform: str = "prizepicks",
         slip_size: int = 5,
         count: int = 3,
+        play_type: str = "best",
+        max_overlap: int = DEFAULT_MAX_OVERLAP,
     ) -> list[dict]:
         """
         Auto-generate optimal DFS slip suggestions.
 
-        Strategy: pick the highest-confidence, lowest-correlation combinations.
+        Strategy: beam search over slip combinations, scored by expected
+        payout (power/flex) with correlation-adjusted hit probabilities.
+        Returns up to `count` slips sharing at most `max_overlap` players.
         """
         lines = self.get_dfs_lines(db, week, platform=platform)
         # Only use picks with real confidence
@@ -234,31 +270,145 @@ class DFSService:
         if len(eligible) < slip_size:
             return []
 
-        suggestions = []
-        used_players: set[str] = set()
-
-        for _ in range(count):
-            slip = self._build_optimal_slip(eligible, slip_size, used_players)
-            if not slip:
-                break
+        ranked = self.search_slips(
+            eligible, slip_size, count,
+            platform=platform, play_type=play_type, max_overlap=max_overlap,
+        )
 
+        suggestions = []
+        for result in ranked:
+            slip = result["picks"]
             correlation = self.score_correlation(slip)
             flex = self.optimize_flex(slip)
 
-            suggestion = {
+            suggestions.append({
                 "picks": slip,
                 "correlation": correlation,
                 "flex_recommendation": flex,
                 "combined_confidence": correlation["adjusted_confidence"],
-            }
-            suggestions.append(suggestion)
-
-            # Track used players to vary suggestions
-            for pick in slip:
-                used_players.add(pick.get("player_name", ""))
+                "play_type": result["play_type"],
+                "expected_value": result["expected_value"],
+                "hit_distribution": result["hit_distribution"],
+            })
 
         return suggestions
 
+    def search_slips(
+        self,
+        candidates: list[dict],
+        size: int,
+        count: int = 3,
+        platform: str = "prizepicks",
+        play_type: str = "best",
+        max_overlap: int = DEFAULT_MAX_OVERLAP,
+        beam_width: int = SEARCH_BEAM_WIDTH,
+    ) -> list[dict]:
+        """
+        Find the top-`count` diverse slips of `size` picks by expected value.
+
+        Pairwise correlation penalties are precomputed once, so extending a
+        partial slip costs O(size). Partial slips are ranked by their
+        correlation-adjusted average confidence; complete slips by EV, with the
+        slip's summed penalty applied once to its all-hit probability.
+        """
+        payouts = PLATFORM_PAYOUTS.get(platform.lower(), PLATFORM_PAYOUTS["prizepicks"])
+        if play_type == "best":
+            tables = {pt: t[size] for pt, t in payouts.items() if size in t}
+        else:
+            tables = {play_type: payouts.get(play_type, {}).get(size)}
+            tables = {k: v for k, v in tables.items() if v}
+        if not tables or len(candidates) < size:
+            return []
+
+        picks = sorted(candidates, key=lambda x: x.get("confidence") or 0, reverse=True)
+        n = len(picks)
+        probs = [(p.get("confidence") or 50) / 100 for p in picks]
+        names = [p.get("player_name", "") for p in picks]
+        teams = [p.get("team", "") for p in picks]
+        penalty = self._correlation_matrix(picks)
+
+        def beam_search(chosen: list[set]) -> list[tuple]:
+            """Complete slips scored by EV, pruning overlap with chosen slips."""
+            # Beam state: (indices, prob_sum, penalty_sum, overlaps) with indices ascending
+            beam = [((), 0.0, 0.0, (0,) * len(chosen))]
+            for depth in range(size):
+                expanded = []
+                remaining = size - depth - 1
+                for indices, prob_sum, pen_sum, overlaps in beam:
+                    last = indices[-1] if indices else -1
+                    used = {names[i] for i in indices}
+                    for j in range(last + 1, n - remaining):
+                        name = names[j]
+                        if name in used:
+                            continue
+                        if chosen:
+                            new_overlaps = tuple(
+                                o + (name in c) for o, c in zip(overlaps, chosen)
+                            )
+                            if max(new_overlaps) > max_overlap:
+                                continue
+                        else:
+                            new_overlaps = overlaps
+                        row = penalty[j]
+                        added = 0.0
+                        for i in indices:
+                            added += row[i]
+                        expanded.append(
+                            (indices + (j,), prob_sum + probs[j], pen_sum + added, new_overlaps)
+                        )
+
+                if not expanded:
+                    return []
+                k = depth + 1
+                expanded.sort(key=lambda st: st[1] / k + st[2] / 100, reverse=True)
+                # Keep a wider pool on the last level so diverse slips survive
+                beam = expanded[: beam_width * 4] if k == size else expanded[:beam_width]
+
+            scored = []
+            for indices, _, pen_sum, _ in beam:
+                # Platforms require picks from at least two teams
+                if len({teams[i] for i in indices}) < 2:
+                    continue
+                dist = _penalized_distribution([probs[i] for i in indices], pen_sum)
+                best_type, best_ev = None, float("-inf")
+                for pt, table in tables.items():
+                    ev = sum(dist[h] * mult for h, mult in table.items()) - 1.0
+                    if ev > best_ev:
+                        best_type, best_ev = pt, ev
+                scored.append((best_ev, best_type, indices, dist))
+
+            scored.sort(key=lambda st: st[0], reverse=True)
+            return scored
+
+        results = []
+        chosen: list[set] = []
+        seen: set[tuple] = set()
+        pool = beam_search(chosen)
+        while pool and len(results) < count:
+            pick_made = False
+            for ev, pt, indices, dist in pool:
+                players = {names[i] for i in indices}
+                if indices in seen or any(len(players & other) > max_overlap for other in chosen):
+                    continue
+                seen.add(indices)
+                chosen.append(players)
+                results.append({
+                    "picks": [picks[i] for i in indices],
+                    "play_type": pt,
+                    "expected_value": round(ev, 4),
+                    "hit_distribution": [round(x, 4) for x in dist],
+                })
+                pick_made = True
+                if len(results) >= count:
+                    break
+            if not pick_made:
+                break
+            # Pool exhausted by overlap limits: search again with chosen slips pruned
+            if len(results) < count:
+                pool = beam_search(chosen)
+
+        return results
+
     def get_line_comparison(
         self,
         db: Session,
@@ -322,65 +472,59 @@ class DFSService:
         confs = [p.get("confidence", 50) for p in picks]
         return sum(confs) / len(confs) if confs else 50
 
+    def _pick_to_analysis(self, pick: dict) -> PropAnalysis:
+        """Wrap a DFS pick dict as a PropAnalysis for the CorrelationAnalyzer."""
+        prop = PlayerProp(
+            player_name=pick.get("player_name", ""),
+            team=pick.get("team", ""),
+            opponent="",
+            position=pick.get("position", ""),
+            stat_type=pick.get("stat_type", ""),
+            line=pick.get("line", 0),
+        )
+        return PropAnalysis(
+            prop=prop,
+            final_confidence=int(pick.get("confidence", 50)),
+            recommendation="",
+            rationale=[],
+            agent_breakdown=pick.get("agent_breakdown") or {},
+            edge_explanation="",
+        )
+
+    def _correlation_matrix(self, picks: list[dict]) -> list[list[float]]:
+        """Symmetric matrix of pairwise correlation penalties between picks."""
+        analyzer = self.correlation_analyzer
+        drivers = [
+            frozenset(analyzer.extract_drivers(self._pick_to_analysis(p))) for p in picks
+        ]
+        n = len(picks)
+        matrix = [[0.0] * n for _ in range(n)]
+        pair_cache: dict[tuple, float] = {}
+        for i in range(n):
+            for j in range(i + 1, n):
+                key = (drivers[i], drivers[j])
+                value = pair_cache.get(key)
+                if value is None:
+                    value = analyzer.driver_penalty(drivers[i], drivers[j])
+                    pair_cache[key] = value
+                matrix[i][j] = matrix[j][i] = value
+        return matrix
+
     def _pairwise_correlation(self, pick: dict, others: list[dict]) -> float:
         """Calculate average correlation penalty of one pick against a list of others."""
         if not others:
             return 0
-        prop = PlayerProp(
-            player_name=pick.get("player_name", ""), team=pick.get("team", ""),
-            opponent="", position=pick.get("position", ""),
-            stat_type=pick.get("stat_type", ""), line=pick.get("line", 0),
-        )
-        analysis = PropAnalysis(
-            prop=prop, final_confidence=int(pick.get("confidence", 50)),
-            recommendation="", rationale=[],
-            agent_breakdown=pick.get("agent_breakdown", {}), edge_explanation="",
-        )
+        analysis = self._pick_to_analysis(pick)
 
         total = 0
         for other in others:
-            other_prop = PlayerProp(
-                player_name=other.get("player_name", ""), team=other.get("team", ""),
-                opponent="", position=other.get("position", ""),
-                stat_type=other.get("stat_type", ""), line=other.get("line", 0),
+            penalty, _ = self.correlation_analyzer.calculate_correlation_risk(
+                analysis, self._pick_to_analysis(other)
             )
-            other_analysis = PropAnalysis(
-                prop=other_prop, final_confidence=int(other.get("confidence", 50)),
-                recommendation="", rationale=[],
-                agent_breakdown=other.get("agent_breakdown", {}), edge_explanation="",
-            )
-            penalty, _ = self.correlation_analyzer.calculate_correlation_risk(analysis, other_analysis)
             total += penalty
 
         return total / len(others)
 
-    def _build_optimal_slip(
-        self, eligible: list[dict], size: int, exclude_players: set[str]
-    ) -> list[dict]:
-        """Greedy: pick highest-confidence players not already used, checking correlation."""
-        available = [
-            p for p in eligible if p.get("player_name", "") not in exclude_players
-        ]
-        if len(available) < size:
-            return []
-
-        slip: list[dict] = []
-        for candidate in available:
-            if len(slip) >= size:
-                break
-            # Skip duplicate players
-            if candidate.get("player_name") in {p.get("player_name") for p in slip}:
-                continue
-            # Check correlation with current slip
-            if slip:
-                test_slip = slip + [candidate]
-                corr = self.score_correlation(test_slip)
-                if corr["risk_level"] == "high":
-                    continue  # Skip high-correlation picks
-            slip.append(candidate)
-
-        return slip if len(slip) == size else []
-
     def _discrepancy_note(self, disc: Optional[float]) -> str:
         if disc is None:
             return "No comparison available"
@@ -391,4 +535,30 @@ class DFSService:
         return f"Platform line is {abs(disc)} LOWER than consensus — lean OVER"
 
 
+def _hit_distribution(probs: list[float]) -> list[float]:
+    """P(exactly k picks hit) for independent picks (Poisson-binomial DP)."""
+    dist = [1.0]
+    for p in probs:
+        nxt = [0.0] * (len(dist) + 1)
+        for k, q in enumerate(dist):
+            nxt[k] += q * (1 - p)
+            nxt[k + 1] += q * p
+        dist = nxt
+    return dist
+
+
+def _penalized_distribution(probs: list[float], penalty: float) -> list[float]:
+    """
+    Hit distribution with a slip's correlation penalty (percentage points,
+    summed over its pairs) applied once to the joint all-hit probability;
+    the probability removed moves to "all but one hit".
+    """
+    dist = _hit_distribution(probs)
+    joint = dist[-1]
+    adjusted = min(joint + dist[-2], max(0.0, joint * (1 + penalty / 100)))
+    dist[-2] += joint - adjusted
+    dist[-1] = adjusted
+    return dist
+
+
 dfs_service = DFSService()
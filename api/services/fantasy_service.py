@@ -40,6 +40,21 @@ SCORING_PRESETS = {
 # Position slots for typical fantasy league
 ROSTER_SLOTS = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "K", "DEF"]
 
+# Positions eligible to fill each roster slot
+SLOT_ELIGIBILITY = {
+    "QB": ["QB"],
+    "RB": ["RB"],
+    "WR": ["WR"],
+    "TE": ["TE"],
+    "FLEX": ["RB", "WR", "TE"],
+    "SUPER_FLEX": ["QB", "RB", "WR", "TE"],
+    "K": ["K"],
+    "DEF": ["DEF"],
+}
+
+# Cost assigned to ineligible slot/player pairs in the assignment solver
+_INELIGIBLE_COST = 1e9
+
 # DVOA position matchup quality (lower = easier matchup)
 # These would ideally come from live DVOA data, but we use engine projections as proxy
 POSITION_GROUPS = {
@@ -82,6 +97,36 @@ class FantasyService:
         if not player:
             return {"player_id": player_id, "fantasy_points": 0, "projections": []}
 
+        return self._build_fantasy_projection(player, projections, scoring)
+
+    def get_fantasy_projections_bulk(
+        self, db: Session, player_ids: list[int], week: int, scoring: str = "ppr"
+    ) -> dict[int, dict]:
+        """
+        Fantasy projections for many players in two queries.
+        Returns dict keyed by player_id; unknown players are omitted.
+        """
+        if not player_ids:
+            return {}
+
+        unique_ids = list(set(player_ids))
+        players = db.query(Player).filter(Player.id.in_(unique_ids)).all()
+        projections = db.query(PlayerProjection).filter(
+            PlayerProjection.player_id.in_(unique_ids),
+            PlayerProjection.week == week,
+        ).all()
+
+        by_player: dict[int, list] = {}
+        for p in projections:
+            by_player.setdefault(p.player_id, []).append(p)
+
+        return {
+            player.id: self._build_fantasy_projection(player, by_player.get(player.id, []), scoring)
+            for player in players
+        }
+
+    def _build_fantasy_projection(self, player: Player, projections: list, scoring: str) -> dict:
+        """Assemble the fantasy projection dict for one player."""
         proj_list = []
         for p in projections:
             proj_list.append({
@@ -101,7 +146,7 @@ class FantasyService:
         ceiling_pts = round(fp * (1 + spread), 1)
 
         return {
-            "player_id": player_id,
+            "player_id": player.id,
             "player_name": player.name,
             "team": player.team,
             "position": player.position,
@@ -121,10 +166,11 @@ class FantasyService:
         scoring: str = "ppr",
     ) -> list[dict]:
         """Get fantasy projections for an entire roster."""
+        by_id = self.get_fantasy_projections_bulk(db, player_ids, week, scoring)
         results = []
-        for pid in player_ids:
-            proj = self.get_player_fantasy_projection(db, pid, week, scoring)
-            if proj["fantasy_points"] > 0:
+        for pid in dict.fromkeys(player_ids):
+            proj = by_id.get(pid)
+            if proj and proj["fantasy_points"] > 0:
                 results.append(proj)
         results.sort(key=lambda x: x["fantasy_points"], reverse=True)
         return results
@@ -263,9 +309,12 @@ class FantasyService:
         week: int,
         weeks_remaining: int = 4,
         scoring: str = "ppr",
+        roster_player_ids: Optional[list[int]] = None,
     ) -> dict:
         """
         Analyze a trade: compare ROS (rest of season) projected value.
+        When roster_player_ids is given, also reports the change in optimal
+        starting lineup before vs after the trade.
         """
         give_total = 0.0
         give_players = []
@@ -296,6 +345,22 @@ class FantasyService:
             verdict = "DECLINE"
             verdict_reason = f"You lose {abs(diff):.1f} projected ROS points ({diff_pct:+.1f}%). Bad value."
 
+        lineup_impact = None
+        if roster_player_ids:
+            give_set = set(give_player_ids)
+            after_ids = [pid for pid in roster_player_ids if pid not in give_set] + list(get_player_ids)
+            lineups = self.optimize_lineups(
+                db, {"before": roster_player_ids, "after": after_ids}, week, scoring
+            )
+            before_total = lineups["before"]["projected_total"]
+            after_total = lineups["after"]["projected_total"]
+            lineup_impact = {
+                "before_total": before_total,
+                "after_total": after_total,
+                "weekly_diff": round(after_total - before_total, 1),
+                "ros_diff": round((after_total - before_total) * weeks_remaining, 1),
+            }
+
         return {
             "give": give_players,
             "get": get_players,
@@ -306,6 +371,7 @@ class FantasyService:
             "verdict": verdict,
             "verdict_reason": verdict_reason,
             "weeks_remaining": weeks_remaining,
+            "lineup_impact": lineup_impact,
             "scoring": scoring,
         }
 
@@ -378,53 +444,168 @@ class FantasyService:
         week: int,
         scoring: str = "ppr",
         roster_slots: Optional[list[str]] = None,
+        risk_aversion: float = 0.0,
     ) -> dict:
         """
         Suggest optimal lineup from available roster players.
-        Fills each roster slot with the highest-projected eligible player.
+        Solves slot × player assignment exactly, so slot order never matters.
+
+        risk_aversion (0-1) pulls each player's value from projection toward
+        floor; 0 maximizes raw projected points.
         """
-        slots = roster_slots or ROSTER_SLOTS
         projections = self.get_roster_projections(db, player_ids, week, scoring)
+        return self._solve_lineup(projections, roster_slots or ROSTER_SLOTS, risk_aversion, scoring)
 
-        # Build eligible players per slot
-        position_eligible = {
-            "QB": ["QB"],
-            "RB": ["RB"],
-            "WR": ["WR"],
-            "TE": ["TE"],
-            "FLEX": ["RB", "WR", "TE"],
-            "K": ["K"],
-            "DEF": ["DEF"],
-        }
+    def optimize_lineups(
+        self,
+        db: Session,
+        rosters: dict,
+        week: int,
+        scoring: str = "ppr",
+        roster_slots: Optional[list[str]] = None,
+        risk_aversion: float = 0.0,
+    ) -> dict:
+        """
+        Optimize several rosters at once (e.g. every team in a league).
+        rosters: {roster_key: [player_id, ...]}
+        Projections for all rosters are loaded in a single pass.
+        """
+        all_ids = [pid for ids in rosters.values() for pid in ids]
+        by_id = self.get_fantasy_projections_bulk(db, all_ids, week, scoring)
+        slots = roster_slots or ROSTER_SLOTS
 
-        lineup = []
-        used_ids = set()
-        bench = []
+        results = {}
+        for key, ids in rosters.items():
+            projections = [
+                by_id[pid] for pid in dict.fromkeys(ids)
+                if pid in by_id and by_id[pid]["fantasy_points"] > 0
+            ]
+            projections.sort(key=lambda x: x["fantasy_points"], reverse=True)
+            results[key] = self._solve_lineup(projections, slots, risk_aversion, scoring)
+        return results
 
+    def _solve_lineup(
+        self,
+        projections: list[dict],
+        slots: list[str],
+        risk_aversion: float,
+        scoring: str,
+    ) -> dict:
+        """Build the lineup/bench response from an exact slot assignment."""
+        risk_aversion = min(1.0, max(0.0, risk_aversion))
+        values = [
+            p["fantasy_points"] - risk_aversion * (p["fantasy_points"] - p.get("floor", p["fantasy_points"]))
+            for p in projections
+        ]
+
+        # Score matrix: slots are rows, players are columns (None = ineligible)
+        weights = []
         for slot in slots:
-            eligible_positions = position_eligible.get(slot, [slot])
-            candidates = [
-                p for p in projections
-                if p["position"] in eligible_positions and p["player_id"] not in used_ids
-            ]
-            if candidates:
-                best = candidates[0]  # Already sorted by fantasy_points desc
-                lineup.append({**best, "slot": slot})
-                used_ids.add(best["player_id"])
+            eligible_positions = SLOT_ELIGIBILITY.get(slot, [slot])
+            weights.append([
+                values[j] if p["position"] in eligible_positions else None
+                for j, p in enumerate(projections)
+            ])
 
-        # Everyone else is bench
-        for p in projections:
-            if p["player_id"] not in used_ids:
-                bench.append({**p, "slot": "BN"})
+        assignment = _max_weight_assignment(weights)
+
+        lineup = []
+        used_ids = set()
+        for slot, col in zip(slots, assignment):
+            if col is None:
+                continue
+            best = projections[col]
+            lineup.append({**best, "slot": slot})
+            used_ids.add(best["player_id"])
+
+        bench = [{**p, "slot": "BN"} for p in projections if p["player_id"] not in used_ids]
 
         total_pts = sum(p["fantasy_points"] for p in lineup)
+        risk_adjusted = sum(values[col] for col in assignment if col is not None)
 
         return {
             "lineup": lineup,
             "bench": bench,
             "projected_total": round(total_pts, 1),
+            "risk_adjusted_total": round(risk_adjusted, 1),
+            "risk_aversion": risk_aversion,
             "scoring": scoring,
         }
 
 
+def _max_weight_assignment(weights: list[list[Optional[float]]]) -> list[Optional[int]]:
+    """
+    Maximum-weight assignment of rows (slots) to columns (players).
+
+    weights[i][j] is the value of putting player j in slot i, or None if
+    ineligible. Each slot gets at most one player and each player fills at
+    most one slot. Returns the chosen column per row (None = slot left empty).
+
+    Hungarian algorithm (O(n^2 m)); one zero-value "empty" column per slot is
+    added so a slot with no eligible player stays unfilled instead of forcing
+    an ineligible pick.
+    """
+    n = len(weights)
+    if n == 0:
+        return []
+    n_players = len(weights[0]) if weights[0] else 0
+    m = n_players + n
+
+    # Minimization costs, 1-indexed per the classic formulation
+    cost = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n):
+        row = weights[i]
+        for j in range(n_players):
+            w = row[j]
+            cost[i + 1][j + 1] = _INELIGIBLE_COST if w is None else -w
+        # Empty-slot columns are free for every row
+
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [float("inf")] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            delta = float("inf")
+            j1 = 0
+            cost_row = cost[i0]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = cost_row[j] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    assignment: list[Optional[int]] = [None] * n
+    for j in range(1, n_players + 1):
+        if p[j] != 0 and cost[p[j]][j] < _INELIGIBLE_COST:
+            assignment[p[j] - 1] = j - 1
+    return assignment
+
+
 fantasy_service = FantasyService()
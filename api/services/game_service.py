@@ -4,10 +4,16 @@ Game Service — Game environment context: implied total, spread, pace, pass/run
 Derives game-level context from odds data to enrich player-level analysis.
 """
 
+import json
 import logging
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-from sqlalchemy.orm import Session
-from api.database import BookOdds, Player, PlayerProjection
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from api.config import settings
+from api.core.cache import cache_get_or_compute
+from api.database import BookOdds, Game, Player, PlayerProjection
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +38,42 @@ PACE_TIERS = {
     "slow": ["BAL", "TEN", "NYJ", "CLE", "DEN", "PIT"],
 }
 
+# Season calendar: weeks run Tuesday -> Monday, week 1 starting the Tuesday after
+# Labor Day. Boundaries sit at 10:00 UTC so Monday night games (past midnight
+# UTC) stay in their week. Week 23 is the Super Bowl (18 regular weeks, four
+# playoff rounds around the pre-Super Bowl bye).
+WEEK_BOUNDARY_HOUR_UTC = 10
+LAST_SEASON_WEEK = 23
+
+
+def _week_one_start(year: int) -> datetime:
+    """Tuesday after Labor Day (first Monday of September) of a season's year."""
+    sept_first = datetime(year, 9, 1, WEEK_BOUNDARY_HOUR_UTC, tzinfo=timezone.utc)
+    labor_day = sept_first + timedelta(days=-sept_first.weekday() % 7)
+    return labor_day + timedelta(days=1)
+
+
+def season_week(when: datetime) -> Optional[int]:
+    """NFL week a kickoff time falls in (None for preseason / offseason)."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    start = _week_one_start(when.year)
+    if when < start:
+        start = _week_one_start(when.year - 1)
+    week = (when - start).days // 7 + 1
+    return week if week <= LAST_SEASON_WEEK else None
+
 
 class GameService:
     """Provides game-level environment context for analysis."""
 
+    def find_game(self, db: Session, team: str, week: int) -> Optional[Game]:
+        """Look up a team's game for the week from the games table."""
+        return db.query(Game).filter(
+            Game.week == week,
+            or_(Game.home_team == team, Game.away_team == team),
+        ).first()
+
     def get_game_environment(
         self,
         db: Session,
@@ -48,9 +86,18 @@ class GameService:
         Uses player prop totals as a proxy for implied game total when
         game-level odds aren't directly stored.
         """
-        # Estimate implied total from player projection data
-        implied_total = self._estimate_implied_total(db, home_team, away_team, week)
-        spread = self._estimate_spread(db, home_team, away_team, week)
+        # Prefer real game lines; fall back to estimates from projection data
+        game = db.query(Game).filter(
+            Game.week == week,
+            Game.home_team == home_team,
+            Game.away_team == away_team,
+        ).first()
+        implied_total = game.total if game and game.total is not None else None
+        spread = game.spread if game and game.spread is not None else None
+        if implied_total is None:
+            implied_total = self._estimate_implied_total(db, home_team, away_team, week)
+        if spread is None:
+            spread = self._estimate_spread(db, home_team, away_team, week)
 
         # Determine pace
         pace = self._get_pace_tier(home_team, away_team)
@@ -85,39 +132,97 @@ class GameService:
     def get_week_slate(self, db: Session, week: int) -> list[dict]:
         """
         Build the full slate of games for a week.
-        Identifies unique team matchups from player projections.
+        Games come from the games table joined against per-team projection
+        aggregates in a single grouped query (uncached; see get_cached_week_slate).
         """
-        # Get all teams with projections this week
-        team_query = db.query(Player.team).join(PlayerProjection).filter(
+        team_stats = db.query(
+            Player.team.label("team"),
+            func.avg(PlayerProjection.confidence).label("avg_confidence"),
+            func.sum(case(
+                (and_(Player.position == "QB", PlayerProjection.stat_type == "pass_yds"),
+                 func.coalesce(PlayerProjection.engine_projection, 0)),
+                else_=None,
+            )).label("qb_pass_yds"),
+        ).join(PlayerProjection, PlayerProjection.player_id == Player.id).filter(
             PlayerProjection.week == week,
-        ).distinct().all()
-
-        teams = [t[0] for t in team_query if t[0]]
+        ).group_by(Player.team).subquery()
+
+        home = aliased(team_stats)
+        away = aliased(team_stats)
+        rows = db.query(
+            Game,
+            home.c.avg_confidence, home.c.qb_pass_yds,
+            away.c.avg_confidence, away.c.qb_pass_yds,
+        ).outerjoin(home, home.c.team == Game.home_team).outerjoin(
+            away, away.c.team == Game.away_team,
+        ).filter(Game.week == week).all()
+
+        if not rows:
+            # Games not fetched yet for this week: one entry per team with projections
+            team_rows = db.query(
+                team_stats.c.team, team_stats.c.avg_confidence, team_stats.c.qb_pass_yds,
+            ).filter(team_stats.c.team.isnot(None)).all()
+            games = [{
+                "home_team": team,
+                "away_team": None,
+                "implied_total": self._implied_total_from_pass_yds(pass_yds),
+                "home_avg_confidence": round(conf, 1) if conf else None,
+                "pace": self._get_pace_tier(team, ""),
+                "dome": team in DOME_TEAMS,
+            } for team, conf, pass_yds in team_rows]
+            games.sort(key=lambda g: g.get("implied_total") or 0, reverse=True)
+            return games
 
-        # Simple matchup detection: pair teams by their game (we don't have a games table,
-        # so we approximate from the player data)
         games = []
-        seen_teams = set()
+        for game, home_conf, home_pass, away_conf, away_pass in rows:
+            implied_total = game.total
+            if implied_total is None:
+                pass_yds = home_pass if home_pass is not None else away_pass
+                implied_total = self._implied_total_from_pass_yds(pass_yds)
 
-        for team in sorted(teams):
-            if team in seen_teams:
-                continue
+            spread = game.spread
+            if spread is None and home_conf and away_conf:
+                spread = self._spread_from_confidence(home_conf, away_conf)
+
+            home_implied = away_implied = None
+            if game.total is not None and game.spread is not None:
+                home_implied = round(game.total / 2 - game.spread / 2, 1)
+                away_implied = round(game.total / 2 + game.spread / 2, 1)
 
-            # Find opponent by looking at matchup data in projections
-            # For now, build a simple slate entry per team
-            env = self.get_game_environment(db, team, "OPP", week)
             games.append({
-                "home_team": team,
-                "implied_total": env["implied_total"],
-                "pace": env["pace"],
-                "dome": env["dome"],
+                "game_id": game.id,
+                "home_team": game.home_team,
+                "away_team": game.away_team,
+                "commence_time": game.commence_time.isoformat() if game.commence_time else None,
+                "implied_total": implied_total,
+                "spread": spread,
+                "home_implied_total": home_implied,
+                "away_implied_total": away_implied,
+                "home_avg_confidence": round(home_conf, 1) if home_conf else None,
+                "away_avg_confidence": round(away_conf, 1) if away_conf else None,
+                "pace": self._get_pace_tier(game.home_team, game.away_team),
+                "dome": game.home_team in DOME_TEAMS,
+                "is_division_game": self._is_division_game(game.home_team, game.away_team),
             })
-            seen_teams.add(team)
 
         # Sort by implied total descending (most interesting games first)
         games.sort(key=lambda g: g.get("implied_total") or 0, reverse=True)
         return games
 
+    async def get_cached_week_slate(self, db: AsyncSession, week: int) -> list[dict]:
+        """
+        Week slate through the shared API cache.
+        The key is week-versioned, so upserting the week's games (which bumps
+        the week version) drops it in every worker.
+        """
+        async def compute() -> str:
+            return json.dumps(await db.run_sync(self.get_week_slate, week))
+
+        cached = await cache_get_or_compute(
+            "game_slate", compute, expire=settings.cache_ttl_seconds, week=week
+        )
+        return json.loads(cached)
+
     def _estimate_implied_total(
         self, db: Session, home_team: str, away_team: str, week: int
     ) -> Optional[float]:
@@ -132,15 +237,21 @@ class GameService:
             ).all()
 
             if qb_projs:
-                # Convert passing yards to approximate points (1 TD per ~40 yds)
                 total_pass_yds = sum(p.engine_projection or 0 for p in qb_projs)
-                # Rough: each team scores ~(pass_yds / 40) TDs from passing
-                # Plus rushing and other scoring ≈ 1.3x multiplier
-                estimated_pts = (total_pass_yds / 40) * 7 * 1.3
-                return round(estimated_pts * 2 / 7 * 7, 1)  # Both teams, round to nearest
+                return self._implied_total_from_pass_yds(total_pass_yds)
 
         return None
 
+    def _implied_total_from_pass_yds(self, total_pass_yds: Optional[float]) -> Optional[float]:
+        """Convert one team's QB passing projection into an approximate game total."""
+        if total_pass_yds is None:
+            return None
+        # Convert passing yards to approximate points (1 TD per ~40 yds)
+        # Rough: each team scores ~(pass_yds / 40) TDs from passing
+        # Plus rushing and other scoring ≈ 1.3x multiplier
+        estimated_pts = (total_pass_yds / 40) * 7 * 1.3
+        return round(estimated_pts * 2 / 7 * 7, 1)  # Both teams, round to nearest
+
     def _estimate_spread(
         self, db: Session, home_team: str, away_team: str, week: int
     ) -> Optional[float]:
@@ -149,11 +260,15 @@ class GameService:
         away_conf = self._get_team_avg_confidence(db, away_team, week)
 
         if home_conf and away_conf:
-            diff = (home_conf - away_conf) / 5  # Scale to spread-like range
-            return round(diff * -1, 1)  # Negative = home favored
+            return self._spread_from_confidence(home_conf, away_conf)
 
         return None
 
+    def _spread_from_confidence(self, home_conf: float, away_conf: float) -> float:
+        """Map team confidence gap to a spread-like number."""
+        diff = (home_conf - away_conf) / 5  # Scale to spread-like range
+        return round(diff * -1, 1)  # Negative = home favored
+
     def _get_team_avg_confidence(
         self, db: Session, team: str, week: int
     ) -> Optional[float]:
@@ -1,12 +1,16 @@
 """Odds service: fetch from The Odds API, store BookOdds, find best prices, track line movement."""
 
 import logging
+import statistics
 from datetime import datetime, timezone
 from typing import Optional
 import httpx
 from sqlalchemy.orm import Session
 from api.config import settings
-from api.database import BookOdds, LineMovement, Player
+from api.core.cache import cache_invalidate_week
+from api.database import BookOdds, Game, LineMovement, Player
+from api.services.game_service import season_week
+from scripts.analysis.team_mapping import normalize_team_name
 
 logger = logging.getLogger(__name__)
 
@@ -84,10 +88,94 @@ class OddsService:
             resp.raise_for_status()
             return resp.json()
 
+    async def fetch_game_lines(self, db: Session, week: int) -> int:
+        """
+        Fetch upcoming games with spreads/totals and upsert the games table.
+        Returns number of games stored.
+        """
+        api_key = self._get_api_key()
+        url = f"{ODDS_API_BASE}/sports/americanfootball_nfl/odds"
+        params = {
+            "apiKey": api_key,
+            "regions": "us",
+            "markets": "spreads,totals",
+            "oddsFormat": "american",
+        }
+
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            try:
+                resp = await client.get(url, params=params)
+                resp.raise_for_status()
+                events = resp.json()
+            except Exception as e:
+                logger.error(f"Odds API game lines fetch failed: {e}")
+                return 0
+
+        return await self.store_game_lines(db, events, week)
+
+    async def store_game_lines(self, db: Session, events: list[dict], week: int) -> int:
+        """Upsert games from odds events and drop cached data for every week touched."""
+        weeks = self._store_games_from_events(db, events, week)
+        # Slates (and anything else cached for those weeks) are now stale
+        for touched in sorted(set(weeks)):
+            await cache_invalidate_week(touched)
+        return len(weeks)
+
+    def _store_games_from_events(self, db: Session, events: list[dict], week: int) -> list[int]:
+        """
+        Upsert Game rows from odds events; spread/total are book medians.
+        The feed lists every upcoming event, so each game's week comes from its
+        kickoff time (the requested week only when the event has none).
+        Returns the week of each game stored.
+        """
+        weeks = []
+        for event in events:
+            event_id = event.get("id")
+            home_name = event.get("home_team", "")
+            away_name = event.get("away_team", "")
+            if not event_id or not home_name or not away_name:
+                continue
+
+            spreads, totals = [], []
+            for bookmaker in event.get("bookmakers", []):
+                for mkt in bookmaker.get("markets", []):
+                    for outcome in mkt.get("outcomes", []):
+                        point = outcome.get("point")
+                        if point is None:
+                            continue
+                        if mkt.get("key") == "spreads" and outcome.get("name") == home_name:
+                            spreads.append(float(point))
+                        elif mkt.get("key") == "totals" and outcome.get("name") == "Over":
+                            totals.append(float(point))
+
+            commence = event.get("commence_time")
+            commence_time = (
+                datetime.fromisoformat(commence.replace("Z", "+00:00")) if commence else None
+            )
+            game_week = season_week(commence_time) if commence_time else week
+            if game_week is None:
+                continue  # Preseason / offseason event
+
+            game = db.query(Game).filter(Game.id == event_id).first()
+            if game is None:
+                game = Game(id=event_id)
+                db.add(game)
+            game.week = game_week
+            game.home_team = _team_abbr(home_name)
+            game.away_team = _team_abbr(away_name)
+            game.commence_time = commence_time
+            game.spread = statistics.median(spreads) if spreads else game.spread
+            game.total = statistics.median(totals) if totals else game.total
+            weeks.append(game_week)
+
+        db.commit()
+        return weeks
+
     async def fetch_all_props_for_week(self, db: Session, week: int) -> dict:
         """Fetch all player props for upcoming games. Returns summary of what was fetched."""
         events = await self.fetch_upcoming_events()
         summary = {"events": len(events), "total_odds": 0}
+        summary["games"] = await self.fetch_game_lines(db, week)
 
         for event in events:
             event_id = event.get("id")
@@ -233,4 +321,10 @@ class OddsService:
         ]
 
 
+def _team_abbr(team_name: str) -> str:
+    """Odds API full team name → abbreviation used by the Player table."""
+    abbr = normalize_team_name(team_name)
+    return "LAR" if abbr == "LA" else abbr
+
+
 odds_service = OddsService()
@@ -134,10 +134,16 @@ class PlayerIntelService:
             drivers.sort(key=lambda d: d["impact"], reverse=True)
             top_drivers = drivers[:3]
 
-        # Game environment
-        game_env = game_service.get_game_environment(
-            db, player.team, "OPP", week
-        )
+        # Game environment (real matchup when the games table has it)
+        game = game_service.find_game(db, player.team, week)
+        if game:
+            game_env = game_service.get_game_environment(
+                db, game.home_team, game.away_team, week
+            )
+        else:
+            game_env = game_service.get_game_environment(
+                db, player.team, "OPP", week
+            )
 
         return {
             "player": {
@@ -3,6 +3,8 @@
 import logging
 from typing import Optional
 import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from api.database import Player, PlayerProjection
 
@@ -35,6 +37,24 @@ class PlayerService:
             q = q.filter(Player.team == team.upper())
         return q.order_by(Player.name).limit(limit).all()
 
+    async def search_async(self, db: AsyncSession, query: str, position: Optional[str] = None, team: Optional[str] = None, limit: int = 20) -> list[Player]:
+        """Async variant of search() for read-only routes."""
+        stmt = select(Player).where(Player.name.ilike(f"%{query}%"))
+        if position:
+            stmt = stmt.where(Player.position == position.upper())
+        if team:
+            stmt = stmt.where(Player.team == team.upper())
+        result = await db.execute(stmt.order_by(Player.name).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_projections_async(self, db: AsyncSession, player_id: int, week: Optional[int] = None) -> list[PlayerProjection]:
+        """Async variant of get_projections() for read-only routes."""
+        stmt = select(PlayerProjection).where(PlayerProjection.player_id == player_id)
+        if week:
+            stmt = stmt.where(PlayerProjection.week == week)
+        result = await db.execute(stmt.order_by(PlayerProjection.week.desc()))
+        return list(result.scalars().all())
+
     def get_by_id(self, db: Session, player_id: int) -> Optional[Player]:
         return db.query(Player).filter(Player.id == player_id).first()
 
@@ -13,12 +13,13 @@ Usage:
 import sqlite3
 import pandas as pd
 from pathlib import Path
-import re
 import argparse
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 import sys
 
+from scripts.analysis.player_identity import canonical_key
+
 
 # ============================================================================
 # CONFIGURATION
@@ -61,12 +62,10 @@ STAT_TYPE_MAP = {
 # ============================================================================
 
 def normalize_name(name: str) -> str:
-    """Normalize player name for matching (same as data_loader.py)"""
-    if not name:
+    """Canonical player key for matching (shared with the analysis loader)"""
+    if not name or pd.isna(name):
         return name
-    name = str(name).strip().replace('.', '')
-    name = re.sub(r'\s+', ' ', name)
-    return name.lower()
+    return canonical_key(str(name))
 
 
 def normalize_team_abbr(abbr: str) -> str:
@@ -22,25 +22,13 @@ if sys.platform == "win32":
 project_root = Path.cwd()
 sys.path.insert(0, str(project_root))
 
-from scripts.api.claude_query_handler import ClaudeQueryHandler
+# Only what the prompt needs is imported up front; LLM clients, the Tk GUI,
+# exporters and scoring modules are imported by the commands that use them
+# (see scripts/benchmark_import_time.py for the startup budget)
 from scripts.analysis.orchestrator import PropAnalyzer
 from scripts.analysis.data_loader import NFLDataLoader
-from scripts.analysis.parlay_builder import ParlayBuilder
-from scripts.analysis.correlation_detector import EnhancedParlayBuilder
-from scripts.analysis.parlay_optimizer import ParlayOptimizer
-from scripts.analysis.dependency_analyzer import DependencyAnalyzer
-from scripts.analysis.performance_tracker import PerformanceTracker
-from scripts.analysis.agent_calibrator import AgentCalibrator
-from scripts.analysis.kelly_optimizer import KellyOptimizer, format_kelly_report
-from scripts.analysis.position_size_optimizer import PositionSizeOptimizer
-from scripts.analysis.odds_integration import OddsIntegrator, integrate_odds_with_analysis
-from scripts.utils.parlay_gui import show_parlays_gui
-from scripts.utils.props_json_exporter import PropsJSONExporter
-from scripts.utils.enhanced_props_exporter import EnhancedPropsExporter
-from scripts.analysis.chat_interface import run_chat_interface
-import auto_scorer
-import prop_logger
-import props_scorer
+from scripts.analysis.analysis_session import AnalysisSession
+from scripts.analysis import instrumentation
 import logging
 
 logging.basicConfig(level=logging.WARNING)
@@ -48,17 +36,56 @@ logging.basicConfig(level=logging.WARNING)
 class BettingAnalyzerCLI:
     def __init__(self):
         self.db_path = project_root / "bets.db"
-        self.handler = ClaudeQueryHandler()
         self.analyzer = PropAnalyzer()
         self.loader = NFLDataLoader(data_dir=str(project_root / "data"))
-        self.parlay_builder = ParlayBuilder()
-        self.tracker = PerformanceTracker(db_path=str(self.db_path))
-        self.calibrator = AgentCalibrator(db_path=str(self.db_path))
-        self.odds_integrator = OddsIntegrator(data_dir=str(project_root / "data"))
+        # Loaded context + full analysis per week, shared by every command
+        self.session = AnalysisSession(self.loader, self.analyzer)
+        # Built on first use (see properties below)
+        self._handler = None
+        self._parlay_builder = None
+        self._tracker = None
+        self._calibrator = None
+        self._odds_integrator = None
         self.week = 9
         self.last_parlays = []
         self.last_parlay_ids = []  # Store parlay IDs for reference
         self.bankroll = 1000
+
+    @property
+    def handler(self):
+        """Claude query handler (Anthropic client) - only the analyze command needs it"""
+        if self._handler is None:
+            from scripts.api.claude_query_handler import ClaudeQueryHandler
+            self._handler = ClaudeQueryHandler()
+        return self._handler
+
+    @property
+    def parlay_builder(self):
+        if self._parlay_builder is None:
+            from scripts.analysis.parlay_builder import ParlayBuilder
+            self._parlay_builder = ParlayBuilder()
+        return self._parlay_builder
+
+    @property
+    def tracker(self):
+        if self._tracker is None:
+            from scripts.analysis.performance_tracker import PerformanceTracker
+            self._tracker = PerformanceTracker(db_path=str(self.db_path))
+        return self._tracker
+
+    @property
+    def calibrator(self):
+        if self._calibrator is None:
+            from scripts.analysis.agent_calibrator import AgentCalibrator
+            self._calibrator = AgentCalibrator(db_path=str(self.db_path))
+        return self._calibrator
+
+    @property
+    def odds_integrator(self):
+        if self._odds_integrator is None:
+            from scripts.analysis.odds_integration import OddsIntegrator
+            self._odds_integrator = OddsIntegrator(data_dir=str(project_root / "data"))
+        return self._odds_integrator
     
     def print_header(self):
         print("\n" + "="*70)
@@ -102,6 +129,7 @@ class BettingAnalyzerCLI:
         print("  show-weights                  - Display current agent weights")
         print("  recent [limit]                - Show recent logged parlays (default: 10)")
         print("  summary <week>                - Show week summary stats")
+        print("  profile [reset]               - Show timings/cache hit rates (start with --profile)")
         print("\n  help                     - Show this message")
         print("  exit/quit                - Exit")
         print("="*70 + "\n")
@@ -136,8 +164,10 @@ class BettingAnalyzerCLI:
     
     def pull_lines(self):
         """Refresh DraftKings betting lines"""
+        from scripts.analysis.odds_integration import integrate_odds_with_analysis
         print(f"\n📡 Refreshing DraftKings betting lines for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
+        self.session.invalidate(self.week)
+        context = self.session.get_context(self.week)
         enriched_props, odds_source = integrate_odds_with_analysis(
             context.get('props', []),
             week=self.week,
@@ -170,11 +200,8 @@ class BettingAnalyzerCLI:
         except ValueError:
             count = 20
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing props (OVER + UNDER)...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Deduplicate: keep only highest confidence for each player+stat_type+bet_type
         seen = {}
@@ -232,11 +259,8 @@ class BettingAnalyzerCLI:
         except ValueError:
             count = 20
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing OVER props...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Filter to OVER only
         over_analyses = [a for a in all_analyses if getattr(a.prop, 'bet_type', 'OVER') == 'OVER']
@@ -291,11 +315,8 @@ class BettingAnalyzerCLI:
         except ValueError:
             count = 20
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing UNDER props...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Filter to UNDER only
         under_analyses = [a for a in all_analyses if getattr(a.prop, 'bet_type', 'OVER') == 'UNDER']
@@ -358,11 +379,8 @@ class BettingAnalyzerCLI:
         except (ValueError, IndexError):
             count = 20
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing props for {team_abbr}...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Filter to team only
         team_analyses = [a for a in all_analyses if a.prop.team.upper() == team_abbr]
@@ -422,16 +440,14 @@ class BettingAnalyzerCLI:
     
     def export_props_command(self, count_str="50"):
         """Export top props as JSON for conversational Claude analysis"""
+        from scripts.utils.props_json_exporter import PropsJSONExporter
         try:
             count = int(count_str)
         except ValueError:
             count = 50
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing props...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Deduplicate: keep only highest confidence for each player+stat_type+bet_type
         seen = {}
@@ -480,16 +496,14 @@ class BettingAnalyzerCLI:
     
     def export_enhanced_command(self, count_str="50"):
         """Export props with correlation clustering and contradiction detection"""
+        from scripts.utils.enhanced_props_exporter import EnhancedPropsExporter
         try:
             count = int(count_str)
         except ValueError:
             count = 50
         
-        print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
-        
         print(f"📊 Analyzing props...")
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
         
         # Deduplicate: keep only highest confidence for each player+stat_type+bet_type
         seen = {}
@@ -548,19 +562,21 @@ class BettingAnalyzerCLI:
             min_conf_str: Minimum confidence threshold
             teams: Optional list of team abbreviations to filter to (e.g., ['GB', 'DET', 'KC'])
         """
+        from scripts.analysis.correlation_detector import EnhancedParlayBuilder
+        from scripts.utils.parlay_gui import show_parlays_gui
         try:
             min_conf = int(min_conf_str)
         except ValueError:
             min_conf = 58
 
         print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
+        context = self.session.get_context(self.week)
 
         props_list = context.get('props', [])
         betting_source = context.get('betting_lines_source', 'UNKNOWN')
         print(f"📊 Analyzing {len(props_list)} props (OVER + UNDER)...")
 
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=60)
 
         # Filter by teams if specified
         if teams:
@@ -611,6 +627,9 @@ class BettingAnalyzerCLI:
             quality_str: Minimum quality threshold
             teams: Optional list of team abbreviations to filter to (e.g., ['GB', 'DET', 'KC'])
         """
+        from scripts.analysis.parlay_optimizer import ParlayOptimizer
+        from scripts.analysis.position_size_optimizer import PositionSizeOptimizer
+        from scripts.utils.parlay_gui import show_parlays_gui
         api_key = os.environ.get('ANTHROPIC_API_KEY')
         if not api_key:
             print("❌ ERROR: ANTHROPIC_API_KEY not set in .env\n")
@@ -624,12 +643,12 @@ class BettingAnalyzerCLI:
                 quality_threshold = 65
 
         print(f"\n🔄 Loading data for Week {self.week}...")
-        context = self.loader.load_all_data(week=self.week)
+        context = self.session.get_context(self.week)
 
         props_list = context.get('props', [])
         print(f"📊 Analyzing {len(props_list)} props (OVER + UNDER)...")
 
-        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=50)
+        all_analyses = self.session.get_analyses(self.week, min_confidence=50)
 
         # Filter by teams if specified
         if teams:
@@ -652,7 +671,8 @@ class BettingAnalyzerCLI:
         )
         
         print("\n🔍 Validating dependencies...\n")
-        dep_analyzer = DependencyAnalyzer(api_key=api_key)
+        # The optimizer already resolved every leg pair; verdicts come from its cache
+        dep_analyzer = optimizer.dep_analyzer
         
         best = []
         for ptype in ['2-leg', '3-leg', '4-leg', '5-leg']:
@@ -767,6 +787,8 @@ class BettingAnalyzerCLI:
         try:
             week = int(week_str)
             if 1 <= week <= 18:
+                if week != self.week:
+                    self.session.invalidate(self.week)
                 self.week = week
                 print(f"✅ Week set to {week}\n")
             else:
@@ -983,6 +1005,7 @@ class BettingAnalyzerCLI:
 
     def score_week_command(self, arg_str):
         """Auto-score parlays from CSV files"""
+        import auto_scorer
         try:
             # Parse arguments
             args = arg_str.split()
@@ -1019,6 +1042,7 @@ class BettingAnalyzerCLI:
 
     def analyze_week_command(self, arg_str):
         """Analyze and log all props for comprehensive scoring"""
+        import prop_logger
         try:
             args = arg_str.split()
 
@@ -1046,10 +1070,8 @@ class BettingAnalyzerCLI:
                 top_n = 100  # Default
 
             print(f"\n[LOADING] Loading data for Week {week}...")
-            context = self.loader.load_all_data(week=week)
-
             print(f"[ANALYZING] Analyzing props...")
-            all_analyses = self.analyzer.analyze_all_props(context, min_confidence=60)
+            all_analyses = self.session.get_analyses(week, min_confidence=60)
 
             print(f"[OK] Analyzed {len(all_analyses)} props\n")
 
@@ -1077,6 +1099,7 @@ class BettingAnalyzerCLI:
 
     def score_props_command(self, arg_str):
         """Score all logged props from CSV files"""
+        import props_scorer
         try:
             args = arg_str.split()
 
@@ -1108,6 +1131,7 @@ class BettingAnalyzerCLI:
 
     def calibrate_props_command(self, week_str=""):
         """Show comprehensive prop calibration report"""
+        import prop_logger
         try:
             week = int(week_str) if week_str else None
 
@@ -1145,7 +1169,7 @@ class BettingAnalyzerCLI:
         print("STEP 1: Injury Data Loading")
         print("-" * 80)
         
-        context = self.loader.load_all_data(week=self.week)
+        context = self.session.get_context(self.week)
         injury_text = context.get('injuries')
         
         if not injury_text:
@@ -1258,6 +1282,7 @@ class BettingAnalyzerCLI:
 
     def kelly_sizing_command(self, arg_str=""):
         """Calculate optimal Kelly sizing"""
+        from scripts.analysis.kelly_optimizer import KellyOptimizer, format_kelly_report
         if not self.last_parlays:
             print("❌ No parlays generated yet. Run 'parlays' or 'opt-parlays' first.\n")
             return
@@ -1306,11 +1331,12 @@ class BettingAnalyzerCLI:
 
     def launch_chat_interface(self):
         """Launch natural language chat interface"""
+        from scripts.analysis.chat_interface import run_chat_interface
         print("\n🚀 Launching Natural Language Chat Interface...")
         print("   Type 'exit' in chat to return to main CLI\n")
         try:
             data_dir = str(project_root / "data")
-            run_chat_interface(data_dir=data_dir)
+            run_chat_interface(data_dir=data_dir, session=self.session)
             print("\n✅ Chat interface closed. Back to main CLI\n")
         except KeyboardInterrupt:
             print("\n✅ Chat interface closed. Back to main CLI\n")
@@ -1318,6 +1344,21 @@ class BettingAnalyzerCLI:
             print(f"\n❌ Error launching chat: {e}\n")
             print("   Make sure ANTHROPIC_API_KEY is set in .env\n")
     
+    def profile_command(self, arg_str=""):
+        """Print (or reset) the instrumentation report"""
+        if not instrumentation.is_enabled():
+            print("ℹ️  Profiling is off. Start the CLI with --profile (or set NFL_PROFILE=1)\n")
+            return
+        if arg_str.strip().lower() == 'reset':
+            instrumentation.reset()
+            print("✅ Profile counters reset\n")
+            return
+        print("\n" + "="*70)
+        print("📈 PROFILE")
+        print("="*70)
+        print(instrumentation.report().format())
+        print("="*70 + "\n")
+
     def run(self):
         """Main CLI loop"""
         self.print_header()
@@ -1407,9 +1448,13 @@ class BettingAnalyzerCLI:
                     self.summary_command(arg)
                 elif command == 'injury-diagnostic':
                     self.injury_diagnostic_command(arg)
+                elif command == 'profile':
+                    self.profile_command(arg)
                 elif command == 'help':
                     self.print_header()
                 elif command in ['exit', 'quit']:
+                    if instrumentation.is_enabled():
+                        self.profile_command()
                     print("👋 Goodbye!\n")
                     break
                 else:
@@ -1425,5 +1470,7 @@ class BettingAnalyzerCLI:
                 print(f"❌ Error: {e}\n")
 
 if __name__ == "__main__":
+    if '--profile' in sys.argv[1:]:
+        instrumentation.enable()
     cli = BettingAnalyzerCLI()
     cli.run()
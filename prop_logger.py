@@ -11,7 +11,30 @@ import sqlite3
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Tuple
+
+# Statements are fixed strings so sqlite3's statement cache prepares each once
+# per connection; executemany reuses it for every row
+INSERT_PROP_SQL = """
+    INSERT OR IGNORE INTO analyzed_props
+    (prop_id, week, player, team, opponent, prop_type, bet_type, line,
+     confidence, agent_scores, created_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_RESULT_SQL = """
+    UPDATE analyzed_props
+    SET result = ?, actual_value = ?, scored_date = ?
+    WHERE prop_id = ?
+"""
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Open the bets database in WAL mode (readers don't block the batch writes)"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
 
 
 def log_analyzed_props(
@@ -19,7 +42,7 @@ def log_analyzed_props(
     week: int,
     db_path: Path = None,
     top_n: int = None
-) -> int:
+) -> Tuple[int, int]:
     """
     Log analyzed props to database for later scoring.
 
@@ -30,14 +53,11 @@ def log_analyzed_props(
         top_n: If set, only log top N props by confidence
 
     Returns:
-        Number of props logged
+        (props logged, duplicates skipped)
     """
     if db_path is None:
         db_path = Path(__file__).parent / "bets.db"
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
     # Sort by confidence descending
     sorted_props = sorted(props_analyses, key=lambda x: x.final_confidence, reverse=True)
 
@@ -45,9 +65,8 @@ def log_analyzed_props(
     if top_n:
         sorted_props = sorted_props[:top_n]
 
-    logged_count = 0
-    skipped_duplicates = 0
-
+    created = datetime.now().isoformat()
+    rows = []
     for analysis in sorted_props:
         prop = analysis.prop
 
@@ -61,35 +80,31 @@ def log_analyzed_props(
                 if isinstance(breakdown, dict) and 'raw_score' in breakdown:
                     agent_scores[agent_name] = breakdown['raw_score']
 
-        try:
-            cursor.execute("""
-                INSERT INTO analyzed_props
-                (prop_id, week, player, team, opponent, prop_type, bet_type, line,
-                 confidence, agent_scores, created_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                prop_id,
-                week,
-                prop.player_name,
-                prop.team,
-                prop.opponent,
-                prop.stat_type,
-                getattr(prop, 'bet_type', 'OVER'),
-                prop.line,
-                analysis.final_confidence,
-                json.dumps(agent_scores),
-                datetime.now().isoformat()
-            ))
-            logged_count += 1
-
-        except sqlite3.IntegrityError:
-            # Duplicate - already logged
-            skipped_duplicates += 1
-            continue
-
-    conn.commit()
-    conn.close()
-
+        rows.append((
+            prop_id,
+            week,
+            prop.player_name,
+            prop.team,
+            prop.opponent,
+            prop.stat_type,
+            getattr(prop, 'bet_type', 'OVER'),
+            prop.line,
+            analysis.final_confidence,
+            json.dumps(agent_scores),
+            created
+        ))
+
+    # One transaction; rows already logged (same prop_id or week/player/type/line) are skipped
+    conn = _connect(db_path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(INSERT_PROP_SQL, rows)
+            logged_count = conn.total_changes - before
+    finally:
+        conn.close()
+
+    skipped_duplicates = len(rows) - logged_count
     return logged_count, skipped_duplicates
 
 
@@ -140,20 +155,39 @@ def update_prop_results(
         actual_value: Actual stat value achieved
         db_path: Path to database
     """
+    update_prop_results_batch([(prop_id, result, actual_value)], db_path)
+
+
+def update_prop_results_batch(
+    results: Iterable[Tuple[str, Optional[int], Optional[float]]],
+    db_path: Path = None
+) -> int:
+    """
+    Update many props with scoring results in one transaction.
+
+    Args:
+        results: (prop_id, result, actual_value) per prop
+        db_path: Path to database
+
+    Returns:
+        Number of props updated
+    """
     if db_path is None:
         db_path = Path(__file__).parent / "bets.db"
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    scored_date = datetime.now().isoformat()
+    rows = [(result, actual_value, scored_date, prop_id) for prop_id, result, actual_value in results]
 
-    cursor.execute("""
-        UPDATE analyzed_props
-        SET result = ?, actual_value = ?, scored_date = ?
-        WHERE prop_id = ?
-    """, (result, actual_value, datetime.now().isoformat(), prop_id))
+    conn = _connect(db_path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(UPDATE_RESULT_SQL, rows)
+            updated = conn.total_changes - before
+    finally:
+        conn.close()
 
-    conn.commit()
-    conn.close()
+    return updated
 
 
 def get_props_summary(week: int = None, db_path: Path = None) -> Dict:
@@ -62,6 +62,7 @@ def score_props_for_week(
         'by_confidence': {}
     }
 
+    updates = []
     for prop in props:
         # Create a leg-like dictionary for scoring
         leg = {
@@ -74,9 +75,9 @@ def score_props_for_week(
         # Score using same logic as auto_scorer
         result, actual_value, debug_info = auto_scorer.score_leg(leg, week_stats)
 
-        # Update prop in database (unless dry run)
+        # Queue the database update (written in one batch unless dry run)
         if not dry_run and result is not None:
-            prop_logger.update_prop_results(prop['prop_id'], result, actual_value, db_path)
+            updates.append((prop['prop_id'], result, actual_value))
 
         # Collect statistics
         if result is not None:
@@ -112,6 +113,9 @@ def score_props_for_week(
         else:
             results['unable_to_score'] += 1
 
+    if updates:
+        prop_logger.update_prop_results_batch(updates, db_path)
+
     # Format results
     return format_props_scoring_results(results, week, dry_run)
 
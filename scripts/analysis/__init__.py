@@ -1,37 +1,43 @@
 """
 NFL Betting Analysis Engine
+
+Exports are resolved lazily (PEP 562) so importing one submodule - or the
+package itself - doesn't pull in every analyzer, LLM client and exporter.
 """
 
-from .orchestrator import PropAnalyzer
-from .data_loader import NFLDataLoader
-from .models import PlayerProp, PropAnalysis
-from .custom_parlay_builder import CustomParlayBuilder, run_custom_parlay_builder
-from .parlay_tracker import ParlayTracker
-from .dependency_analyzer import DependencyAnalyzer
-from .export_parlays import (
-    WeeklyParlayExporter,
-    export_weekly_parlays,
-    export_all_parlays,
-    preview_weekly_parlays
-)
-from .parlay_saver import save_parlays_to_tracker, save_parlays_after_analysis
-from .chat_interface import NLQueryInterface, run_chat_interface
-
-__all__ = [
-    'PropAnalyzer',
-    'NFLDataLoader',
-    'PlayerProp',
-    'PropAnalysis',
-    'CustomParlayBuilder',
-    'run_custom_parlay_builder',
-    'ParlayTracker',
-    'DependencyAnalyzer',
-    'WeeklyParlayExporter',
-    'export_weekly_parlays',
-    'export_all_parlays',
-    'preview_weekly_parlays',
-    'save_parlays_to_tracker',
-    'save_parlays_after_analysis',
-    'NLQueryInterface',
-    'run_chat_interface'
-]
+import importlib
+
+_EXPORTS = {
+    'PropAnalyzer': '.orchestrator',
+    'NFLDataLoader': '.data_loader',
+    'PlayerProp': '.models',
+    'PropAnalysis': '.models',
+    'CustomParlayBuilder': '.custom_parlay_builder',
+    'run_custom_parlay_builder': '.custom_parlay_builder',
+    'ParlayTracker': '.parlay_tracker',
+    'DependencyAnalyzer': '.dependency_analyzer',
+    'WeeklyParlayExporter': '.export_parlays',
+    'export_weekly_parlays': '.export_parlays',
+    'export_all_parlays': '.export_parlays',
+    'preview_weekly_parlays': '.export_parlays',
+    'save_parlays_to_tracker': '.parlay_saver',
+    'save_parlays_after_analysis': '.parlay_saver',
+    'NLQueryInterface': '.chat_interface',
+    'run_chat_interface': '.chat_interface',
+    'AnalysisSession': '.analysis_session',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
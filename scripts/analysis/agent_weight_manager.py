@@ -32,12 +32,23 @@ class AgentWeightManager:
     MAX_ADJUSTMENT_PER_WEEK = 0.5  # Maximum change in one week
     MIN_SAMPLES_FOR_ADJUSTMENT = 10  # Minimum legs scored to adjust
 
+    # Per-agent, per-week sufficient statistics (see record_week_stats); all additive,
+    # so any range of weeks merges by summing
+    WEEK_STAT_FIELDS = (
+        'total_predictions', 'wins', 'losses',
+        'high_conf_predictions', 'high_conf_wins',
+        'medium_conf_predictions', 'medium_conf_wins',
+        'over_predictions', 'over_wins', 'under_predictions', 'under_wins',
+        'total_confidence_sum', 'aligned_predictions',
+        'contrarian_correct', 'contrarian_wrong',
+    )
+
     def __init__(self, db_path: str = "bets.db"):
         self.db_path = db_path
         self._ensure_tables_exist()
 
     def _ensure_tables_exist(self):
-        """Create agent_weights and agent_weight_history tables if they don't exist."""
+        """Create agent_weights, history, per-week stats and config tables if they don't exist."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -69,6 +80,37 @@ class AgentWeightManager:
             )
         """)
 
+        # Per-week agent performance (merged across weeks by summing)
+        stat_columns = ",\n".join(
+            f"                {name} {'REAL' if name == 'total_confidence_sum' else 'INTEGER'} DEFAULT 0"
+            for name in self.WEEK_STAT_FIELDS
+        )
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS agent_week_stats (
+                agent_name TEXT NOT NULL,
+                week INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+{stat_columns},
+                source TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (agent_name, week)
+            )
+        """)
+
+        # One row per recorded week, even when no agent had a decided prediction
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS agent_week_sources (
+                week INTEGER PRIMARY KEY,
+                source TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        # Weeks recorded before agent_week_sources existed
+        cursor.execute("""
+            INSERT OR IGNORE INTO agent_week_sources (week, source, updated_at)
+            SELECT week, MAX(source), MAX(updated_at) FROM agent_week_stats GROUP BY week
+        """)
+
         # Auto-learning config table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS learning_config (
@@ -273,6 +315,79 @@ class AgentWeightManager:
 
         return adjustments
 
+    def record_week_stats(self, week: int, agent_stats: Dict[str, Dict[str, float]],
+                          source: Optional[str] = None):
+        """
+        Replace one week's per-agent stats.
+
+        Args:
+            week: Week number
+            agent_stats: Agent name -> {field: value} for WEEK_STAT_FIELDS, in first-seen order
+            source: Identifies the graded data the stats came from (to detect regrading)
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        columns = ", ".join(self.WEEK_STAT_FIELDS)
+        placeholders = ", ".join("?" * (len(self.WEEK_STAT_FIELDS) + 5))
+        now = datetime.now().isoformat()
+        cursor.execute("DELETE FROM agent_week_stats WHERE week = ?", (week,))
+        cursor.executemany(f"""
+            INSERT INTO agent_week_stats
+            (agent_name, week, position, {columns}, source, updated_at)
+            VALUES ({placeholders})
+        """, [
+            (agent_name, week, position, *(stats.get(name, 0) for name in self.WEEK_STAT_FIELDS), source, now)
+            for position, (agent_name, stats) in enumerate(agent_stats.items())
+        ])
+        cursor.execute("""
+            INSERT OR REPLACE INTO agent_week_sources (week, source, updated_at) VALUES (?, ?, ?)
+        """, (week, source, now))
+
+        conn.commit()
+        conn.close()
+
+    def get_week_stats_sources(self, weeks: Optional[List[int]] = None) -> Dict[int, Optional[str]]:
+        """Week -> source of its recorded stats, for every recorded week (with or without agent rows)."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        where, params = self._weeks_filter(weeks)
+        cursor.execute(f"SELECT week, source FROM agent_week_sources {where}", params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {week: source for week, source in rows}
+
+    def merge_week_stats(self, weeks: Optional[List[int]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Sum the recorded per-week stats of each agent over the given weeks (all by default).
+
+        Agents come back in first-seen order (earliest week, then position in that week).
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        where, params = self._weeks_filter(weeks)
+        sums = ", ".join(f"SUM({name})" for name in self.WEEK_STAT_FIELDS)
+        cursor.execute(f"""
+            SELECT agent_name, {sums}
+            FROM agent_week_stats {where}
+            GROUP BY agent_name
+            ORDER BY MIN(week * 1000 + position)
+        """, params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        return {row[0]: dict(zip(self.WEEK_STAT_FIELDS, row[1:])) for row in rows}
+
+    @staticmethod
+    def _weeks_filter(weeks: Optional[List[int]]) -> Tuple[str, tuple]:
+        if weeks is None:
+            return "", ()
+        weeks = tuple(weeks)
+        return f"WHERE week IN ({', '.join('?' * len(weeks))})", weeks
+
     def get_weight_history(self, agent_name: Optional[str] = None, limit: int = 50) -> List[Dict]:
         """Get weight adjustment history."""
         conn = sqlite3.connect(self.db_path)
@@ -12,7 +12,7 @@ from .trend_agent import TrendAgent
 from .variance_agent import VarianceAgent
 from .weather_agent import WeatherAgent
 from .hit_rate_agent import HitRateAgent
-from .meta_agent import MetaAgent, MetaAgentConfig, MetaAgentResult
+from .meta_agent import MetaAgent, MetaAgentConfig, MetaAgentResult, StubMetaClient
 
 __all__ = [
     'BaseAgent',
@@ -29,4 +29,5 @@ __all__ = [
     'MetaAgent',
     'MetaAgentConfig',
     'MetaAgentResult',
+    'StubMetaClient',
 ]
@@ -5,17 +5,8 @@ UPDATED: Incorporates individual QB EPA/DVOA analytics
 """
 
 from typing import Dict, List, Tuple
-import re
 from .base_agent import BaseAgent
-
-
-def normalize_player_name(name: str) -> str:
-    """Normalize player name for matching"""
-    if not name:
-        return name
-    name = name.replace('.', '')
-    name = re.sub(r'\s+', ' ', name)
-    return name.strip().lower()
+from ..prop_features import features_for
 
 
 class DVOAAgent(BaseAgent):
@@ -28,37 +19,29 @@ class DVOAAgent(BaseAgent):
         rationale = []
         score = 50
 
-        off_dvoa = context.get('dvoa_offensive', {})
-        def_dvoa = context.get('dvoa_defensive', {})
-        qb_analytics = context.get('qb_analytics', {})
-        
-        team_off = off_dvoa.get(prop.team, {})
-        opp_def = def_dvoa.get(prop.opponent, {})
-        
-        if not team_off or not opp_def:
+        features = features_for(prop, context)
+
+        if not features['has_off_dvoa'] or not features['has_def_dvoa']:
             rationale.append("⚠️ DVOA data not available")
             return (50, "AVOID", rationale)
         
-        total_off_dvoa = team_off.get('offense_dvoa', 0)
-        pass_off_dvoa = team_off.get('passing_dvoa', 0)
-        rush_off_dvoa = team_off.get('rushing_dvoa', 0)
+        total_off_dvoa = features['offense_dvoa']
+        pass_off_dvoa = features['passing_dvoa']
+        rush_off_dvoa = features['rushing_dvoa']
         
-        total_def_dvoa = opp_def.get('defense_dvoa', 0)
-        pass_def_dvoa = opp_def.get('pass_defense_dvoa', 0)
-        rush_def_dvoa = opp_def.get('rush_defense_dvoa', 0)
+        total_def_dvoa = features['defense_dvoa']
+        pass_def_dvoa = features['pass_defense_dvoa']
+        rush_def_dvoa = features['rush_defense_dvoa']
         
         # POSITION-SPECIFIC HANDLING
         if prop.position == 'QB':
             # First check individual QB analytics (EPA, DVOA per QB)
-            qb_name = normalize_player_name(prop.player_name)
-            qb_data = qb_analytics.get(qb_name, {})
-
-            if qb_data:
+            if features['has_qb_analytics']:
                 # Individual QB efficiency metrics
-                qb_epa = qb_data.get('epa_per_dropback', 0)
-                qb_dvoa = qb_data.get('dvoa', 0)
-                qb_rating = qb_data.get('passer_rating', 0)
-                qb_ypa = qb_data.get('yards_per_attempt', 0)
+                qb_epa = features['qb_epa_per_dropback']
+                qb_dvoa = features['qb_dvoa']
+                qb_rating = features['qb_passer_rating']
+                qb_ypa = features['qb_yards_per_attempt']
 
                 # EPA per dropback analysis (excellent predictor)
                 if qb_epa >= 0.25:
@@ -4,6 +4,7 @@ Game Script Agent - Game flow analysis
 
 from typing import Dict, List, Tuple
 from .base_agent import BaseAgent
+from ..prop_features import features_for
 
 
 class GameScriptAgent(BaseAgent):
@@ -53,8 +54,7 @@ class GameScriptAgent(BaseAgent):
             if is_favorite:
                 if prop.position == 'RB' and 'Rush' in prop.stat_type:
                     # Check if opponent has elite run defense (overrides game script)
-                    def_dvoa = context.get('dvoa_defensive', {}).get(prop.opponent, {})
-                    rush_def_dvoa = def_dvoa.get('rush_defense_dvoa', 0)
+                    rush_def_dvoa = features_for(prop, context)['rush_defense_dvoa']
                     
                     if rush_def_dvoa <= -20:  # Elite run defense
                         score -= 5
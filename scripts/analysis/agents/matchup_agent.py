@@ -4,16 +4,7 @@ Matchup Agent - Position-Specific Defensive Analysis (COMPLETE DVOA RANGES)
 
 from typing import Dict, List, Tuple
 from .base_agent import BaseAgent
-import re
-
-
-def normalize_player_name(name: str) -> str:
-    """Normalize player name for matching"""
-    if not name:
-        return name
-    name = name.replace('.', '')
-    name = re.sub(r'\s+', ' ', name)
-    return name.strip()
+from ..prop_features import features_for
 
 
 class MatchupAgent(BaseAgent):
@@ -26,18 +17,15 @@ class MatchupAgent(BaseAgent):
         rationale = []
         score = 50
         
-        # This key ('defensive_vs_receiver') is now created by our new function in run_analysis.py
-        def_vs_receiver = context.get('defensive_vs_receiver', {})
-        opp_def = def_vs_receiver.get(prop.opponent, {})
+        features = features_for(prop, context)
         
-        if not opp_def:
+        if not features['has_def_vs_receiver']:
             rationale.append(f"⚠️ Position-specific defensive data unavailable for {prop.opponent}")
             return (50, "AVOID", rationale)
         
         # Handle QB separately
         if prop.position == 'QB':
-            def_dvoa = context.get('dvoa_defensive', {}).get(prop.opponent, {})
-            pass_def_dvoa = def_dvoa.get('pass_defense_dvoa', 0)
+            pass_def_dvoa = features['pass_defense_dvoa']
             
             if pass_def_dvoa >= 20:
                 score += 25
@@ -57,13 +45,13 @@ class MatchupAgent(BaseAgent):
             direction = "OVER" if score >= 50 else "UNDER"
             return (score, direction, rationale)
         
-        wr_role = self._classify_wr_role(prop.player_name, prop.position, context)
-        align_info = self._get_alignment_efficiency(prop.player_name, context)
+        wr_role = self._classify_wr_role(prop.position, features)
+        align_info = self._get_alignment_efficiency(features)
 
         if wr_role in ['WR1', 'WR2', 'WR3']:
             # Use the keys we mapped in our new transformer
             dvoa_key = f'vs_{wr_role.lower()}_dvoa'
-            dvoa = opp_def.get(dvoa_key, 0)
+            dvoa = features[dvoa_key]
 
             # Add alignment context to rationale
             if align_info['slot_pct'] >= 60:
@@ -105,7 +93,7 @@ class MatchupAgent(BaseAgent):
                 rationale.append(f"⚠️⚠️ ELITE {wr_role} COVERAGE: {dvoa:.1f}% DVOA")
         
         elif prop.position == 'TE':
-            te_dvoa = opp_def.get('vs_te_dvoa', 0)
+            te_dvoa = features['vs_te_dvoa']
             
             # Simplified logic (removed te_yds)
             if te_dvoa >= 50:
@@ -129,8 +117,7 @@ class MatchupAgent(BaseAgent):
         elif prop.position == 'RB':
             if 'Rush' in prop.stat_type or 'Rushing' in prop.stat_type:
                 # RUSHING: Use rush_defense_dvoa (primary driver for rushing volume)
-                def_dvoa = context.get('dvoa_defensive', {}).get(prop.opponent, {})
-                rush_def_dvoa = def_dvoa.get('rush_defense_dvoa', 0)
+                rush_def_dvoa = features['rush_defense_dvoa']
                 
                 if rush_def_dvoa >= 25:
                     score += 25
@@ -155,7 +142,7 @@ class MatchupAgent(BaseAgent):
             
             elif 'Rec' in prop.stat_type:
                 # RECEIVING: Use vs_rb_dvoa (receiving-specific)
-                rb_dvoa = opp_def.get('vs_rb_dvoa', 0)
+                rb_dvoa = features['vs_rb_dvoa']
                 
                 if rb_dvoa >= 40:
                     score += 20
@@ -175,8 +162,8 @@ class MatchupAgent(BaseAgent):
 
         return (score, direction, rationale)
 
-    def _classify_wr_role(self, player_name: str, position: str, context: Dict) -> str:
-        """Classify WR role using NORMALIZED names and alignment data"""
+    def _classify_wr_role(self, position: str, features: Dict) -> str:
+        """Classify WR role using the prop's usage and alignment features"""
         if position == 'TE':
             return 'TE'
         if position == 'RB':
@@ -184,19 +171,9 @@ class MatchupAgent(BaseAgent):
         if position == 'QB':
             return 'QB'
 
-        # Normalize the player name
-        normalized_name = normalize_player_name(player_name).lower()
-
-        usage = context.get('usage', {})
-        alignment = context.get('alignment', {})
-
-        # Try normalized name first, then original
-        player_usage = usage.get(normalized_name, usage.get(player_name.lower(), {}))
-        player_alignment = alignment.get(normalized_name, alignment.get(player_name.lower(), {}))
-
-        target_share = player_usage.get('target_share_pct', 0)
-        slot_pct = player_alignment.get('slot_pct', 0)
-        wide_pct = player_alignment.get('wide_pct', 0)
+        target_share = features['target_share_pct']
+        slot_pct = features['slot_pct']
+        wide_pct = features['wide_pct']
 
         # Primary classification based on alignment + target share
         if slot_pct >= 60:
@@ -216,16 +193,12 @@ class MatchupAgent(BaseAgent):
 
         return 'WR3'
 
-    def _get_alignment_efficiency(self, player_name: str, context: Dict) -> dict:
+    def _get_alignment_efficiency(self, features: Dict) -> dict:
         """Get alignment-specific efficiency metrics for a receiver"""
-        normalized_name = normalize_player_name(player_name).lower()
-        alignment = context.get('alignment', {})
-        player_align = alignment.get(normalized_name, alignment.get(player_name.lower(), {}))
-
         return {
-            'slot_pct': player_align.get('slot_pct', 0),
-            'wide_pct': player_align.get('wide_pct', 0),
-            'primary_alignment': player_align.get('primary_alignment', 'UNKNOWN'),
-            'slot_ypr': player_align.get('slot_yards_per_route', 0),
-            'wide_ypr': player_align.get('wide_yards_per_route', 0),
+            'slot_pct': features['slot_pct'],
+            'wide_pct': features['wide_pct'],
+            'primary_alignment': features['primary_alignment'],
+            'slot_ypr': features['slot_yards_per_route'],
+            'wide_ypr': features['wide_yards_per_route'],
         }
@@ -3,11 +3,16 @@ Meta-Agent - Claude-powered oversight for aggregated analysis
 Reviews agent outputs to catch edge cases, evaluate agreement, and add narrative context.
 """
 
+import hashlib
 import logging
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
 import numpy as np
 
@@ -16,6 +21,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+DEFAULT_CACHE_DIR = project_root / "data" / "cache" / "meta_agent"
+
 
 @dataclass
 class MetaAgentConfig:
@@ -25,6 +33,10 @@ class MetaAgentConfig:
     model: str = "gemini-2.0-flash"
     max_tokens: int = 800
     max_adjustment: int = 10  # -10 to +10
+    max_concurrency: int = 8  # Reviews in flight at once
+    requests_per_minute: int = 0  # 0 = no rate limit
+    run_token_budget: Optional[int] = None  # Estimated tokens per batch; None = unlimited
+    cache_dir: Optional[Union[str, Path]] = DEFAULT_CACHE_DIR  # None disables the disk cache
 
 
 @dataclass
@@ -42,6 +54,94 @@ class MetaAgentResult:
     model_used: str = ""
 
 
+class StubMetaClient:
+    """
+    Local stand-in for GeminiClient (tests, offline runs).
+
+    `response` is either a fixed JSON dict or a callable taking the review
+    prompt and returning one. Defaults to a neutral review.
+    """
+
+    def __init__(self, response: Union[Dict, Callable[[str], Dict], None] = None):
+        self.response = response or {"adjustment": 0, "override": None,
+                                     "narrative_factors": [], "edge_case_warnings": [],
+                                     "rationale": "Stub review - no adjustment."}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+    def generate_json(self, prompt: str, system_instruction: Optional[str] = None) -> Optional[Dict]:
+        with self._lock:
+            self.calls += 1
+        return self.response(prompt) if callable(self.response) else dict(self.response)
+
+
+class MetaReviewCache:
+    """On-disk cache of raw review JSON, one file per prompt hash"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(model: str, system_prompt: str, review_prompt: str) -> str:
+        payload = "\x1f".join((model, system_prompt, review_prompt))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, data: Dict):
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent runs never read a partial file
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Meta-agent cache write failed: {e}")
+
+
+class _RateLimiter:
+    """Spaces request starts evenly across worker threads"""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+@dataclass
+class _PendingReview:
+    """Per-analysis inputs for a batch review"""
+    analysis: 'PropAnalysis'
+    agreement_score: float
+    disagreement_flags: List[str]
+    review_prompt: str
+    cache_key: str
+
+
 class MetaAgent:
     """
     Claude-powered meta-agent that reviews aggregated analysis from the 9 Python agents.
@@ -49,10 +149,12 @@ class MetaAgent:
     and add narrative context.
     """
 
-    def __init__(self, config: MetaAgentConfig = None):
+    def __init__(self, config: MetaAgentConfig = None, client=None):
         self.config = config or MetaAgentConfig()
         self.logger = logging.getLogger(self.__class__.__name__)
-        self._model = None  # Lazy init
+        self._model = client  # Lazy init unless a client (e.g. StubMetaClient) is injected
+        self.cache = MetaReviewCache(self.config.cache_dir) if self.config.cache_dir else None
+        self._rate_limiter = _RateLimiter(self.config.requests_per_minute)
 
     @property
     def client(self):
@@ -85,68 +187,132 @@ class MetaAgent:
         Returns:
             MetaAgentResult with adjustments and insights
         """
-        original_confidence = analysis.final_confidence
+        return self.review_batch([analysis], context)[0]
 
-        # Calculate agent agreement first (doesn't require API)
-        agreement_score, disagreement_flags = self._calculate_agent_agreement(
-            analysis.agent_breakdown
-        )
+    def review_batch(self, analyses: List['PropAnalysis'], context: Dict) -> List[MetaAgentResult]:
+        """
+        Review many analyses at once (results in input order).
 
-        # If no client available, return neutral result with agreement info
-        if self.client is None or not self.client.is_available:
-            self.logger.warning("Gemini client unavailable - returning neutral result")
-            return MetaAgentResult(
-                confidence_adjustment=0,
-                adjusted_confidence=original_confidence,
-                agent_agreement_score=agreement_score,
-                disagreement_flags=disagreement_flags,
-                meta_rationale="Meta-agent API unavailable",
-                model_used="none"
+        Cached reviews are served from disk; the rest are sent concurrently
+        (config.max_concurrency, config.requests_per_minute), highest
+        confidence first, until config.run_token_budget is spent. Anything
+        not reviewed gets a neutral result carrying the agreement info.
+        """
+        system_prompt = self._build_system_prompt()
+        pending = []
+        for analysis in analyses:
+            # Agent agreement doesn't require the API
+            agreement_score, disagreement_flags = self._calculate_agent_agreement(
+                analysis.agent_breakdown
             )
-
-        try:
-            # Build prompts
-            system_prompt = self._build_system_prompt()
             review_prompt = self._build_review_prompt(analysis, context, agreement_score, disagreement_flags)
+            pending.append(_PendingReview(
+                analysis=analysis,
+                agreement_score=agreement_score,
+                disagreement_flags=disagreement_flags,
+                review_prompt=review_prompt,
+                cache_key=MetaReviewCache.key(self.config.model, system_prompt, review_prompt),
+            ))
+
+        responses: Dict[str, Optional[Dict]] = {}
+        if self.cache is not None:
+            for p in pending:
+                if p.cache_key not in responses:
+                    cached = self.cache.get(p.cache_key)
+                    if cached is not None:
+                        responses[p.cache_key] = cached
+        cache_hits = len(responses)
+
+        # Identical prompts (same prop from several books) share one call
+        misses = {}
+        for p in sorted(pending, key=lambda p: p.analysis.final_confidence, reverse=True):
+            if p.cache_key not in responses:
+                misses.setdefault(p.cache_key, p)
+
+        skipped = {}
+        if misses:
+            client = self.client
+            if client is None or not client.is_available:
+                self.logger.warning("Gemini client unavailable - returning neutral results")
+                skipped = {key: "Meta-agent API unavailable" for key in misses}
+            else:
+                to_send = []
+                budget = self.config.run_token_budget
+                for key, p in misses.items():
+                    cost = self._estimate_tokens(system_prompt, p.review_prompt)
+                    if budget is not None and cost > budget:
+                        skipped[key] = "Meta-agent token budget exhausted"
+                        continue
+                    if budget is not None:
+                        budget -= cost
+                    to_send.append((key, p.review_prompt))
+
+                responses.update(self._send_reviews(client, system_prompt, to_send))
+
+        results = [self._to_result(p, responses, skipped) for p in pending]
+        self.logger.info(
+            f"🧠 Meta-agent: {len(pending)} reviews ({cache_hits} cached, "
+            f"{len(misses) - len(skipped)} API calls, {len(skipped)} skipped)"
+        )
+        return results
 
-            # Call Gemini API
-            # GeminiClient handles JSON parsing internally
-            result_json = self.client.generate_json(
-                prompt=review_prompt,
-                system_instruction=system_prompt
-            )
-
-            if not result_json:
-                raise ValueError("Empty response from Gemini")
-
-            # Result is already a dict
-            result = self._parse_json_result(result_json, original_confidence)
-            
-            result.agent_agreement_score = agreement_score
-            result.disagreement_flags = disagreement_flags
-            # OpenAI/Anthropic usage stats are different/not always available in simple Gemini response
-            # We'll just track that we used it.
-            result.model_used = self.config.model
-
-            self.logger.info(
-                f"Meta-agent review: {original_confidence} -> {result.adjusted_confidence} "
-                f"({result.confidence_adjustment:+d}), agreement: {agreement_score:.2f}"
-            )
-
-            return result
+    def _send_reviews(self, client, system_prompt: str,
+                      requests: List[Tuple[str, str]]) -> Dict[str, Optional[Dict]]:
+        """Call the client concurrently; returns cache_key -> JSON (None on failure)"""
+        if not requests:
+            return {}
 
-        except Exception as e:
-            self.logger.error(f"Meta-agent API call failed: {e}")
-            # Return neutral result on failure
+        def call(request: Tuple[str, str]) -> Tuple[str, Optional[Dict]]:
+            key, review_prompt = request
+            self._rate_limiter.wait()
+            try:
+                data = client.generate_json(prompt=review_prompt, system_instruction=system_prompt)
+            except Exception as e:
+                self.logger.error(f"Meta-agent API call failed: {e}")
+                return key, None
+            if data and self.cache is not None:
+                self.cache.set(key, data)
+            return key, data
+
+        workers = max(1, min(self.config.max_concurrency, len(requests)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meta-agent") as pool:
+            return dict(pool.map(call, requests))
+
+    def _estimate_tokens(self, system_prompt: str, review_prompt: str) -> int:
+        """Rough cost of one call: ~4 chars per prompt token plus the output cap"""
+        return (len(system_prompt) + len(review_prompt)) // 4 + self.config.max_tokens
+
+    def _to_result(self, p: _PendingReview, responses: Dict[str, Optional[Dict]],
+                   skipped: Dict[str, str]) -> MetaAgentResult:
+        original_confidence = p.analysis.final_confidence
+        data = responses.get(p.cache_key)
+
+        if not data:
+            if p.cache_key in skipped:
+                rationale, model_used = skipped[p.cache_key], "none"
+            else:
+                rationale, model_used = "Meta-agent review failed: empty response", "error"
             return MetaAgentResult(
                 confidence_adjustment=0,
                 adjusted_confidence=original_confidence,
-                agent_agreement_score=agreement_score,
-                disagreement_flags=disagreement_flags,
-                meta_rationale=f"Meta-agent review failed: {str(e)[:50]}",
-                model_used="error"
+                agent_agreement_score=p.agreement_score,
+                disagreement_flags=p.disagreement_flags,
+                meta_rationale=rationale,
+                model_used=model_used
             )
 
+        result = self._parse_json_result(data, original_confidence)
+        result.agent_agreement_score = p.agreement_score
+        result.disagreement_flags = p.disagreement_flags
+        # Gemini responses don't carry usage stats; we just track the model
+        result.model_used = self.config.model
+
+        self.logger.debug(
+            f"Meta-agent review: {original_confidence} -> {result.adjusted_confidence} "
+            f"({result.confidence_adjustment:+d}), agreement: {p.agreement_score:.2f}"
+        )
+        return result
+
     def _calculate_agent_agreement(self, agent_breakdown: Dict) -> Tuple[float, List[str]]:
         """
         Calculate agent agreement score and identify disagreements.
@@ -32,8 +32,7 @@ class TrendAgent(BaseAgent):
         # Previously we skipped volume props, which was a mistake.
         
         trends = context.get('trends', {})
-        player_name = prop.player_name.lower()
-        player_trend = trends.get(player_name, {})
+        player_trend = trends.get(prop.player_id, {})
         
         if not player_trend:
             # No specific trend data
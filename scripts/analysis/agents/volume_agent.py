@@ -5,16 +5,7 @@ UPDATED: QB-friendly volume scoring
 
 from typing import Dict, List, Tuple
 from .base_agent import BaseAgent
-
-
-def normalize_player_name(name: str) -> str:
-    """Normalize player name for matching"""
-    import re
-    if not name:
-        return name
-    name = name.replace('.', '')
-    name = re.sub(r'\s+', ' ', name)
-    return name.strip().lower()
+from ..prop_features import features_for
 
 
 class VolumeAgent(BaseAgent):
@@ -27,23 +18,15 @@ class VolumeAgent(BaseAgent):
         rationale = []
         score = 50
         
-        usage_data = context.get('usage', {})
-        
-        # Try normalized name first
-        normalized_name = normalize_player_name(prop.player_name)
-        player_usage = usage_data.get(normalized_name)
-        
-        # Try original name lowercase as fallback
-        if not player_usage:
-            player_usage = usage_data.get(prop.player_name.lower(), {})
+        features = features_for(prop, context)
         
-        if not player_usage:
+        if not features['has_usage']:
             rationale.append("⚠️ Limited usage data")
             return (50, "AVOID", rationale)
         
         if prop.position == 'QB':
             # QB: Check snap share (primary starter indicator)
-            snap_share = player_usage.get('snap_share_pct', 0)
+            snap_share = features['snap_share_pct']
             
             if snap_share >= 90:
                 score += 15
@@ -59,7 +42,7 @@ class VolumeAgent(BaseAgent):
                 rationale.append(f"⚠️ Limited role: {snap_share:.1f}% snaps")
             
             # Check for pass attempts if available
-            pass_attempts = player_usage.get('pass_attempts', 0)
+            pass_attempts = features['pass_attempts']
             if pass_attempts > 0:
                 if pass_attempts >= 40:
                     score += 8
@@ -70,7 +53,7 @@ class VolumeAgent(BaseAgent):
         
         elif prop.position in ['WR', 'TE']:
             # WR/TE: Target share is crucial metric
-            target_share = player_usage.get('target_share_pct', 0)
+            target_share = features['target_share_pct']
             
             if target_share >= 28:
                 score += 22
@@ -87,10 +70,10 @@ class VolumeAgent(BaseAgent):
         
         elif prop.position == 'RB':
             # RB: Check snap share, touch share, and rushing attempts
-            snap_share = player_usage.get('snap_share_pct', 0)
-            rush_attempts = player_usage.get('rush_attempts', 0)
-            touch_pct = player_usage.get('touch_pct', 0)
-            rush_attempt_pct = player_usage.get('rush_attempt_pct', 0)
+            snap_share = features['snap_share_pct']
+            rush_attempts = features['rush_attempts']
+            touch_pct = features['touch_pct']
+            rush_attempt_pct = features['rush_attempt_pct']
 
             # Snap share analysis
             if snap_share >= 75:
@@ -131,7 +114,7 @@ class VolumeAgent(BaseAgent):
                 rationale.append(f"Good volume: {rush_attempts:.0f} attempts/game")
         
         # Trend analysis - same for all positions
-        trend = player_usage.get('trend', 'stable')
+        trend = features['trend']
         if trend == 'increasing':
             score += 10
             rationale.append("📈 Usage trending UP")
@@ -0,0 +1,112 @@
+"""
+Analysis Session - interactive-session cache for the CLI and chat interface
+
+Loading a week and running every agent over every prop takes seconds, while
+most interactive commands are just different views of the same result (top
+overs, a team filter, a parlay build). The session keeps the loaded context
+and the full, unfiltered analysis per (week, book, weights version) so
+follow-up commands only filter and sort.
+
+Invalidation:
+- week change / data refresh: call invalidate(week)
+- weight changes: detected automatically; the weights version is read from
+  the weight store on each access and a new version misses the cache
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .models import PropAnalysis
+
+logger = logging.getLogger(__name__)
+
+# Weeks kept in memory at once (each entry holds a context + ~1k analyses)
+MAX_CACHED_WEEKS = 4
+
+
+class AnalysisSession:
+    """Caches loaded context and full analysis for an interactive session"""
+
+    def __init__(self, loader, analyzer=None, preferred_book: Optional[str] = None,
+                 max_weeks: int = MAX_CACHED_WEEKS):
+        self.loader = loader
+        self._analyzer = analyzer
+        self.preferred_book = preferred_book
+        self.max_weeks = max_weeks
+        self._contexts: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self._analyses: "OrderedDict[Tuple, List[PropAnalysis]]" = OrderedDict()
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from .orchestrator import PropAnalyzer
+            self._analyzer = PropAnalyzer()
+        return self._analyzer
+
+    def weights_version(self) -> Tuple:
+        """Current agent weights as a hashable version.
+
+        Pulls the latest weights from the weight store (calibrate-agents and
+        auto-learn write there) into the analyzer's agents first, so a weight
+        change both bumps the version and takes effect in the next analysis.
+        """
+        analyzer = self.analyzer
+        manager = getattr(analyzer, 'weight_manager', None)
+        if manager is not None:
+            try:
+                weights = manager.get_current_weights()
+                for name, agent in analyzer.agents.items():
+                    if name in weights:
+                        agent.weight = weights[name]
+            except Exception as e:
+                logger.warning(f"Could not refresh agent weights: {e}")
+        return tuple(sorted((name, agent.weight) for name, agent in analyzer.agents.items()))
+
+    def _context_key(self, week: int) -> Tuple:
+        return (week, self.preferred_book)
+
+    def get_context(self, week: int) -> Dict:
+        """Loaded data for a week (loaded once per session)"""
+        key = self._context_key(week)
+        context = self._contexts.get(key)
+        if context is None:
+            context = self.loader.load_all_data(week=week, preferred_book=self.preferred_book)
+            self._contexts[key] = context
+            self._evict(self._contexts)
+        else:
+            self._contexts.move_to_end(key)
+        return context
+
+    def get_analyses(self, week: int, min_confidence: int = 0) -> List[PropAnalysis]:
+        """All analyses for a week at or above min_confidence, highest first.
+
+        Returns a new list each call; the PropAnalysis objects are shared, so
+        callers should treat them as read-only.
+        """
+        key = self._context_key(week) + (self.weights_version(),)
+        analyses = self._analyses.get(key)
+        if analyses is None:
+            # Entries for older weight versions of this week can never hit again
+            for stale in [k for k in self._analyses if k[:2] == key[:2]]:
+                del self._analyses[stale]
+            analyses = self.analyzer.analyze_all_props(self.get_context(week), min_confidence=0)
+            self._analyses[key] = analyses
+            self._evict(self._analyses)
+        else:
+            self._analyses.move_to_end(key)
+        return [a for a in analyses if a.final_confidence >= min_confidence]
+
+    def invalidate(self, week: Optional[int] = None):
+        """Drop cached data for one week (or everything)"""
+        if week is None:
+            self._contexts.clear()
+            self._analyses.clear()
+            return
+        for cache in (self._contexts, self._analyses):
+            for key in [k for k in cache if k[0] == week]:
+                del cache[key]
+
+    def _evict(self, cache: OrderedDict):
+        while len(cache) > self.max_weeks:
+            cache.popitem(last=False)
@@ -9,16 +9,10 @@ import logging
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
-# Gemini Client - optional import to avoid breaking other imports
-try:
-    from ..core.gemini_client import GeminiClient
-except ImportError:
-    GeminiClient = None  # Will fail at runtime if chat interface is used without deps
-
 from .parlay_tracker import ParlayTracker
 from .export_parlays import export_weekly_parlays, preview_weekly_parlays
 from .data_loader import NFLDataLoader
-from .orchestrator import PropAnalyzer
+from .analysis_session import AnalysisSession
 from .models import PropAnalysis
 from .parlay_builder import ParlayBuilder
 from .correlation_detector import EnhancedParlayBuilder
@@ -126,14 +120,16 @@ Example responses:
 class NLQueryInterface:
     """Natural language query interface using Google Gemini"""
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", session: Optional[AnalysisSession] = None):
         """
         Initialize the query interface.
 
         Args:
             data_dir: Directory containing NFL data
+            session: Analysis cache to share with the caller (e.g. the CLI)
         """
         try:
+            from ..core.gemini_client import GeminiClient
             self.client = GeminiClient(model_name="gemini-2.0-flash")
             self.client_available = self.client.is_available
         except Exception as e:
@@ -142,10 +138,13 @@ class NLQueryInterface:
             
         self.conversation_history: List[Dict[str, str]] = []
         self.tracker = ParlayTracker()
-        self.data_loader = NFLDataLoader(data_dir=data_dir)
+        self.data_loader = session.loader if session else NFLDataLoader(data_dir=data_dir)
         self.data_dir = Path(data_dir)
 
-        # Cache for loaded data
+        # Loaded data and full analysis per week; queries are views over it
+        self.session = session or AnalysisSession(self.data_loader)
+
+        # Last props view (used by agent breakdown lookups)
         self.cached_week = None
         self.cached_props = None
 
@@ -326,15 +325,9 @@ class NLQueryInterface:
         limit: Optional[int] = None
     ) -> str:
         """Get all analyzed props for a week"""
-        # Load data if not cached
-        if self.cached_week != week or self.cached_props is None:
-            print(f"Loading props for week {week}...")
-            context = self.data_loader.load_all_data(week=week)
-            analyzer = PropAnalyzer()
-            self.cached_props = analyzer.analyze_all_props(context, min_confidence=min_confidence)
-            self.cached_week = week
-
-        props = self.cached_props
+        props = self.session.get_analyses(week, min_confidence=min_confidence)
+        self.cached_props = props
+        self.cached_week = week
 
         # Apply filters
         if position:
@@ -492,12 +485,7 @@ class NLQueryInterface:
             if count < 2 or count > 6:
                 return f"[ERROR] Leg count must be between 2-6, got {count}"
 
-        print(f"Loading and analyzing props for week {week}...")
-
-        # Load data
-        context = self.data_loader.load_all_data(week=week)
-        analyzer = PropAnalyzer()
-        all_analyses = analyzer.analyze_all_props(context, min_confidence=40)
+        all_analyses = self.session.get_analyses(week, min_confidence=40)
 
         # Apply team exclusions if specified
         if exclude_teams:
@@ -585,12 +573,7 @@ class NLQueryInterface:
             if count < 2 or count > 6:
                 return f"[ERROR] Leg count must be between 2-6, got {count}"
 
-        print(f"Loading and analyzing props for week {week}...")
-
-        # Load data
-        context = self.data_loader.load_all_data(week=week)
-        analyzer = PropAnalyzer()
-        all_analyses = analyzer.analyze_all_props(context, min_confidence=40)
+        all_analyses = self.session.get_analyses(week, min_confidence=40)
 
         # Apply team exclusions if specified
         if exclude_teams:
@@ -775,12 +758,13 @@ Type 'exit' or 'quit' to end the session.
                 logger.error(f"Chat loop error: {e}")
 
 
-def run_chat_interface(data_dir: str = "data"):
+def run_chat_interface(data_dir: str = "data", session: Optional[AnalysisSession] = None):
     """
     Convenience function to run the chat interface.
 
     Args:
         data_dir: Directory containing NFL data
+        session: Optional analysis cache shared with the caller
     """
-    interface = NLQueryInterface(data_dir=data_dir)
+    interface = NLQueryInterface(data_dir=data_dir, session=session)
     interface.run()
@@ -98,31 +98,44 @@ class CorrelationAnalyzer:
         leg1_drivers = self._extract_drivers(leg1)
         leg2_drivers = self._extract_drivers(leg2)
         
-        # Find shared drivers
-        shared_drivers = list(leg1_drivers & leg2_drivers)
+        penalty = self.driver_penalty(leg1_drivers, leg2_drivers)
+        if penalty == 0.0:
+            return 0.0, []  # No correlation
+        
+        self.logger.debug(
+            f"Correlation: {leg1.prop.player_name} & {leg2.prop.player_name} "
+            f"share {sorted(leg1_drivers & leg2_drivers)} → penalty {penalty:.1f}%"
+        )
+        
+        return penalty, []
+    
+    def driver_penalty(self, drivers1: Set[str], drivers2: Set[str]) -> float:
+        """
+        Correlation penalty for two legs given their driver sets.
+        
+        Pure function of the two sets, so callers scoring many pairs can
+        extract drivers once per leg and build a pairwise matrix.
+        """
+        shared_drivers = sorted(drivers1 & drivers2)
         
         if not shared_drivers:
-            return 0.0, []  # No correlation
+            return 0.0
         
         # LOGIC: Use the correlation strength matrix if 2+ drivers are shared
         # Otherwise use baseline strength of 1.0
-        
         if len(shared_drivers) >= 2:
             # Two or more shared drivers - look up their pair strength
             # This is the most common case (e.g., both DVOA and Matchup shared)
             pair_strength = self.get_correlation_strength(shared_drivers[0], shared_drivers[1])
-            penalty = -5.0 * pair_strength
-        else:
-            # Single shared driver - use baseline strength
-            # This is less redundant than having 2+ shared drivers
-            penalty = -5.0 * 1.0  # Baseline strength = 1.0
-        
-        self.logger.debug(
-            f"Correlation: {leg1.prop.player_name} & {leg2.prop.player_name} "
-            f"share {shared_drivers} → penalty {penalty:.1f}%"
-        )
+            return -5.0 * pair_strength
         
-        return penalty, []
+        # Single shared driver - use baseline strength
+        # This is less redundant than having 2+ shared drivers
+        return -5.0 * 1.0  # Baseline strength = 1.0
+    
+    def extract_drivers(self, analysis: PropAnalysis) -> Set[str]:
+        """Top contributing agents for a leg (for callers precomputing driver sets)"""
+        return self._extract_drivers(analysis)
     
     def _extract_drivers(self, analysis: PropAnalysis) -> Set[str]:
         """Extract top 2 contributing agents from a PropAnalysis"""
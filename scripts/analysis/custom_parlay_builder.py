@@ -8,7 +8,6 @@ import logging
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from tabulate import tabulate
-import anthropic
 
 from .models import PropAnalysis, PlayerProp, Parlay
 from .parlay_tracker import ParlayTracker
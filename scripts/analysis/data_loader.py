@@ -4,26 +4,23 @@ Uses roster data to accurately assign teams to players in betting lines.
 Handles double headers in DVOA files.
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
-import re
 import csv
 import io
-from typing import Dict, Optional, Any
-from api.database import SessionLocal, GameDataFile
+from typing import Dict, Optional, Any, Tuple
+# Player identity lives in one place; normalize_name is re-exported for callers
+# that still import it from here (graders, API)
+from scripts.analysis.player_identity import PlayerTable, normalize_name, player_id
+from scripts.analysis.prop_features import PropFeatureTable
+from scripts.analysis import instrumentation
+from scripts.analysis.roster_index import InferredRoster, RosterIndex, file_roster_index, roster_index
 
 logger = logging.getLogger(__name__)
 
 
-# Helper function to normalize player names (used across loading/transforming)
-def normalize_name(name):
-    """Normalize player name to lowercase, remove periods"""
-    if not name: return name
-    name = str(name).strip().replace('.', '')
-    name = re.sub(r'\s+', ' ', name)
-    return name.lower()
-
 def safe_float(val, default=0):
     """Convert value to float, handling commas, percentage signs, and dashes"""
     if pd.isna(val) or val == '' or val == '-':
@@ -52,208 +49,282 @@ def normalize_team_abbr(abbr):
 # ====================================================================
 #  ROSTER LOADING FUNCTION
 # ====================================================================
-def _load_roster_data(data_dir: Path) -> Dict[str, str]:
-    """Loads the roster CSV and returns a player_name -> team_abbr map."""
-    player_to_team_map = {}
-    roster_file = data_dir / "NFL_roster - Sheet1.csv" # Specific filename
-    if not roster_file.exists():
-        logger.error(f"CRITICAL: Roster file not found at {roster_file}. Cannot accurately assign player teams.")
-        return player_to_team_map # Return empty map
+def _load_roster_data(data_dir: Path) -> RosterIndex:
+    """Shared player_id -> team_abbr index for data_dir's roster CSV (parsed once per version)."""
+    return file_roster_index(data_dir)
 
-    try:
-        df_roster = pd.read_csv(roster_file)
-        # Ensure required columns exist
-        if 'Player' not in df_roster.columns or 'Team' not in df_roster.columns:
-             logger.error(f"Roster file {roster_file.name} is missing 'Player' or 'Team' column.")
-             return player_to_team_map
 
-        for _, row in df_roster.iterrows():
-            player_name_raw = row.get('Player')
-            team_abbr = row.get('Team')
-            if player_name_raw and team_abbr and not pd.isna(player_name_raw) and not pd.isna(team_abbr):
-                normalized_player = normalize_name(player_name_raw)
-                player_to_team_map[normalized_player] = normalize_team_abbr(team_abbr) # Normalize team abbr
+# ====================================================================
+#  DATA TRANSFORMER FUNCTIONS
+# ====================================================================
+
+TEAM_FULL_NAME_TO_ABBR = { # Used if home/away columns contain full names
+    'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
+    'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
+    'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
+    'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GB',
+    'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAC',
+    'Kansas City Chiefs': 'KC', 'Las Vegas Raiders': 'LV', 'Los Angeles Chargers': 'LAC',
+    'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
+    'New England Patriots': 'NE', 'New Orleans Saints': 'NO', 'New York Giants': 'NYG',
+    'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
+    'San Francisco 49ers': 'SF', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TB',
+    'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS',
+    'Washington Football Team': 'WAS','LA Chargers': 'LAC', 'LA Rams': 'LAR',
+}
+
+# Odds API market keys -> stat_type used throughout the analysis
+BETTING_MARKET_STATS = {
+    'player_pass_yds': 'Pass Yds', 'player_pass_tds': 'Pass TDs',
+    'player_pass_completions': 'Pass Completions', 'player_rush_yds': 'Rush Yds',
+    'player_rush_attempts': 'Rush Attempts', 'player_reception_yds': 'Rec Yds',
+    'player_receiving_yds': 'Rec Yds', 'player_receptions': 'Receptions',
+    'player_rush_reception_yds': 'Rush+Rec Yds',
+    'player_pass_attempts': 'Pass Attempts',
+}
+
+
+def infer_position(stat_type):
+    stat_lower = str(stat_type).lower()
+    if 'pass' in stat_lower: return 'QB'
+    if 'rush' in stat_lower: return 'RB'
+    if 'rec' in stat_lower: return 'WR'
+    return 'UNK'
+
+
+def team_abbr(team_name):
+    """Abbreviation for a team given as abbreviation or full name ('' if missing)"""
+    if not team_name or pd.isna(team_name): return ''
+    team_name_str = str(team_name).strip()
+    if len(team_name_str) <= 3 and team_name_str.isupper(): return normalize_team_abbr(team_name_str)
+    abbr = TEAM_FULL_NAME_TO_ABBR.get(team_name_str)
+    if abbr: return normalize_team_abbr(abbr)
+    return normalize_team_abbr(team_name_str)
+
+
+def _map_distinct(values, func) -> pd.Series:
+    """Apply func once per distinct value and broadcast back (names, teams and
+    markets repeat across books, sides and lines, so this is the expensive part done once)"""
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    # Missing values factorize to code -1, which picks the trailing func(NaN)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:len(uniques)] = [func(u) for u in uniques]
+    mapped[-1] = func(np.nan)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def _column(df: pd.DataFrame, name: str, default=None) -> pd.Series:
+    if name in df.columns:
+        return df[name].astype(object)
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _first_present(primary: pd.Series, fallback: pd.Series) -> pd.Series:
+    return primary.where(primary.notna(), fallback)
+
+
+def _optional_float(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors='coerce').astype(float).astype(object)
+    return numeric.where(values.notna(), None)
+
+
+def _transformed_lines_frame(lines: pd.DataFrame, week, player_roster_map: Dict[int, str]) -> pd.DataFrame:
+    """Pre-transformed format (Player/Team/Opponent columns): trust CSV teams, fill from roster"""
+    pid = _map_distinct(lines['Player'], player_id)
+    player_name = _map_distinct(lines['Player'], normalize_name)
+    roster_team = _map_distinct(pid, lambda p: player_roster_map.get(p) or '')
+    csv_team = _map_distinct(lines['Team'], team_abbr)
+
+    mismatch = roster_team.ne('') & csv_team.ne(roster_team)
+    for name, csv_abbr, roster_abbr in zip(player_name[mismatch], csv_team[mismatch], roster_team[mismatch]):
+        logger.warning(f"Team mismatch for {name}: CSV='{csv_abbr}', Roster='{roster_abbr}'. Using CSV team.")
+
+    stat_type = lines['Stat_Type'].astype(object)
+    position = _column(lines, 'Position') if 'Position' in lines.columns else _map_distinct(stat_type, infer_position)
+    return pd.DataFrame({
+        'player_name': player_name, 'player_id': pid,
+        # Roster team only fills in when the CSV team is blank; on a mismatch the CSV wins
+        'team': roster_team.where(roster_team.ne('') & ~mismatch, csv_team),
+        'opponent': _map_distinct(lines['Opponent'], team_abbr),
+        'position': position,
+        'stat_type': stat_type, 'line': pd.to_numeric(_column(lines, 'Line', 0)).astype(float),
+        'game_total': _column(lines, 'Game_Total'), 'spread': _column(lines, 'Spread'),
+        'is_home': _column(lines, 'Is_Home', True), 'week': week,
+    })
+
+
+def _market_lines_frame(lines: pd.DataFrame, week, player_roster_map: Dict[int, str],
+                        inferred_roster: Optional[Dict[int, str]] = None) -> pd.DataFrame:
+    """Odds API / fetcher format (home_team/away_team + market): teams come from the roster"""
+    name_col = 'description' if 'description' in lines.columns else 'player_name'
+    if name_col not in lines.columns:
+        logger.error(f"Missing player name column ('{name_col}')"); return pd.DataFrame()
+
+    # Markets: mapped ones get their stat name, other player_* markets pass through as-is
+    market = _column(lines, 'market', '').fillna('').astype(str)
+    lines = lines[market.isin(BETTING_MARKET_STATS.keys()) | market.str.startswith('player_')]
+    market = market[lines.index]
+    stat_type = _map_distinct(market, lambda m: BETTING_MARKET_STATS.get(m, m))
+
+    player_raw = _column(lines, name_col, '')
+    # Support both CSV formats: 'point'/'label' (odds API) and 'line'/'direction' (fetcher)
+    line = pd.to_numeric(_first_present(_column(lines, 'point'), _column(lines, 'line', 0))).astype(float)
+    raw_label = _first_present(_column(lines, 'label'), _column(lines, 'direction', 'Over'))
+    frame = pd.DataFrame({
+        'player_raw': player_raw,
+        'player_id': _map_distinct(player_raw, player_id),
+        'stat_type': stat_type, 'line': line,
+        'label': _map_distinct(raw_label, lambda v: str(v) if v else 'Over'),
+        'bookmaker': _map_distinct(_column(lines, 'bookmaker', 'unknown'), lambda v: str(v).strip().lower()),
+    })
+    # The same offer can appear more than once per book (refetches); keep the first
+    frame = frame[~frame.duplicated(subset=['player_id', 'stat_type', 'line', 'label', 'bookmaker'])]
+    lines = lines.loc[frame.index]
+
+    home = _map_distinct(_column(lines, 'home_team'), team_abbr)
+    away = _map_distinct(_column(lines, 'away_team'), team_abbr)
+    has_teams = home.ne('') & away.ne('')
+    frame, lines, home, away = frame[has_teams], lines[has_teams], home[has_teams], away[has_teams]
+
+    # --- Roster lookup with smart fallback ---
+    # Players missing from the roster file are assumed to be on the home team of their
+    # first game here (most feeds list the home team first). The inference is local to
+    # this slate; the shared roster map is never written, the caller's overlay may be.
+    team = _map_distinct(frame['player_id'], lambda p: player_roster_map.get(p) or '')
+    unrostered = team.eq('')
+    first_seen = frame[unrostered].assign(home=home[unrostered]).drop_duplicates(subset=['player_id'])
+    inferred = dict(zip(first_seen['player_id'], first_seen['home']))
+    for name, abbr in zip(first_seen['player_raw'], first_seen['home']):
+        logger.info(f"Auto-assigned '{name}' to {abbr} (not in roster)")
+    if inferred:
+        team = team.where(~unrostered, _map_distinct(frame['player_id'], lambda p: inferred.get(p, '')))
+        if inferred_roster is not None:
+            inferred_roster.update(inferred)
+
+    is_home = team.eq(home)
+    in_game = is_home | team.eq(away)
+    if not in_game.all():
+        # Expected in edge cases (trades, stale roster), so debug rather than warning
+        logger.debug(f"Skipping {int((~in_game).sum())} lines whose roster team isn't in the game")
+    frame, lines = frame[in_game], lines[in_game]
+    team, home, away, is_home = team[in_game], home[in_game], away[in_game], is_home[in_game]
+
+    # Include both OVER and UNDER bets (not just Over)
+    raw_odds = _column(lines, 'odds') if 'odds' in lines.columns else _column(lines, 'price')
+    props = pd.DataFrame({
+        'player_name': _map_distinct(frame['player_raw'], normalize_name), 'player_id': frame['player_id'],
+        'team': team, 'opponent': away.where(is_home, home),
+        'position': _map_distinct(frame['stat_type'], infer_position),
+        'stat_type': frame['stat_type'], 'line': frame['line'],
+        'bet_type': frame['label'],  # Store 'Over' or 'Under' explicitly
+        'game_total': 44.5,  # Default reasonable NFL game total
+        'spread': 0.0,  # Default neutral (ideally from separate moneyline data)
+        'is_home': is_home, 'week': week,
+        'bookmaker': frame['bookmaker'],
+        'odds': _optional_float(raw_odds),
+    })
+    if inferred:
+         logger.info(f"Auto-assigned {len(inferred)} players not in roster file (inferred from betting lines)")
+    return props
 
-        logger.info(f"✓ Loaded roster data for {len(player_to_team_map)} players from {roster_file.name}")
-    except Exception as e:
-        logger.error(f"Error loading roster file {roster_file.name}: {e}", exc_info=True)
 
-    return player_to_team_map
+def betting_lines_frame(betting_lines_df, week, player_roster_map: Dict[int, str],
+                        inferred_roster: Optional[Dict[int, str]] = None) -> pd.DataFrame:
+    """
+    Transform a betting lines DataFrame into a props frame (one row per prop), column-wise.
+    Uses the player_roster_map (keyed by player ID) to assign correct teams; the map is read-only.
+    Teams inferred for players missing from it are recorded in inferred_roster, if given.
+    """
+    if betting_lines_df is None: logger.warning("Betting lines DF is None."); return pd.DataFrame()
+    if not player_roster_map: logger.error("Player roster map is empty. Cannot accurately assign teams."); # Don't return, try anyway but log error
 
+    columns = betting_lines_df.columns
+    if 'Player' in columns and 'Team' in columns and 'Opponent' in columns:
+        logger.info("Detected TRANSFORMED betting lines.")
+        props = _transformed_lines_frame(betting_lines_df, week, player_roster_map)
+    elif 'home_team' in columns and 'away_team' in columns:
+        logger.info("Detected home_team/away_team betting lines. Using roster for team assignment.")
+        props = _market_lines_frame(betting_lines_df, week, player_roster_map, inferred_roster)
+    else:
+        logger.error("Betting lines CSV format unrecognized.")
+        props = pd.DataFrame()
 
-# ====================================================================
-#  DATA TRANSFORMER FUNCTIONS
-# ====================================================================
+    logger.info(f"Total props transformed after roster lookup: {len(props)}")
+    if props.empty: logger.error("No props were transformed.")
+    return props.reset_index(drop=True)
 
-def transform_betting_lines_to_props(betting_lines_df, week, player_roster_map: Dict[str, str]):
+
+def _props_records(props: pd.DataFrame) -> list:
+    """Materialize prop dicts (python scalars) from a props frame"""
+    if props.empty:
+        return []
+    return props.astype(object).to_dict('records')
+
+
+def transform_betting_lines_to_props(betting_lines_df, week, player_roster_map: Dict[int, str]):
     """
     Transform betting lines DataFrame into props format.
-    Uses the player_roster_map to assign correct teams.
+    Uses the player_roster_map (keyed by player ID) to assign correct teams.
     """
+    return _props_records(betting_lines_frame(betting_lines_df, week, player_roster_map))
 
-    def infer_position(stat_type):
-        stat_lower = str(stat_type).lower()
-        if 'pass' in stat_lower: return 'QB'
-        if 'rush' in stat_lower: return 'RB'
-        if 'rec' in stat_lower: return 'WR'
-        return 'UNK'
-
-    TEAM_FULL_NAME_TO_ABBR = { # Used if home/away columns contain full names
-        'Arizona Cardinals': 'ARI', 'Atlanta Falcons': 'ATL', 'Baltimore Ravens': 'BAL',
-        'Buffalo Bills': 'BUF', 'Carolina Panthers': 'CAR', 'Chicago Bears': 'CHI',
-        'Cincinnati Bengals': 'CIN', 'Cleveland Browns': 'CLE', 'Dallas Cowboys': 'DAL',
-        'Denver Broncos': 'DEN', 'Detroit Lions': 'DET', 'Green Bay Packers': 'GB',
-        'Houston Texans': 'HOU', 'Indianapolis Colts': 'IND', 'Jacksonville Jaguars': 'JAC',
-        'Kansas City Chiefs': 'KC', 'Las Vegas Raiders': 'LV', 'Los Angeles Chargers': 'LAC',
-        'Los Angeles Rams': 'LAR', 'Miami Dolphins': 'MIA', 'Minnesota Vikings': 'MIN',
-        'New England Patriots': 'NE', 'New Orleans Saints': 'NO', 'New York Giants': 'NYG',
-        'New York Jets': 'NYJ', 'Philadelphia Eagles': 'PHI', 'Pittsburgh Steelers': 'PIT',
-        'San Francisco 49ers': 'SF', 'Seattle Seahawks': 'SEA', 'Tampa Bay Buccaneers': 'TB',
-        'Tennessee Titans': 'TEN', 'Washington Commanders': 'WAS',
-        'Washington Football Team': 'WAS','LA Chargers': 'LAC', 'LA Rams': 'LAR',
-    }
-    def is_abbr(team_name):
-        return isinstance(team_name, str) and len(team_name) <= 3 and team_name.isupper()
-
-    def get_abbr(team_name):
-         if not team_name or pd.isna(team_name): return ''
-         team_name_str = str(team_name).strip()
-         if is_abbr(team_name_str): return normalize_team_abbr(team_name_str)
-         abbr = TEAM_FULL_NAME_TO_ABBR.get(team_name_str)
-         if abbr: return normalize_team_abbr(abbr)
-         return normalize_team_abbr(team_name_str)
-
-    props = []
-    if betting_lines_df is None: logger.warning("Betting lines DF is None."); return props
-    if not player_roster_map: logger.error("Player roster map is empty. Cannot accurately assign teams."); # Don't return, try anyway but log error
 
-    # Check for TRANSFORMED format
-    if 'Player' in betting_lines_df.columns and 'Team' in betting_lines_df.columns and 'Opponent' in betting_lines_df.columns:
-        logger.info("Detected TRANSFORMED betting lines.")
-        for _, row in betting_lines_df.iterrows():
-            player_name_norm = normalize_name(row['Player'])
-            # Verify team from roster if possible
-            roster_team = player_roster_map.get(player_name_norm)
-            csv_team = get_abbr(row['Team'])
-            if roster_team and csv_team != roster_team:
-                logger.warning(f"Team mismatch for {player_name_norm}: CSV='{csv_team}', Roster='{roster_team}'. Using CSV team.")
-                player_team_abbr = csv_team # Trust CSV if transformed? Or override with roster? Decide policy.
-            else:
-                 player_team_abbr = roster_team if roster_team else csv_team # Use roster if available, else CSV
+def _select_book_lines(keys: pd.DataFrame, preferred_book: Optional[str] = None) -> Tuple[pd.Series, pd.Series]:
+    """
+    Pick one row per (player, stat_type, bet_type) group from a frame with
+    player_key/stat_type/bet_type/line/bookmaker columns.
 
-            opponent_abbr = get_abbr(row['Opponent'])
+    Returns (selected row position per group, group number per row); groups are
+    numbered in first-seen order. A group's row is the preferred book's if present,
+    otherwise the one closest to the group's median line (first one on ties).
+    """
+    group = keys.groupby(['player_key', 'stat_type', 'bet_type'], sort=False, dropna=False).ngroup()
+    position = pd.Series(np.arange(len(keys)), index=keys.index)
 
-            stat_type = row['Stat_Type']
-            prop = {
-                'player_name': player_name_norm, 'team': player_team_abbr, 'opponent': opponent_abbr,
-                'position': row.get('Position', infer_position(stat_type)),
-                'stat_type': stat_type, 'line': float(row.get('Line', 0)), # Use .get for safety
-                'game_total': row.get('Game_Total'), 'spread': row.get('Spread'),
-                'is_home': row.get('Is_Home', True), 'week': week,
-            }
-            props.append(prop)
+    median_line = keys['line'].groupby(group).transform('median')
+    distance = (keys['line'] - median_line).abs().fillna(np.inf)
+    selected = position.loc[distance.groupby(group).idxmin()]
+    selected.index = np.arange(len(selected))
 
-    # Check for DraftKings/API format
-    elif 'home_team' in betting_lines_df.columns and 'away_team' in betting_lines_df.columns:
-        logger.info("Detected home_team/away_team betting lines. Using roster for team assignment.")
-        stat_map = {
-            'player_pass_yds': 'Pass Yds', 'player_pass_tds': 'Pass TDs',
-            'player_pass_completions': 'Pass Completions', 'player_rush_yds': 'Rush Yds',
-            'player_rush_attempts': 'Rush Attempts', 'player_reception_yds': 'Rec Yds',
-            'player_receiving_yds': 'Rec Yds', 'player_receptions': 'Receptions',
-             'player_rush_reception_yds': 'Rush+Rec Yds',
-             'player_pass_attempts': 'Pass Attempts',
-        }
-        name_col = 'description' if 'description' in betting_lines_df.columns else 'player_name'
-        if name_col not in betting_lines_df.columns:
-             logger.error(f"Missing player name column ('{name_col}')"); return props
-
-        processed_ids = set()
-        skipped_roster_lookup = 0
-        auto_assigned_players = set()  # Track which players we auto-assigned
-        for _, row in betting_lines_df.iterrows():
-            market = row.get('market', ''); stat_type = stat_map.get(market, market)
-            if not stat_type or (stat_type == market and not market.startswith('player_')): continue
-
-            player_name_raw = row.get(name_col, ''); player_name_norm = normalize_name(player_name_raw)
-            # Support both CSV formats: 'point'/'label' (odds API) and 'line'/'direction' (fetcher)
-            raw_line = row.get('point') if row.get('point') is not None and not pd.isna(row.get('point')) else row.get('line', 0)
-            line = float(raw_line) if raw_line is not None else 0.0
-            raw_label = row.get('label') if row.get('label') is not None and not pd.isna(row.get('label')) else row.get('direction', 'Over')
-            label = str(raw_label) if raw_label else 'Over'
-            bookmaker = str(row.get('bookmaker', 'unknown')).strip().lower()
-
-            prop_unique_id = (player_name_norm, stat_type, line, label, bookmaker)
-            if prop_unique_id in processed_ids: continue
-            processed_ids.add(prop_unique_id)
-
-            home_team_abbr = get_abbr(row.get('home_team'))
-            away_team_abbr = get_abbr(row.get('away_team'))
-            if not home_team_abbr or not away_team_abbr: continue
-
-            # --- *** Use Roster Lookup with Smart Fallback *** ---
-            player_team_abbr = player_roster_map.get(player_name_norm)
-            opponent_abbr = None
-            is_home = None
-
-            if player_team_abbr:
-                # Player found in roster - check if team matches game
-                if player_team_abbr == home_team_abbr:
-                    opponent_abbr = away_team_abbr
-                    is_home = True
-                elif player_team_abbr == away_team_abbr:
-                    opponent_abbr = home_team_abbr
-                    is_home = False
-                else:
-                    # Team mismatch - this shouldn't happen if roster/game data match
-                    # Log as debug, not warning, since it's expected in edge cases
-                    logger.debug(f"Roster team '{player_team_abbr}' for {player_name_norm} doesn't match game teams ({home_team_abbr}/{away_team_abbr}). Skipping.")
-                    continue
-            else:
-                # Player not found in roster file - INFER from position
-                # QBs are typically only 1-2 per game, so use heuristic:
-                # If this is a QB stat, assume they're playing for one of the teams
-                # For now, default to home team (can be improved with more logic)
-                inferred_position = infer_position(stat_type)
-
-                # Smart fallback: assume player is on home team by default
-                # This works reasonably well since most betting lines are formatted
-                # with home team first
-                player_team_abbr = home_team_abbr
-                opponent_abbr = away_team_abbr
-                is_home = True
-
-                # Auto-add to roster map so we remember for next props
-                player_roster_map[player_name_norm] = player_team_abbr
-
-                if player_name_norm not in auto_assigned_players:
-                    logger.info(f"Auto-assigned '{player_name_raw}' to {player_team_abbr} (not in roster)")
-                    auto_assigned_players.add(player_name_norm)
-                    skipped_roster_lookup += 1
-            # --- *** End Roster Lookup with Smart Fallback *** ---
-
-            position = infer_position(stat_type)
-
-            # Include both OVER and UNDER bets (not just Over)
-            raw_odds = row.get('odds') if row.get('odds') is not None else row.get('price')
-            prop = {
-                'player_name': player_name_norm, 'team': player_team_abbr, 'opponent': opponent_abbr,
-                'position': position, 'stat_type': stat_type, 'line': line,
-                'bet_type': label,  # Store 'Over' or 'Under' explicitly
-                'game_total': 44.5,  # Default reasonable NFL game total
-                'spread': 0.0,  # Default neutral (ideally from separate moneyline data)
-                'is_home': is_home, 'week': week,
-                'bookmaker': bookmaker,
-                'odds': float(raw_odds) if raw_odds is not None and not pd.isna(raw_odds) else None,
-            }
-            props.append(prop)
-    else: logger.error("Betting lines CSV format unrecognized.")
+    if preferred_book:
+        preferred_lower = preferred_book.lower().strip()
+        books = _map_distinct(keys['bookmaker'], lambda b: str(b).lower().strip() if isinstance(b, str) else '')
+        preferred = position[books.eq(preferred_lower)].groupby(group[books.eq(preferred_lower)]).first()
+        selected.loc[preferred.index] = preferred.to_numpy()
+    return selected, group
 
-    if skipped_roster_lookup > 0:
-         logger.info(f"Auto-assigned {skipped_roster_lookup} players not in roster file (inferred from betting lines)")
-    logger.info(f"Total props transformed after roster lookup: {len(props)}")
-    if not props: logger.error("No props were transformed.")
-    return props
+
+def _all_books(keys: pd.DataFrame, group: pd.Series) -> list:
+    """Per group (first-seen order): every book's line/odds, for the frontend"""
+    books = [[] for _ in range(int(group.max()) + 1)] if len(group) else []
+    for g, bookmaker, line, odds in zip(group, keys['bookmaker'], keys['line'], keys['odds']):
+        books[g].append({'bookmaker': bookmaker, 'line': line, 'odds': odds})
+    return books
+
+
+def _log_dedup(before_count: int, after_count: int):
+    if before_count != after_count:
+        logger.info(f"Deduplication: {before_count} -> {after_count} props ({before_count - after_count} duplicates removed)")
+
+
+def deduplicate_props_frame(props: pd.DataFrame, preferred_book: Optional[str] = None) -> pd.DataFrame:
+    """deduplicate_props for a props frame: one row per group, with an all_books column"""
+    if props.empty:
+        return props
+    keys = pd.DataFrame({
+        'player_key': props['player_id'] if 'player_id' in props.columns else props['player_name'],
+        'stat_type': props['stat_type'],
+        'bet_type': props['bet_type'] if 'bet_type' in props.columns else 'Over',
+        'line': props['line'],
+        'bookmaker': props['bookmaker'] if 'bookmaker' in props.columns else 'unknown',
+        'odds': props['odds'] if 'odds' in props.columns else None,
+    }, index=props.index).astype({'player_key': object})
+    selected, group = _select_book_lines(keys, preferred_book)
+    deduped = props.iloc[selected.to_numpy()].reset_index(drop=True)
+    deduped['all_books'] = _all_books(keys.astype({'line': object, 'odds': object}), group)
+    _log_dedup(len(props), len(deduped))
+    return deduped
 
 
 def deduplicate_props(props: list, preferred_book: Optional[str] = None) -> list:
@@ -266,64 +337,36 @@ def deduplicate_props(props: list, preferred_book: Optional[str] = None) -> list
     - Otherwise, use the median line across all books
     - Stores all available books/lines as metadata for the frontend
     """
-    from statistics import median
-    from collections import defaultdict
-
     if not props:
         return props
 
-    # Group props by (player, stat_type, bet_type)
-    groups = defaultdict(list)
-    for prop in props:
-        key = (prop['player_name'], prop['stat_type'], prop.get('bet_type', 'Over'))
-        groups[key].append(prop)
+    keys = pd.DataFrame({
+        'player_key': pd.Series([p.get('player_id', p['player_name']) for p in props], dtype=object),
+        'stat_type': [p['stat_type'] for p in props],
+        'bet_type': [p.get('bet_type', 'Over') for p in props],
+        'line': pd.Series([p['line'] for p in props], dtype=object),
+        'bookmaker': pd.Series([p.get('bookmaker', 'unknown') for p in props], dtype=object),
+        'odds': pd.Series([p.get('odds') for p in props], dtype=object),
+    })
+    selected, group = _select_book_lines(keys.astype({'line': float}), preferred_book)
+    all_books = _all_books(keys, group)
 
     deduped = []
-    for key, group_props in groups.items():
-        if len(group_props) == 1:
-            # Only one book - keep as is, add metadata
-            prop = group_props[0]
-            prop['all_books'] = [{
-                'bookmaker': prop.get('bookmaker', 'unknown'),
-                'line': prop['line'],
-                'odds': prop.get('odds'),
-            }]
-            deduped.append(prop)
-            continue
-
-        # Multiple books - need to pick one
-        # Collect book info for metadata
-        all_books = [{
-            'bookmaker': p.get('bookmaker', 'unknown'),
-            'line': p['line'],
-            'odds': p.get('odds'),
-        } for p in group_props]
-
-        selected = None
-
-        # Try preferred book first
-        if preferred_book:
-            preferred_lower = preferred_book.lower().strip()
-            for p in group_props:
-                if p.get('bookmaker', '').lower().strip() == preferred_lower:
-                    selected = p
-                    break
+    for g, position in enumerate(selected):
+        prop = props[position]
+        prop['all_books'] = all_books[g]
+        deduped.append(prop)
 
-        # Fallback to median line
-        if selected is None:
-            lines = [p['line'] for p in group_props]
-            median_line = median(lines)
-            # Pick the prop closest to median line
-            selected = min(group_props, key=lambda p: abs(p['line'] - median_line))
+    _log_dedup(len(props), len(deduped))
+    return deduped
 
-        selected['all_books'] = all_books
-        deduped.append(selected)
 
-    before_count = len(props)
-    after_count = len(deduped)
-    if before_count != after_count:
-        logger.info(f"Deduplication: {before_count} -> {after_count} props ({before_count - after_count} duplicates removed)")
-    return deduped
+def props_from_betting_lines(betting_lines_df, week, player_roster_map: Dict[int, str],
+                             preferred_book: Optional[str] = None,
+                             inferred_roster: Optional[Dict[int, str]] = None) -> list:
+    """Transform + deduplicate in one columnar pass; prop dicts are only built for the survivors"""
+    props = betting_lines_frame(betting_lines_df, week, player_roster_map, inferred_roster)
+    return _props_records(deduplicate_props_frame(props, preferred_book=preferred_book))
 
 
 # --- DVOA Transformation Functions (Using Positional Access) ---
@@ -414,8 +457,20 @@ class NFLDataLoader:
 
     def __init__(self, data_dir):
         self.data_dir = Path(data_dir)
-        # Load roster data on init (Try DB first, then File)
-        self.player_roster_map = self._load_roster_data_smart()
+        self._player_roster_map = None
+        # week -> teams inferred from that week's betting lines (kept out of the roster)
+        self._inferred_rosters: Dict[int, InferredRoster] = {}
+
+    @property
+    def player_roster_map(self) -> Dict[int, str]:
+        """Roster map, resolved on first use (Try DB first, then File); shared and read-only"""
+        if self._player_roster_map is None:
+            self._player_roster_map = self._load_roster_data_smart()
+        return self._player_roster_map
+
+    @player_roster_map.setter
+    def player_roster_map(self, value: Dict[int, str]):
+        self._player_roster_map = value
 
     def _fix_missing_header(self, df: pd.DataFrame, file_type: str) -> pd.DataFrame:
         """Fix missing headers for specific file types by applying known schemas"""
@@ -436,6 +491,8 @@ class NFLDataLoader:
 
     def _load_from_db(self, week: int, file_type: str) -> Optional[str]:
         """Try to load file content from database"""
+        # Deferred: SQLAlchemy + models are only needed once data is loaded
+        from api.database import SessionLocal, GameDataFile
         session = SessionLocal()
         try:
             record = session.query(GameDataFile).filter_by(week=week, file_type=file_type).first()
@@ -449,33 +506,47 @@ class NFLDataLoader:
         finally:
             session.close()
 
-    def _load_roster_data_smart(self) -> Dict[str, str]:
-        """Load roster from DB or File"""
+    def _load_roster_data_smart(self) -> RosterIndex:
+        """Load roster from DB or File (the shared index; only re-parsed when the source changes)"""
         # 1. Try DB
-        content = self._load_from_db(week=0, file_type='roster') # Week 0 for global/roster
-        if content:
-            player_to_team_map = {}
-            try:
-                df_roster = pd.read_csv(io.StringIO(content))
-                # reuse processing logic (copy-paste from _load_roster_data or helper)
-                for _, row in df_roster.iterrows():
-                    player_name_raw = row.get('Player')
-                    team_abbr = row.get('Team')
-                    if player_name_raw and team_abbr and not pd.isna(player_name_raw) and not pd.isna(team_abbr):
-                        # ... verify normalize_name is available in scope or self ...
-                        # It is defined in module scope, good.
-                        normalized_player = normalize_name(player_name_raw)
-                        player_to_team_map[normalized_player] = normalize_team_abbr(team_abbr)
-                return player_to_team_map
-            except Exception as e:
-                logger.error(f"Error parsing roster from DB: {e}")
+        index = self._load_roster_from_db()
+        if index:
+            return index
 
         # 2. Fallback to File
         return _load_roster_data(self.data_dir)
 
+    def _load_roster_from_db(self) -> Optional[RosterIndex]:
+        """Roster index from the DB (Week 0 = global roster); content is only fetched when the row changes"""
+        # Deferred: SQLAlchemy + models are only needed once data is loaded
+        from api.database import SessionLocal, GameDataFile
+        session = SessionLocal()
+        try:
+            record = (session.query(GameDataFile.id, GameDataFile.uploaded_at)
+                      .filter_by(week=0, file_type='roster').first())
+            if record is None:
+                return None
+
+            def read():
+                logger.info("✓ Loaded roster from Database (Week 0)")
+                return session.query(GameDataFile.content).filter_by(id=record.id).scalar() or ''
+
+            return roster_index(('db', str(session.get_bind().url), 'roster'),
+                                (record.id, record.uploaded_at), read, label="Database roster")
+        except Exception as e:
+            logger.error(f"Error parsing roster from DB: {e}")
+            return None
+        finally:
+            session.close()
+
+    def inferred_roster(self, week: int) -> InferredRoster:
+        """Teams inferred for unrostered players from the last load of this week's betting lines"""
+        return self._inferred_rosters.get(week) or InferredRoster(week)
+
     def load_all_data(self, week, preferred_book: Optional[str] = None):
         """Load all data needed for analysis"""
         logger.info(f"Loading data for Week {week}...")
+        stages = instrumentation.laps('load')
 
         context = {
             'week': week,
@@ -485,6 +556,8 @@ class NFLDataLoader:
             'loaded_files': ['Roster: NFL_roster - Sheet1.csv'] if self.player_roster_map else []  # Track loaded files for UI display
         }
 
+        stages.lap('roster')
+
         # --- Load RAW DataFrames ---
         
         # Helper to load CSV from DB or File
@@ -556,6 +629,7 @@ class NFLDataLoader:
             header=0
         )
         if lines_df is not None:
+             instrumentation.count('lines.loaded', len(lines_df))
              context['betting_lines_raw'] = lines_df
              context['betting_lines_source'] = name
              context['loaded_files'].append(f"Betting Lines: {name}")
@@ -578,6 +652,7 @@ class NFLDataLoader:
                 logger.info(f"✓ Loaded injury report content")
             else: logger.info(f"ℹ No injury report file found (tried patterns like wk{week}-injury-report.csv, ...).")
         except Exception as e: logger.warning(f"Injury report loading error: {e}")
+        stages.lap('files')
 
         # --- Load Historical Stats ---
         context['historical_stats'] = {}
@@ -596,11 +671,12 @@ class NFLDataLoader:
                  except Exception as e: logger.debug(f"Hist stats wk{hist_week} {st}: {e}")
              if has_data: loaded_hist_weeks +=1
         logger.info(f"✓ Loaded historical stats for {loaded_hist_weeks} weeks")
+        stages.lap('history')
 
         # --- Load Current Week Usage Data (Falls back to previous weeks) ---
         # Load BOTH receiving_usage AND rushing_usage for complete player data
         try:
-            usage_dict = {}
+            usage_dict = PlayerTable()
 
             # 1. Load RECEIVING usage (WR, TE, pass-catching RB)
             recv_usage_file = None
@@ -612,8 +688,8 @@ class NFLDataLoader:
             if recv_usage_file and recv_usage_file.exists():
                 recv_df = pd.read_csv(recv_usage_file, skiprows=1)
                 for _, row in recv_df.iterrows():
-                    player = normalize_name(row.get('Player', ''))
-                    if player:
+                    player = player_id(row.get('Player', ''))
+                    if player is not None:
                         usage_dict[player] = {
                             'snap_share_pct': safe_float(row.get('SNP%')),
                             'target_share_pct': safe_float(row.get('TAR%')),
@@ -635,8 +711,8 @@ class NFLDataLoader:
                 rush_df = pd.read_csv(rush_usage_file, skiprows=1)
                 rush_count = 0
                 for _, row in rush_df.iterrows():
-                    player = normalize_name(row.get('Player', ''))
-                    if player:
+                    player = player_id(row.get('Player', ''))
+                    if player is not None:
                         snap_pct = safe_float(row.get('SNP%'))
                         attempt_pct = safe_float(row.get('ATT%'))
                         touch_pct = safe_float(row.get('TCH%'))
@@ -674,7 +750,7 @@ class NFLDataLoader:
 
         # --- Load QB Analytics from passing_base ---
         try:
-            qb_analytics = {}
+            qb_analytics = PlayerTable()
             passing_file = None
             for try_week in [week-1, week-2, week-3]:
                 if try_week < 1: break
@@ -684,8 +760,8 @@ class NFLDataLoader:
             if passing_file and passing_file.exists():
                 pass_df = pd.read_csv(passing_file, skiprows=1)
                 for _, row in pass_df.iterrows():
-                    player = normalize_name(row.get('Player', ''))
-                    if player:
+                    player = player_id(row.get('Player', ''))
+                    if player is not None:
                         qb_analytics[player] = {
                             'pass_attempts': safe_float(row.get('ATT')),
                             'completions': safe_float(row.get('COM')),
@@ -713,7 +789,7 @@ class NFLDataLoader:
 
         # --- Load Receiver Alignment Data ---
         try:
-            alignment_data = {}
+            alignment_data = PlayerTable()
             align_file = None
             for try_week in [week-1, week-2, week-3]:
                 if try_week < 1: break
@@ -723,8 +799,8 @@ class NFLDataLoader:
             if align_file and align_file.exists():
                 align_df = pd.read_csv(align_file, skiprows=1)
                 for _, row in align_df.iterrows():
-                    player = normalize_name(row.get('Player', ''))
-                    if player:
+                    player = player_id(row.get('Player', ''))
+                    if player is not None:
                         wide_pct = safe_float(row.get('OW%'))
                         slot_pct = safe_float(row.get('SLOT%'))
 
@@ -744,6 +820,7 @@ class NFLDataLoader:
         except Exception as e:
             logger.error(f"Error loading alignment data: {e}")
             context['alignment'] = {}
+        stages.lap('usage')
 
         # --- Aggregate Historical Stats ---
         try:
@@ -754,20 +831,30 @@ class NFLDataLoader:
             context = stats_agg.aggregate_historical_stats(context); logger.info("✓ Aggregated historical stats.")
         except Exception as e:
             logger.error(f"FAIL Aggregation: {e}"); context['trends']={}; context['alignment']={}
+        stages.lap('aggregate')
 
         # ====================================================================
         #  TRANSFORM DATA FOR AGENTS (Now uses roster map)
         # ====================================================================
         logger.info("Transforming raw data for agents using roster map...")
         # Pass roster map loaded during __init__
-        raw_props = transform_betting_lines_to_props(
-            context.get('betting_lines_raw'), week, self.player_roster_map
+        # Inferred teams go to this week's overlay, never into the shared roster
+        inferred_roster = InferredRoster(week)
+        context['props'] = props_from_betting_lines(
+            context.get('betting_lines_raw'), week, self.player_roster_map, preferred_book=preferred_book,
+            inferred_roster=inferred_roster
         )
-        context['props'] = deduplicate_props(raw_props, preferred_book=preferred_book)
+        self._inferred_rosters[week] = inferred_roster
+        context['inferred_roster'] = inferred_roster
+        stages.lap('props')
         context['dvoa_offensive'] = transform_dvoa_offensive(context.get('dvoa_off_raw'))
         context['dvoa_defensive'] = transform_dvoa_defensive(context.get('dvoa_def_raw'))
         context['defensive_vs_receiver'] = transform_def_vs_receiver(context.get('def_vs_wr_raw'))
 
+        # One pre-joined feature row per prop; agents read this instead of the nested tables
+        context['prop_features'] = PropFeatureTable.build(context)
+        stages.lap('features')
+
         logger.info(f"✓ Transformed {len(context.get('props', []))} props")
         logger.info(f"✓ Transformed {len(context.get('dvoa_offensive', {}))} offensive teams")
         logger.info(f"✓ Transformed {len(context.get('dvoa_defensive', {}))} defensive teams")
@@ -779,6 +866,7 @@ class NFLDataLoader:
         if not context.get('dvoa_defensive'): logger.error("ERROR: DVOA Defensive dict empty.")
         if not context.get('defensive_vs_receiver'): logger.error("ERROR: Def vs Receiver dict empty.")
 
+        stages.done()
         return context
 
     def get_validation_status(self, context: Dict) -> Dict:
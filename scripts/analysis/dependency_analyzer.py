@@ -1,86 +1,280 @@
-"""Dependency Analyzer - Claude-powered correlation detection in parlays"""
+"""Dependency Analyzer - Claude-powered correlation detection in parlays
+
+Dependencies are judged per leg pair: a parlay's verdict is assembled from
+the verdicts of its pairs. Pair verdicts are cached by a canonical pair key
+(in memory and on disk), so parlays that share legs - the normal case when
+an optimizer builds dozens of parlays from the same top props - only pay for
+pairs nobody has asked about yet. Uncached pairs are sent in batches, several
+requests at a time.
+"""
+import hashlib
+import importlib.util
 import json
 import logging
 import os
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
-try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# The SDK itself is imported when a client is built (it is slow to import)
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
 
 from .models import PropAnalysis, Parlay
+from .player_identity import canonical_key
 
 logger = logging.getLogger(__name__)
 
+project_root = Path(__file__).resolve().parent.parent.parent
+DEFAULT_PAIR_CACHE = str(project_root / "data" / "cache" / "dependency_pairs.json")
+PAIRS_PER_REQUEST = 8
+MAX_CONCURRENT_REQUESTS = 4
+
+# Parlay-level adjustment bounds (same as the old whole-parlay prompt)
+MAX_PARLAY_PENALTY = -5
+MAX_PAIR_PENALTY = -3
+
+
+class PairVerdictCache:
+    """Pair key -> verdict dict, persisted as one JSON file"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = Path(path) if path else None
+        self._verdicts: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            try:
+                with open(self.path) as f:
+                    self._verdicts = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable dependency cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._verdicts.get(key)
+
+    def set(self, key: str, verdict: Dict):
+        with self._lock:
+            self._verdicts[key] = verdict
+            self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._verdicts
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp, "w") as f:
+                    json.dump(self._verdicts, f)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning(f"Could not save dependency cache: {e}")
+
 
 class DependencyAnalyzer:
     """Analyzes parlay dependencies using Claude API - CONSERVATIVE approach"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client=None,
+                 cache_path: Optional[str] = DEFAULT_PAIR_CACHE,
+                 pairs_per_request: int = PAIRS_PER_REQUEST,
+                 max_workers: int = MAX_CONCURRENT_REQUESTS):
+        self.model = "claude-sonnet-4-20250514"
+        self.pairs_per_request = pairs_per_request
+        self.max_workers = max_workers
+        self.cache = PairVerdictCache(cache_path)
+        self.client = client
+        if client is not None:
+            return
+
         if not ANTHROPIC_AVAILABLE:
             logger.warning("anthropic package not installed")
-            self.client = None
             return
-        
+
+        import anthropic
         self.client = anthropic.Anthropic(api_key=api_key)
-        self.model = "claude-sonnet-4-20250514"
+
+    # --- Pair keys ---
+
+    @staticmethod
+    def _leg_key(leg: PropAnalysis) -> str:
+        # Keys are persisted, so use the canonical name rather than player_id
+        # (registry IDs are dense and only stable within one process)
+        prop = leg.prop
+        return "|".join(str(v) for v in (
+            canonical_key(prop.player_name), prop.team, prop.opponent, prop.stat_type, prop.bet_type, prop.line,
+        ))
+
+    def _pair_key(self, a: PropAnalysis, b: PropAnalysis) -> str:
+        """Order-independent key for a leg pair (model-scoped)"""
+        first, second = sorted((self._leg_key(a), self._leg_key(b)))
+        raw = f"{self.model}\x1f{first}\x1f{second}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _can_depend(a: PropAnalysis, b: PropAnalysis) -> bool:
+        """Only the same player or the same game can carry a real dependency.
+
+        Everything else is independent under the conservative rules, so it is
+        decided locally without an API call.
+        """
+        if a.prop.player_id == b.prop.player_id:
+            return True
+        return bool({a.prop.team, a.prop.opponent} & {b.prop.team, b.prop.opponent})
+
+    # --- Parlay-level API ---
 
     def analyze_parlay_dependencies(self, parlay: Parlay) -> Dict:
         """Analyze a single parlay for dependencies"""
-        if not self.client:
-            return {
-                "adjusted_confidence": parlay.combined_confidence,
-                "recommendation": "ACCEPT",
-                "dependency_chains": [],
-                "correlation_adjustment": {"adjustment_value": 0}
-            }
-        
-        legs_context = self._build_legs_context(parlay)
-        analysis_result = self._get_claude_analysis(parlay, legs_context)
-        return self._parse_claude_response(analysis_result)
-
-    def _build_legs_context(self, parlay: Parlay) -> str:
-        """Build context about parlay legs"""
-        context_lines = []
-        for i, leg in enumerate(parlay.legs, 1):
-            prop = leg.prop
-            context_lines.append(f"Leg {i}: {prop.player_name}")
-            context_lines.append(f"  Position: {prop.position}")
-            context_lines.append(f"  {prop.stat_type} OVER {prop.line}")
-            context_lines.append(f"  {prop.team} vs {prop.opponent}")
-            context_lines.append(f"  Confidence: {leg.final_confidence}%")
-        return "\n".join(context_lines)
-
-    def _get_claude_analysis(self, parlay: Parlay, legs_context: str) -> str:
-        """Get Claude analysis of dependencies - CONSERVATIVE SCORING"""
-        prompt = f"""Analyze this NFL parlay for REAL correlations (not speculative ones).
-
-Parlay Type: {parlay.parlay_type}
-Combined Confidence: {parlay.combined_confidence}%
-
-Legs:
-{legs_context}
+        self._resolve_pairs([parlay])
+        return self._assemble_verdict(parlay)
+
+    def analyze_all_parlays(self, parlays: Dict[str, List[Parlay]]) -> Dict:
+        """Analyze all parlays for dependencies"""
+        result = {"2-leg": [], "3-leg": [], "4-leg": [], "5-leg": []}
+
+        # Ask about every uncached pair across the whole set up front
+        self._resolve_pairs(p for ptype in result for p in parlays.get(ptype, []))
+
+        for ptype in ["2-leg", "3-leg", "4-leg", "5-leg"]:
+            for i, parlay in enumerate(parlays.get(ptype, []), 1):
+                analysis = self._assemble_verdict(parlay)
+                result[ptype].append({
+                    "parlay": parlay,
+                    "dependency_analysis": analysis
+                })
+
+                rec = analysis.get('recommendation')
+                print(f"  ✓ {ptype} Parlay {i}: {rec}")
+
+        return result
+
+    def _assemble_verdict(self, parlay: Parlay) -> Dict:
+        """Parlay verdict from its pair verdicts (missing pairs count as independent)"""
+        adjustment = 0
+        chains, risk_flags, reasons = [], [], []
+        for a, b in combinations(parlay.legs, 2):
+            verdict = self.cache.get(self._pair_key(a, b))
+            if not verdict or not verdict.get("dependent"):
+                continue
+            adjustment += verdict.get("adjustment_value", 0)
+            chains.append(f"{a.prop.player_name} {a.prop.stat_type} <-> "
+                          f"{b.prop.player_name} {b.prop.stat_type}")
+            if verdict.get("reasoning"):
+                reasons.append(verdict["reasoning"])
+            risk_flags.extend(verdict.get("risk_flags", []))
+
+        adjustment = max(MAX_PARLAY_PENALTY, min(0, adjustment))
+        if adjustment == 0:
+            recommendation = "ACCEPT"
+        elif adjustment > MAX_PARLAY_PENALTY:
+            recommendation = "MODIFY"
+        else:
+            recommendation = "AVOID"
+
+        return {
+            "adjusted_confidence": max(0, min(100, parlay.combined_confidence + adjustment)),
+            "recommendation": recommendation,
+            "dependency_chains": chains,
+            "correlation_adjustment": {"adjustment_value": adjustment, "reasoning": "; ".join(reasons)},
+            "risk_flags": list(dict.fromkeys(risk_flags)),
+        }
+
+    # --- Pair resolution ---
+
+    def _resolve_pairs(self, parlays: Iterable[Parlay]):
+        """Make sure every leg pair in these parlays has a cached verdict"""
+        pending: Dict[str, Tuple[PropAnalysis, PropAnalysis]] = {}
+        local = 0
+        for parlay in parlays:
+            for a, b in combinations(parlay.legs, 2):
+                key = self._pair_key(a, b)
+                if key in self.cache or key in pending:
+                    continue
+                if not self._can_depend(a, b):
+                    self.cache.set(key, {"dependent": False, "adjustment_value": 0,
+                                         "reasoning": "Different players in different games"})
+                    local += 1
+                    continue
+                pending[key] = (a, b)
+
+        if pending and self.client:
+            items = list(pending.items())
+            batches = [items[i:i + self.pairs_per_request]
+                       for i in range(0, len(items), self.pairs_per_request)]
+            workers = max(1, min(self.max_workers, len(batches)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dependency") as pool:
+                for verdicts in pool.map(self._ask_pairs, batches):
+                    for key, verdict in verdicts.items():
+                        self.cache.set(key, verdict)
+            logger.info(f"🔗 Dependency pairs: {len(pending)} queried in {len(batches)} requests, "
+                        f"{local} decided locally, {len(self.cache)} cached")
+
+        self.cache.save()
+
+    @staticmethod
+    def _describe_leg(leg: PropAnalysis) -> str:
+        prop = leg.prop
+        return (f"{prop.player_name} ({prop.position}, {prop.team} vs {prop.opponent}) "
+                f"{prop.stat_type} {prop.bet_type} {prop.line}")
+
+    def _build_pairs_prompt(self, batch: List[Tuple[str, Tuple[PropAnalysis, PropAnalysis]]]) -> str:
+        pair_lines = []
+        for i, (_, (a, b)) in enumerate(batch, 1):
+            pair_lines.append(f"Pair {i}:\n  A: {self._describe_leg(a)}\n  B: {self._describe_leg(b)}")
+        pairs = "\n".join(pair_lines)
+
+        return f"""Judge each pair of NFL prop legs for REAL correlations (not speculative ones).
+
+{pairs}
 
 CRITICAL RULES - Be conservative:
 - Do NOT penalize for different players in same game (they're independent)
 - Do NOT penalize for "potential" game script effects (too speculative)
 - DO penalize only for OBVIOUS dependencies:
-  * SAME PLAYER in multiple legs = Correlation
-  * Same QB + same target (even different stat type) = Minor correlation only
-  * Same defense being targeted by multiple props = Minor correlation only
-
-Adjustment guidelines:
-- No real dependencies = ACCEPT, adjustment 0
-- Minor/speculative correlations = ACCEPT, adjustment 0 (don't penalize speculation)
-- Clear same-player dependencies = MODIFY, adjustment -2 to -3
-- Multiple same-player dependencies = MODIFY, adjustment -3 to -5
-- Parlays that break with one player failure = AVOID, adjustment -5
-
-Return ONLY valid JSON:
-{{"adjusted_confidence": 50-100, "recommendation": "ACCEPT/MODIFY/AVOID", "correlation_adjustment": {{"adjustment_value": -5 to 5, "reasoning": ""}}, "dependency_chains": [], "risk_flags": []}}"""
-        
+  * SAME PLAYER in both legs = Correlation, adjustment -2 to -3
+  * Same QB + same target (even different stat type) = Minor correlation only, adjustment -1
+  * Same defense being targeted by both props = Minor correlation only, adjustment -1 or 0
+- No real dependency = dependent false, adjustment 0
+
+Return ONLY valid JSON with one entry per pair:
+{{"pairs": [{{"id": 1, "dependent": false, "adjustment_value": -3 to 0, "reasoning": "", "risk_flags": []}}]}}"""
+
+    def _ask_pairs(self, batch: List[Tuple[str, Tuple[PropAnalysis, PropAnalysis]]]) -> Dict[str, Dict]:
+        """One API request for a batch of pairs; returns verdicts by pair key.
+
+        Pairs missing from the response are left uncached so the next run
+        asks again.
+        """
+        data = self._parse_claude_response(self._get_claude_analysis(self._build_pairs_prompt(batch)))
+        verdicts = {}
+        for entry in data.get("pairs", []):
+            try:
+                index = int(entry.get("id")) - 1
+                adjustment = int(entry.get("adjustment_value", 0))
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if not 0 <= index < len(batch):
+                continue
+            adjustment = max(MAX_PAIR_PENALTY, min(0, adjustment))
+            verdicts[batch[index][0]] = {
+                "dependent": bool(entry.get("dependent")) and adjustment < 0,
+                "adjustment_value": adjustment,
+                "reasoning": entry.get("reasoning", ""),
+                "risk_flags": entry.get("risk_flags", []),
+            }
+        return verdicts
+
+    def _get_claude_analysis(self, prompt: str) -> str:
+        """Send one prompt to Claude and return the raw text"""
         try:
             response = self.client.messages.create(
                 model=self.model,
@@ -93,59 +287,21 @@ Return ONLY valid JSON:
             return "{}"
 
     def _parse_claude_response(self, text: str) -> Dict:
-        """Parse Claude JSON response with bounds checking"""
+        """Parse Claude JSON response (tolerates markdown code fences)"""
         try:
             text = text.strip()
-            
+
             # Remove markdown code blocks if present
             if "```json" in text:
                 text = text.split("```json")[1].split("```")[0]
             elif "```" in text:
                 text = text.split("```")[1].split("```")[0]
-            
-            text = text.strip()
-            data = json.loads(text)
-            
-            # Ensure required fields
-            data.setdefault("adjusted_confidence", 50)
-            data.setdefault("recommendation", "REVIEW")
-            data.setdefault("dependency_chains", [])
-            data.setdefault("correlation_adjustment", {"adjustment_value": 0})
-            
-            # BOUNDS CHECK: Ensure adjustments don't exceed -5 to +5 range
-            adj_value = data["correlation_adjustment"].get("adjustment_value", 0)
-            data["correlation_adjustment"]["adjustment_value"] = max(-5, min(5, adj_value))
-            
-            # BOUNDS CHECK: Ensure confidence is 0-100
-            conf = data.get("adjusted_confidence", 50)
-            data["adjusted_confidence"] = max(0, min(100, conf))
-            
-            return data
+
+            data = json.loads(text.strip())
+            return data if isinstance(data, dict) else {}
         except json.JSONDecodeError as e:
             logger.error(f"JSON parse error: {e}")
-            return {
-                "adjusted_confidence": 50,
-                "recommendation": "REVIEW",
-                "dependency_chains": [],
-                "correlation_adjustment": {"adjustment_value": 0}
-            }
-
-    def analyze_all_parlays(self, parlays: Dict[str, List[Parlay]]) -> Dict:
-        """Analyze all parlays for dependencies"""
-        result = {"2-leg": [], "3-leg": [], "4-leg": [], "5-leg": []}
-        
-        for ptype in ["2-leg", "3-leg", "4-leg", "5-leg"]:
-            for i, parlay in enumerate(parlays.get(ptype, []), 1):
-                analysis = self.analyze_parlay_dependencies(parlay)
-                result[ptype].append({
-                    "parlay": parlay,
-                    "dependency_analysis": analysis
-                })
-                
-                rec = analysis.get('recommendation')
-                print(f"  ✓ {ptype} Parlay {i}: {rec}")
-        
-        return result
+            return {}
 
     def generate_dependency_report(self, analyzed_parlays: Dict) -> str:
         """Generate summary report"""
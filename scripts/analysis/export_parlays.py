@@ -2,20 +2,61 @@
 Weekly Parlay Export for Calibration
 Exports all parlays generated for a specific week to CSV for manual Win/Loss entry.
 Implements "mark everything" philosophy to maximize learning data.
+
+Rows are streamed: database parlays come from one joined query read in
+chunks, are merged with the JSON tracker's parlays by parlay_id, and each
+parlay's legs go straight to the CSV writer, so memory stays flat however
+many parlays a season has. export_all_weeks reads the database once.
 """
 
+import os
+import csv
 import pandas as pd
+from itertools import chain, groupby
 from pathlib import Path
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Iterable, Iterator
 import logging
 import json
 
+from api.database import Parlay, Leg
 from .parlay_tracker import ParlayTracker
 from .performance_tracker import PerformanceTracker
 
 logger = logging.getLogger(__name__)
 
+# Leg-level CSV columns, in file order
+EXPORT_COLUMNS = [
+    'week', 'year', 'parlay_id', 'leg_number', 'parlay_type', 'was_bet_on',
+    'player_name', 'position', 'team', 'opponent', 'home_away', 'prop_type', 'line',
+    'prediction', 'leg_confidence', 'parlay_raw_confidence', 'correlation_adjustment',
+    'parlay_adjusted_confidence', 'dvoa_score', 'matchup_score', 'volume_score',
+    'injury_score', 'trend_score', 'gamescript_score', 'variance_score', 'weather_score',
+    'bet_result',
+]
+
+# Rows buffered per CSV write / database rows fetched per round trip
+CHUNK_SIZE = 1000
+
+
+def _json_value(value) -> Dict:
+    """JSON columns come back as dicts (SQLAlchemy JSON) or strings (older rows)"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value) if value else {}
+        except ValueError:
+            return {}
+    return value or {}
+
+
+def _as_float(value):
+    """Numbers as floats, so mixed int/float columns read the same in every row"""
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+
+
+def _percent(confidence):
+    # Convert 0-1 to 0-100
+    return confidence * 100 if confidence < 1 else confidence
+
 
 class WeeklyParlayExporter:
     """
@@ -56,6 +97,11 @@ class WeeklyParlayExporter:
         Returns:
             File path if successful, None otherwise
         """
+        return self._export_week(week, year, self._iter_sqlite_parlays([week], year), overwrite)
+
+    def _export_week(self, week: int, year: int, sqlite_parlays: Iterable[Dict],
+                     overwrite: bool = False) -> Optional[str]:
+        """Stream one week's merged parlays into its CSV"""
         print(f"\n{'=' * 80}")
         print(f"EXPORT: EXPORTING PARLAYS FOR WEEK {week} ({year})")
         print(f"{'=' * 80}\n")
@@ -67,123 +113,22 @@ class WeeklyParlayExporter:
         json_parlays = self.tracker.get_parlays_by_week(week, year)
         print(f"  - Found {len(json_parlays)} parlays in JSON tracker")
 
-        # Source 2: SQLite database (optimized system parlays)
-        sqlite_parlays = self._load_parlays_from_sqlite(week, year)
-        print(f"  - Found {len(sqlite_parlays)} parlays in SQLite database")
+        # Source 2: SQLite database (optimized system parlays), streamed
+        counts = {'json': len(json_parlays), 'sqlite': 0}
 
-        # Merge parlays (avoid duplicates by parlay_id)
-        parlays = self._merge_parlays(json_parlays, sqlite_parlays)
+        def counted_sqlite():
+            for parlay in sqlite_parlays:
+                counts['sqlite'] += 1
+                yield parlay
 
-        if not parlays:
+        # Merge parlays (avoid duplicates by parlay_id)
+        parlays = self._iter_merged_parlays(json_parlays, counted_sqlite())
+        first = next(parlays, None)
+        if first is None:
             print(f"\n[ERROR] No parlays found for week {week} ({year})")
             print(f"   Make sure you've run analysis for this week first.")
             return None
-
-        # Categorize parlays
-        system_parlays = [p for p in parlays if p.get('parlay_type') in ['traditional', 'enhanced', 'generated']]
-        custom_parlays = [p for p in parlays if p.get('parlay_type') == 'custom']
-        bet_parlays = [p for p in parlays if p.get('bet_on', False)]
-
-        print(f"\nTotal parlays after merging: {len(parlays)}")
-        print(f"  - {len(system_parlays)} system parlays")
-        print(f"  - {len(custom_parlays)} custom parlays")
-        print(f"  - {len(bet_parlays)} parlays actually bet on\n")
-
-        # Convert parlays to leg-level rows
-        print("Converting parlays to individual legs...")
-        rows = []
-        total_legs = 0
-
-        for parlay_idx, parlay in enumerate(parlays, 1):
-            parlay_id = parlay.get('parlay_id', f'unknown_{parlay_idx}')
-            parlay_type = parlay.get('parlay_type', 'unknown')
-            was_bet = parlay.get('bet_on', False)
-            props = parlay.get('props', [])
-            correlations = parlay.get('correlations', [])
-
-            # Get correlation adjustment (if available)
-            correlation_adjustment = 0
-            if correlations:
-                # Try to extract correlation adjustment
-                for corr in correlations:
-                    if isinstance(corr, dict):
-                        correlation_adjustment = corr.get('adjustment', 0)
-                        break
-
-            # Process each leg (prop) in the parlay
-            for leg_idx, prop in enumerate(props, 1):
-                total_legs += 1
-
-                # Extract base prop data
-                player_name = prop.get('player', 'Unknown')
-                position = prop.get('position', 'Unknown')
-                team = prop.get('team', 'Unknown')
-                opponent = prop.get('opponent', 'Unknown')
-                stat_type = prop.get('stat_type', 'Unknown')
-                line = prop.get('line', 0)
-                direction = prop.get('direction', 'OVER')
-                confidence = prop.get('confidence', 0)
-
-                # Determine home/away (default to UNKNOWN if not specified)
-                home_away = "UNKNOWN"
-                if 'is_home' in prop:
-                    home_away = "HOME" if prop['is_home'] else "AWAY"
-
-                # Extract agent scores
-                agent_scores = prop.get('agent_scores', {})
-
-                # Handle both formats: old style (raw scores) and new style (with raw_score/weight)
-                dvoa_score = self._extract_agent_score(agent_scores, 'DVOA')
-                matchup_score = self._extract_agent_score(agent_scores, 'Matchup')
-                volume_score = self._extract_agent_score(agent_scores, 'Volume')
-                injury_score = self._extract_agent_score(agent_scores, 'Injury')
-                trend_score = self._extract_agent_score(agent_scores, 'Trend')
-                gamescript_score = self._extract_agent_score(agent_scores, 'GameScript')
-                variance_score = self._extract_agent_score(agent_scores, 'Variance')
-                weather_score = self._extract_agent_score(agent_scores, 'Weather')
-
-                # Calculate raw confidence (before correlation adjustment)
-                # For custom parlays, raw_confidence might be in parlay data
-                raw_confidence = parlay.get('raw_confidence', confidence)
-                adjusted_confidence = parlay.get('effective_confidence', confidence)
-
-                # Build row
-                row = {
-                    'week': week,
-                    'year': year,
-                    'parlay_id': parlay_id,
-                    'leg_number': leg_idx,
-                    'parlay_type': parlay_type,
-                    'was_bet_on': was_bet,
-                    'player_name': player_name,
-                    'position': position,
-                    'team': team,
-                    'opponent': opponent,
-                    'home_away': home_away,
-                    'prop_type': stat_type,
-                    'line': line,
-                    'prediction': direction,
-                    'leg_confidence': confidence,
-                    'parlay_raw_confidence': raw_confidence,
-                    'correlation_adjustment': correlation_adjustment,
-                    'parlay_adjusted_confidence': adjusted_confidence,
-                    'dvoa_score': dvoa_score,
-                    'matchup_score': matchup_score,
-                    'volume_score': volume_score,
-                    'injury_score': injury_score,
-                    'trend_score': trend_score,
-                    'gamescript_score': gamescript_score,
-                    'variance_score': variance_score,
-                    'weather_score': weather_score,
-                    'bet_result': ''  # Empty for user to fill in
-                }
-
-                rows.append(row)
-
-        print(f"[OK] Converted {len(parlays)} parlays into {total_legs} individual legs\n")
-
-        # Create DataFrame
-        df = pd.DataFrame(rows)
+        parlays = chain([first], parlays)
 
         # Generate filename
         filename = f"week_{week}_{year}_parlays.csv"
@@ -197,17 +142,45 @@ class WeeklyParlayExporter:
                 print("[ERROR] Export cancelled")
                 return None
 
-        # Save to CSV
-        df.to_csv(filepath, index=False)
+        # Convert parlays to leg-level rows as they stream in
+        print("Converting parlays to individual legs...")
+        totals = {'parlays': 0, 'legs': 0, 'system': 0, 'custom': 0, 'bet': 0}
+
+        def rows():
+            for parlay_idx, parlay in enumerate(parlays, 1):
+                totals['parlays'] += 1
+                parlay_type = parlay.get('parlay_type')
+                totals['system'] += parlay_type in ['traditional', 'enhanced', 'generated']
+                totals['custom'] += parlay_type == 'custom'
+                totals['bet'] += bool(parlay.get('bet_on', False))
+                for row in self._parlay_rows(parlay, parlay_idx, week, year):
+                    totals['legs'] += 1
+                    yield row
+
+        # Save to CSV (via a temp file, so a failed export leaves the old file intact)
+        temp_path = filepath.with_suffix('.csv.tmp')
+        try:
+            self._write_csv(temp_path, rows())
+            os.replace(temp_path, filepath)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+
+        print(f"  - Found {counts['sqlite']} parlays in SQLite database")
+        print(f"\nTotal parlays after merging: {totals['parlays']}")
+        print(f"  - {totals['system']} system parlays")
+        print(f"  - {totals['custom']} custom parlays")
+        print(f"  - {totals['bet']} parlays actually bet on\n")
+        print(f"[OK] Converted {totals['parlays']} parlays into {totals['legs']} individual legs\n")
 
         # Print summary
         print(f"{'=' * 80}")
         print(f"[SUCCESS] EXPORT SUCCESSFUL")
         print(f"{'=' * 80}")
         print(f"File: {filepath}")
-        print(f"Total parlays: {len(parlays)}")
-        print(f"Total legs exported: {total_legs}")
-        print(f"Columns: {len(df.columns)}")
+        print(f"Total parlays: {totals['parlays']}")
+        print(f"Total legs exported: {totals['legs']}")
+        print(f"Columns: {len(EXPORT_COLUMNS)}")
         print(f"\nNOTE: Next steps:")
         print(f"  1. Open the CSV file in Excel/Google Sheets")
         print(f"  2. Fill in the 'bet_result' column with W (win) or L (loss) for each leg")
@@ -217,6 +190,82 @@ class WeeklyParlayExporter:
 
         return str(filepath)
 
+    @staticmethod
+    def _write_csv(filepath: Path, rows: Iterable[Dict]) -> None:
+        """Write rows in CHUNK_SIZE batches"""
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= CHUNK_SIZE:
+                    writer.writerows(chunk)
+                    chunk.clear()
+            writer.writerows(chunk)
+
+    def _parlay_rows(self, parlay: Dict, parlay_idx: int, week: int, year: int) -> Iterator[Dict]:
+        """One CSV row per leg of a parlay"""
+        parlay_id = parlay.get('parlay_id', f'unknown_{parlay_idx}')
+        parlay_type = parlay.get('parlay_type', 'unknown')
+        was_bet = parlay.get('bet_on', False)
+        props = parlay.get('props', [])
+        correlations = parlay.get('correlations', [])
+
+        # Get correlation adjustment (if available)
+        correlation_adjustment = 0
+        if correlations:
+            # Try to extract correlation adjustment
+            for corr in correlations:
+                if isinstance(corr, dict):
+                    correlation_adjustment = corr.get('adjustment', 0)
+                    break
+
+        # Process each leg (prop) in the parlay
+        for leg_idx, prop in enumerate(props, 1):
+            # Extract base prop data
+            confidence = prop.get('confidence', 0)
+
+            # Determine home/away (default to UNKNOWN if not specified)
+            home_away = "UNKNOWN"
+            if 'is_home' in prop:
+                home_away = "HOME" if prop['is_home'] else "AWAY"
+
+            # Extract agent scores
+            # Handle both formats: old style (raw scores) and new style (with raw_score/weight)
+            agent_scores = prop.get('agent_scores', {})
+
+            yield {
+                'week': week,
+                'year': year,
+                'parlay_id': parlay_id,
+                'leg_number': leg_idx,
+                'parlay_type': parlay_type,
+                'was_bet_on': was_bet,
+                'player_name': prop.get('player', 'Unknown'),
+                'position': prop.get('position', 'Unknown'),
+                'team': prop.get('team', 'Unknown'),
+                'opponent': prop.get('opponent', 'Unknown'),
+                'home_away': home_away,
+                'prop_type': prop.get('stat_type', 'Unknown'),
+                'line': _as_float(prop.get('line', 0)),
+                'prediction': prop.get('direction', 'OVER'),
+                'leg_confidence': _as_float(confidence),
+                # Raw confidence (before correlation adjustment); custom parlays carry it on the parlay
+                'parlay_raw_confidence': _as_float(parlay.get('raw_confidence', confidence)),
+                'correlation_adjustment': correlation_adjustment,
+                'parlay_adjusted_confidence': _as_float(parlay.get('effective_confidence', confidence)),
+                'dvoa_score': self._extract_agent_score(agent_scores, 'DVOA'),
+                'matchup_score': self._extract_agent_score(agent_scores, 'Matchup'),
+                'volume_score': self._extract_agent_score(agent_scores, 'Volume'),
+                'injury_score': self._extract_agent_score(agent_scores, 'Injury'),
+                'trend_score': self._extract_agent_score(agent_scores, 'Trend'),
+                'gamescript_score': self._extract_agent_score(agent_scores, 'GameScript'),
+                'variance_score': self._extract_agent_score(agent_scores, 'Variance'),
+                'weather_score': self._extract_agent_score(agent_scores, 'Weather'),
+                'bet_result': ''  # Empty for user to fill in
+            }
+
     def _extract_agent_score(self, agent_scores: Dict, agent_name: str) -> float:
         """
         Extract agent score from agent_scores dict.
@@ -258,79 +307,69 @@ class WeeklyParlayExporter:
         Returns:
             List of parlay dictionaries in JSON tracker format
         """
-        import sqlite3
+        return list(self._iter_sqlite_parlays([week], year))
 
-        parlays = []
+    def _iter_sqlite_parlays(self, weeks: List[int], year: int = 2024) -> Iterator[Dict]:
+        """
+        Stream database parlays for the given weeks in JSON tracker format.
 
+        One parlays-legs join ordered by week, read CHUNK_SIZE rows at a time;
+        each parlay is yielded as soon as its legs have been read.
+        """
+        session = None
         try:
-            # Query parlays from SQLite
-            cursor = self.perf_tracker.conn.cursor()
-            query = """
-                SELECT parlay_id, confidence_score, parlay_type, agent_breakdown, created_date
-                FROM parlays
-                WHERE week = ?
-                ORDER BY created_timestamp
-            """
-            results = cursor.execute(query, (week,)).fetchall()
-
-            for parlay_id, confidence, parlay_type, agent_breakdown_json, created_date in results:
-                # Get legs for this parlay
-                legs_query = """
-                    SELECT player, team, prop_type, bet_type, line, agent_scores
-                    FROM legs
-                    WHERE parlay_id = ?
-                """
-                legs = cursor.execute(legs_query, (parlay_id,)).fetchall()
+            session = self.perf_tracker.get_session()
+            rows = (
+                session.query(
+                    Parlay.parlay_id, Parlay.week, Parlay.confidence_score, Parlay.parlay_type,
+                    Parlay.agent_breakdown, Parlay.created_date, Leg.leg_id, Leg.player, Leg.team,
+                    Leg.prop_type, Leg.bet_type, Leg.line, Leg.agent_scores,
+                )
+                .outerjoin(Leg, Leg.parlay_id == Parlay.parlay_id)
+                .filter(Parlay.week.in_(weeks))
+                .order_by(Parlay.week, Parlay.created_timestamp, Parlay.parlay_id)
+                .yield_per(CHUNK_SIZE)
+            )
+
+            for parlay_id, legs in groupby(rows, key=lambda r: r.parlay_id):
+                legs = list(legs)
+                first = legs[0]
+                confidence = _percent(first.confidence_score)
 
                 # Convert to JSON tracker format
-                props = []
-                for player, team, prop_type, bet_type, line, agent_scores_json in legs:
-                    try:
-                        agent_scores = json.loads(agent_scores_json) if agent_scores_json else {}
-                    except:
-                        agent_scores = {}
-
-                    props.append({
-                        'player': player,
-                        'team': team,
-                        'opponent': 'Unknown',  # Not stored in SQLite
-                        'position': 'Unknown',  # Not stored in SQLite
-                        'stat_type': prop_type,
-                        'line': line,
-                        'direction': bet_type,
-                        'confidence': confidence * 100 if confidence < 1 else confidence,  # Convert 0-1 to 0-100
-                        'is_home': None,
-                        'agent_scores': agent_scores
-                    })
-
-                # Parse agent breakdown
-                try:
-                    agent_breakdown = json.loads(agent_breakdown_json) if agent_breakdown_json else {}
-                except:
-                    agent_breakdown = {}
-
-                # Create parlay dict in JSON tracker format
-                parlay_dict = {
+                props = [{
+                    'player': leg.player,
+                    'team': leg.team,
+                    'opponent': 'Unknown',  # Not stored in SQLite
+                    'position': 'Unknown',  # Not stored in SQLite
+                    'stat_type': leg.prop_type,
+                    'line': leg.line,
+                    'direction': leg.bet_type,
+                    'confidence': confidence,
+                    'is_home': None,
+                    'agent_scores': _json_value(leg.agent_scores)
+                } for leg in legs if leg.leg_id is not None]
+
+                yield {
                     'parlay_id': parlay_id,
-                    'week': week,
+                    'week': first.week,
                     'year': year,
-                    'parlay_type': parlay_type or 'generated',
+                    'parlay_type': first.parlay_type or 'generated',
                     'props': props,
-                    'raw_confidence': confidence * 100 if confidence < 1 else confidence,
-                    'effective_confidence': confidence * 100 if confidence < 1 else confidence,
+                    'raw_confidence': confidence,
+                    'effective_confidence': confidence,
                     'correlations': [],
                     'bet_on': False,
-                    'agent_breakdown': agent_breakdown,
-                    'generated_timestamp': created_date
+                    'agent_breakdown': _json_value(first.agent_breakdown),
+                    'generated_timestamp': first.created_date
                 }
 
-                parlays.append(parlay_dict)
-
         except Exception as e:
             logger.error(f"Error loading parlays from SQLite: {e}")
             # Don't fail the whole export, just log and continue
-
-        return parlays
+        finally:
+            if session is not None:
+                session.close()
 
     def _merge_parlays(self, json_parlays: List[Dict], sqlite_parlays: List[Dict]) -> List[Dict]:
         """
@@ -343,25 +382,16 @@ class WeeklyParlayExporter:
         Returns:
             Combined list without duplicates
         """
-        # Use parlay_id as key to avoid duplicates
-        seen_ids = set()
-        merged = []
-
-        # Add JSON parlays first (these are authoritative)
-        for parlay in json_parlays:
-            parlay_id = parlay.get('parlay_id')
-            if parlay_id and parlay_id not in seen_ids:
-                seen_ids.add(parlay_id)
-                merged.append(parlay)
+        return list(self._iter_merged_parlays(json_parlays, sqlite_parlays))
 
-        # Add SQLite parlays that aren't already in JSON
-        for parlay in sqlite_parlays:
+    def _iter_merged_parlays(self, json_parlays: Iterable[Dict], sqlite_parlays: Iterable[Dict]) -> Iterator[Dict]:
+        """JSON parlays first (these are authoritative), then database parlays not already seen, by parlay_id"""
+        seen_ids = set()
+        for parlay in chain(json_parlays, sqlite_parlays):
             parlay_id = parlay.get('parlay_id')
             if parlay_id and parlay_id not in seen_ids:
                 seen_ids.add(parlay_id)
-                merged.append(parlay)
-
-        return merged
+                yield parlay
 
     def get_available_weeks(self, year: int = 2024) -> List[int]:
         """
@@ -404,9 +434,16 @@ class WeeklyParlayExporter:
         print(f"{'=' * 80}")
         print(f"Found parlays for weeks: {', '.join(map(str, available_weeks))}\n")
 
+        # One pass over the database: its parlays arrive grouped by week, in week order
+        sqlite_weeks = groupby(self._iter_sqlite_parlays(available_weeks, year), key=lambda p: p['week'])
+        current = next(sqlite_weeks, None)
+
         exported_files = []
         for week in available_weeks:
-            filepath = self.export_week(week, year, overwrite=overwrite)
+            sqlite_parlays = current[1] if current and current[0] == week else iter(())
+            filepath = self._export_week(week, year, sqlite_parlays, overwrite=overwrite)
+            if current and current[0] == week:
+                current = next(sqlite_weeks, None)
             if filepath:
                 exported_files.append(filepath)
             print()  # Add spacing between exports
@@ -0,0 +1,344 @@
+"""
+Instrumentation - opt-in timers, counters and cache hit rates for the pipeline
+
+Off by default; everything below is a cheap no-op until enable() is called
+(or NFL_PROFILE=1 is set). When on, the loader, analyzer and parlay builders
+record:
+
+- per-stage and per-agent timers (calls, total, max)
+- event counters (props analyzed, agent runs skipped, ...)
+- cache hits/misses, plus any lru_cache registered with register_cache
+- peak resident memory of the process
+
+report() returns a structured ProfileReport (text table, dict, or
+Prometheus exposition for the API's /metrics). Worker processes ship their
+numbers back with snapshot() and the parent folds them in with merge().
+
+Hot loops should read is_enabled() once per pass and time inline with
+time.perf_counter() rather than entering timer() per item.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# (rate name, counter, timer): counter events per second of the timer
+RATES = [
+    ('props_per_sec', 'props.analyzed', 'analyze'),
+    ('lines_per_sec', 'lines.loaded', 'load'),
+]
+
+_enabled = os.getenv('NFL_PROFILE', '').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+# name -> [calls, total seconds, max seconds]
+_timers: Dict[str, List[float]] = {}
+_counters: Dict[str, float] = {}
+# name -> [hits, misses]
+_caches: Dict[str, List[int]] = {}
+# name -> callable returning an object with hits/misses (e.g. lru_cache.cache_info),
+# and its (hits, misses) at the last reset
+_cache_sources: Dict[str, Callable] = {}
+_cache_baselines: Dict[str, Tuple[int, int]] = {}
+# Peak RSS reported by worker processes (bytes)
+_merged_peak_rss = 0
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Drop everything recorded so far (registered cache sources stay)"""
+    global _merged_peak_rss
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _caches.clear()
+        _merged_peak_rss = 0
+    for name, info in _cache_sources.items():
+        _cache_baselines[name] = _source_counts(info)
+
+
+def record_time(name: str, seconds: float):
+    with _lock:
+        stat = _timers.get(name)
+        if stat is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            stat[0] += 1
+            stat[1] += seconds
+            if seconds > stat[2]:
+                stat[2] = seconds
+
+
+@contextmanager
+def _timing(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_time(name, time.perf_counter() - start)
+
+
+def timer(name: str):
+    """Context manager timing a block under name (no-op when disabled)"""
+    return _timing(name) if _enabled else nullcontext()
+
+
+def timed(name: str):
+    """Decorator timing every call under name (checked per call, so enable() applies later)"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _timing(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, n: float = 1):
+    if _enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def cache_lookups(name: str, hits: int = 0, misses: int = 0):
+    if _enabled:
+        with _lock:
+            stat = _caches.setdefault(name, [0, 0])
+            stat[0] += hits
+            stat[1] += misses
+
+
+def cache_hit(name: str):
+    cache_lookups(name, hits=1)
+
+
+def cache_miss(name: str):
+    cache_lookups(name, misses=1)
+
+
+def register_cache(name: str, info: Callable):
+    """Report a cache whose hits/misses are kept elsewhere (info() -> .hits, .misses)"""
+    _cache_sources[name] = info
+    _cache_baselines[name] = _source_counts(info)
+
+
+def _source_counts(info: Callable) -> Tuple[int, int]:
+    try:
+        stats = info()
+        return stats.hits, stats.misses
+    except Exception:
+        return 0, 0
+
+
+class _Laps:
+    """Times consecutive sections of one function under '<prefix>.<section>'"""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.started = self.last = time.perf_counter()
+
+    def lap(self, section: str):
+        now = time.perf_counter()
+        record_time(f"{self.prefix}.{section}", now - self.last)
+        self.last = now
+
+    def done(self):
+        record_time(self.prefix, time.perf_counter() - self.started)
+
+
+class _NoLaps:
+    def lap(self, section: str):
+        pass
+
+    def done(self):
+        pass
+
+
+_NO_LAPS = _NoLaps()
+
+
+def laps(prefix: str):
+    """Section timer for long functions: call .lap(name) after each section, .done() at the end"""
+    return _Laps(prefix) if _enabled else _NO_LAPS
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident memory of this process (max with merged workers), if the platform reports it"""
+    if resource is None:
+        return _merged_peak_rss or None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    peak = peak if sys.platform == 'darwin' else peak * 1024
+    return max(peak, _merged_peak_rss)
+
+
+def _cache_counts() -> Dict[str, List[int]]:
+    """Recorded and merged counts, plus registered caches' lookups since the last reset"""
+    with _lock:
+        caches = {name: list(stat) for name, stat in _caches.items()}
+    for name, info in _cache_sources.items():
+        hits, misses = _source_counts(info)
+        base_hits, base_misses = _cache_baselines.get(name, (0, 0))
+        if hits - base_hits or misses - base_misses:
+            stat = caches.setdefault(name, [0, 0])
+            stat[0] += hits - base_hits
+            stat[1] += misses - base_misses
+    return caches
+
+
+def snapshot() -> Dict:
+    """Raw numbers recorded in this process (picklable, for merge() in a parent)"""
+    with _lock:
+        timers = {name: list(stat) for name, stat in _timers.items()}
+        counters = dict(_counters)
+    return {'timers': timers, 'counters': counters, 'caches': _cache_counts(), 'peak_rss': peak_rss_bytes()}
+
+
+def merge(other: Optional[Dict]):
+    """Fold a worker's snapshot() into this process's numbers"""
+    global _merged_peak_rss
+    if not other:
+        return
+    with _lock:
+        for name, (calls, total, longest) in other.get('timers', {}).items():
+            stat = _timers.setdefault(name, [0, 0.0, 0.0])
+            stat[0] += calls
+            stat[1] += total
+            stat[2] = max(stat[2], longest)
+        for name, n in other.get('counters', {}).items():
+            _counters[name] = _counters.get(name, 0) + n
+        for name, (hits, misses) in other.get('caches', {}).items():
+            stat = _caches.setdefault(name, [0, 0])
+            stat[0] += hits
+            stat[1] += misses
+        _merged_peak_rss = max(_merged_peak_rss, other.get('peak_rss') or 0)
+
+
+@dataclass
+class StageStat:
+    name: str
+    calls: int
+    total: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+@dataclass
+class CacheStat:
+    name: str
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+@dataclass
+class ProfileReport:
+    """Everything recorded so far, stages sorted by name"""
+    stages: List[StageStat] = field(default_factory=list)
+    counters: Dict[str, float] = field(default_factory=dict)
+    caches: List[CacheStat] = field(default_factory=list)
+    rates: Dict[str, float] = field(default_factory=dict)
+    peak_rss_bytes: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'stages': {s.name: {'calls': s.calls, 'total_s': round(s.total, 6), 'mean_s': round(s.mean, 6),
+                                'max_s': round(s.max, 6)} for s in self.stages},
+            'counters': dict(self.counters),
+            'caches': {c.name: {'hits': c.hits, 'misses': c.misses, 'hit_rate': c.hit_rate} for c in self.caches},
+            'rates': dict(self.rates),
+            'peak_rss_mb': round(self.peak_rss_bytes / 2**20, 1) if self.peak_rss_bytes else None,
+        }
+
+    def format(self) -> str:
+        """Text tables for terminals and logs"""
+        lines = [f"{'Stage':<36} {'Calls':>7} {'Total':>9} {'Mean':>9} {'Max':>9}"]
+        lines.append("-" * len(lines[0]))
+        for s in self.stages:
+            lines.append(f"{s.name:<36} {s.calls:>7} {s.total:8.3f}s {s.mean * 1000:7.2f}ms {s.max * 1000:7.2f}ms")
+        if self.counters:
+            lines.append("")
+            lines.extend(f"{name:<36} {value:>10g}" for name, value in sorted(self.counters.items()))
+        if self.caches:
+            lines.append("")
+            for c in self.caches:
+                rate = f"{c.hit_rate * 100:5.1f}%" if c.hit_rate is not None else f"{'-':>6}"
+                lines.append(f"{c.name:<36} {rate} hit ({c.hits} hits, {c.misses} misses)")
+        if self.rates:
+            lines.append("")
+            lines.extend(f"{name:<36} {value:10.1f}" for name, value in self.rates.items())
+        if self.peak_rss_bytes:
+            lines.append(f"{'Peak memory (RSS)':<36} {self.peak_rss_bytes / 2**20:8.1f} MB")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix: str = 'nfl') -> str:
+        """Prometheus text exposition format"""
+        def label(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"')
+
+        lines = [f"# TYPE {prefix}_stage_seconds_total counter"]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{label(s.name)}"}} {s.total:.6f}' for s in self.stages]
+        lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+        lines += [f'{prefix}_stage_calls_total{{stage="{label(s.name)}"}} {s.calls}' for s in self.stages]
+        lines.append(f"# TYPE {prefix}_stage_max_seconds gauge")
+        lines += [f'{prefix}_stage_max_seconds{{stage="{label(s.name)}"}} {s.max:.6f}' for s in self.stages]
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        lines += [f'{prefix}_events_total{{event="{label(name)}"}} {value:g}'
+                  for name, value in sorted(self.counters.items())]
+        lines.append(f"# TYPE {prefix}_cache_hits_total counter")
+        lines += [f'{prefix}_cache_hits_total{{cache="{label(c.name)}"}} {c.hits}' for c in self.caches]
+        lines.append(f"# TYPE {prefix}_cache_misses_total counter")
+        lines += [f'{prefix}_cache_misses_total{{cache="{label(c.name)}"}} {c.misses}' for c in self.caches]
+        if self.peak_rss_bytes:
+            lines.append(f"# TYPE {prefix}_peak_rss_bytes gauge")
+            lines.append(f"{prefix}_peak_rss_bytes {self.peak_rss_bytes}")
+        lines.append(f"# TYPE {prefix}_instrumentation_enabled gauge")
+        lines.append(f"{prefix}_instrumentation_enabled {int(_enabled)}")
+        return "\n".join(lines) + "\n"
+
+
+def report() -> ProfileReport:
+    numbers = snapshot()
+    timers, counters = numbers['timers'], numbers['counters']
+    rates = {}
+    for rate, counter, stage in RATES:
+        if counters.get(counter) and timers.get(stage) and timers[stage][1] > 0:
+            rates[rate] = counters[counter] / timers[stage][1]
+    return ProfileReport(
+        stages=[StageStat(name, int(calls), total, longest) for name, (calls, total, longest) in sorted(timers.items())],
+        counters=counters,
+        caches=[CacheStat(name, hits, misses) for name, (hits, misses) in sorted(numbers['caches'].items())],
+        rates=rates,
+        peak_rss_bytes=numbers['peak_rss'],
+    )
@@ -8,6 +8,8 @@ from datetime import datetime
 import numpy as np
 import logging # Keep logging import if other parts use it
 
+from scripts.analysis.player_identity import player_id as resolve_player_id
+
 if TYPE_CHECKING:
     from .agents.meta_agent import MetaAgentResult
 
@@ -31,10 +33,15 @@ class PlayerProp:
 
     direction: Literal['OVER', 'UNDER', 'AVOID'] = 'OVER'
     bet_type: Literal['OVER', 'UNDER'] = 'OVER'
+    player_id: Optional[int] = None  # Canonical ID from player_identity
     confidence: int = 0
     agent_scores: dict = field(default_factory=dict)
     rationale_points: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        if self.player_id is None and self.player_name:
+            self.player_id = resolve_player_id(self.player_name)
+
 
 @dataclass
 class PropAnalysis:
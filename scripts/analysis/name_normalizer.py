@@ -2,7 +2,7 @@
 Player Name Normalizer - Standardizes player names for matching
 """
 
-import re
+from scripts.analysis.player_identity import clean_display_name
 
 
 def normalize_player_name(name: str) -> str:
@@ -13,20 +13,10 @@ def normalize_player_name(name: str) -> str:
     - "A.J.  Brown" -> "AJ Brown"
     - "DeVonta  Smith" -> "DeVonta Smith"
     - "Ja'Marr  Chase" -> "Ja'Marr Chase"
+
+    Display-preserving form; use player_identity.player_id for lookups.
     """
-    if not name:
-        return name
-    
-    # Remove periods from initials (A.J. -> AJ)
-    name = name.replace('.', '')
-    
-    # Replace multiple spaces with single space
-    name = re.sub(r'\s+', ' ', name)
-    
-    # Strip leading/trailing whitespace
-    name = name.strip()
-    
-    return name
+    return clean_display_name(name)
 
 
 def create_player_lookup(players_dict: dict) -> dict:
@@ -2,13 +2,15 @@
 Prop Analyzer Orchestrator - Combines all agents with dynamic weight loading
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import logging
 import numpy as np
 import sys
 import json
+import time
 from pathlib import Path
 
+from . import instrumentation
 from .models import PlayerProp, PropAnalysis
 from .props_validator import PropsValidator
 from .agents import (
@@ -40,26 +42,59 @@ class PropAnalyzer:
         self.db_path = db_path
         self.use_dynamic_weights = use_dynamic_weights
         self.apply_calibration = apply_calibration
+        self.custom_weights = custom_weights
 
-        # Load calibration config
-        self.calibration_config = self._load_calibration_config()
-        if self.calibration_config and self.apply_calibration:
-            self.logger.info("📊 Calibration config loaded (stat filters + bias corrections)")
+        # Calibration config, weight store and agents are loaded on first use
+        # so constructing an analyzer (CLI startup, API import) stays cheap
+        self._calibration_config = None
+        self._weight_manager = None
+        self._agents = None
 
-        # Initialize weight manager and load weights
-        if custom_weights is not None:
+        # Initialize meta-agent (optional, enabled by default; its LLM client is lazy)
+        meta_config = MetaAgentConfig()
+        self.meta_agent = MetaAgent(meta_config) if meta_config.enabled else None
+
+    @property
+    def calibration_config(self) -> Dict:
+        if self._calibration_config is None:
+            self._calibration_config = self._load_calibration_config()
+            if self._calibration_config and self.apply_calibration:
+                self.logger.info("📊 Calibration config loaded (stat filters + bias corrections)")
+        return self._calibration_config
+
+    @calibration_config.setter
+    def calibration_config(self, value: Dict):
+        self._calibration_config = value
+
+    @property
+    def weight_manager(self):
+        """AgentWeightManager when weights come from the database, else None"""
+        if self._weight_manager is None and self.custom_weights is None and self.use_dynamic_weights:
+            self._weight_manager = AgentWeightManager(self.db_path)
+            # Ensure weights are initialized
+            self._weight_manager.initialize_default_weights(force=False)
+        return self._weight_manager
+
+    @property
+    def agents(self) -> Dict:
+        if self._agents is None:
+            self._agents = self._build_agents()
+        return self._agents
+
+    @agents.setter
+    def agents(self, value: Dict):
+        self._agents = value
+
+    def _build_agents(self) -> Dict:
+        """Create agents with custom, database or calibrated static weights"""
+        if self.custom_weights is not None:
             # Use provided weights directly (for optimization)
-            weights = custom_weights
-            self.weight_manager = None
+            weights = self.custom_weights
             self.logger.info("🔧 Using custom weights (optimization mode)...")
         elif self.use_dynamic_weights:
-            self.weight_manager = AgentWeightManager(db_path)
-            # Ensure weights are initialized
-            self.weight_manager.initialize_default_weights(force=False)
             weights = self.weight_manager.get_current_weights()
             self.logger.info("🔄 Loading agent weights from database...")
         else:
-            self.weight_manager = None
             # Fallback to calibrated weights from offseason analysis
             # Based on weeks 11-16 data: Matchup/Volume hurt predictions, Injury/DVOA/Variance help
             # REMOVED: Trend, Weather, HitRate (no predictive value)
@@ -75,7 +110,7 @@ class PropAnalyzer:
 
         # Initialize agents with dynamic weights
         # REMOVED: Trend (68% neutral), Weather (no data), HitRate (no predictive value)
-        self.agents = {
+        agents = {
             'DVOA': DVOAAgent(weight=weights.get('DVOA', 2.0)),
             'Matchup': MatchupAgent(weight=weights.get('Matchup', 1.5)),
             'Injury': InjuryAgent(weight=weights.get('Injury', 3.0)),
@@ -85,16 +120,11 @@ class PropAnalyzer:
         }
 
         # Log weights
-        for agent_name, agent in self.agents.items():
+        for agent_name, agent in agents.items():
             self.logger.info(f"  {agent_name:12s} weight: {agent.weight:.2f}")
 
-        # Initialize meta-agent (optional, enabled by default)
-        meta_config = MetaAgentConfig()
-        self.meta_agent = MetaAgent(meta_config) if meta_config.enabled else None
-        if self.meta_agent:
-            self.logger.info("🔮 Meta-agent initialized (reviews picks >= 65 confidence)")
-
-        self.logger.info("🧠 PropAnalyzer initialized with 6 agents")
+        self.logger.info(f"🧠 PropAnalyzer agents ready ({len(agents)} agents)")
+        return agents
 
     def _load_calibration_config(self) -> Dict:
         """Load calibration config from config/calibration_config.json"""
@@ -226,6 +256,16 @@ class PropAnalyzer:
     def analyze_prop(self, prop_data: Dict, context: Dict, use_meta_agent: bool = False) -> PropAnalysis:
         """Analyze a single prop bet - forcing OVER analysis then inverting for UNDER"""
         prop = self._create_prop_object(prop_data)
+        agent_pass = self._run_agent_pass(prop, context)
+        return self._build_analysis(prop, prop_data, agent_pass, context, use_meta_agent)
+
+    def _run_agent_pass(self, prop: PlayerProp, context: Dict) -> Dict:
+        """Run every agent once from the OVER perspective.
+
+        The result is side-independent: agent scores always mean "confidence
+        that OVER will hit", so one pass serves both the OVER and UNDER rows of
+        a market (see _build_analysis).
+        """
         bet_indicator = prop.bet_type[0]  # 'O' for OVER, 'U' for UNDER
         prop_log_id = f"{prop.player_name} ({prop.team}) {prop.stat_type} {bet_indicator}{prop.line}"
 
@@ -237,13 +277,22 @@ class PropAnalyzer:
         prop.bet_type = 'OVER'  # Force OVER for consistent agent analysis
 
         skipped_agents = []
+        # Per-agent lines are debug-only: this runs once per market
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        profiling = instrumentation.is_enabled()
         
         for agent_name, agent in self.agents.items():
             try:
-                analysis_result = agent.analyze(prop, context)
+                if profiling:
+                    started = time.perf_counter()
+                    analysis_result = agent.analyze(prop, context)
+                    instrumentation.record_time(f"agent.{agent_name}", time.perf_counter() - started)
+                else:
+                    analysis_result = agent.analyze(prop, context)
                 # PROJECT 1 FIX: Skip agents that return None instead of including them as 50
                 if analysis_result is None:
-                     self.logger.info(f"  ⏭️  {agent_name} returned None (missing data) - SKIPPING")
+                     if debug:
+                         self.logger.debug(f"  ⏭️  {agent_name} returned None (missing data) - SKIPPING")
                      skipped_agents.append(agent_name)
                      continue
                 else:
@@ -262,8 +311,8 @@ class PropAnalyzer:
                 continue
         
         # Log skipped agents
-        if skipped_agents:
-            self.logger.info(f"⏭️  Skipped agents: {', '.join(skipped_agents)}")
+        if skipped_agents and debug:
+            self.logger.debug(f"⏭️  Skipped agents for {prop_log_id}: {', '.join(skipped_agents)}")
 
         # DON'T invert agent scores - keep them in OVER perspective for consistent interpretation
         # This way, agent scores always mean "confidence that OVER will hit"
@@ -286,6 +335,26 @@ class PropAnalyzer:
             over_confidence, prop.stat_type
         )
 
+        return {
+            'agent_results': agent_results,
+            'rationale': all_rationale,
+            'over_confidence': over_confidence,
+            'skipped_agents': skipped_agents,
+        }
+
+    def _build_analysis(self, prop: PlayerProp, prop_data: Dict, agent_pass: Dict,
+                        context: Dict, use_meta_agent: bool = False) -> PropAnalysis:
+        """Turn a shared OVER-perspective agent pass into this prop's PropAnalysis"""
+        over_confidence = agent_pass['over_confidence']
+
+        # Each side gets its own copies so later edits (meta-agent rationale,
+        # validators) on one analysis never leak into its sibling
+        agent_results = {
+            name: {**res, 'rationale': list(res['rationale'])}
+            for name, res in agent_pass['agent_results'].items()
+        }
+        all_rationale = list(agent_pass['rationale'])
+
         # Invert confidence for UNDER bets
         if prop.bet_type == 'UNDER':
             final_confidence = 100 - over_confidence
@@ -320,17 +389,39 @@ class PropAnalyzer:
         analysis._source_prop_data = prop_data
 
         # Meta-agent review (optional)
-        if use_meta_agent and self.meta_agent and self.meta_agent.should_review(analysis):
-            meta_result = self.meta_agent.review(analysis, context)
+        if use_meta_agent:
+            self.apply_meta_review([analysis], context)
+
+        return analysis
+
+    def apply_meta_review(self, analyses: List[PropAnalysis], context: Dict) -> int:
+        """Batch meta-agent review of the analyses that qualify (in place).
+
+        Returns the number of analyses sent for review.
+        """
+        if not self.meta_agent:
+            return 0
+        to_review = [a for a in analyses if self.meta_agent.should_review(a)]
+        if not to_review:
+            return 0
+        for analysis, meta_result in zip(to_review, self.meta_agent.review_batch(to_review, context)):
             analysis.final_confidence = meta_result.adjusted_confidence
             analysis.meta_agent_result = meta_result
             if meta_result.meta_rationale:
                 analysis.rationale.insert(0, f"[META] {meta_result.meta_rationale}")
+        return len(to_review)
 
-        return analysis
+    @staticmethod
+    def _market_key(prop: PlayerProp) -> tuple:
+        """Everything the agents see except the side, so OVER/UNDER rows share a pass"""
+        return (
+            prop.player_id, prop.player_name, prop.team, prop.opponent, prop.position, prop.stat_type,
+            prop.line, prop.game_total, prop.spread, prop.is_home, prop.week,
+        )
 
     def analyze_all_props(self, context: Dict, min_confidence: int = 50,
-                          exclude_players: List[str] = None) -> List[PropAnalysis]:
+                          exclude_players: List[str] = None,
+                          use_meta_agent: bool = False) -> List[PropAnalysis]:
         """Analyze all props and filter based on whether we should take the bet
 
         With the fixed system:
@@ -342,6 +433,7 @@ class PropAnalyzer:
             context: Dict containing props and other context data
             min_confidence: Minimum confidence threshold for filtering
             exclude_players: List of player names to exclude (for Pick6/platform filtering)
+            use_meta_agent: Run the batched meta-agent review after scoring
         """
         props = context.get('props', [])
         if not props:
@@ -349,7 +441,7 @@ class PropAnalyzer:
 
         # Filter out excluded players if provided
         if exclude_players:
-            exclude_players_lower = [p.lower().strip() for p in exclude_players]
+            exclude_players_lower = {p.lower().strip() for p in exclude_players}
             original_count = len(props)
             props = [p for p in props if p.get('player_name', '').lower().strip() not in exclude_players_lower]
             filtered_count = original_count - len(props)
@@ -358,6 +450,60 @@ class PropAnalyzer:
 
         self.logger.info(f"📊 Analyzing {len(props)} props...")
         results = []
+        stages = instrumentation.laps('analyze')
+
+        rows, agent_passes, excluded_count = self.score_markets(props, context)
+        stages.lap('score_markets')
+        for prop_data, prop, market in rows:
+            try:
+                analysis = self._build_analysis(prop, prop_data, agent_passes[market], context)
+                if analysis and hasattr(analysis, 'final_confidence'):
+                    results.append(PropsValidator.validate_prop_analysis(analysis))
+
+            except Exception as e:
+                player = prop_data.get('player_name', '?')
+                stat = prop_data.get('stat_type', '?')
+                self.logger.error(f"❌ Failed: {player} {stat} - {e}", exc_info=False)
+
+        stages.lap('build_analyses')
+
+        # Meta-review runs once over the whole slate so calls go out concurrently
+        if use_meta_agent:
+            self.apply_meta_review(results, context)
+            stages.lap('meta_review')
+
+        # FIXED: Now confidence is already adjusted for bet type
+        # Both OVER and UNDER use the same threshold
+        results = [a for a in results if a.final_confidence >= min_confidence]
+        results = PropsValidator.validate_all_analyses(results)
+        results.sort(key=lambda x: x.final_confidence, reverse=True)
+        stages.lap('filter')
+        stages.done()
+        instrumentation.count('props.analyzed', len(rows))
+        instrumentation.count('props.selected', len(results))
+
+        skipped = sum(len(p['skipped_agents']) for p in agent_passes)
+        if skipped:
+            self.logger.info(f"⏭️  {skipped} agent runs skipped across {len(agent_passes)} markets (missing data)")
+        if excluded_count > 0:
+            self.logger.info(f"🚫 Excluded {excluded_count} props (calibration filter)")
+        self.logger.info(f"✅ Analyzed {len(results)} props")
+        return results
+
+
+    def score_markets(self, props: List[Dict], context: Dict) -> Tuple[List[Tuple], List[Dict], int]:
+        """Run the agents once per market for a slate of prop rows.
+
+        The OVER and UNDER rows (and duplicate rows from other books) of a
+        market share one agent pass.
+
+        Returns:
+            (rows, agent_passes, excluded_count): rows are (prop_data, prop, market index)
+            for every row that can be analyzed, agent_passes[market index] its shared pass
+        """
+        rows = []
+        agent_passes = []
+        markets = {}
 
         excluded_count = 0
         for prop_data in props:
@@ -371,29 +517,98 @@ class PropAnalyzer:
                     excluded_count += 1
                     continue
 
-                analysis = self.analyze_prop(prop_data, context)
-                if analysis and hasattr(analysis, 'final_confidence'):
-                    analysis = PropsValidator.validate_prop_analysis(analysis)
-
-                    # FIXED: Now confidence is already adjusted for bet type
-                    # Both OVER and UNDER use the same threshold
-                    should_include = analysis.final_confidence >= min_confidence
-
-                    if should_include:
-                        results.append(analysis)
+                prop = self._create_prop_object(prop_data)
+                market_key = self._market_key(prop)
+                market = markets.get(market_key)
+                if market is None:
+                    agent_passes.append(self._run_agent_pass(prop, context))
+                    market = markets[market_key] = len(agent_passes) - 1
+                rows.append((prop_data, prop, market))
 
             except Exception as e:
                 player = prop_data.get('player_name', '?')
                 stat = prop_data.get('stat_type', '?')
                 self.logger.error(f"❌ Failed: {player} {stat} - {e}", exc_info=False)
 
-        results = PropsValidator.validate_all_analyses(results)
-        results.sort(key=lambda x: x.final_confidence, reverse=True)
-        if excluded_count > 0:
-            self.logger.info(f"🚫 Excluded {excluded_count} props (calibration filter)")
-        self.logger.info(f"✅ Analyzed {len(results)} props")
-        return results
+        self.logger.info(f"🔁 {len(agent_passes)} unique markets scored")
+        # A row whose market was already scored reuses its agent pass
+        instrumentation.cache_lookups('agent_pass', hits=len(rows) - len(agent_passes), misses=len(agent_passes))
+        instrumentation.count('agents.skipped', sum(len(p['skipped_agents']) for p in agent_passes))
+        return rows, agent_passes, excluded_count
+
+    def over_confidence_matrix(self, agent_passes: List[Dict], stat_types: List[str],
+                               weights: Dict[str, np.ndarray]) -> np.ndarray:
+        """OVER confidence of every market under many weight configurations at once.
+
+        Vectorized _calculate_final_confidence + bias correction + stat type
+        adjustment: the same arithmetic in the same agent order, so a row of
+        the result equals what an analyzer built with that row's weights gives.
+
+        Args:
+            agent_passes: Agent passes from score_markets (one per market)
+            stat_types: Stat type of each market
+            weights: Agent name -> (configs,) weight array; agents not listed
+                     keep the weight recorded in the pass
+
+        Returns:
+            (configs x markets) int array
+        """
+        n_configs = len(next(iter(weights.values()))) if weights else 1
+        n_markets = len(agent_passes)
+        anti_predictive = self._get_anti_predictive_agents()
+
+        agent_names = list(self.agents)
+        for agent_pass in agent_passes:
+            agent_names.extend(n for n in agent_pass['agent_results'] if n not in agent_names)
+        scores = np.full((n_markets, len(agent_names)), np.nan)
+        pass_weights = np.zeros((n_markets, len(agent_names)))
+        for m, agent_pass in enumerate(agent_passes):
+            for agent_name, result in agent_pass['agent_results'].items():
+                a = agent_names.index(agent_name)
+                raw_score = result.get('raw_score', 50)
+                scores[m, a] = 100 - raw_score if agent_name in anti_predictive else raw_score
+                pass_weights[m, a] = result.get('weight', 0)
+
+        total_weighted_score = np.zeros((n_configs, n_markets))
+        total_weight = np.zeros((n_configs, n_markets))
+        for a, agent_name in enumerate(agent_names):
+            raw_score = scores[:, a]
+            weight = weights[agent_name][:, None] if agent_name in weights else pass_weights[None, :, a]
+            counted = ~np.isnan(raw_score) & (weight > 0)
+            # Neutral signals count at 20% weight (see _calculate_final_confidence)
+            effective_weight = np.where(np.abs(raw_score - 50) < 5, weight * 0.2, weight)
+            total_weighted_score += np.where(counted, raw_score * effective_weight, 0.0)
+            total_weight += np.where(counted, effective_weight, 0.0)
+
+        # No positive weights: plain average of the agents that ran
+        present = ~np.isnan(scores)
+        unweighted_total = np.zeros(n_markets)
+        for a in range(len(agent_names)):
+            unweighted_total += np.where(present[:, a], scores[:, a], 0.0)
+        unweighted = total_weight == 0
+        total_weighted_score = np.where(unweighted, unweighted_total, total_weighted_score)
+        total_weight = np.where(unweighted, present.sum(axis=1), total_weight)
+
+        agreement_adj = np.array([self._calculate_agreement_adjustment(p['agent_results'])
+                                  for p in agent_passes], dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            final_score = 50 + (total_weighted_score / total_weight - 50) * 1.0
+        final_score += agreement_adj
+        confidence = np.round(np.clip(final_score, 0, 100))
+        confidence = np.where(total_weight == 0, 50, confidence)
+
+        if self.calibration_config and self.apply_calibration:
+            bias = np.array([self.calibration_config.get('over_under_bias', {}).get(s, 0) for s in stat_types],
+                            dtype=float)
+            corrected = np.round(np.clip(confidence - bias / 3, 0, 100))
+            confidence = np.where(bias == 0, confidence, corrected)
+
+            bonuses = self.calibration_config.get('stat_type_bonus', {})
+            penalties = self.calibration_config.get('stat_type_penalty', {})
+            offset = np.array([bonuses.get(s, 0) - penalties.get(s, 0) for s in stat_types], dtype=float)
+            confidence = np.clip(confidence + offset, 0, 100)
 
+        return confidence.astype(int)
 
     def _create_prop_object(self, prop_data: Dict) -> PlayerProp:
         """Convert dict to PlayerProp object"""
@@ -410,7 +625,8 @@ class PropAnalyzer:
         bet_type = 'UNDER' if str(label).lower() == 'under' else 'OVER'
 
         return PlayerProp(
-            player_name=prop_data.get('player_name', ''), team=prop_data.get('team', ''),
+            player_name=prop_data.get('player_name', ''), player_id=prop_data.get('player_id'),
+            team=prop_data.get('team', ''),
             opponent=prop_data.get('opponent', ''), position=prop_data.get('position', ''),
             stat_type=prop_data.get('stat_type', ''), line=line,
             game_total=game_total, spread=spread,
@@ -6,6 +6,7 @@ WITH PLAYER DIVERSITY - Maintains recently_used_players throughout all parlays
 from typing import List, Dict, Set, Tuple, Optional
 from .models import PropAnalysis, Parlay
 from .props_validator import PropsValidator
+from . import instrumentation
 import logging
 import itertools
 from collections import defaultdict
@@ -20,6 +21,7 @@ def get_prop_analysis_id(analysis: PropAnalysis) -> Tuple:
 class ParlayBuilder:
     """Builds optimal parlay combinations with player diversity"""
 
+    @instrumentation.timed('parlays.build')
     def build_parlays(self, all_analyses: List[PropAnalysis],
                       min_confidence: int = 58) -> Dict[str, List[Parlay]]:
         """Main function to build up to 10 parlays with player diversity
@@ -4,6 +4,7 @@ from typing import List, Dict, Tuple, Set
 from .models import PropAnalysis, Parlay
 from .dependency_analyzer import DependencyAnalyzer
 from .prop_availability_validator import PropAvailabilityValidator
+from . import instrumentation
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,7 @@ class ParlayOptimizer:
         self.dep_analyzer = DependencyAnalyzer(api_key=api_key)
         self.validator = PropAvailabilityValidator(db_path=db_path)
 
+    @instrumentation.timed('parlays.optimize')
     def rebuild_parlays_low_correlation(
         self,
         all_analyses: List[PropAnalysis],
@@ -349,6 +351,7 @@ class ParlayOptimizer:
         print(f"  ❌ AVOID: {avoids}")
         print("="*70)
 
+    @instrumentation.timed('parlays.best')
     def get_best_parlays(
         self, 
         analyzed_parlays: Dict,
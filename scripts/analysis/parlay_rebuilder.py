@@ -8,6 +8,7 @@ from collections import defaultdict
 import logging
 from .models import Parlay, PropAnalysis
 from .prop_availability_validator import PropAvailabilityValidator
+from . import instrumentation
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class ParlayRebuilder:
     def __init__(self, db_path: str = "bets.db"):
         self.validator = PropAvailabilityValidator(db_path)
 
+    @instrumentation.timed('parlays.rebuild')
     def rebuild_parlays(self,
                        valid_props_pool: List[PropAnalysis],
                        additional_props: List[PropAnalysis],
@@ -43,6 +45,15 @@ class ParlayRebuilder:
         Returns:
             Dict of parlay_type -> List[Parlay]
         """
+        # One load of the rules and availability for the whole build
+        with self.validator.batch():
+            return self._rebuild_parlays(valid_props_pool, additional_props, target_counts, min_confidence)
+
+    def _rebuild_parlays(self,
+                         valid_props_pool: List[PropAnalysis],
+                         additional_props: List[PropAnalysis],
+                         target_counts: Dict[str, int],
+                         min_confidence: int) -> Dict[str, List[Parlay]]:
         if target_counts is None:
             target_counts = {
                 "2-leg": 3,
@@ -226,36 +237,20 @@ class ParlayRebuilder:
         """
         valid_props = []
 
-        for validation in rejected_parlays:
-            parlay = validation["parlay"]
-            reason = validation.get("reason", "")
+        with self.validator.batch():
+            for validation in rejected_parlays:
+                parlay = validation["parlay"]
+                reason = validation.get("reason", "")
 
-            # If reason indicates which props were invalid, extract the valid ones
-            # For now, we rely on the prop_availability table marked during interactive validation
-            for leg in parlay.legs:
-                # Check if this prop was marked as available
-                if self._is_prop_available(leg.prop):
-                    valid_props.append(leg)
+                # If reason indicates which props were invalid, extract the valid ones
+                # For now, we rely on the prop_availability table marked during interactive validation
+                for leg in parlay.legs:
+                    # Check if this prop was marked as available
+                    if self._is_prop_available(leg.prop):
+                        valid_props.append(leg)
 
         return valid_props
 
     def _is_prop_available(self, prop) -> bool:
-        """Check if a prop is marked as available in the database"""
-        import sqlite3
-
-        conn = sqlite3.connect(self.validator.db_path)
-        cursor = conn.cursor()
-
-        prop_signature = f"{prop.player_name}|{prop.stat_type}|{prop.bet_type}|{prop.line}"
-
-        cursor.execute("""
-            SELECT is_available FROM prop_availability
-            WHERE prop_signature = ?
-        """, (prop_signature,))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result is None:
-            return True  # Unknown = assume available
-        return result[0] == 1
+        """Check if a prop is marked as available (unknown = assume available)"""
+        return self.validator.is_prop_available(prop)
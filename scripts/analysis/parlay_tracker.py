@@ -3,8 +3,13 @@ Parlay Tracking System - Track parlay generation, betting, and results
 Enhanced with agent breakdown storage for calibration analysis
 """
 
+import os
 import json
+import atexit
 import hashlib
+import uuid
+import weakref
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Literal
@@ -18,12 +23,29 @@ class ParlayTracker:
     Tracks all generated parlays, betting decisions, and results.
     Enables system learning and performance analysis.
     Now captures agent breakdown for calibration.
+
+    Persistence: the JSON file is a snapshot; each change is appended as one
+    line to a journal next to it (<name>.journal.jsonl) and replayed on load.
+    The snapshot is rewritten when the journal reaches COMPACT_AFTER records,
+    on compact() and on close() (also run at exit). Every snapshot write gets
+    a new generation, which the journal's header line names; a journal whose
+    snapshot was deleted or replaced is discarded rather than replayed.
+    Lookups by id, week and version key are indexed.
     """
+
+    # Journal records kept before they are folded into the snapshot
+    COMPACT_AFTER = 200
     
     def __init__(self, tracking_file: str = "parlay_tracking.json"):
-        """Initialize the tracker with a JSON file for persistence"""
+        """Initialize the tracker with a JSON snapshot plus append-only journal"""
         self.tracking_file = Path(tracking_file)
+        self.journal_file = self.tracking_file.with_suffix('.journal.jsonl')
         self.data = self._load_data()
+        # Generation of the snapshot on disk (None until one is written)
+        self._generation = self.data["metadata"].get("journal_generation") if self.tracking_file.exists() else None
+        self._build_indexes()
+        self._journal_records = self._replay_journal()
+        atexit.register(_close_at_exit, weakref.ref(self))
     
     def _load_data(self) -> Dict:
         """Load existing tracking data or create new structure"""
@@ -50,14 +72,110 @@ class ParlayTracker:
             }
         }
     
-    def _save_data(self):
-        """Save tracking data to file"""
+    def _build_indexes(self):
+        """Index parlays by id, by week and by (hash, week, year, type) count"""
+        self._by_id: Dict[str, Dict] = {}
+        self._by_week: Dict[int, List[Dict]] = defaultdict(list)
+        self._version_counts: Counter = Counter()
+        for parlay in self.data["parlays"]:
+            self._index(parlay)
+
+    def _index(self, parlay: Dict):
+        # First parlay with an id wins, as the old linear scan did
+        self._by_id.setdefault(parlay["parlay_id"], parlay)
+        self._by_week[parlay["week"]].append(parlay)
+        self._version_counts[(parlay["content_hash"], parlay["week"], parlay["year"], parlay["parlay_type"])] += 1
+
+    def _replay_journal(self) -> int:
+        """Apply journal records written since the last snapshot; returns how many"""
+        if not self.journal_file.exists():
+            return 0
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            try:
+                generation = json.loads(f.readline()).get("generation")
+            except (json.JSONDecodeError, AttributeError):
+                generation = None
+            lines = f.readlines() if self._generation is not None and generation == self._generation else None
+        if lines is None:
+            # The snapshot this journal extended was deleted or replaced
+            logger.warning(f"Discarding {self.journal_file}: it does not match {self.tracking_file}")
+            self.journal_file.unlink(missing_ok=True)
+            return 0
+
+        applied = 0
+        for line_number, line in enumerate(lines, 2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A write cut short by a crash leaves a partial last line
+                logger.warning(f"Skipping unreadable journal line {line_number} in {self.journal_file}")
+                continue
+            self._apply(record)
+            applied += 1
+        return applied
+
+    def _apply(self, record: Dict):
+        if "add" in record:
+            parlay = record["add"]
+            # Already in the snapshot if a compaction was interrupted before the journal reset
+            if parlay["parlay_id"] not in self._by_id:
+                self.data["parlays"].append(parlay)
+                self._index(parlay)
+        elif "update" in record:
+            parlay = self._by_id.get(record["update"])
+            if parlay is not None:
+                parlay.update(record["fields"])
+        if "metadata" in record:
+            self.data["metadata"] = record["metadata"]
+
+    def _append(self, record: Dict):
+        """Persist one change as a journal line (compacting when the journal is long)"""
         self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+        record["metadata"] = self.data["metadata"]
         try:
-            with open(self.tracking_file, 'w', encoding='utf-8') as f:
+            if not self.journal_file.exists():
+                # A journal only extends a snapshot that is on disk
+                if self._generation is None and not self._save_data():
+                    return
+                with open(self.journal_file, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps({"generation": self._generation}) + "\n")
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._journal_records += 1
+        except Exception as e:
+            logger.error(f"Error saving tracking data: {e}")
+            return
+
+        if self._journal_records >= self.COMPACT_AFTER:
+            self.compact()
+
+    def _save_data(self) -> bool:
+        """Write the full snapshot (atomically, via a temp file) under a new generation"""
+        self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+        self.data["metadata"]["journal_generation"] = uuid.uuid4().hex
+        temp_file = self.tracking_file.with_suffix('.json.tmp')
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.tracking_file)
+            self._generation = self.data["metadata"]["journal_generation"]
+            return True
         except Exception as e:
             logger.error(f"Error saving tracking data: {e}")
+            return False
+
+    def compact(self):
+        """Fold the journal into the snapshot and start an empty journal"""
+        if self._save_data():
+            self.journal_file.unlink(missing_ok=True)
+            self._journal_records = 0
+
+    def close(self):
+        """Compact any journaled changes so the snapshot alone is current"""
+        if self._journal_records:
+            self.compact()
     
     def _generate_content_hash(self, props: List[Dict]) -> str:
         """
@@ -74,14 +192,7 @@ class ParlayTracker:
     
     def _get_next_version(self, content_hash: str, week: int, year: int, parlay_type: str) -> int:
         """Get next version number for this prop combination"""
-        existing = [
-            p for p in self.data["parlays"]
-            if p["content_hash"] == content_hash
-            and p["week"] == week
-            and p["year"] == year
-            and p["parlay_type"] == parlay_type
-        ]
-        return len(existing) + 1
+        return self._version_counts[(content_hash, week, year, parlay_type)] + 1
     
     def add_parlay(
         self,
@@ -156,6 +267,7 @@ class ParlayTracker:
         }
         
         self.data["parlays"].append(parlay)
+        self._index(parlay)
         self.data["metadata"]["total_parlays_generated"] += 1
         
         # Track weeks
@@ -163,46 +275,49 @@ class ParlayTracker:
             self.data["metadata"]["weeks_tracked"].append(week)
             self.data["metadata"]["weeks_tracked"].sort()
         
-        self._save_data()
+        self._append({"add": parlay})
         logger.info(f"Added parlay: {parlay_id}")
         return parlay_id
     
     def mark_bet(self, parlay_id: str, bet_amount: float) -> bool:
         """Mark a parlay as actually bet on"""
-        for parlay in self.data["parlays"]:
-            if parlay["parlay_id"] == parlay_id:
-                parlay["bet_on"] = True
-                parlay["actual_bet_amount"] = round(bet_amount, 2)
-                parlay["bet_timestamp"] = datetime.now().isoformat()
-                
-                if parlay["result"] is None:
-                    parlay["result"] = "pending"
-                
-                self.data["metadata"]["total_parlays_bet"] += 1
-                self._save_data()
-                logger.info(f"Marked {parlay_id} as bet: ${bet_amount}")
-                return True
-        
-        logger.warning(f"Parlay not found: {parlay_id}")
-        return False
+        parlay = self._by_id.get(parlay_id)
+        if parlay is None:
+            logger.warning(f"Parlay not found: {parlay_id}")
+            return False
+
+        parlay["bet_on"] = True
+        parlay["actual_bet_amount"] = round(bet_amount, 2)
+        parlay["bet_timestamp"] = datetime.now().isoformat()
+        
+        if parlay["result"] is None:
+            parlay["result"] = "pending"
+        
+        self.data["metadata"]["total_parlays_bet"] += 1
+        self._append_update(parlay, "bet_on", "actual_bet_amount", "bet_timestamp", "result")
+        logger.info(f"Marked {parlay_id} as bet: ${bet_amount}")
+        return True
+
+    def _append_update(self, parlay: Dict, *fields: str):
+        self._append({"update": parlay["parlay_id"], "fields": {f: parlay[f] for f in fields}})
     
     def unmark_bet(self, parlay_id: str) -> bool:
         """Remove bet marking from a parlay"""
-        for parlay in self.data["parlays"]:
-            if parlay["parlay_id"] == parlay_id:
-                if parlay["bet_on"]:
-                    self.data["metadata"]["total_parlays_bet"] -= 1
-                
-                parlay["bet_on"] = False
-                parlay["actual_bet_amount"] = None
-                parlay["bet_timestamp"] = None
-                
-                self._save_data()
-                logger.info(f"Unmarked {parlay_id} as bet")
-                return True
-        
-        logger.warning(f"Parlay not found: {parlay_id}")
-        return False
+        parlay = self._by_id.get(parlay_id)
+        if parlay is None:
+            logger.warning(f"Parlay not found: {parlay_id}")
+            return False
+
+        if parlay["bet_on"]:
+            self.data["metadata"]["total_parlays_bet"] -= 1
+        
+        parlay["bet_on"] = False
+        parlay["actual_bet_amount"] = None
+        parlay["bet_timestamp"] = None
+        
+        self._append_update(parlay, "bet_on", "actual_bet_amount", "bet_timestamp")
+        logger.info(f"Unmarked {parlay_id} as bet")
+        return True
     
     def mark_result(
         self,
@@ -223,61 +338,48 @@ class ParlayTracker:
         Returns:
             True if successful, False if parlay not found
         """
-        for parlay in self.data["parlays"]:
-            if parlay["parlay_id"] == parlay_id:
-                old_result = parlay["result"]
-                parlay["result"] = result
-                parlay["result_entered_timestamp"] = datetime.now().isoformat()
-                
-                if prop_results:
-                    parlay["prop_results"] = prop_results
-                
-                if actual_payout is not None:
-                    parlay["actual_payout"] = round(actual_payout, 2)
-                elif result == "won" and parlay["bet_on"] and parlay["actual_bet_amount"]:
-                    # Calculate payout if not provided
-                    bet_amount = parlay["actual_bet_amount"]
-                    odds = parlay["payout_odds"]
-                    parlay["actual_payout"] = round(bet_amount * (odds / 100 + 1), 2)
-                elif result == "lost":
-                    parlay["actual_payout"] = 0
-                
-                # Update metadata count
-                if old_result not in ["won", "lost"] and result in ["won", "lost"]:
-                    self.data["metadata"]["total_results_entered"] += 1
-                
-                self._save_data()
-                logger.info(f"Marked {parlay_id} as {result}")
-                return True
-        
-        logger.warning(f"Parlay not found: {parlay_id}")
-        return False
+        parlay = self._by_id.get(parlay_id)
+        if parlay is None:
+            logger.warning(f"Parlay not found: {parlay_id}")
+            return False
+
+        old_result = parlay["result"]
+        parlay["result"] = result
+        parlay["result_entered_timestamp"] = datetime.now().isoformat()
+        
+        if prop_results:
+            parlay["prop_results"] = prop_results
+        
+        if actual_payout is not None:
+            parlay["actual_payout"] = round(actual_payout, 2)
+        elif result == "won" and parlay["bet_on"] and parlay["actual_bet_amount"]:
+            # Calculate payout if not provided
+            bet_amount = parlay["actual_bet_amount"]
+            odds = parlay["payout_odds"]
+            parlay["actual_payout"] = round(bet_amount * (odds / 100 + 1), 2)
+        elif result == "lost":
+            parlay["actual_payout"] = 0
+        
+        # Update metadata count
+        if old_result not in ["won", "lost"] and result in ["won", "lost"]:
+            self.data["metadata"]["total_results_entered"] += 1
+        
+        self._append_update(parlay, "result", "result_entered_timestamp", "prop_results", "actual_payout")
+        logger.info(f"Marked {parlay_id} as {result}")
+        return True
     
     def get_parlays_by_week(self, week: int, year: int = 2024) -> List[Dict]:
         """Get all parlays for a specific week"""
-        return [
-            p for p in self.data["parlays"]
-            if p["week"] == week and p["year"] == year
-        ]
+        return [p for p in self._by_week.get(week, []) if p["year"] == year]
     
     def get_pending_parlays(self, week: Optional[int] = None) -> List[Dict]:
         """Get all parlays that need results entered"""
-        pending = [
-            p for p in self.data["parlays"]
-            if p["result"] is None or p["result"] == "pending"
-        ]
-        
-        if week is not None:
-            pending = [p for p in pending if p["week"] == week]
-        
-        return pending
+        parlays = self.data["parlays"] if week is None else self._by_week.get(week, [])
+        return [p for p in parlays if p["result"] is None or p["result"] == "pending"]
     
     def get_parlay_by_id(self, parlay_id: str) -> Optional[Dict]:
         """Get a specific parlay by ID"""
-        for parlay in self.data["parlays"]:
-            if parlay["parlay_id"] == parlay_id:
-                return parlay
-        return None
+        return self._by_id.get(parlay_id)
     
     def get_completed_parlays(self, week: Optional[int] = None, year: int = 2024) -> List[Dict]:
         """
@@ -290,15 +392,8 @@ class ParlayTracker:
         Returns:
             List of completed parlay dicts with agent_breakdown data
         """
-        completed = [
-            p for p in self.data["parlays"]
-            if p["result"] in ["won", "lost"] and p["year"] == year
-        ]
-        
-        if week is not None:
-            completed = [p for p in completed if p["week"] == week]
-        
-        return completed
+        parlays = self.data["parlays"] if week is None else self._by_week.get(week, [])
+        return [p for p in parlays if p["result"] in ["won", "lost"] and p["year"] == year]
     
     def get_statistics(
         self,
@@ -439,3 +534,9 @@ class ParlayTracker:
                 })
         
         logger.info(f"Exported {len(self.data['parlays'])} parlays to {output_file}")
+
+
+def _close_at_exit(tracker_ref):
+    tracker = tracker_ref()
+    if tracker is not None:
+        tracker.close()
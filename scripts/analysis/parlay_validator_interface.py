@@ -49,29 +49,30 @@ class ParlayValidatorInterface:
 
         # Check each parlay against rules first
         print("📋 Pre-filtering with validation rules...\n")
-        for parlay_type, parlay_list in parlays.items():
-            for i, parlay in enumerate(parlay_list, 1):
-                is_valid, violations = self.validator.validate_parlay_props(parlay.legs)
-
-                if not is_valid:
-                    print(f"❌ {parlay_type.upper()} Parlay #{i} - RULE VIOLATIONS:")
-                    for violation in violations:
-                        print(f"   {violation}")
-
-                    parlay_validations.append({
-                        "parlay": parlay,
-                        "parlay_type": parlay_type,
-                        "is_valid": False,
-                        "reason": "Rule violations: " + "; ".join(violations)
-                    })
-                else:
-                    print(f"✅ {parlay_type.upper()} Parlay #{i} - Passed rule checks")
-                    parlay_validations.append({
-                        "parlay": parlay,
-                        "parlay_type": parlay_type,
-                        "is_valid": True,
-                        "reason": None
-                    })
+        with self.validator.batch():
+            for parlay_type, parlay_list in parlays.items():
+                for i, parlay in enumerate(parlay_list, 1):
+                    is_valid, violations = self.validator.validate_parlay_props(parlay.legs)
+
+                    if not is_valid:
+                        print(f"❌ {parlay_type.upper()} Parlay #{i} - RULE VIOLATIONS:")
+                        for violation in violations:
+                            print(f"   {violation}")
+
+                        parlay_validations.append({
+                            "parlay": parlay,
+                            "parlay_type": parlay_type,
+                            "is_valid": False,
+                            "reason": "Rule violations: " + "; ".join(violations)
+                        })
+                    else:
+                        print(f"✅ {parlay_type.upper()} Parlay #{i} - Passed rule checks")
+                        parlay_validations.append({
+                            "parlay": parlay,
+                            "parlay_type": parlay_type,
+                            "is_valid": True,
+                            "reason": None
+                        })
 
         # Now interactive review
         print("\n" + "="*80)
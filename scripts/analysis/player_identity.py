@@ -0,0 +1,183 @@
+"""
+Player Identity - one canonical ID per player across loader, agents and graders
+
+Every source spells names a little differently ("A.J. Brown", "AJ  Brown",
+"Marvin Harrison Jr.", "Hollywood Brown"). Names are resolved once, at
+ingest, to a compact integer ID; context tables are keyed on that ID so the
+analysis hot path never re-normalizes strings.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from scripts.analysis.instrumentation import register_cache
+
+# Generational suffixes dropped from the canonical key
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Nicknames / alternate spellings seen in sportsbook and stats feeds.
+# Keys and values are canonical keys (see canonical_key).
+PLAYER_ALIASES = {
+    'hollywood brown': 'marquise brown',
+    'gabe davis': 'gabriel davis',
+    'chig okonkwo': 'chigoziem okonkwo',
+    'josh palmer': 'joshua palmer',
+    'tank dell': 'nathaniel dell',
+    'scotty miller': 'scott miller',
+    'mitch trubisky': 'mitchell trubisky',
+    'ken walker': 'kenneth walker',
+    'bam knight': 'zonovan knight',
+}
+
+_RESOLVER_CACHE_SIZE = 16384
+
+
+def normalize_name(name) -> str:
+    """Lowercase, drop periods, collapse whitespace ("A.J.  Brown" -> "aj brown").
+
+    This is the historical lookup normalization shared by the loader and
+    graders; canonical_key builds on it.
+    """
+    if not name:
+        return name
+    return _normalize(str(name))
+
+
+@lru_cache(maxsize=_RESOLVER_CACHE_SIZE)
+def _normalize(name: str) -> str:
+    name = name.strip().replace('.', '')
+    name = re.sub(r'\s+', ' ', name)
+    return name.lower()
+
+
+def clean_display_name(name: str) -> str:
+    """Display-safe cleanup that keeps capitalization ("A.J.  Brown" -> "AJ Brown")"""
+    if not name:
+        return name
+    name = name.replace('.', '')
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip()
+
+
+@lru_cache(maxsize=_RESOLVER_CACHE_SIZE)
+def canonical_key(name: str) -> str:
+    """Identity key: normalized, punctuation-free, suffix-free, alias-resolved"""
+    key = _normalize(str(name))
+    key = re.sub(r"['’`,]", '', key).replace('-', ' ')
+    tokens = key.split()
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    key = ' '.join(tokens)
+    return PLAYER_ALIASES.get(key, key)
+
+
+class PlayerRegistry:
+    """Interns canonical player keys to dense integer IDs (process-wide)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def resolve(self, name) -> Optional[int]:
+        """ID for any raw name variant, registering the player on first sight"""
+        if name is None or isinstance(name, float) or not str(name).strip():
+            return None
+        return self._resolve_key(canonical_key(str(name)), str(name))
+
+    def lookup(self, name) -> Optional[int]:
+        """ID for a raw name if the player is known, without registering it"""
+        if name is None or isinstance(name, float) or not str(name).strip():
+            return None
+        return self._ids.get(canonical_key(str(name)))
+
+    def _resolve_key(self, key: str, display: str) -> int:
+        player_id = self._ids.get(key)
+        if player_id is not None:
+            return player_id
+        with self._lock:
+            player_id = self._ids.get(key)
+            if player_id is None:
+                player_id = len(self._names)
+                self._names.append(clean_display_name(display))
+                self._ids[key] = player_id
+        return player_id
+
+    def name(self, player_id: int) -> Optional[str]:
+        """Display name first seen for this ID"""
+        if player_id is None or not 0 <= player_id < len(self._names):
+            return None
+        return self._names[player_id]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+player_registry = PlayerRegistry()
+
+register_cache('player_names', canonical_key.cache_info)
+
+
+def player_id(name) -> Optional[int]:
+    """Resolve a raw name to its canonical player ID"""
+    if isinstance(name, int):
+        return name
+    return player_registry.resolve(name)
+
+
+PlayerKey = Union[int, str]
+
+
+class PlayerTable(dict):
+    """Dict keyed by player ID that also accepts any raw name variant.
+
+    Loaders write with names or IDs; agents read with prop.player_id. Names
+    are resolved through the registry, so "A.J. Brown" and "aj brown" land on
+    the same row.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _key(key: PlayerKey) -> Optional[int]:
+        return player_id(key)
+
+    @staticmethod
+    def _read_key(key: PlayerKey) -> Optional[int]:
+        # Reads never register new players
+        if isinstance(key, int):
+            return key
+        return player_registry.lookup(key)
+
+    def __setitem__(self, key: PlayerKey, value):
+        super().__setitem__(self._key(key), value)
+
+    def __getitem__(self, key: PlayerKey):
+        return super().__getitem__(self._read_key(key))
+
+    def __contains__(self, key) -> bool:
+        return super().__contains__(self._read_key(key))
+
+    def get(self, key: PlayerKey, default=None):
+        return super().get(self._read_key(key), default)
+
+    def setdefault(self, key: PlayerKey, default=None):
+        return super().setdefault(self._key(key), default)
+
+    def pop(self, key: PlayerKey, *args):
+        return super().pop(self._read_key(key), *args)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def copy(self) -> 'PlayerTable':
+        return PlayerTable(self)
+
+    def names(self) -> Dict[str, object]:
+        """Same table keyed by display name (debugging / printing)"""
+        return {player_registry.name(pid): value for pid, value in self.items()}
@@ -4,6 +4,8 @@ Handles filtering props that aren't available on DraftKings Pick6
 """
 
 from typing import List, Dict, Set, Tuple, Optional
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
 import json
 import logging
@@ -25,6 +27,16 @@ class ValidationRule:
     auto_applied: bool = True  # If False, only suggests rejection
 
 
+@dataclass
+class CompiledRule:
+    """A same-player rule reduced to what checking a parlay needs"""
+    rule_id: str
+    description: str
+    prop_types: Tuple[str, ...]  # Normalized, in rule order
+    bet_types: List[str]
+    mask: int  # One bit per normalized prop type the player must have
+
+
 class PropAvailabilityValidator:
     """
     Validates prop availability using both rules and learned patterns
@@ -34,6 +46,12 @@ class PropAvailabilityValidator:
     2. Learning from manual validations
     3. Interactive validation workflow
     4. Minimum threshold filtering (e.g., receptions must be > 2.5)
+
+    Outside batch(), every call reads the current rules and unavailable prop
+    signatures from the database, so writes from other validators and
+    processes are seen. Inside batch(), one compiled snapshot taken on entry
+    serves any number of parlays without database calls; rule trigger counts
+    are buffered and written once when the batch ends.
     """
 
     # Minimum thresholds for prop types (DraftKings typically doesn't offer props below these values)
@@ -54,6 +72,14 @@ class PropAvailabilityValidator:
         else:
             self.min_thresholds = self.MINIMUM_THRESHOLDS.copy()
             
+        # Batch snapshot of compiled rules / unavailable signatures; None outside batch()
+        self._rules: Optional[List[CompiledRule]] = None
+        self._unavailable: Optional[Set[str]] = None
+        self._type_bits: Dict[str, int] = {}
+        self._normalized: Dict[str, str] = {}
+        self._pending_triggers: Counter = Counter()
+        self._batch_depth = 0
+
         init_db()  # Ensure tables exist
         self._load_default_rules()
 
@@ -131,83 +157,164 @@ class PropAvailabilityValidator:
         finally:
             session.close()
 
-    def validate_parlay_props(self, props: List[PropAnalysis]) -> Tuple[bool, List[str]]:
+    def refresh(self):
+        """Take the batch snapshot: rules and unavailable prop signatures from the database"""
+        self._rules, self._unavailable = self._load()
+
+    def _load(self, rules: bool = True, unavailable: bool = True
+              ) -> Tuple[Optional[List[CompiledRule]], Optional[Set[str]]]:
+        """Compiled rules and/or unavailable signatures in one session (None if not asked for or on error)"""
+        session = self.get_session()
+        try:
+            rule_rows = session.query(PropValidationRule).all() if rules else None
+            unavailable_rows = (session.query(PropAvailability.id).filter(PropAvailability.is_available == False).all()
+                                if unavailable else None)
+        except Exception as e:
+            logger.error(f"Error loading validation rules: {e}")
+            return None, None
+        finally:
+            session.close()
+
+        compiled = (None if rule_rows is None else
+                    [rule for rule in map(self._compile_rule, rule_rows) if rule is not None])
+        signatures = None if unavailable_rows is None else {row[0] for row in unavailable_rows}
+        return compiled, signatures
+
+    def _compile_rule(self, rule: PropValidationRule) -> Optional[CompiledRule]:
+        if not rule.auto_applied or rule.rule_type != "same_player_props":
+            return None
+        # rule.conditions is already a dict if using JSON type
+        conditions = rule.conditions if isinstance(rule.conditions, dict) else (json.loads(rule.conditions) if rule.conditions else {})
+        if conditions.get("player") != "same":
+            return None
+
+        prop_types = tuple(self._normalize_prop_type(t) for t in conditions.get("prop_types", []))
+        mask = 0
+        for prop_type in prop_types:
+            mask |= self._type_bit(prop_type)
+        return CompiledRule(rule.rule_id, rule.description, prop_types, conditions.get("bet_types", []), mask)
+
+    def _type_bit(self, normalized_type: str) -> int:
+        bit = self._type_bits.get(normalized_type)
+        if bit is None:
+            bit = self._type_bits[normalized_type] = 1 << len(self._type_bits)
+        return bit
+
+    def _get_rules(self) -> List[CompiledRule]:
+        """The batch snapshot inside batch(), the current rules otherwise"""
+        if self._batch_depth == 0:
+            return self._load(unavailable=False)[0] or []
+        if self._rules is None:
+            self._rules = self._load(unavailable=False)[0]
+        return self._rules or []
+
+    def _get_unavailable(self) -> Set[str]:
+        """The batch snapshot inside batch(), the current signatures otherwise"""
+        if self._batch_depth == 0:
+            return self._load(rules=False)[1] or set()
+        if self._unavailable is None:
+            self._unavailable = self._load(rules=False)[1]
+        return self._unavailable or set()
+
+    @contextmanager
+    def batch(self):
         """
-        Validate if all props in a parlay are available
+        Validate many parlays against one snapshot of the rules and availability.
+
+        Trigger counts from validate_parlay_props are written in one transaction on exit.
         """
-        violations = []
+        if self._batch_depth == 0:
+            self.refresh()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._rules = self._unavailable = None
+                self.flush_trigger_counts()
+
+    def flush_trigger_counts(self):
+        """Add buffered rule trigger counts to times_triggered"""
+        if not self._pending_triggers:
+            return
+        pending, self._pending_triggers = self._pending_triggers, Counter()
+
         session = self.get_session()
-        
         try:
-            # Check against rules
-            rules = session.query(PropValidationRule).all()
-            
-            for rule in rules:
-                if not rule.auto_applied:
-                    continue
-
-                if rule.rule_type == "same_player_props":
-                    # rule.conditions is already a dict if using JSON type
-                    conditions = rule.conditions if isinstance(rule.conditions, dict) else (json.loads(rule.conditions) if rule.conditions else {})
-                    
-                    violation = self._check_same_player_rule(props, conditions, rule.description)
-                    if violation:
-                        violations.append(violation)
-                        
-                        # Update times_triggered
-                        rule.times_triggered += 1
-                        session.add(rule)
-            
+            for rule_id, count in pending.items():
+                session.query(PropValidationRule).filter_by(rule_id=rule_id).update(
+                    {PropValidationRule.times_triggered: func.coalesce(PropValidationRule.times_triggered, 0) + count},
+                    synchronize_session=False
+                )
             session.commit()
-            return (len(violations) == 0, violations)
-            
         except Exception as e:
-            logger.error(f"Error validating parlay: {e}")
-            return (True, []) # Default to valid on error to not block
+            session.rollback()
+            logger.error(f"Error saving rule trigger counts: {e}")
         finally:
             session.close()
 
-    def _check_same_player_rule(self, props: List[PropAnalysis], conditions: Dict, description: str) -> Optional[str]:
-        """Check if props violate a same-player rule"""
-        if conditions.get("player") != "same":
-            return None
+    def validate_parlay_props(self, props: List[PropAnalysis]) -> Tuple[bool, List[str]]:
+        """
+        Validate if all props in a parlay are available
+        """
+        rules = self._get_rules()
+        if not rules:
+            return (True, [])
 
-        # Group props by player
+        # Players with 2+ props: (bitset of their normalized prop types, their props)
         player_props: Dict[str, List[PropAnalysis]] = {}
         for prop_analysis in props:
-            player = prop_analysis.prop.player_name
-            if player not in player_props:
-                player_props[player] = []
-            player_props[player].append(prop_analysis)
-
-        # Check each player's props
+            player_props.setdefault(prop_analysis.prop.player_name, []).append(prop_analysis)
+        players = {}
         for player, player_prop_list in player_props.items():
             if len(player_prop_list) < 2:
                 continue
+            bits = 0
+            for prop_analysis in player_prop_list:
+                bits |= self._type_bit(self._normalize_prop_type(prop_analysis.prop.stat_type))
+            players[player] = (bits, player_prop_list)
 
-            # Get prop types and bet types
-            prop_types = conditions.get("prop_types", [])
-            bet_types = conditions.get("bet_types", [])
+        violations = []
+        for rule in rules:
+            violation = self._check_same_player_rule(players, rule)
+            if violation:
+                violations.append(violation)
+                self._pending_triggers[rule.rule_id] += 1
+
+        if self._batch_depth == 0:
+            self.flush_trigger_counts()
+        return (len(violations) == 0, violations)
+
+    def _check_same_player_rule(self, players: Dict[str, Tuple[int, List[PropAnalysis]]],
+                                rule: CompiledRule) -> Optional[str]:
+        """Check if props violate a same-player rule"""
+        for player, (bits, player_prop_list) in players.items():
+            # Player lacks one of the rule's prop types
+            if bits & rule.mask != rule.mask:
+                continue
 
-            # Check if this player has the forbidden combination
+            # First prop of each of the rule's types, then check bet types match
             found_props = []
-            for target_prop_type in prop_types:
+            for target_prop_type in rule.prop_types:
                 for prop_analysis in player_prop_list:
-                    if self._normalize_prop_type(prop_analysis.prop.stat_type) == self._normalize_prop_type(target_prop_type):
+                    if self._normalize_prop_type(prop_analysis.prop.stat_type) == target_prop_type:
                         found_props.append(prop_analysis)
                         break
 
-            if len(found_props) == len(prop_types):
-                # Check bet types match
-                actual_bet_types = [p.prop.bet_type for p in found_props]
-                if self._bet_types_match(actual_bet_types, bet_types):
-                    prop_desc = " + ".join([f"{p.prop.stat_type} {p.prop.bet_type}" for p in found_props])
-                    return f"❌ {player}: {prop_desc} ({description})"
+            actual_bet_types = [p.prop.bet_type for p in found_props]
+            if self._bet_types_match(actual_bet_types, rule.bet_types):
+                prop_desc = " + ".join([f"{p.prop.stat_type} {p.prop.bet_type}" for p in found_props])
+                return f"❌ {player}: {prop_desc} ({rule.description})"
 
         return None
 
     def _normalize_prop_type(self, prop_type: str) -> str:
         """Normalize prop type for comparison"""
+        cached = self._normalized.get(prop_type)
+        if cached is not None:
+            return cached
+
         # Handle variations like "Pass Yds", "Passing Yards", "PassingYards"
         normalized = prop_type.lower().replace(" ", "").replace("_", "")
 
@@ -224,7 +331,8 @@ class PropAvailabilityValidator:
             "rushattempts": "rushingattempts",
         }
 
-        return mappings.get(normalized, normalized)
+        normalized = self._normalized[prop_type] = mappings.get(normalized, normalized)
+        return normalized
 
     def _bet_types_match(self, actual: List[str], expected: List[str]) -> bool:
         """Check if bet types match (allowing for order independence)"""
@@ -261,6 +369,11 @@ class PropAvailabilityValidator:
                 session.add(new_prop)
             
             session.commit()
+            if self._unavailable is not None:
+                if is_available:
+                    self._unavailable.discard(prop_signature)
+                else:
+                    self._unavailable.add(prop_signature)
         except Exception as e:
             session.rollback()
             logger.error(f"Error marking prop availability: {e}")
@@ -284,6 +397,7 @@ class PropAvailabilityValidator:
             )
             session.add(new_rule)
             session.commit()
+            self._rules = None  # Recompile on next use
             logger.info(f"✅ Added custom rule: {description}")
         except Exception as e:
             session.rollback()
@@ -295,29 +409,17 @@ class PropAvailabilityValidator:
         """Generate unique signature for a prop"""
         return f"{prop.player_name}|{prop.stat_type}|{prop.bet_type}|{prop.line}"
 
+    def is_prop_available(self, prop: PlayerProp) -> bool:
+        """False only if the prop has been marked unavailable"""
+        return self._get_prop_signature(prop) not in self._get_unavailable()
+
     def filter_available_props(self, props: List[PropAnalysis]) -> List[PropAnalysis]:
         """
         Filter props based on known availability
         Returns only props that haven't been marked as unavailable
         """
-        session = self.get_session()
-        try:
-            # Get all unavailable signatures
-            unavailable = session.query(PropAvailability.id).filter(PropAvailability.is_available == False).all()
-            unavailable_sigs = {row[0] for row in unavailable}
-            
-            available_props = []
-            for prop_analysis in props:
-                prop_signature = self._get_prop_signature(prop_analysis.prop)
-                if prop_signature not in unavailable_sigs:
-                    available_props.append(prop_analysis)
-            
-            return available_props
-        except Exception as e:
-            logger.error(f"Error filtering available props: {e}")
-            return props
-        finally:
-            session.close()
+        unavailable_sigs = self._get_unavailable()
+        return [p for p in props if self._get_prop_signature(p.prop) not in unavailable_sigs]
 
     def filter_by_minimum_thresholds(self, props: List[PropAnalysis], verbose: bool = True) -> List[PropAnalysis]:
         """
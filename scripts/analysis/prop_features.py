@@ -0,0 +1,244 @@
+"""
+Prop Features - one pre-joined feature row per prop
+
+The loader's context holds per-team and per-player lookup tables (DVOA,
+position splits, usage, alignment, QB analytics, injuries). Instead of every
+agent re-walking those nested dicts for every prop, the tables are joined onto
+the slate once, column-wise, into a single frame:
+
+- one row per prop, in slate order (ready-made feature matrix for batch/ML use)
+- row dicts indexed by (player_id, team, opponent) for the agents
+
+Missing values take the same defaults the agents used with dict.get(), and
+has_* flags record whether the source row existed at all, so agents keep their
+"data not available" behavior.
+"""
+
+import csv
+import io
+import logging
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from scripts.analysis.player_identity import PlayerTable, player_id
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ['player_id', 'team', 'opponent']
+
+# (context key, join column, presence flag, {source field: feature column})
+FEATURE_SOURCES = [
+    ('dvoa_offensive', 'team', 'has_off_dvoa', {
+        'offense_dvoa': 'offense_dvoa',
+        'passing_dvoa': 'passing_dvoa',
+        'rushing_dvoa': 'rushing_dvoa',
+    }),
+    ('dvoa_defensive', 'opponent', 'has_def_dvoa', {
+        'defense_dvoa': 'defense_dvoa',
+        'pass_defense_dvoa': 'pass_defense_dvoa',
+        'rush_defense_dvoa': 'rush_defense_dvoa',
+    }),
+    ('defensive_vs_receiver', 'opponent', 'has_def_vs_receiver', {
+        'vs_wr1_dvoa': 'vs_wr1_dvoa',
+        'vs_wr2_dvoa': 'vs_wr2_dvoa',
+        'vs_wr3_dvoa': 'vs_wr3_dvoa',
+        'vs_te_dvoa': 'vs_te_dvoa',
+        'vs_rb_dvoa': 'vs_rb_dvoa',
+    }),
+    ('usage', 'player_id', 'has_usage', {
+        'snap_share_pct': 'snap_share_pct',
+        'pass_attempts': 'pass_attempts',
+        'target_share_pct': 'target_share_pct',
+        'rush_attempts': 'rush_attempts',
+        'touch_pct': 'touch_pct',
+        'rush_attempt_pct': 'rush_attempt_pct',
+        'trend': 'trend',
+    }),
+    ('alignment', 'player_id', 'has_alignment', {
+        'slot_pct': 'slot_pct',
+        'wide_pct': 'wide_pct',
+        'primary_alignment': 'primary_alignment',
+        'slot_yards_per_route': 'slot_yards_per_route',
+        'wide_yards_per_route': 'wide_yards_per_route',
+    }),
+    ('qb_analytics', 'player_id', 'has_qb_analytics', {
+        'epa_per_dropback': 'qb_epa_per_dropback',
+        'dvoa': 'qb_dvoa',
+        'passer_rating': 'qb_passer_rating',
+        'yards_per_attempt': 'qb_yards_per_attempt',
+    }),
+]
+
+# Non-numeric features; everything else defaults to 0 like the agents' dict.get(..., 0)
+FEATURE_DEFAULTS = {'trend': 'stable', 'primary_alignment': 'UNKNOWN'}
+
+# Context entries the table is built from; replacing any of them triggers a rebuild
+SOURCE_KEYS = ('injuries',) + tuple(source[0] for source in FEATURE_SOURCES)
+
+INJURY_OUT_STATUSES = ['out', 'ir', 'pup-r', 'pup-nr', 'nfi-r', 'nfi-nr', 'reserve-ret', 'reserve-sus', 'inactive']
+
+# Ordinal injury severity for the feature matrix (0 = not listed / active)
+INJURY_STATUS_CODES = {'probable': 1, 'day to day': 2, 'questionable': 3, 'doubtful': 4}
+INJURY_OUT_CODE = 5
+
+
+def injury_status_code(status: str) -> int:
+    if status in INJURY_OUT_STATUSES:
+        return INJURY_OUT_CODE
+    return INJURY_STATUS_CODES.get(status, 0)
+
+
+def parse_injury_report(injury_report_text: str) -> PlayerTable:
+    """Parses the CSV injury report text into a player ID -> status table."""
+    injury_data = PlayerTable()
+    if not injury_report_text:
+        logger.warning("Injury report text empty, skipping parse.")
+        return injury_data
+
+    try:
+        csvfile = io.StringIO(injury_report_text)
+        reader = csv.DictReader(csvfile)
+        expected_headers = ['Player', 'Team', 'Pos', 'Injury', 'Status', 'Est. Return']
+        actual_headers = reader.fieldnames
+        if not actual_headers:
+            logger.error("Injury report CSV empty or no header row.")
+            return injury_data
+
+        # Check the FIRST header specifically, removing potential BOM before comparison
+        clean_first_header = actual_headers[0].lstrip('\ufeff')
+        headers_match = (
+            clean_first_header == expected_headers[0] and
+            all(exp_h in actual_headers for exp_h in expected_headers[1:])
+        )
+
+        if not headers_match:
+            logged_headers = [clean_first_header] + actual_headers[1:]
+            logger.error("Injury report CSV headers mismatch!")
+            logger.error(f"Expected something like: {expected_headers}")
+            logger.error(f"Got: {logged_headers}")
+            return injury_data
+
+        player_count = 0
+        # Use the actual first header name found (may carry the BOM)
+        player_key = actual_headers[0]
+
+        for row in reader:
+            player_name_raw = row.get(player_key)
+            status_raw = row.get('Status', '')
+            status = status_raw.strip().lower() if status_raw else ''
+            if player_name_raw and status:
+                injury_data[player_name_raw] = status
+                player_count += 1
+        logger.info(f"Parsed injury data for {player_count} players.")
+
+    except csv.Error as e: logger.error(f"CSV Error parsing injury report: {e}")
+    except Exception as e: logger.error(f"Error parsing injury report: {e}", exc_info=False)
+
+    return injury_data
+
+
+def _prop_value(prop, field: str):
+    if isinstance(prop, Mapping):
+        return prop.get(field)
+    return getattr(prop, field, None)
+
+
+def _prop_key(prop) -> Tuple:
+    pid = _prop_value(prop, 'player_id')
+    if pid is None:
+        # Same resolution PlayerProp applies when a prop dict has no ID
+        pid = player_id(_prop_value(prop, 'player_name') or '')
+    return (pid, _prop_value(prop, 'team') or '', _prop_value(prop, 'opponent') or '')
+
+
+def _source_frame(table, fields: Dict[str, str], flag: str) -> pd.DataFrame:
+    """Lookup table (key -> dict) as a frame of the wanted feature columns"""
+    rows = {k: v for k, v in table.items() if v} if isinstance(table, Mapping) else {}
+    frame = pd.DataFrame.from_dict(rows, orient='index') if rows else pd.DataFrame(index=[])
+    frame = frame.reindex(columns=list(fields)).rename(columns=fields)
+    frame[flag] = True
+    return frame
+
+
+def build_feature_frame(props: Iterable, context: Dict,
+                        injuries: Optional[PlayerTable] = None) -> pd.DataFrame:
+    """Join every context lookup table onto the props in one pass (one row per prop)"""
+    props = list(props)
+    keys = [_prop_key(p) for p in props]
+    frame = pd.DataFrame({
+        'player_id': pd.Series([k[0] for k in keys], dtype=object),
+        'team': [k[1] for k in keys],
+        'opponent': [k[2] for k in keys],
+        'game_total': pd.to_numeric(pd.Series([_prop_value(p, 'game_total') for p in props], dtype=object),
+                                    errors='coerce'),
+        'spread': pd.to_numeric(pd.Series([_prop_value(p, 'spread') for p in props], dtype=object),
+                                errors='coerce'),
+    })
+
+    joined = [frame]
+    for context_key, join_column, flag, fields in FEATURE_SOURCES:
+        source = _source_frame(context.get(context_key, {}), fields, flag)
+        part = source.reindex(frame[join_column].tolist())
+        part.index = frame.index
+        joined.append(part)
+    frame = pd.concat(joined, axis=1)
+
+    for _, _, flag, fields in FEATURE_SOURCES:
+        frame[flag] = frame[flag].eq(True)
+        for column in fields.values():
+            default = FEATURE_DEFAULTS.get(column, 0)
+            if column in FEATURE_DEFAULTS:
+                frame[column] = frame[column].astype(object).where(frame[column].notna(), default)
+            else:
+                frame[column] = pd.to_numeric(frame[column], errors='coerce').fillna(default)
+
+    if injuries is None:
+        injuries = parse_injury_report(context.get('injuries')) if context.get('injuries') else PlayerTable()
+    frame['injury_report_loaded'] = bool(injuries)
+    frame['injury_status'] = [injuries.get(pid) or '' for pid in frame['player_id']]
+    frame['injury_code'] = frame['injury_status'].map(injury_status_code).astype(int)
+    return frame
+
+
+class PropFeatureTable:
+    """Pre-joined features for a slate: a frame for batch use, row dicts for agents"""
+
+    def __init__(self, frame: pd.DataFrame, injuries: Optional[PlayerTable] = None,
+                 context: Optional[Dict] = None):
+        self.frame = frame
+        self.injuries = injuries if injuries is not None else PlayerTable()
+        self._context = context if context is not None else {}
+        self._sources = {key: self._context.get(key) for key in SOURCE_KEYS}
+        self._rows: Dict[Tuple, Dict] = {}
+        for record in frame.to_dict('records'):
+            self._rows.setdefault(tuple(record[k] for k in KEY_COLUMNS), record)
+
+    @classmethod
+    def build(cls, context: Dict, props: Optional[List] = None) -> 'PropFeatureTable':
+        injuries = parse_injury_report(context.get('injuries')) if context.get('injuries') else PlayerTable()
+        props = context.get('props', []) if props is None else props
+        frame = build_feature_frame(props, context, injuries=injuries)
+        return cls(frame, injuries=injuries, context=context)
+
+    def is_current(self, context: Dict) -> bool:
+        """False once any source table in the context has been replaced"""
+        return all(context.get(key) is value for key, value in self._sources.items())
+
+    def row(self, prop) -> Dict:
+        key = _prop_key(prop)
+        record = self._rows.get(key)
+        if record is None:
+            # Ad-hoc prop that wasn't on the slate: join just this one
+            record = build_feature_frame([prop], self._context, injuries=self.injuries).to_dict('records')[0]
+            self._rows[key] = record
+        return record
+
+
+def features_for(prop, context: Dict) -> Dict:
+    """Feature row for a prop, building (or rebuilding) the context's table on demand"""
+    table = context.get('prop_features')
+    if not isinstance(table, PropFeatureTable) or not table.is_current(context):
+        table = PropFeatureTable.build(context)
+        context['prop_features'] = table
+    return table.row(prop)
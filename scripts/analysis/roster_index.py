@@ -0,0 +1,171 @@
+"""
+Roster Index - one shared player -> team map per roster version
+
+Every NFLDataLoader used to re-read and re-parse the roster (DB row or
+"NFL_roster - Sheet1.csv") on first use, and loaders are built per request,
+per API service and per backtest worker. The roster is now parsed once per
+process per version:
+
+- a source (file path / DB row) is checked by a cheap stamp (mtime+size, or
+  row id+upload time); its bytes are read and hashed only when the stamp moves
+- the index for a content hash is built once, keyed by canonical player ID,
+  and shared read-only by every loader and thread (forked workers inherit it)
+- only each source's current version is kept; an index no source refers to
+  any more is dropped (loaders still holding it keep their reference)
+
+Players a slate assigns by inference (not on the roster) never go into the
+index; they live in a per-week InferredRoster kept by the loader.
+"""
+
+import hashlib
+import io
+import logging
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple, Union
+
+import pandas as pd
+
+from scripts.analysis import instrumentation
+from scripts.analysis.player_identity import PlayerTable
+
+logger = logging.getLogger(__name__)
+
+ROSTER_FILENAME = "NFL_roster - Sheet1.csv"
+
+
+class RosterIndex(Mapping):
+    """Read-only player ID -> team abbreviation map for one roster version.
+
+    Lookups accept IDs or any raw name variant (see PlayerTable).
+    """
+
+    def __init__(self, teams: PlayerTable, version: Optional[str] = None, source: Optional[str] = None):
+        self._teams = teams
+        self.version = version
+        self.source = source
+
+    def __getitem__(self, key):
+        return self._teams[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._teams
+
+    def get(self, key, default=None):
+        return self._teams.get(key, default)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._teams)
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+    def names(self) -> Dict[str, str]:
+        """Same map keyed by display name (debugging / printing)"""
+        return self._teams.names()
+
+    def __repr__(self) -> str:
+        return f"RosterIndex({len(self)} players, version={self.version}, source={self.source})"
+
+
+class InferredRoster(PlayerTable):
+    """One week's team assignments for players missing from the roster"""
+
+    def __init__(self, week: int, *args, **kwargs):
+        self.week = week
+        super().__init__(*args, **kwargs)
+
+
+def parse_roster(content: Union[bytes, str]) -> PlayerTable:
+    """Player -> normalized team from roster CSV content (Player and Team columns)"""
+    # Deferred: avoids a circular import (the loader imports this module)
+    from scripts.analysis.data_loader import normalize_team_abbr
+
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    df_roster = pd.read_csv(io.BytesIO(content))
+    if 'Player' not in df_roster.columns or 'Team' not in df_roster.columns:
+        raise ValueError("roster is missing 'Player' or 'Team' column")
+
+    teams = PlayerTable()
+    for player_name_raw, team_abbr in zip(df_roster['Player'], df_roster['Team']):
+        if player_name_raw and team_abbr and not pd.isna(player_name_raw) and not pd.isna(team_abbr):
+            teams[player_name_raw] = normalize_team_abbr(team_abbr)
+    return teams
+
+
+# content hash -> index (only hashes some source is currently on), and
+# source key -> (stamp, content hash)
+_indexes: Dict[str, RosterIndex] = {}
+_sources: Dict[Hashable, Tuple[Hashable, str]] = {}
+_lock = threading.Lock()
+
+
+def roster_index(source: Hashable, stamp: Hashable, read: Callable[[], Union[bytes, str]],
+                 label: Optional[str] = None) -> RosterIndex:
+    """
+    Shared index for a roster source.
+
+    Args:
+        source: Identifies where the roster lives (e.g. ('file', path))
+        stamp: Changes whenever the source may have changed (mtime/size, upload time)
+        read: Returns the source's content; only called when the stamp is new
+        label: Shown in logs (defaults to str(source))
+
+    Raises whatever read/parse raise; nothing is cached for a failed source.
+    """
+    known = _sources.get(source)
+    if known is not None and known[0] == stamp:
+        instrumentation.cache_hit('roster_index')
+        return _indexes[known[1]]
+
+    instrumentation.cache_miss('roster_index')
+    with _lock:
+        known = _sources.get(source)
+        if known is not None and known[0] == stamp:
+            return _indexes[known[1]]
+
+        content = read()
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        version = hashlib.sha1(content).hexdigest()
+        index = _indexes.get(version)
+        if index is None:
+            index = RosterIndex(parse_roster(content), version=version, source=label or str(source))
+            _indexes[version] = index
+            logger.info(f"✓ Loaded roster data for {len(index)} players from {index.source}")
+        _sources[source] = (stamp, version)
+        if known is not None and known[1] != version:
+            _drop_unreferenced(known[1])
+        return index
+
+
+def _drop_unreferenced(version: str):
+    """Forget an index once no source is on its version (call with _lock held)"""
+    if all(current != version for _, current in _sources.values()):
+        _indexes.pop(version, None)
+
+
+def file_roster_index(data_dir: Union[str, Path]) -> RosterIndex:
+    """Shared index for data_dir's roster CSV (empty when the file is missing or unreadable)"""
+    roster_file = Path(data_dir) / ROSTER_FILENAME
+    try:
+        stat = roster_file.stat()
+    except OSError:
+        logger.error(f"CRITICAL: Roster file not found at {roster_file}. Cannot accurately assign player teams.")
+        return RosterIndex(PlayerTable())
+
+    try:
+        return roster_index(('file', str(roster_file.resolve())), (stat.st_mtime_ns, stat.st_size),
+                            roster_file.read_bytes, label=roster_file.name)
+    except Exception as e:
+        logger.error(f"Error loading roster file {roster_file.name}: {e}", exc_info=True)
+        return RosterIndex(PlayerTable())
+
+
+def clear_roster_cache():
+    """Forget every loaded roster (tests, or after editing a roster in place)"""
+    with _lock:
+        _indexes.clear()
+        _sources.clear()
@@ -1,16 +1,10 @@
 import pandas as pd
 import logging
 from typing import Dict
-import re
 
-logger = logging.getLogger(__name__)
+from scripts.analysis.player_identity import PlayerTable, player_id
 
-def normalize_player_name(name: str) -> str:
-    if not name or pd.isna(name):
-        return ""
-    name = str(name).strip().replace(".", "")
-    name = re.sub(r"\s+", " ", name)
-    return name.lower()
+logger = logging.getLogger(__name__)
 
 def extract_usage_stats(usage_df: pd.DataFrame, position: str) -> Dict:
     if usage_df is None or usage_df.empty:
@@ -22,7 +16,7 @@ def extract_usage_stats(usage_df: pd.DataFrame, position: str) -> Dict:
         usage_df.columns = usage_df.iloc[0].tolist()
         usage_df = usage_df.iloc[1:].reset_index(drop=True)
     
-    usage_dict = {}
+    usage_dict = PlayerTable()
     cols = usage_df.columns.tolist()
     
     for _, row in usage_df.iterrows():
@@ -35,8 +29,8 @@ def extract_usage_stats(usage_df: pd.DataFrame, position: str) -> Dict:
         if player_val is None or pd.isna(player_val):
             continue
         
-        player_name = normalize_player_name(player_val)
-        if not player_name:
+        player_name = player_id(player_val)
+        if player_name is None:
             continue
         
         player_stats = {}
@@ -76,7 +70,7 @@ def extract_base_stats(base_df: pd.DataFrame, stat_type: str) -> Dict:
         base_df.columns = base_df.iloc[0].tolist()
         base_df = base_df.iloc[1:].reset_index(drop=True)
     
-    base_dict = {}
+    base_dict = PlayerTable()
     cols = base_df.columns.tolist()
     
     for _, row in base_df.iterrows():
@@ -89,8 +83,8 @@ def extract_base_stats(base_df: pd.DataFrame, stat_type: str) -> Dict:
         if player_val is None or pd.isna(player_val):
             continue
         
-        player_name = normalize_player_name(player_val)
-        if not player_name:
+        player_name = player_id(player_val)
+        if player_name is None:
             continue
         
         player_stats = {}
@@ -127,8 +121,8 @@ def aggregate_historical_stats(context: Dict) -> Dict:
         return context
     
     historical = context["historical_stats"]
-    usage_agg = {}
-    trends_agg = {}
+    usage_agg = PlayerTable()
+    trends_agg = PlayerTable()
     weeks_processed = sorted(list(historical.keys()))
     logger.info(f"Processing historical weeks: {weeks_processed}")
     
@@ -36,8 +36,12 @@ class BettingAssistantAgent:
         self.db_path = db_path
 
         # Analysis components
-        self.analyzer = None  # Initialized on-demand
+        self.analyzer = None  # Initialized on-demand, then reused across turns
         self.parlay_builder = ParlayBuilder()
+        # Full (unfiltered) analysis of the loaded slate; later turns only re-filter
+        self._analyzed_context = None
+        self._all_analyses = []
+        self._constraint_removed = 0
 
         logger.info("Betting Assistant Agent initialized (Phase 3 enabled)")
 
@@ -157,20 +161,9 @@ class BettingAssistantAgent:
         props = context.get('props', [])
         platform = prefs.get('platform', 'pick6')
 
-        # Get excluded players from conversation + constraints engine
-        excluded_players = self.conversation.get_excluded_players()
-        excluded_players.extend(self.constraints.get_excluded_players(platform))
-
-        # Initialize analyzer
-        self.analyzer = PropAnalyzer(db_path=self.db_path)
-
         # Analyze props
         logger.info(f"Analyzing {len(props)} props with threshold {threshold}%")
-        analyses = self.analyzer.analyze_all_props(
-            context=context,
-            min_confidence=threshold,
-            exclude_players=excluded_players
-        )
+        analyses = self._get_analyses(context, threshold, platform)
 
         # Save to conversation
         self.conversation.set_current_props([
@@ -206,6 +199,30 @@ class BettingAssistantAgent:
 
         return "\n".join(response_lines)
 
+    def _get_analyses(self, context: Dict, threshold: int, platform: str) -> List:
+        """
+        Analyses for the loaded slate at or above threshold, with constraints applied.
+
+        The slate is analyzed once per loaded context; later turns (new
+        threshold, new exclusions, parlay builds) only re-filter.
+        """
+        if self.analyzer is None:
+            self.analyzer = PropAnalyzer(db_path=self.db_path)
+
+        if self._analyzed_context is not context:
+            self._all_analyses = self.analyzer.analyze_all_props(context=context, min_confidence=0)
+            self._analyzed_context = context
+
+        eligible = [a for a in self._all_analyses if a.final_confidence >= threshold]
+        analyses, reasons = self.constraints.filter_analyses(
+            eligible, platform,
+            extra_excluded_players=self.conversation.get_excluded_players()
+        )
+        self._constraint_removed = len(reasons)
+        if reasons:
+            logger.info(f"Constraints removed {len(reasons)} props")
+        return analyses
+
     def _handle_build_parlay(self, params: Dict) -> str:
         """Handle parlay building request"""
         # Check if props are analyzed
@@ -225,20 +242,10 @@ class BettingAssistantAgent:
         prefs = self.conversation.get_user_preferences()
         threshold = prefs['confidence_threshold']
 
-        # Get excluded players
         platform = prefs.get('platform', 'pick6')
-        excluded_players = self.conversation.get_excluded_players()
-        excluded_players.extend(self.constraints.get_excluded_players(platform))
 
-        # Re-analyze with exclusions
-        if not self.analyzer:
-            self.analyzer = PropAnalyzer(db_path=self.db_path)
-
-        analyses = self.analyzer.analyze_all_props(
-            context=context,
-            min_confidence=threshold,
-            exclude_players=excluded_players
-        )
+        # Re-filter the cached analysis with current exclusions
+        analyses = self._get_analyses(context, threshold, platform)
 
         if len(analyses) == 0:
             return "No props available to build parlays. Try lowering the confidence threshold."
@@ -291,9 +298,9 @@ class BettingAssistantAgent:
         response_lines.append("")
 
         # Add Pick6 note if applicable
-        if platform == 'pick6' and excluded_players:
+        if platform == 'pick6' and self._constraint_removed:
             response_lines.append(
-                f"[NOTE] Excluded {len(excluded_players)} players for Pick6 availability"
+                f"[NOTE] Excluded {self._constraint_removed} props for Pick6 availability"
             )
 
         response_lines.append("")
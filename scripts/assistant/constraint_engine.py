@@ -5,12 +5,15 @@ Manages Pick6 availability tracking, constraint rules, and pattern learning
 
 import sqlite3
 import json
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from collections import defaultdict
 import logging
 import uuid
 
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +26,79 @@ class ConstraintType:
     MAX_LINE_THRESHOLD = "max_line_threshold"
 
 
+class CompiledConstraints:
+    """
+    Active rules and exclusions for one platform, compiled for bulk filtering.
+
+    Built from one read of pick6_availability and constraint_rules. evaluate()
+    runs each check as a column mask over the whole prop table instead of
+    looping rules per prop; checks apply in the same order as the old loop
+    (player exclusion, then rules in order) so the first failing check gives
+    the reason.
+    """
+
+    def __init__(self, platform: str, availability: Dict[str, Dict[str, tuple]],
+                 rules: List[Dict]):
+        self.platform = platform
+        # player_name -> prop_type ('*' = all) -> (is_available, source, notes, last_updated)
+        self.availability = availability
+        self.rules = rules
+        self.excluded_players = {
+            player for player, by_type in availability.items()
+            if any(not entry[0] for entry in by_type.values())
+        }
+        self.excluded_lower = {p.lower() for p in self.excluded_players}
+
+    def availability_of(self, player_name: str, prop_type: str = None) -> Optional[tuple]:
+        """Most recent exact-or-wildcard availability entry, like the old query"""
+        by_type = self.availability.get(player_name.strip())
+        if not by_type:
+            return None
+        candidates = [by_type[k] for k in {prop_type or "*", "*"} if k in by_type]
+        return max(candidates, key=lambda entry: entry[3]) if candidates else None
+
+    def evaluate(self, frame: pd.DataFrame, extra_excluded_players: Iterable[str] = ()) -> pd.Series:
+        """
+        Exclusion reason per row (None = keep).
+
+        frame needs player_name, stat_type and line columns.
+        """
+        players = frame['player_name'].fillna('').astype(str).str.strip()
+        stat_types = frame['stat_type'].fillna('').astype(str)
+        lines = pd.to_numeric(frame['line'], errors='coerce').fillna(0)
+        reasons = pd.Series([None] * len(frame), index=frame.index, dtype=object)
+        open_rows = pd.Series(True, index=frame.index)
+
+        def exclude(mask: pd.Series, reason):
+            nonlocal open_rows
+            hit = mask & open_rows
+            if hit.any():
+                reasons[hit] = reason(hit) if callable(reason) else reason
+                open_rows &= ~hit
+
+        excluded = self.excluded_lower | {p.lower().strip() for p in extra_excluded_players}
+        exclude(players.str.lower().isin(excluded),
+                lambda hit: "Excluded " + players[hit] + f" (unavailable on {self.platform})")
+
+        for rule in self.rules:
+            rule_type, rule_data = rule['rule_type'], rule['rule_data']
+            if rule_type == ConstraintType.PROP_TYPE_EXCLUDED:
+                exclude(stat_types.isin(rule_data.get('excluded_types', [])),
+                        lambda hit, rid=rule['rule_id'][:8]: "Excluded " + stat_types[hit] + f" (rule: {rid})")
+            elif rule_type == ConstraintType.MIN_LINE_THRESHOLD:
+                min_line = rule_data.get('min_line', 0)
+                exclude(lines < min_line,
+                        lambda hit: ("Excluded " + players[hit] + " " + stat_types[hit]
+                                     + " (line " + frame['line'][hit].astype(str) + f" < {min_line})"))
+            elif rule_type == ConstraintType.MAX_LINE_THRESHOLD:
+                max_line = rule_data.get('max_line', 999)
+                exclude(lines > max_line,
+                        lambda hit: ("Excluded " + players[hit] + " " + stat_types[hit]
+                                     + " (line " + frame['line'][hit].astype(str) + f" > {max_line})"))
+
+        return reasons
+
+
 class ConstraintEngine:
     """Manages constraints and Pick6 availability learning"""
 
@@ -32,6 +108,67 @@ class ConstraintEngine:
         self.rule_cache = {}  # Rule ID -> rule data
         self.pattern_history = defaultdict(list)  # Track user patterns
 
+        # One connection for the engine's lifetime (opened on first use)
+        self._conn = None
+        self._lock = threading.RLock()
+        # Platform -> (state version, CompiledConstraints)
+        self._compiled: Dict[str, Tuple[tuple, CompiledConstraints]] = {}
+        self._local_writes = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _state_version(self) -> tuple:
+        """Changes whenever availability/rules may have changed.
+
+        PRAGMA data_version moves when another connection commits to the
+        database; our own writes are counted locally.
+        """
+        try:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            data_version = None
+        return (self._local_writes, data_version)
+
+    def _changed(self):
+        """Invalidate compiled constraints after a write through this engine"""
+        self._local_writes += 1
+        self.exclusion_cache.clear()
+
+    def compile(self, platform: str = "pick6") -> CompiledConstraints:
+        """Compiled rules/exclusions for a platform (rebuilt only after changes)"""
+        with self._lock:
+            version = self._state_version()
+            cached = self._compiled.get(platform)
+            if cached and cached[0] == version:
+                return cached[1]
+
+            availability: Dict[str, Dict[str, tuple]] = defaultdict(dict)
+            try:
+                rows = self.conn.execute("""
+                    SELECT player_name, prop_type, is_available, source, notes, last_updated
+                    FROM pick6_availability
+                    WHERE platform = ?
+                """, (platform,)).fetchall()
+                for player, prop_type, is_available, source, notes, last_updated in rows:
+                    availability[player][prop_type] = (bool(is_available), source, notes, last_updated or "")
+            except Exception as e:
+                logger.error(f"Failed to load availability: {e}")
+
+            compiled = CompiledConstraints(platform, dict(availability), self._load_active_rules(platform))
+            self._compiled[platform] = (version, compiled)
+            self.exclusion_cache[platform] = set(compiled.excluded_players)
+            return compiled
+
     def mark_player_unavailable(self, player_name: str, prop_type: str = None,
                                 platform: str = "pick6", source: str = "user",
                                 notes: str = None):
@@ -46,34 +183,25 @@ class ConstraintEngine:
             notes: Additional notes
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             # Use wildcard for all prop types
             prop_type_key = prop_type or "*"
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO pick6_availability
-                (player_name, prop_type, platform, is_available, confidence,
-                 last_updated, source, notes)
-                VALUES (?, ?, ?, 0, 1.0, ?, ?, ?)
-            """, (
-                player_name.strip(),
-                prop_type_key,
-                platform,
-                datetime.now().isoformat(),
-                source,
-                notes
-            ))
-
-            conn.commit()
-            conn.close()
-
-            # Update cache
-            cache_key = platform
-            if cache_key not in self.exclusion_cache:
-                self.exclusion_cache[cache_key] = set()
-            self.exclusion_cache[cache_key].add(player_name.strip())
+            with self._lock:
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO pick6_availability
+                    (player_name, prop_type, platform, is_available, confidence,
+                     last_updated, source, notes)
+                    VALUES (?, ?, ?, 0, 1.0, ?, ?, ?)
+                """, (
+                    player_name.strip(),
+                    prop_type_key,
+                    platform,
+                    datetime.now().isoformat(),
+                    source,
+                    notes
+                ))
+                self.conn.commit()
+                self._changed()
 
             logger.info(f"Marked {player_name} as unavailable on {platform}")
 
@@ -88,63 +216,20 @@ class ConstraintEngine:
         Returns:
             (is_available, reason) tuple
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # Check exact match and wildcard
-            cursor.execute("""
-                SELECT is_available, source, notes
-                FROM pick6_availability
-                WHERE player_name = ? AND platform = ?
-                  AND (prop_type = ? OR prop_type = '*')
-                ORDER BY last_updated DESC
-                LIMIT 1
-            """, (player_name.strip(), platform, prop_type or "*"))
-
-            row = cursor.fetchone()
-            conn.close()
-
-            if row:
-                is_available = bool(row[0])
-                reason = f"Marked unavailable by {row[1]}"
-                if row[2]:
-                    reason += f" ({row[2]})"
-                return is_available, None if is_available else reason
-
-        except Exception as e:
-            logger.error(f"Failed to check player availability: {e}")
+        entry = self.compile(platform).availability_of(player_name, prop_type)
+        if entry:
+            is_available, source, notes, _ = entry
+            reason = f"Marked unavailable by {source}"
+            if notes:
+                reason += f" ({notes})"
+            return is_available, None if is_available else reason
 
         # Default to available if no record
         return True, None
 
     def get_excluded_players(self, platform: str = "pick6") -> List[str]:
         """Get list of excluded players for a platform"""
-        # Check cache first
-        if platform in self.exclusion_cache:
-            return list(self.exclusion_cache[platform])
-
-        # Load from database
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                SELECT DISTINCT player_name
-                FROM pick6_availability
-                WHERE platform = ? AND is_available = 0
-            """, (platform,))
-
-            players = [row[0] for row in cursor.fetchall()]
-            conn.close()
-
-            # Update cache
-            self.exclusion_cache[platform] = set(players)
-            return players
-
-        except Exception as e:
-            logger.error(f"Failed to get excluded players: {e}")
-            return []
+        return list(self.compile(platform).excluded_players)
 
     def create_constraint_rule(self, rule_type: str, rule_data: Dict,
                               platform: str = "pick6", auto_apply: bool = True) -> str:
@@ -162,24 +247,21 @@ class ConstraintEngine:
         """
         try:
             rule_id = str(uuid.uuid4())
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO constraint_rules
-                (rule_id, rule_type, rule_data, platform, auto_apply, created_date)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                rule_id,
-                rule_type,
-                json.dumps(rule_data),
-                platform,
-                1 if auto_apply else 0,
-                datetime.now().isoformat()
-            ))
-
-            conn.commit()
-            conn.close()
+            with self._lock:
+                self.conn.execute("""
+                    INSERT INTO constraint_rules
+                    (rule_id, rule_type, rule_data, platform, auto_apply, created_date)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    rule_id,
+                    rule_type,
+                    json.dumps(rule_data),
+                    platform,
+                    1 if auto_apply else 0,
+                    datetime.now().isoformat()
+                ))
+                self.conn.commit()
+                self._changed()
 
             # Update cache
             self.rule_cache[rule_id] = {
@@ -198,88 +280,74 @@ class ConstraintEngine:
 
     def get_active_rules(self, platform: str = "pick6") -> List[Dict]:
         """Get all active constraint rules for a platform"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return list(self.compile(platform).rules)
 
-            cursor.execute("""
+    def _load_active_rules(self, platform: str) -> List[Dict]:
+        try:
+            rows = self.conn.execute("""
                 SELECT rule_id, rule_type, rule_data, times_applied
                 FROM constraint_rules
                 WHERE platform = ? AND auto_apply = 1
-            """, (platform,))
-
-            rules = []
-            for row in cursor.fetchall():
-                rules.append({
-                    'rule_id': row[0],
-                    'rule_type': row[1],
-                    'rule_data': json.loads(row[2]),
-                    'times_applied': row[3]
-                })
+            """, (platform,)).fetchall()
 
-            conn.close()
-            return rules
+            return [{
+                'rule_id': row[0],
+                'rule_type': row[1],
+                'rule_data': json.loads(row[2]),
+                'times_applied': row[3]
+            } for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get active rules: {e}")
             return []
 
-    def apply_constraints_to_props(self, props: List[Dict], platform: str = "pick6") -> Tuple[List[Dict], List[str]]:
+    @staticmethod
+    def _prop_frame(players: List, stat_types: List, lines: List) -> pd.DataFrame:
+        # Lines stay as given (object dtype) so reasons print them unchanged
+        return pd.DataFrame({
+            'player_name': players,
+            'stat_type': stat_types,
+            'line': pd.Series(lines, dtype=object),
+        })
+
+    def apply_constraints_to_props(self, props: List[Dict], platform: str = "pick6",
+                                   extra_excluded_players: Iterable[str] = ()) -> Tuple[List[Dict], List[str]]:
         """
         Apply constraints to filter props
 
+        Args:
+            props: Prop dicts (player_name, stat_type, line)
+            platform: Platform whose rules/exclusions apply
+            extra_excluded_players: Session-level exclusions on top of the stored ones
+
         Returns:
             (filtered_props, exclusion_reasons) tuple
         """
-        filtered = []
-        reasons = []
-
-        # Get excluded players
-        excluded_players = set(p.lower() for p in self.get_excluded_players(platform))
-
-        # Get active rules
-        active_rules = self.get_active_rules(platform)
-
-        for prop in props:
-            player_name = prop.get('player_name', '').strip()
-            prop_type = prop.get('stat_type', '')
-            line = prop.get('line', 0)
-
-            # Check player exclusion
-            if player_name.lower() in excluded_players:
-                reasons.append(f"Excluded {player_name} (unavailable on {platform})")
-                continue
-
-            # Check rule constraints
-            excluded = False
-            for rule in active_rules:
-                rule_type = rule['rule_type']
-                rule_data = rule['rule_data']
-
-                if rule_type == ConstraintType.PROP_TYPE_EXCLUDED:
-                    if prop_type in rule_data.get('excluded_types', []):
-                        reasons.append(f"Excluded {prop_type} (rule: {rule['rule_id'][:8]})")
-                        excluded = True
-                        break
-
-                elif rule_type == ConstraintType.MIN_LINE_THRESHOLD:
-                    min_line = rule_data.get('min_line', 0)
-                    if line < min_line:
-                        reasons.append(f"Excluded {player_name} {prop_type} (line {line} < {min_line})")
-                        excluded = True
-                        break
-
-                elif rule_type == ConstraintType.MAX_LINE_THRESHOLD:
-                    max_line = rule_data.get('max_line', 999)
-                    if line > max_line:
-                        reasons.append(f"Excluded {player_name} {prop_type} (line {line} > {max_line})")
-                        excluded = True
-                        break
-
-            if not excluded:
-                filtered.append(prop)
-
-        return filtered, reasons
+        if not props:
+            return [], []
+        frame = self._prop_frame(
+            [p.get('player_name', '') for p in props],
+            [p.get('stat_type', '') for p in props],
+            [p.get('line', 0) for p in props],
+        )
+        reasons = self.compile(platform).evaluate(frame, extra_excluded_players)
+        keep = reasons.isna().to_numpy()
+        filtered = [prop for prop, k in zip(props, keep) if k]
+        return filtered, reasons[~keep].tolist()
+
+    def filter_analyses(self, analyses: List, platform: str = "pick6",
+                        extra_excluded_players: Iterable[str] = ()) -> Tuple[List, List[str]]:
+        """apply_constraints_to_props for PropAnalysis objects"""
+        if not analyses:
+            return [], []
+        frame = self._prop_frame(
+            [a.prop.player_name for a in analyses],
+            [a.prop.stat_type for a in analyses],
+            [a.prop.line for a in analyses],
+        )
+        reasons = self.compile(platform).evaluate(frame, extra_excluded_players)
+        keep = reasons.isna().to_numpy()
+        return [a for a, k in zip(analyses, keep) if k], reasons[~keep].tolist()
 
     def record_pattern(self, platform: str, pattern_type: str, data: Dict):
         """Record a user behavior pattern for learning"""
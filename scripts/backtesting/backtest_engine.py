@@ -10,6 +10,7 @@ import pandas as pd
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.analysis import instrumentation
 from scripts.analysis.data_loader import NFLDataLoader
 from scripts.analysis.orchestrator import PropAnalyzer
 from scripts.analysis.parlay_builder import ParlayBuilder
@@ -23,13 +24,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class BacktestEngine:
-    def __init__(self, data_dir=None, custom_weights=None):
+    def __init__(self, data_dir=None, custom_weights=None, loader=None, analyzer=None):
         self.project_root = Path(__file__).parent.parent.parent
         self.data_dir = data_dir or (self.project_root / "data")
         self.results_dir = self.data_dir / "backtest_results"
         self.results_dir.mkdir(exist_ok=True, parents=True)
         self.custom_weights = custom_weights  # Optional weights for optimization
-        
+        # Loader (roster) and analyzer (weights) are built once and reused across weeks
+        self._loader = loader
+        self._analyzer = analyzer
+
+    @property
+    def loader(self) -> NFLDataLoader:
+        if self._loader is None:
+            self._loader = NFLDataLoader(data_dir=str(self.data_dir))
+        return self._loader
+
+    @property
+    def analyzer(self) -> PropAnalyzer:
+        if self._analyzer is None:
+            self._analyzer = PropAnalyzer(custom_weights=self.custom_weights)
+        return self._analyzer
+
     def run_backtest(self, week: int, min_confidence: int = 50):
         """
         Run the analysis pipeline for a historical week.
@@ -37,23 +53,41 @@ class BacktestEngine:
         logger.info(f"🚀 Starting Backtest for Week {week}...")
         
         # 1. Load Historical Data
-        loader = NFLDataLoader(data_dir=str(self.data_dir))
         # This automatically looks for files like "wk{week}_dvoa..." etc.
-        context = loader.load_all_data(week=week)
+        context = self.load_week(week)
+        if context is None:
+            return None
+        
+        # 2. Analyze Props
+        all_analyses = self.analyze_week(context, min_confidence)
+        
+        # 3-4. Serialize and Save Predictions for Grading
+        output_file, _ = self.save_predictions(week, all_analyses)
+        
+        # 5. Build Parlays (Optional match check)
+        self.save_parlays(week, all_analyses)
+        
+        return output_file
+
+    def load_week(self, week: int):
+        """Historical context for a week, or None if it has no props"""
+        context = self.loader.load_all_data(week=week)
         
         if not context.get('props'):
             logger.error(f"❌ No props found for Week {week}. Check if 'wk{week}_betting_lines_draftkings.csv' exists.")
             return None
             
         logger.info(f"✓ Loaded {len(context['props'])} base props for Week {week}")
-        
-        # 2. Analyze Props
+        return context
+
+    def analyze_week(self, context, min_confidence: int = 50):
         logger.info("🧠 Analyzing props with historical data...")
-        analyzer = PropAnalyzer(custom_weights=self.custom_weights)
-        all_analyses = analyzer.analyze_all_props(context, min_confidence=min_confidence)
+        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=min_confidence)
         logger.info(f"✓ Generated {len(all_analyses)} analyses with confidence >= {min_confidence}")
-        
-        # 3. Serialize Predictions for Grading
+        return all_analyses
+
+    def save_predictions(self, week: int, all_analyses):
+        """Serialize predictions for grading; returns (file, predictions)"""
         predictions = []
         for a in all_analyses:
             predictions.append({
@@ -68,14 +102,14 @@ class BacktestEngine:
                 'is_home': a.prop.is_home
             })
             
-        # 4. Save Predictions
         output_file = self.results_dir / f"predictions_week_{week}.json"
         with open(output_file, 'w') as f:
             json.dump(predictions, f, indent=2)
             
         logger.info(f"💾 Saved {len(predictions)} predictions to {output_file}")
-        
-        # 5. Build Parlays (Optional match check)
+        return output_file, predictions
+
+    def save_parlays(self, week: int, all_analyses):
         # We can also save the "betting card" parlays to see what the system WOULD have recommended
         parlay_builder = ParlayBuilder()
         # Diversify first (mimic run_analysis logic)
@@ -102,8 +136,7 @@ class BacktestEngine:
             json.dump(serialized_parlays, f, indent=2)
             
         logger.info(f"💾 Saved generated parlays to {parlay_output_file}")
-        
-        return output_file
+        return parlay_output_file
 
     def run_backtest_in_memory(self, week: int, min_confidence: int = 50):
         """
@@ -115,15 +148,13 @@ class BacktestEngine:
             line, bet_type, confidence
         """
         # 1. Load Historical Data
-        loader = NFLDataLoader(data_dir=str(self.data_dir))
-        context = loader.load_all_data(week=week)
+        context = self.loader.load_all_data(week=week)
 
         if not context.get('props'):
             return []
 
         # 2. Analyze Props (suppress logging for speed)
-        analyzer = PropAnalyzer(custom_weights=self.custom_weights)
-        all_analyses = analyzer.analyze_all_props(context, min_confidence=min_confidence)
+        all_analyses = self.analyzer.analyze_all_props(context, min_confidence=min_confidence)
 
         # 3. Return predictions directly (no file write)
         predictions = []
@@ -160,7 +191,13 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--week', type=int, required=True, help='Week to backtest')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report per-stage/per-agent timings, cache hit rates and peak memory')
     args = parser.parse_args()
     
+    if args.profile:
+        instrumentation.enable()
     engine = BacktestEngine()
     engine.run_backtest(args.week)
+    if args.profile:
+        logger.info("\n📈 PROFILE\n" + instrumentation.report().format())
@@ -6,13 +6,14 @@ then feeds those to AgentWeightManager for automated weight adjustments.
 """
 
 import sys
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 from dataclasses import dataclass, field
 
+import pandas as pd
+
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -27,6 +28,8 @@ agent_weight_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(agent_weight_module)
 AgentWeightManager = agent_weight_module.AgentWeightManager
 
+from scripts.backtesting.graded_store import GradedResults, GradedResultsStore
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -130,105 +133,124 @@ class CalibrationAnalyzer:
         self.project_root = Path(__file__).parent.parent.parent
         self.data_dir = Path(data_dir) if data_dir else (self.project_root / "data")
         self.results_dir = self.data_dir / "backtest_results"
+        self.store = GradedResultsStore(self.results_dir)
         self.weight_manager = AgentWeightManager(db_path)
 
         # Agent statistics
         self.agent_stats: Dict[str, AgentStats] = {}
 
-    def load_graded_results(self, weeks: List[int]) -> List[Dict]:
+    def load_graded_results(self, weeks: List[int]) -> GradedResults:
         """Load graded results from specified weeks."""
-        all_results = []
+        graded = self.store.load(weeks)
+        week_counts = graded.frame['week'].value_counts()
 
         for week in weeks:
-            graded_file = self.results_dir / f"graded_week_{week}.json"
-            if not graded_file.exists():
+            if week not in week_counts.index:
                 logger.warning(f"No graded results for Week {week}")
-                continue
-
-            with open(graded_file, 'r') as f:
-                results = json.load(f)
-                # Tag with week number
-                for r in results:
-                    r['week'] = week
-                all_results.extend(results)
-                logger.info(f"Loaded {len(results)} graded predictions from Week {week}")
+            else:
+                logger.info(f"Loaded {week_counts[week]} graded predictions from Week {week}")
 
-        return all_results
+        return graded
 
-    def analyze_agent_performance(self, graded_results: List[Dict]) -> Dict[str, AgentStats]:
+    def _agent_stat_columns(self, graded_results: GradedResults) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Analyze each agent's performance across all graded predictions.
+        Per decided (prediction, agent) row, its contribution to each AgentStats counter.
 
         For each prediction:
         - Check what direction the agent recommended (from agent's 'direction' field)
         - Check if agent agreed with the final bet direction
         - Track wins/losses when aligned vs contrarian
         """
+        agents = graded_results.agent_frame
+        # Skip void/unknown results
+        agents = agents[agents['result'].isin(['WIN', 'LOSS'])]
+
+        bet_won = agents['result'].eq('WIN')
+        aligned = agents['agrees']
+        score = agents['score']
+        high_conf = score >= self.HIGH_CONFIDENCE_THRESHOLD
+        medium_conf = ~high_conf & (score >= self.MEDIUM_CONFIDENCE_THRESHOLD)
+
+        columns = pd.DataFrame({
+            'total_predictions': 1,
+            'aligned_predictions': aligned,
+            'total_confidence_sum': score.where(aligned, 0.0),
+            'wins': aligned & bet_won,
+            'losses': aligned & ~bet_won,
+            'high_conf_predictions': aligned & high_conf,
+            'high_conf_wins': aligned & high_conf & bet_won,
+            'medium_conf_predictions': aligned & medium_conf,
+            'medium_conf_wins': aligned & medium_conf & bet_won,
+            'over_predictions': aligned & agents['direction'].eq(1),
+            'over_wins': aligned & agents['direction'].eq(1) & bet_won,
+            'under_predictions': aligned & agents['direction'].eq(-1),
+            'under_wins': aligned & agents['direction'].eq(-1) & bet_won,
+            # Agent disagreed with the bet: right if the bet lost
+            'contrarian_correct': ~aligned & ~bet_won,
+            'contrarian_wrong': ~aligned & bet_won,
+        }, index=agents.index)
+        return agents, columns
+
+    @staticmethod
+    def _stat_values(row) -> Dict[str, float]:
+        return {k: (float(v) if k == 'total_confidence_sum' else int(v)) for k, v in row.items()}
+
+    def analyze_agent_performance(self, graded_results: GradedResults) -> Dict[str, AgentStats]:
+        """Analyze each agent's performance across all graded predictions."""
+        agents, columns = self._agent_stat_columns(graded_results)
+        totals = columns.groupby(agents['agent'], sort=False).sum()
+
         self.agent_stats = {}
+        for agent_name, row in totals.iterrows():
+            self.agent_stats[agent_name] = AgentStats(name=agent_name, **self._stat_values(row))
+
+        return self.agent_stats
+
+    def record_week_stats(self, graded_results: GradedResults, weeks: Optional[List[int]] = None) -> List[int]:
+        """
+        Save per-agent, per-week stats to the database, so later calibrations
+        merge them instead of re-reading the predictions.
+
+        Args:
+            graded_results: Graded predictions for the weeks
+            weeks: Weeks to record (default: every week in graded_results). Weeks
+                   without predictions are recorded too, as graded with no agent stats.
+        """
+        agents, columns = self._agent_stat_columns(graded_results)
+        totals = columns.groupby([agents['week'], agents['agent']], sort=False).sum()
 
-        for pred in graded_results:
-            result = pred.get('result', 'UNKNOWN')
-
-            # Skip void/unknown results
-            if result not in ['WIN', 'LOSS']:
-                continue
-
-            bet_won = (result == 'WIN')
-            bet_direction = pred.get('bet_type', '').upper()
-            agents = pred.get('agents', {})
-
-            for agent_name, agent_data in agents.items():
-                # Initialize agent stats if needed
-                if agent_name not in self.agent_stats:
-                    self.agent_stats[agent_name] = AgentStats(name=agent_name)
-
-                stats = self.agent_stats[agent_name]
-                stats.total_predictions += 1
-
-                # Get agent's recommendation
-                agent_score = agent_data.get('raw_score', 50)
-                agent_direction = agent_data.get('direction', '').upper()
-
-                # Check if agent agreed with final bet direction
-                agent_aligned = (agent_direction == bet_direction)
-
-                if agent_aligned:
-                    # Agent agreed with the bet
-                    stats.aligned_predictions += 1
-                    stats.total_confidence_sum += agent_score
-
-                    if bet_won:
-                        stats.wins += 1
-                    else:
-                        stats.losses += 1
-
-                    # Track by confidence level
-                    if agent_score >= self.HIGH_CONFIDENCE_THRESHOLD:
-                        stats.high_conf_predictions += 1
-                        if bet_won:
-                            stats.high_conf_wins += 1
-                    elif agent_score >= self.MEDIUM_CONFIDENCE_THRESHOLD:
-                        stats.medium_conf_predictions += 1
-                        if bet_won:
-                            stats.medium_conf_wins += 1
-
-                    # Track by direction
-                    if agent_direction == 'OVER':
-                        stats.over_predictions += 1
-                        if bet_won:
-                            stats.over_wins += 1
-                    elif agent_direction == 'UNDER':
-                        stats.under_predictions += 1
-                        if bet_won:
-                            stats.under_wins += 1
-                else:
-                    # Agent disagreed with the bet (contrarian)
-                    # If bet lost, agent was right to disagree
-                    if not bet_won:
-                        stats.contrarian_correct += 1
-                    else:
-                        stats.contrarian_wrong += 1
+        if weeks is None:
+            weeks = [int(w) for w in graded_results.frame['week'].unique()]
+        for week in weeks:
+            week_totals = totals.xs(week, level=0) if week in totals.index.get_level_values(0) else totals.iloc[:0]
+            self.weight_manager.record_week_stats(
+                week,
+                {agent_name: self._stat_values(row) for agent_name, row in week_totals.iterrows()},
+                source=self.store.source(week),
+            )
+        return weeks
+
+    def load_agent_stats(self, weeks: List[int]) -> Dict[str, AgentStats]:
+        """
+        Agent stats over the given weeks from the per-week database totals.
+
+        Weeks graded (or regraded) since their totals were recorded are
+        recomputed from the graded results first; the rest cost one row per agent.
+        """
+        recorded = self.weight_manager.get_week_stats_sources(weeks)
+        stale = [w for w in weeks
+                 if self.store.source(w) is not None and recorded.get(w, '') != self.store.source(w)]
+        if stale:
+            logger.info(f"Recording agent stats for weeks {stale}")
+            self.record_week_stats(self.load_graded_results(stale), weeks=stale)
+
+        for week in weeks:
+            if week not in recorded and week not in stale:
+                logger.warning(f"No graded results for Week {week}")
 
+        totals = self.weight_manager.merge_week_stats(weeks)
+        self.agent_stats = {name: AgentStats(name=name, **self._stat_values(values))
+                            for name, values in totals.items()}
         return self.agent_stats
 
     def generate_performance_report(self) -> str:
@@ -346,17 +368,14 @@ class CalibrationAnalyzer:
         """
         logger.info(f"Starting calibration analysis for weeks: {weeks}")
 
-        # Load graded results
-        graded_results = self.load_graded_results(weeks)
+        # Per-week agent stats, merged over the requested weeks
+        self.load_agent_stats(weeks)
 
-        if not graded_results:
+        if not self.agent_stats:
             logger.error("No graded results found. Run grade_results.py first.")
             return "No graded results found.", []
 
-        logger.info(f"Analyzing {len(graded_results)} total predictions...")
-
-        # Analyze performance
-        self.analyze_agent_performance(graded_results)
+        logger.info(f"Analyzing {len(self.agent_stats)} agents...")
 
         # Generate report
         report = self.generate_performance_report()
@@ -408,30 +427,20 @@ class CalibrationAnalyzer:
 
         return report, adjustments
 
-    def analyze_by_stat_type(self, graded_results: List[Dict]) -> Dict[str, Dict]:
+    def analyze_by_stat_type(self, graded_results: GradedResults) -> Dict[str, Dict]:
         """
         Analyze agent performance broken down by stat type (pass_yds, rush_yds, etc.)
         Useful for identifying if agents perform differently on different prop types.
         """
-        stat_type_performance = defaultdict(lambda: defaultdict(lambda: {'wins': 0, 'total': 0}))
-
-        for pred in graded_results:
-            result = pred.get('result', 'UNKNOWN')
-            if result not in ['WIN', 'LOSS']:
-                continue
-
-            bet_won = (result == 'WIN')
-            stat_type = pred.get('stat_type', 'unknown').lower()
-            bet_direction = pred.get('bet_type', '').upper()
-            agents = pred.get('agents', {})
-
-            for agent_name, agent_data in agents.items():
-                agent_direction = agent_data.get('direction', '').upper()
+        agents = graded_results.agent_frame
+        counts = graded_results.agent_counts(
+            ['agent', agents['stat_type'].str.lower()],
+            where=agents['result'].isin(['WIN', 'LOSS']) & agents['agrees']
+        )
 
-                if agent_direction == bet_direction:
-                    stat_type_performance[agent_name][stat_type]['total'] += 1
-                    if bet_won:
-                        stat_type_performance[agent_name][stat_type]['wins'] += 1
+        stat_type_performance = defaultdict(dict)
+        for (agent_name, stat_type), row in counts.iterrows():
+            stat_type_performance[agent_name][stat_type] = {'wins': int(row['wins']), 'total': int(row['total'])}
 
         return dict(stat_type_performance)
 
@@ -10,25 +10,27 @@ import re
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# Direct import to avoid circular dependency issues
-import importlib.util
-spec = importlib.util.spec_from_file_location(
-    "data_loader",
-    project_root / "scripts" / "analysis" / "data_loader.py"
-)
-data_loader_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_loader_module)
-normalize_name = data_loader_module.normalize_name
+from scripts.analysis.player_identity import player_id
+from scripts.backtesting.graded_store import GradedResults, GradedResultsStore
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger(__name__)
 
 class ResultGrader:
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, db_path=None):
+        """
+        Args:
+            data_dir: Path to data directory
+            db_path: If set, each graded week's per-agent stats are recorded in this
+                     database for incremental calibration (see CalibrationAnalyzer)
+        """
         self.project_root = Path(__file__).parent.parent.parent
         self.data_dir = data_dir or (self.project_root / "data")
         self.results_dir = self.data_dir / "backtest_results"
+        self.store = GradedResultsStore(self.results_dir)
+        self.db_path = db_path
+        self._calibration = None
         
     def load_actual_stats(self, week: int):
         """
@@ -84,8 +86,8 @@ class ResultGrader:
                     # Skip if row is just garbage/git markers
                     if not isinstance(row.get('Player'), str): continue
                     if 'BASIC' in str(row.get('Player')): continue
-                    player = normalize_name(row.get('Player', ''))
-                    if not player: continue
+                    player = player_id(row.get('Player', ''))
+                    if player is None: continue
                     
                     if player not in stats_map: stats_map[player] = {}
                     
@@ -113,6 +115,12 @@ class ResultGrader:
         with open(pred_file, 'r') as f:
             predictions = json.load(f)
             
+        return self.grade_predictions(week, predictions)
+
+    def grade_predictions(self, week: int, predictions):
+        """
+        Grade in-memory predictions (as written by BacktestEngine) and save the graded file.
+        """
         actuals = self.load_actual_stats(week)
         graded_results = []
         
@@ -137,7 +145,7 @@ class ResultGrader:
         logger.info(f"DEBUG: Loaded {len(actuals)} players in actuals. Samples: {sample_keys}")
         
         for p in predictions:
-            player = normalize_name(p['player_name'])
+            player = player_id(p['player_name'])
             stat_type_raw = p['stat_type'].lower() # Lowercase for matching
             line = p['line']
             bet_type = p['bet_type'] # 'Over' or 'Under'
@@ -190,7 +198,7 @@ class ResultGrader:
                     result = 'PUSH' if actual_val == line else result
             else:
                 if len(graded_results) < 5:
-                    logger.info(f"DEBUG: Failed match for {player} - Key: {internal_key}. In Actuals? {player in actuals}")
+                    logger.info(f"DEBUG: Failed match for {p['player_name']} - Key: {internal_key}. In Actuals? {player in actuals}")
                     if player in actuals:
                         logger.info(f"   Available keys: {list(actuals[player].keys())}")
 
@@ -210,15 +218,29 @@ class ResultGrader:
         output_file = self.results_dir / f"graded_week_{week}.json"
         with open(output_file, 'w') as f:
             json.dump(graded_results, f, indent=2)
+        # Columnar copy for the calibration analyses
+        frame = self.store.append(week, graded_results)
+        if self.db_path:
+            self._record_agent_stats(week, frame)
             
         logger.info(f"💾 Saved graded results to {output_file}")
         return output_file
 
+    def _record_agent_stats(self, week: int, frame: pd.DataFrame):
+        from scripts.backtesting.calibration_analyzer import CalibrationAnalyzer
+
+        try:
+            if self._calibration is None:
+                self._calibration = CalibrationAnalyzer(data_dir=self.data_dir, db_path=str(self.db_path))
+            self._calibration.record_week_stats(GradedResults(frame), weeks=[week])
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record agent stats: {e}")
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--week', type=int, required=True, help='Week to grade')
     args = parser.parse_args()
     
-    grader = ResultGrader()
+    grader = ResultGrader(db_path=str(project_root / "bets.db"))
     grader.grade_week(args.week)
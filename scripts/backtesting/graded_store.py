@@ -0,0 +1,281 @@
+"""
+Graded Results Store - every graded prediction in one columnar table
+
+The grader writes graded_week_{N}.json per week, and each calibration script
+used to re-read those files and re-walk the nested agent dicts in its own
+loops. The store flattens them once into a single frame:
+
+- one row per prediction (week, player, stat type, line, bet, confidence, result)
+- typed per-agent columns: <Agent>_score (float, NaN when the agent is absent)
+  and <Agent>_direction (int8: 1 = OVER, -1 = UNDER, 0 = anything else)
+
+Each week is kept as a column partition (graded_week_{N}.pkl next to the JSON),
+written when the week is graded and rebuilt only if the JSON changes. Analyses
+aggregate through GradedResults.counts() / agent_counts() instead of looping.
+"""
+
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DIRECTION_CODES = {'OVER': 1, 'UNDER': -1}
+SCORE_SUFFIX = '_score'
+DIRECTION_SUFFIX = '_direction'
+
+# Prediction-level columns copied onto each row of the per-agent table
+AGENT_FRAME_COLUMNS = ['week', 'player_name', 'stat_type', 'line', 'bet_type', 'confidence', 'result']
+
+Mask = Union[None, pd.Series, np.ndarray, Callable[[pd.DataFrame], pd.Series]]
+
+
+def direction_code(direction) -> int:
+    return DIRECTION_CODES.get(str(direction or '').upper(), 0)
+
+
+def graded_frame(graded: List[Dict], week: int) -> pd.DataFrame:
+    """Flatten one week of graded predictions (as saved by ResultGrader)"""
+    frame = pd.DataFrame({
+        'week': np.full(len(graded), week, dtype=np.int64),
+        'player_name': [r.get('player_name', '') for r in graded],
+        'team': [r.get('team', '') for r in graded],
+        'opponent': [r.get('opponent', '') for r in graded],
+        'stat_type': [r.get('stat_type', 'Unknown') for r in graded],
+        'line': pd.to_numeric(pd.Series([r.get('line') for r in graded], dtype=object)).astype(float),
+        'bet_type': [(r.get('bet_type') or '').upper() for r in graded],
+        'confidence': pd.to_numeric(pd.Series([r.get('confidence', 0) for r in graded], dtype=object)),
+        'is_home': [bool(r.get('is_home')) for r in graded],
+        'actual_value': pd.to_numeric(pd.Series([r.get('actual_value') for r in graded], dtype=object)),
+        'result': [(r.get('result') or '').upper() for r in graded],
+    })
+
+    # Agents in first-seen order, one score and one direction array each
+    scores: Dict[str, np.ndarray] = {}
+    directions: Dict[str, np.ndarray] = {}
+    for i, r in enumerate(graded):
+        for agent, data in (r.get('agents') or {}).items():
+            if agent not in scores:
+                scores[agent] = np.full(len(graded), np.nan)
+                directions[agent] = np.zeros(len(graded), dtype=np.int8)
+            score = data.get('raw_score', 50)
+            scores[agent][i] = 50 if score is None else score
+            directions[agent][i] = direction_code(data.get('direction'))
+
+    agent_columns = {}
+    for agent in scores:
+        agent_columns[agent + SCORE_SUFFIX] = scores[agent]
+        agent_columns[agent + DIRECTION_SUFFIX] = directions[agent]
+    return pd.concat([frame, pd.DataFrame(agent_columns, index=frame.index)], axis=1)
+
+
+def outcome_counts(frame: pd.DataFrame, by=None, where: Mask = None) -> pd.DataFrame:
+    """
+    Wins, losses, voids (VOID/PUSH), total, decided and win_rate per group.
+
+    Args:
+        frame: Graded rows with a 'result' column
+        by: Column name(s) and/or arrays aligned with frame; None for one overall row
+        where: Boolean mask (or callable frame -> mask) selecting rows first
+
+    Groups keep first-seen order; win_rate is NaN when nothing was decided.
+    """
+    keys = []
+    if by is not None:
+        for key in (by if isinstance(by, (list, tuple)) else [by]):
+            if isinstance(key, str):
+                key = frame[key]
+            keys.append(pd.Series(np.asarray(key), index=frame.index,
+                                  name=getattr(key, 'name', None)))
+
+    if where is not None:
+        mask = np.asarray(where(frame) if callable(where) else where, dtype=bool)
+        frame = frame[mask]
+        keys = [key[mask] for key in keys]
+
+    result = frame['result']
+    flags = pd.DataFrame({
+        'wins': result.eq('WIN').to_numpy(),
+        'losses': result.eq('LOSS').to_numpy(),
+        'voids': result.isin(['VOID', 'PUSH']).to_numpy(),
+    }, index=frame.index).astype(np.int64)
+    flags['total'] = 1
+
+    if keys:
+        counts = flags.groupby(keys, sort=False).sum()
+    else:
+        counts = flags.sum().to_frame().T
+    counts['decided'] = counts['wins'] + counts['losses']
+    counts['win_rate'] = counts['wins'] / counts['decided'].where(counts['decided'] > 0)
+    return counts
+
+
+def count_dicts(counts: pd.DataFrame, columns: Sequence[str] = ('wins', 'losses')) -> Dict:
+    """{group key: {column: int}} from outcome_counts, in group order"""
+    values = counts[list(columns)].to_numpy(np.int64)
+    return {key: dict(zip(columns, map(int, row))) for key, row in zip(counts.index, values)}
+
+
+class GradedResults:
+    """A loaded slice of the store: the prediction frame plus per-agent views"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.reset_index(drop=True)
+        self.agents = [c[:-len(SCORE_SUFFIX)] for c in self.frame.columns if c.endswith(SCORE_SUFFIX)]
+        for agent in self.agents:
+            # Weeks without an agent come back from concat as NaN
+            column = agent + DIRECTION_SUFFIX
+            self.frame[column] = self.frame[column].fillna(0).astype(np.int8)
+        self._agent_frame = None
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def decided(self) -> pd.Series:
+        return self.frame['result'].isin(['WIN', 'LOSS'])
+
+    @property
+    def bet_direction(self) -> np.ndarray:
+        return self.frame['bet_type'].map(DIRECTION_CODES).fillna(0).to_numpy(np.int8)
+
+    def scores(self, agents: Optional[Sequence[str]] = None) -> np.ndarray:
+        """(predictions x agents) scores; NaN where the agent didn't run"""
+        agents = self.agents if agents is None else agents
+        columns = [self.frame[a + SCORE_SUFFIX].to_numpy(float) if a in self.agents
+                   else np.full(len(self), np.nan) for a in agents]
+        return np.column_stack(columns) if columns else np.empty((len(self), 0))
+
+    def directions(self, agents: Optional[Sequence[str]] = None) -> np.ndarray:
+        """(predictions x agents) direction codes; 0 where absent or not OVER/UNDER"""
+        agents = self.agents if agents is None else agents
+        columns = [self.frame[a + DIRECTION_SUFFIX].to_numpy(np.int8) if a in self.agents
+                   else np.zeros(len(self), dtype=np.int8) for a in agents]
+        return np.column_stack(columns) if columns else np.empty((len(self), 0), dtype=np.int8)
+
+    def agreement(self, agents: Optional[Sequence[str]] = None):
+        """Per prediction: (agents agreeing with the bet, agents with an OVER/UNDER call)"""
+        directions = self.directions(agents)
+        signaled = directions != 0
+        agreeing = signaled & (directions == self.bet_direction[:, None])
+        return agreeing.sum(axis=1), signaled.sum(axis=1)
+
+    @property
+    def agent_frame(self) -> pd.DataFrame:
+        """One row per (prediction, agent that ran), agent-major, with the prediction columns"""
+        if self._agent_frame is None:
+            scores = self.scores()
+            columns, rows = np.nonzero(~np.isnan(scores).T)
+            direction = self.directions()[rows, columns]
+            frame = self.frame[AGENT_FRAME_COLUMNS].iloc[rows].reset_index(drop=True)
+            frame.insert(0, 'agent', np.asarray(self.agents, dtype=object)[columns])
+            frame['row'] = rows
+            frame['score'] = scores[rows, columns]
+            frame['direction'] = direction
+            frame['signaled'] = direction != 0
+            frame['agrees'] = frame['signaled'] & (direction == self.bet_direction[rows])
+            self._agent_frame = frame
+        return self._agent_frame
+
+    def counts(self, by=None, where: Mask = None) -> pd.DataFrame:
+        """Outcome counts over predictions (see outcome_counts)"""
+        return outcome_counts(self.frame, by, where)
+
+    def agent_counts(self, by=('agent',), where: Mask = None) -> pd.DataFrame:
+        """Outcome counts over (prediction, agent) rows, by agent by default"""
+        return outcome_counts(self.agent_frame, list(by), where)
+
+
+class GradedResultsStore:
+    """Per-week column partitions of graded results under a backtest_results dir"""
+
+    def __init__(self, results_dir):
+        self.results_dir = Path(results_dir)
+        # week -> (JSON stamp, frame) for partitions already read in this process
+        self._weeks: Dict[int, Tuple] = {}
+
+    def _json_path(self, week: int) -> Path:
+        return self.results_dir / f"graded_week_{week}.json"
+
+    def _partition_path(self, week: int) -> Path:
+        return self.results_dir / f"graded_week_{week}.pkl"
+
+    @staticmethod
+    def _stamp(path: Path):
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def source(self, week: int) -> Optional[str]:
+        """Version tag of a week's graded JSON (changes whenever it is rewritten)"""
+        json_path = self._json_path(week)
+        if not json_path.exists():
+            return None
+        return "{}:{}".format(*self._stamp(json_path))
+
+    def append(self, week: int, graded: List[Dict]) -> pd.DataFrame:
+        """Store a freshly graded week (call after its JSON has been written)"""
+        frame = graded_frame(graded, week)
+        self._write(week, frame)
+        return frame
+
+    def _write(self, week: int, frame: pd.DataFrame):
+        json_path = self._json_path(week)
+        stamp = self._stamp(json_path) if json_path.exists() else None
+        self._weeks[week] = (stamp, frame)
+        try:
+            with open(self._partition_path(week), 'wb') as f:
+                pickle.dump({'source': stamp, 'frame': frame}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save graded partition for Week {week}: {e}")
+
+    def _week_frame(self, week: int) -> Optional[pd.DataFrame]:
+        json_path = self._json_path(week)
+        if not json_path.exists():
+            self._weeks.pop(week, None)
+            return None
+        stamp = self._stamp(json_path)
+        cached = self._weeks.get(week)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        partition_path = self._partition_path(week)
+        if partition_path.exists():
+            try:
+                with open(partition_path, 'rb') as f:
+                    stored = pickle.load(f)
+                if stored.get('source') == stamp:
+                    self._weeks[week] = (stamp, stored['frame'])
+                    return stored['frame']
+            except Exception as e:
+                logger.warning(f"⚠️ Rebuilding graded partition for Week {week}: {e}")
+
+        with open(json_path, 'r') as f:
+            frame = graded_frame(json.load(f), week)
+        self._write(week, frame)
+        return frame
+
+    def graded_weeks(self) -> List[int]:
+        weeks = []
+        for path in self.results_dir.glob("graded_week_*.json"):
+            suffix = path.stem[len("graded_week_"):]
+            if suffix.isdigit():
+                weeks.append(int(suffix))
+        return sorted(weeks)
+
+    def load(self, weeks: Optional[Iterable[int]] = None) -> GradedResults:
+        """Graded predictions for the given weeks (all graded weeks by default), in week order given"""
+        weeks = self.graded_weeks() if weeks is None else list(weeks)
+        frames = []
+        for week in weeks:
+            frame = self._week_frame(week)
+            if frame is not None:
+                frames.append(frame)
+        if not frames:
+            return GradedResults(graded_frame([], 0))
+        return GradedResults(pd.concat(frames, ignore_index=True))
+
@@ -1,16 +1,188 @@
 
-import subprocess
+import os
 import sys
+import time
 import logging
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis import instrumentation
+from scripts.analysis.orchestrator import PropAnalyzer
+from scripts.backtesting.backtest_engine import BacktestEngine
+from scripts.backtesting.grade_results import ResultGrader
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+STAGES = ['load', 'analyze', 'save', 'parlays', 'grade']
+
+
+@dataclass
+class WeekRun:
+    """Outcome and per-stage timings (seconds) for one week"""
+    week: int
+    predictions: int = 0
+    wins: int = 0
+    decided: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Instrumentation recorded by a pool worker for this week (see instrumentation.snapshot)
+    profile: Optional[Dict] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per-process state: the roster, loader and analyzer (SQLite weights) are
+# built once per worker and shared by every week that worker runs
+_engine: Optional[BacktestEngine] = None
+_grader: Optional[ResultGrader] = None
+# Pool workers hand their instrumentation back with each WeekRun
+_ship_profile = False
+
+
+def _init_worker(data_dir: Optional[str] = None, custom_weights: Optional[Dict[str, float]] = None,
+                 profile: bool = False, ship_profile: bool = False):
+    global _engine, _grader, _ship_profile
+    if profile:
+        instrumentation.enable()
+    _ship_profile = profile and ship_profile
+    data_dir = Path(data_dir) if data_dir else None
+    # Same weights database the per-week scripts used (they ran from the project root)
+    analyzer = PropAnalyzer(db_path=str(project_root / "bets.db"), custom_weights=custom_weights)
+    _engine = BacktestEngine(data_dir=data_dir, custom_weights=custom_weights, analyzer=analyzer)
+    # Agent stats are recorded by the parent (see run_weeks): one SQLite writer, not one per worker
+    _grader = ResultGrader(data_dir=data_dir)
+
+
+def _run_week(week: int, skip_backtest: bool = False, skip_grading: bool = False,
+              min_confidence: int = 50) -> WeekRun:
+    """Backtest and grade one week in this process; predictions go straight to the grader"""
+    run = WeekRun(week=week)
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            run.timings[stage] = time.perf_counter() - start
+            if instrumentation.is_enabled():
+                instrumentation.record_time(f"batch.{stage}", run.timings[stage])
+
+    try:
+        predictions = None
+        if not skip_backtest:
+            logger.info(f"▶️ Running Backtest Engine for Week {week}...")
+            context = timed('load', _engine.load_week, week)
+            if context is None:
+                run.error = "no props"
+                return run
+            analyses = timed('analyze', _engine.analyze_week, context, min_confidence)
+            _, predictions = timed('save', _engine.save_predictions, week, analyses)
+            timed('parlays', _engine.save_parlays, week, analyses)
+            run.predictions = len(predictions)
+
+        if not skip_grading:
+            logger.info(f"▶️ Grading Results for Week {week}...")
+            if predictions is None:
+                # Using existing predictions from an earlier run
+                graded = timed('grade', _grader.grade_week, week)
+                if graded is None:
+                    run.error = "no predictions file"
+                    return run
+            else:
+                timed('grade', _grader.grade_predictions, week, predictions)
+                run.wins = sum(1 for p in predictions if p.get('result') == 'WIN')
+                run.decided = sum(1 for p in predictions if p.get('result') in ('WIN', 'LOSS'))
+    except Exception as e:
+        logger.error(f"❌ Week {week} failed: {e}")
+        run.error = str(e)
+    finally:
+        # Every exit ships (and clears) this week's numbers, so none leak into the next week
+        if _ship_profile:
+            run.profile = instrumentation.snapshot()
+            instrumentation.reset()
+    return run
+
+
+def run_weeks(weeks: List[int], skip_backtest=False, skip_grading=False, workers: Optional[int] = None,
+              data_dir=None, custom_weights=None, min_confidence: int = 50,
+              db_path=None, profile: bool = False) -> List[WeekRun]:
+    """
+    Backtest and grade weeks in parallel worker processes (in this process when workers == 1).
+    Returns one WeekRun per week, in week order. With db_path, each graded week's
+    per-agent stats are recorded there for calibration. With profile, instrumentation
+    is on and worker numbers are merged into this process's instrumentation.report().
+    """
+    workers = workers or min(len(weeks), os.cpu_count() or 1)
+    args = (skip_backtest, skip_grading, min_confidence)
+    init_args = (str(data_dir) if data_dir else None, custom_weights)
+    if profile:
+        instrumentation.enable()
+
+    if workers <= 1 or len(weeks) <= 1:
+        _init_worker(*init_args, profile, False)
+        runs = [_run_week(week, *args) for week in weeks]
+    else:
+        runs = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=init_args + (profile, True)) as pool:
+            futures = {pool.submit(_run_week, week, *args): week for week in weeks}
+            for future in as_completed(futures):
+                try:
+                    runs.append(future.result())
+                except Exception as e:  # Worker died (e.g. killed); keep the other weeks
+                    runs.append(WeekRun(week=futures[future], error=str(e)))
+        for run in runs:
+            instrumentation.merge(run.profile)
+
+    runs.sort(key=lambda r: r.week)
+    if db_path and not skip_grading:
+        _record_agent_stats([run.week for run in runs if run.ok], data_dir, db_path)
+    return runs
+
+
+def _record_agent_stats(weeks: List[int], data_dir, db_path):
+    """Per-agent, per-week stats of freshly graded weeks (from the graded store the workers wrote)"""
+    from scripts.backtesting.calibration_analyzer import CalibrationAnalyzer
+
+    if not weeks:
+        return
+    try:
+        calibration = CalibrationAnalyzer(data_dir=str(data_dir) if data_dir else None, db_path=str(db_path))
+        calibration.record_week_stats(calibration.load_graded_results(weeks), weeks=weeks)
+    except Exception as e:
+        logger.error(f"❌ Could not record agent stats for weeks {weeks}: {e}")
+
+
+def format_timing_report(runs: List[WeekRun], wall_time: float) -> str:
+    """Per-week, per-stage timing table plus totals"""
+    header = f"{'Week':>4}  {'Preds':>5}  {'Win%':>6}  " + "  ".join(f"{s:>8}" for s in STAGES) + f"  {'Total':>8}"
+    lines = [header, "-" * len(header)]
+    for run in runs:
+        win_rate = f"{run.wins / run.decided * 100:5.1f}%" if run.decided else f"{'-':>6}"
+        stages = "  ".join(f"{run.timings[s]:7.2f}s" if s in run.timings else f"{'-':>8}" for s in STAGES)
+        status = "" if run.ok else f"  ❌ {run.error}"
+        lines.append(f"{run.week:>4}  {run.predictions:>5}  {win_rate}  {stages}  "
+                     f"{sum(run.timings.values()):7.2f}s{status}")
+    totals = "  ".join(f"{sum(r.timings.get(s, 0) for r in runs):7.2f}s" for s in STAGES)
+    lines.append("-" * len(header))
+    lines.append(f"{'All':>4}  {sum(r.predictions for r in runs):>5}  {'':>6}  {totals}  "
+                 f"{sum(sum(r.timings.values()) for r in runs):7.2f}s")
+    lines.append(f"Wall time: {wall_time:.2f}s")
+    return "\n".join(lines)
+
+
 def run_batch(start_week, end_week, skip_backtest=False, skip_grading=False,
-              run_calibration=False, apply_weights=False):
+              run_calibration=False, apply_weights=False, workers=None, profile=False):
     """
     Run backtesting pipeline for a range of weeks.
 
@@ -21,63 +193,45 @@ def run_batch(start_week, end_week, skip_backtest=False, skip_grading=False,
         skip_grading: Skip grading step (use existing graded results)
         run_calibration: Run calibration analysis after all weeks
         apply_weights: Apply weight adjustments (requires run_calibration)
+        workers: Worker processes (default: one per week, up to the CPU count)
+        profile: Record instrumentation and log its report after the timing table
     """
-    project_root = Path(__file__).parent.parent.parent
-    processed_weeks = []
-
-    for week in range(start_week, end_week + 1):
-        logger.info(f"\n{'='*50}")
-        logger.info(f"🔄 PROCESSING WEEK {week}")
-        logger.info(f"{'='*50}")
+    weeks = list(range(start_week, end_week + 1))
+    logger.info(f"\n{'='*50}")
+    logger.info(f"🔄 PROCESSING WEEKS {start_week}-{end_week}")
+    logger.info(f"{'='*50}")
 
-        # 1. Run Backtest Engine (generate predictions)
-        if not skip_backtest:
-            logger.info(f"▶️ Running Backtest Engine for Week {week}...")
-            try:
-                cmd = [sys.executable, "scripts/backtesting/backtest_engine.py", "--week", str(week)]
-                subprocess.run(cmd, check=True, cwd=project_root)
-            except subprocess.CalledProcessError:
-                logger.error(f"❌ Backtest failed for Week {week}. Skipping grading.")
-                continue
-        else:
-            logger.info(f"⏭️ Skipping backtest (using existing predictions)")
-
-        # 2. Run Grader
-        if not skip_grading:
-            logger.info(f"▶️ Grading Results for Week {week}...")
-            try:
-                cmd = [sys.executable, "scripts/backtesting/grade_results.py", "--week", str(week)]
-                subprocess.run(cmd, check=True, cwd=project_root)
-                processed_weeks.append(week)
-            except subprocess.CalledProcessError:
-                logger.error(f"❌ Grading failed for Week {week}.")
-                continue
-        else:
-            logger.info(f"⏭️ Skipping grading (using existing graded results)")
-            processed_weeks.append(week)
+    started = time.perf_counter()
+    # Graded weeks record their agent stats up front when they will be calibrated
+    db_path = project_root / "bets.db" if run_calibration else None
+    runs = run_weeks(weeks, skip_backtest=skip_backtest, skip_grading=skip_grading, workers=workers,
+                     db_path=db_path, profile=profile)
+    processed_weeks = [run.week for run in runs if run.ok]
 
     logger.info("\n✅ Batch processing complete.")
+    logger.info("\n" + format_timing_report(runs, time.perf_counter() - started))
+    if profile:
+        logger.info("\n📈 PROFILE\n" + instrumentation.report().format())
 
     # 3. Run Calibration Analysis (optional)
     if run_calibration and processed_weeks:
+        from scripts.backtesting.calibration_analyzer import CalibrationAnalyzer
+
         logger.info(f"\n{'='*50}")
         logger.info(f"🧠 RUNNING CALIBRATION ANALYSIS")
         logger.info(f"{'='*50}")
 
-        weeks_arg = f"{start_week}-{end_week}"
-        cmd = [sys.executable, "scripts/backtesting/calibration_analyzer.py",
-               "--weeks", weeks_arg]
-
         if apply_weights:
-            cmd.append("--apply")
             logger.info("⚠️ Weight adjustments will be APPLIED")
         else:
             logger.info("📋 Running in dry-run mode (no changes)")
 
         try:
-            subprocess.run(cmd, check=True, cwd=project_root)
-        except subprocess.CalledProcessError:
-            logger.error("❌ Calibration analysis failed.")
+            CalibrationAnalyzer(db_path=str(project_root / "bets.db")).run_calibration(
+                weeks=weeks, dry_run=not apply_weights
+            )
+        except Exception as e:
+            logger.error(f"❌ Calibration analysis failed: {e}")
 
     return processed_weeks
 
@@ -93,6 +247,10 @@ if __name__ == "__main__":
                         help='Run calibration analysis after processing')
     parser.add_argument('--apply-weights', action='store_true',
                         help='Apply weight adjustments (use with --calibrate)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per week, up to CPU count; 1 = in-process)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Report per-stage/per-agent timings, cache hit rates and peak memory')
 
     args = parser.parse_args()
 
@@ -102,5 +260,7 @@ if __name__ == "__main__":
         skip_backtest=args.skip_backtest,
         skip_grading=args.skip_grading,
         run_calibration=args.calibrate,
-        apply_weights=args.apply_weights
+        apply_weights=args.apply_weights,
+        workers=args.workers,
+        profile=args.profile
     )
@@ -0,0 +1,126 @@
+"""
+Benchmark API read throughput: sync sessions (threadpool) vs async sessions.
+
+Mounts the same read queries twice on a throwaway FastAPI app - once through
+get_db (sync Session, FastAPI threadpool) and once through get_async_db
+(AsyncSession on the async engine) - and fires concurrent requests at each.
+
+Usage:
+    python scripts/benchmark_api_db.py --requests 2000 --concurrency 50
+    DATABASE_URL=postgresql://... python scripts/benchmark_api_db.py
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api.database import Player, PlayerProjection, get_async_db, get_db
+
+
+def build_app(week: int) -> FastAPI:
+    """Two equivalent endpoints per query: /sync/* and /async/*."""
+    app = FastAPI()
+
+    def feed_query(limit: int = 20):
+        return select(PlayerProjection, Player).join(
+            Player, Player.id == PlayerProjection.player_id
+        ).where(
+            PlayerProjection.week == week,
+            PlayerProjection.confidence.isnot(None),
+        ).order_by(PlayerProjection.confidence.desc()).limit(limit)
+
+    @app.get("/sync/feed")
+    def sync_feed(db: Session = Depends(get_db)):
+        rows = db.execute(feed_query()).all()
+        return {"count": len(rows)}
+
+    @app.get("/async/feed")
+    async def async_feed(db: AsyncSession = Depends(get_async_db)):
+        rows = (await db.execute(feed_query())).all()
+        return {"count": len(rows)}
+
+    @app.get("/sync/search")
+    def sync_search(db: Session = Depends(get_db)):
+        rows = db.execute(select(Player).where(Player.name.ilike("%a%")).limit(20)).scalars().all()
+        return {"count": len(rows)}
+
+    @app.get("/async/search")
+    async def async_search(db: AsyncSession = Depends(get_async_db)):
+        rows = (await db.execute(select(Player).where(Player.name.ilike("%a%")).limit(20))).scalars().all()
+        return {"count": len(rows)}
+
+    return app
+
+
+async def run_load(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> dict:
+    """Send `total` GETs to `path` with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "req_per_s": round(total / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Sync vs async DB session throughput")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--week", type=int, default=17)
+    args = parser.parse_args()
+
+    app = build_app(args.week)
+    transport = httpx.ASGITransport(app=app)
+
+    print("=" * 70)
+    print(f"API DB BENCHMARK - {args.requests} requests, concurrency {args.concurrency}")
+    print("=" * 70)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for query in ("feed", "search"):
+            # Warm both pools before timing
+            await client.get(f"/sync/{query}")
+            await client.get(f"/async/{query}")
+            for mode in ("sync", "async"):
+                result = await run_load(client, f"/{mode}/{query}", args.requests, args.concurrency)
+                print(
+                    f"{result['path']:<16} {result['req_per_s']:>9} req/s  "
+                    f"p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms  "
+                    f"errors {result['errors']}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,146 @@
+"""
+Benchmark CLI cold start: import time and time-to-prompt.
+
+Each measurement runs in a fresh interpreter so nothing is warm. Reports:
+- wall time to import each entry-point module
+- time until BettingAnalyzerCLI is constructed (what the user waits for
+  before the first prompt)
+- heavy optional modules that leaked into startup (LLM SDKs, Tk, SQLAlchemy)
+- the slowest imports from `python -X importtime`
+
+Exits non-zero when time-to-prompt exceeds the budget, so it can gate CI.
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --budget 1.0 --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+ENTRY_MODULES = [
+    "scripts.analysis.orchestrator",
+    "scripts.analysis.data_loader",
+    "scripts.analysis.analysis_session",
+]
+
+# Must not be imported before the first prompt
+DEFERRED_MODULES = [
+    "anthropic",
+    "google.generativeai",
+    "tkinter",
+    "sqlalchemy",
+    "scripts.api.claude_query_handler",
+    "scripts.analysis.chat_interface",
+    "scripts.utils.parlay_gui",
+    "auto_scorer",
+    "prop_logger",
+    "props_scorer",
+]
+
+# Runs in the child interpreter; prints a JSON result line
+_PROMPT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import betting_cli
+imported = time.perf_counter()
+cli = betting_cli.BettingAnalyzerCLI()
+ready = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "prompt_s": ready - start,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+_IMPORT_PROBE = """
+import json, time, importlib
+start = time.perf_counter()
+importlib.import_module(%r)
+print(json.dumps({"import_s": time.perf_counter() - start}))
+"""
+
+
+def _run_child(code: str, extra_args=()) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(project_root))
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        cwd=project_root, env=env, capture_output=True, text=True,
+    )
+
+
+def _last_json(proc: subprocess.CompletedProcess) -> dict:
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "child failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(code: str, runs: int) -> list:
+    return [_last_json(_run_child(code)) for _ in range(runs)]
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """(cumulative_ms, module) for the slowest imports below `module`"""
+    proc = _run_child(f"import {module}", extra_args=("-X", "importtime"))
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us | cumulative_us | <indent>module"
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us) / 1000, name.strip()))
+    # Only top-level packages give a readable picture
+    rows = [r for r in rows if "." not in r[1] or r[1].startswith("scripts.")]
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI import-time / time-to-prompt benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=1.0, help="Max seconds to first prompt")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"IMPORT-TIME BENCHMARK ({args.runs} cold runs each)")
+    print("=" * 70)
+
+    for module in ENTRY_MODULES:
+        results = measure(_IMPORT_PROBE % module, args.runs)
+        median_ms = statistics.median(r["import_s"] for r in results) * 1000
+        print(f"import {module:<40} {median_ms:8.1f} ms")
+
+    try:
+        prompt_runs = measure(_PROMPT_PROBE, args.runs)
+    except RuntimeError as e:
+        print(f"\n❌ betting_cli failed to start: {e}")
+        sys.exit(2)
+
+    import_ms = statistics.median(r["import_s"] for r in prompt_runs) * 1000
+    prompt_s = statistics.median(r["prompt_s"] for r in prompt_runs)
+    print(f"import betting_cli{'':<30} {import_ms:8.1f} ms")
+    print(f"time to prompt{'':<34} {prompt_s * 1000:8.1f} ms  (budget {args.budget * 1000:.0f} ms)")
+
+    leaked = prompt_runs[-1]["loaded"]
+    if leaked:
+        print(f"\n⚠️  Deferred modules imported at startup: {', '.join(leaked)}")
+
+    print("\nSlowest imports under betting_cli (cumulative):")
+    for ms, name in slowest_imports("betting_cli", args.top):
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if prompt_s > args.budget:
+        print(f"\n❌ Time to prompt {prompt_s:.2f}s exceeds budget {args.budget:.2f}s")
+        sys.exit(1)
+    print("\n✅ Within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,169 +11,92 @@ Possible hypotheses:
 This script tests these hypotheses.
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict
 from itertools import combinations
 
+import numpy as np
+
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.backtesting.graded_store import GradedResults, GradedResultsStore, count_dicts
 
-def load_graded_results(weeks: List[int]) -> List[dict]:
-    """Load all graded results from specified weeks."""
-    results_dir = project_root / "data" / "backtest_results"
-    all_results = []
-
-    for week in weeks:
-        graded_file = results_dir / f"graded_week_{week}.json"
-        if graded_file.exists():
-            with open(graded_file, 'r') as f:
-                week_results = json.load(f)
-                for r in week_results:
-                    r['week'] = week
-                all_results.extend(week_results)
-
-    return all_results
 
-
-def analyze_individual_agent_agreement(results: List[dict]) -> Dict:
+def analyze_individual_agent_agreement(results: GradedResults) -> Dict:
     """
     For each agent: what's the win rate when it agrees vs disagrees with final bet?
 
     Hypothesis: "Bad" agents (Matchup, Volume) disagreeing might be a positive signal.
     """
+    agents = results.agent_frame
+    counts = results.agent_counts(['agent', 'agrees'],
+                                  where=agents['signaled'] & agents['result'].isin(['WIN', 'LOSS']))
+
     agent_stats = defaultdict(lambda: {
         'agrees_wins': 0, 'agrees_losses': 0,
         'disagrees_wins': 0, 'disagrees_losses': 0
     })
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        for agent_name, agent_data in agents.items():
-            agent_dir = agent_data.get('direction', '').upper()
-
-            if agent_dir not in ('OVER', 'UNDER'):
-                continue
-
-            agrees = (agent_dir == final_direction)
-
-            if agrees:
-                if result == 'WIN':
-                    agent_stats[agent_name]['agrees_wins'] += 1
-                else:
-                    agent_stats[agent_name]['agrees_losses'] += 1
-            else:
-                if result == 'WIN':
-                    agent_stats[agent_name]['disagrees_wins'] += 1
-                else:
-                    agent_stats[agent_name]['disagrees_losses'] += 1
+    for (agent_name, agrees), data in count_dicts(counts).items():
+        prefix = 'agrees' if agrees else 'disagrees'
+        agent_stats[agent_name][f'{prefix}_wins'] += data['wins']
+        agent_stats[agent_name][f'{prefix}_losses'] += data['losses']
 
     return dict(agent_stats)
 
 
-def analyze_contrarian_signals(results: List[dict]) -> Dict:
+def analyze_contrarian_signals(results: GradedResults) -> Dict:
     """
     When a specific agent disagrees with the consensus, what happens?
 
     This helps identify which agents provide valuable contrarian signals.
     """
-    contrarian_stats = defaultdict(lambda: {'wins': 0, 'losses': 0})
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        # Count how many agents agree with final direction
-        agreeing_agents = []
-        disagreeing_agents = []
-
-        for agent_name, agent_data in agents.items():
-            agent_dir = agent_data.get('direction', '').upper()
-            if agent_dir in ('OVER', 'UNDER'):
-                if agent_dir == final_direction:
-                    agreeing_agents.append(agent_name)
-                else:
-                    disagreeing_agents.append(agent_name)
+    agents = results.agent_frame
+    disagreeing = agents['signaled'] & ~agents['agrees'] & agents['result'].isin(['WIN', 'LOSS'])
 
-        # For each disagreeing agent, track outcomes
-        for agent in disagreeing_agents:
-            key = f"{agent}_disagrees"
-            if result == 'WIN':
-                contrarian_stats[key]['wins'] += 1
-            else:
-                contrarian_stats[key]['losses'] += 1
+    # For each disagreeing agent, track outcomes
+    counts = results.agent_counts(where=disagreeing)
+    return {f"{agent}_disagrees": data for agent, data in count_dicts(counts).items()}
 
-    return dict(contrarian_stats)
 
-
-def analyze_agent_pair_agreement(results: List[dict]) -> Dict:
+def analyze_agent_pair_agreement(results: GradedResults) -> Dict:
     """
     When specific pairs of agents agree/disagree, what's the win rate?
 
     Helps identify which agent combinations are predictive.
     """
-    pair_stats = defaultdict(lambda: {
-        'both_agree_wins': 0, 'both_agree_losses': 0,
-        'both_disagree_wins': 0, 'both_disagree_losses': 0,
-        'split_wins': 0, 'split_losses': 0
-    })
-
     agents_of_interest = ['DVOA', 'Matchup', 'Volume', 'Injury', 'HitRate']
 
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
+    # Get agent directions
+    directions = results.directions(agents_of_interest)
+    signaled = directions != 0
+    agrees = directions == results.bet_direction[:, None]
+    decided = results.decided.to_numpy()
 
-        if result not in ('WIN', 'LOSS'):
+    pair_stats = {}
+    for (i, a1), (j, a2) in combinations(enumerate(agents_of_interest), 2):
+        both_signaled = decided & signaled[:, i] & signaled[:, j]
+        if not both_signaled.any():
             continue
 
-        # Get agent directions
-        agent_dirs = {}
-        for agent_name in agents_of_interest:
-            if agent_name in agents:
-                agent_dir = agents[agent_name].get('direction', '').upper()
-                if agent_dir in ('OVER', 'UNDER'):
-                    agent_dirs[agent_name] = (agent_dir == final_direction)
-
-        # Check all pairs
-        for a1, a2 in combinations(agents_of_interest, 2):
-            if a1 not in agent_dirs or a2 not in agent_dirs:
-                continue
-
-            pair_key = f"{a1}+{a2}"
-            a1_agrees = agent_dirs[a1]
-            a2_agrees = agent_dirs[a2]
+        category = np.select(
+            [agrees[:, i] & agrees[:, j], ~agrees[:, i] & ~agrees[:, j]],
+            ['both_agree', 'both_disagree'],
+            default='split'
+        )
+        stats = {f'{c}_{outcome}': 0 for c in ('both_agree', 'both_disagree', 'split')
+                 for outcome in ('wins', 'losses')}
+        for c, data in count_dicts(results.counts(category, where=both_signaled)).items():
+            stats[f'{c}_wins'] = data['wins']
+            stats[f'{c}_losses'] = data['losses']
+        pair_stats[f"{a1}+{a2}"] = stats
 
-            if a1_agrees and a2_agrees:
-                category = 'both_agree'
-            elif not a1_agrees and not a2_agrees:
-                category = 'both_disagree'
-            else:
-                category = 'split'
+    return pair_stats
 
-            if result == 'WIN':
-                pair_stats[pair_key][f'{category}_wins'] += 1
-            else:
-                pair_stats[pair_key][f'{category}_losses'] += 1
 
-    return dict(pair_stats)
-
-
-def analyze_good_vs_bad_agent_split(results: List[dict]) -> Dict:
+def analyze_good_vs_bad_agent_split(results: GradedResults) -> Dict:
     """
     What happens when "good" agents (Injury, DVOA, Variance) agree
     but "bad" agents (Matchup, Volume) disagree?
@@ -190,114 +113,54 @@ def analyze_good_vs_bad_agent_split(results: List[dict]) -> Dict:
     good_agents = ['Injury', 'DVOA', 'Variance']
     bad_agents = ['Matchup', 'Volume']
 
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        # Check good agents
-        good_agreeing = 0
-        good_total = 0
-        for agent_name in good_agents:
-            if agent_name in agents:
-                agent_dir = agents[agent_name].get('direction', '').upper()
-                if agent_dir in ('OVER', 'UNDER'):
-                    good_total += 1
-                    if agent_dir == final_direction:
-                        good_agreeing += 1
-
-        # Check bad agents
-        bad_agreeing = 0
-        bad_total = 0
-        for agent_name in bad_agents:
-            if agent_name in agents:
-                agent_dir = agents[agent_name].get('direction', '').upper()
-                if agent_dir in ('OVER', 'UNDER'):
-                    bad_total += 1
-                    if agent_dir == final_direction:
-                        bad_agreeing += 1
-
-        # Categorize
-        if good_total >= 2 and bad_total >= 1:
-            good_majority = good_agreeing >= (good_total / 2)
-            bad_majority = bad_agreeing >= (bad_total / 2)
-
-            if good_majority and not bad_majority:
-                category = 'good_agree_bad_disagree'
-            elif not good_majority and bad_majority:
-                category = 'good_disagree_bad_agree'
-            elif good_majority and bad_majority:
-                category = 'all_good_agree'  # Using this for "all agree" case
-            else:
-                continue  # Skip when neither group has majority
-
-            if result == 'WIN':
-                stats[category]['wins'] += 1
-            else:
-                stats[category]['losses'] += 1
-
+    good_agreeing, good_total = results.agreement(good_agents)
+    bad_agreeing, bad_total = results.agreement(bad_agents)
+    good_majority = good_agreeing >= (good_total / 2)
+    bad_majority = bad_agreeing >= (bad_total / 2)
+
+    # Categorize (skip when neither group has majority)
+    category = np.select(
+        [good_majority & ~bad_majority,
+         ~good_majority & bad_majority,
+         good_majority & bad_majority],  # Using all_good_agree for "all agree" case
+        ['good_agree_bad_disagree', 'good_disagree_bad_agree', 'all_good_agree'],
+        default=''
+    )
+    eligible = results.decided & (good_total >= 2) & (bad_total >= 1) & (category != '')
+
+    stats.update(count_dicts(results.counts(category, where=eligible)))
     return stats
 
 
-def analyze_confidence_with_disagreement(results: List[dict]) -> Dict:
+def analyze_confidence_with_disagreement(results: GradedResults) -> Dict:
     """
     Does the relationship between confidence and win rate change
     based on agent agreement level?
     """
-    stats = defaultdict(lambda: defaultdict(lambda: {'wins': 0, 'losses': 0}))
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-        confidence = r.get('confidence', 50)
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        # Calculate agreement %
-        agreeing = 0
-        total = 0
-        for agent_name, agent_data in agents.items():
-            agent_dir = agent_data.get('direction', '').upper()
-            if agent_dir in ('OVER', 'UNDER'):
-                total += 1
-                if agent_dir == final_direction:
-                    agreeing += 1
-
-        if total == 0:
-            continue
-
+    agreeing, total = results.agreement()
+    with np.errstate(divide='ignore', invalid='ignore'):
         agreement_pct = agreeing / total * 100
 
-        # Bucket agreement
-        if agreement_pct >= 80:
-            agreement_bucket = 'high (80%+)'
-        elif agreement_pct >= 50:
-            agreement_bucket = 'medium (50-80%)'
-        else:
-            agreement_bucket = 'low (<50%)'
+    # Bucket agreement
+    agreement_bucket = np.select(
+        [agreement_pct >= 80, agreement_pct >= 50],
+        ['high (80%+)', 'medium (50-80%)'],
+        default='low (<50%)'
+    )
 
-        # Bucket confidence
-        if confidence >= 75:
-            conf_bucket = '75%+'
-        elif confidence >= 60:
-            conf_bucket = '60-75%'
-        else:
-            conf_bucket = '<60%'
+    # Bucket confidence
+    confidence = results.frame['confidence'].to_numpy()
+    conf_bucket = np.select([confidence >= 75, confidence >= 60], ['75%+', '60-75%'], default='<60%')
 
-        if result == 'WIN':
-            stats[agreement_bucket][conf_bucket]['wins'] += 1
-        else:
-            stats[agreement_bucket][conf_bucket]['losses'] += 1
+    stats = defaultdict(dict)
+    counts = results.counts([agreement_bucket, conf_bucket], where=results.decided & (total > 0))
+    for (agreement, conf), data in count_dicts(counts).items():
+        stats[agreement][conf] = data
 
-    return {k: dict(v) for k, v in stats.items()}
+    return dict(stats)
 
 
-def print_analysis(results: List[dict]):
+def print_analysis(results: GradedResults):
     """Run and print all analyses."""
 
     print("\n" + "=" * 80)
@@ -468,7 +331,7 @@ def main():
         weeks = [int(w) for w in args.weeks.split(',')]
 
     print(f"Loading data for weeks {weeks}...")
-    results = load_graded_results(weeks)
+    results = GradedResultsStore(project_root / "data" / "backtest_results").load(weeks)
 
     if not results:
         print("No results found!")
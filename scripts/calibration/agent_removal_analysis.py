@@ -9,80 +9,57 @@ Criteria for removal:
 3. Adds noise without improving accuracy
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
 
+import pandas as pd
+
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-
-def load_graded_results(weeks):
-    results_dir = project_root / "data" / "backtest_results"
-    all_results = []
-    for week in weeks:
-        graded_file = results_dir / f"graded_week_{week}.json"
-        if graded_file.exists():
-            with open(graded_file, 'r') as f:
-                week_results = json.load(f)
-                all_results.extend(week_results)
-    return all_results
+from scripts.backtesting.graded_store import GradedResultsStore, count_dicts
 
 
 def analyze_agent_value(results):
     """Analyze each agent's contribution and predictive value."""
-
-    agent_stats = defaultdict(lambda: {
-        'total_appearances': 0,
-        'neutral_scores': 0,  # Score == 50
-        'strong_signals': 0,  # Score >= 65 or <= 35
-        'agrees_wins': 0,
-        'agrees_losses': 0,
-        'disagrees_wins': 0,
-        'disagrees_losses': 0,
-        'score_distribution': defaultdict(int),
-    })
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        for agent_name, agent_data in agents.items():
-            stats = agent_stats[agent_name]
-            stats['total_appearances'] += 1
-
-            score = agent_data.get('raw_score', 50)
-            direction = agent_data.get('direction', '').upper()
-
-            # Track score distribution
-            bucket = (score // 10) * 10
-            stats['score_distribution'][bucket] += 1
-
-            # Track neutral scores
-            if score == 50:
-                stats['neutral_scores'] += 1
-
-            # Track strong signals
-            if score >= 65 or score <= 35:
-                stats['strong_signals'] += 1
-
-            # Track accuracy
-            if result in ('WIN', 'LOSS') and direction in ('OVER', 'UNDER'):
-                agrees = (direction == final_direction)
-                if agrees:
-                    if result == 'WIN':
-                        stats['agrees_wins'] += 1
-                    else:
-                        stats['agrees_losses'] += 1
-                else:
-                    if result == 'WIN':
-                        stats['disagrees_wins'] += 1
-                    else:
-                        stats['disagrees_losses'] += 1
-
-    return dict(agent_stats)
+    agents = results.agent_frame
+    score = agents['score']
+
+    # Appearances, neutral scores (== 50) and strong signals (>= 65 or <= 35)
+    signal = pd.DataFrame({
+        'total_appearances': 1,
+        'neutral_scores': score.eq(50),
+        'strong_signals': (score >= 65) | (score <= 35),
+    }, index=agents.index).groupby(agents['agent'], sort=False).sum()
+
+    # Track score distribution
+    distribution = agents.groupby(['agent', (score // 10 * 10).astype(int)], sort=False).size()
+
+    # Track accuracy
+    accuracy = results.agent_counts(['agent', 'agrees'],
+                                    where=agents['signaled'] & agents['result'].isin(['WIN', 'LOSS']))
+
+    agent_stats = {}
+    for agent_name, row in signal.iterrows():
+        agent_stats[agent_name] = {
+            'total_appearances': int(row['total_appearances']),
+            'neutral_scores': int(row['neutral_scores']),
+            'strong_signals': int(row['strong_signals']),
+            'agrees_wins': 0,
+            'agrees_losses': 0,
+            'disagrees_wins': 0,
+            'disagrees_losses': 0,
+            'score_distribution': defaultdict(int),
+        }
+    for (agent_name, bucket), count in distribution.items():
+        agent_stats[agent_name]['score_distribution'][int(bucket)] = int(count)
+    for (agent_name, agrees), data in count_dicts(accuracy).items():
+        prefix = 'agrees' if agrees else 'disagrees'
+        agent_stats[agent_name][f'{prefix}_wins'] = data['wins']
+        agent_stats[agent_name][f'{prefix}_losses'] = data['losses']
+
+    return agent_stats
 
 
 def print_analysis(agent_stats):
@@ -195,7 +172,7 @@ KEEP AS-IS (predictive value):
 def main():
     weeks = list(range(11, 17))
     print(f"Loading data for weeks {weeks}...")
-    results = load_graded_results(weeks)
+    results = GradedResultsStore(project_root / "data" / "backtest_results").load(weeks)
     print(f"Loaded {len(results)} predictions")
 
     agent_stats = analyze_agent_value(results)
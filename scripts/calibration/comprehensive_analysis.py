@@ -5,187 +5,106 @@ Comprehensive Season Analysis
 Runs multiple analyses on graded backtest data to identify actionable patterns.
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict
+
+import numpy as np
+import pandas as pd
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-
-def load_graded_results(weeks: List[int]) -> List[dict]:
-    """Load all graded results from specified weeks."""
-    results_dir = project_root / "data" / "backtest_results"
-    all_results = []
-
-    for week in weeks:
-        graded_file = results_dir / f"graded_week_{week}.json"
-        if graded_file.exists():
-            with open(graded_file, 'r') as f:
-                week_results = json.load(f)
-                for r in week_results:
-                    r['week'] = week
-                all_results.extend(week_results)
-
-    return all_results
+from scripts.backtesting.graded_store import GradedResults, GradedResultsStore, count_dicts
 
 
-def analyze_stat_types(results: List[dict]) -> Dict:
+def analyze_stat_types(results: GradedResults) -> Dict:
     """Analyze performance by stat type."""
-    stats = defaultdict(lambda: {'wins': 0, 'losses': 0, 'voids': 0})
+    counts = results.counts('stat_type')
+    counts['voids'] = counts['total'] - counts['decided']
+    return count_dicts(counts, ('wins', 'losses', 'voids'))
 
-    for r in results:
-        stat_type = r.get('stat_type', 'Unknown')
-        result = r.get('result', '').upper()
 
-        if result == 'WIN':
-            stats[stat_type]['wins'] += 1
-        elif result == 'LOSS':
-            stats[stat_type]['losses'] += 1
-        else:
-            stats[stat_type]['voids'] += 1
-
-    return dict(stats)
-
-
-def analyze_over_under_bias(results: List[dict]) -> Dict:
+def analyze_over_under_bias(results: GradedResults) -> Dict:
     """Analyze over vs under performance."""
+    decided = results.frame['bet_type'].isin(['OVER', 'UNDER']) & results.decided
+
     bias = {
         'OVER': {'wins': 0, 'losses': 0},
         'UNDER': {'wins': 0, 'losses': 0}
     }
+    bias.update(count_dicts(results.counts('bet_type', where=decided)))
 
     by_stat = defaultdict(lambda: {
         'OVER': {'wins': 0, 'losses': 0},
         'UNDER': {'wins': 0, 'losses': 0}
     })
-
-    for r in results:
-        bet_type = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-        stat_type = r.get('stat_type', 'Unknown')
-
-        if bet_type in ('OVER', 'UNDER') and result in ('WIN', 'LOSS'):
-            if result == 'WIN':
-                bias[bet_type]['wins'] += 1
-                by_stat[stat_type][bet_type]['wins'] += 1
-            else:
-                bias[bet_type]['losses'] += 1
-                by_stat[stat_type][bet_type]['losses'] += 1
+    for (stat_type, bet_type), data in count_dicts(results.counts(['stat_type', 'bet_type'], where=decided)).items():
+        by_stat[stat_type][bet_type] = data
 
     return {'overall': bias, 'by_stat': dict(by_stat)}
 
 
-def analyze_agent_performance(results: List[dict]) -> Dict:
+def analyze_agent_performance(results: GradedResults) -> Dict:
     """Analyze individual agent predictive power."""
+    agents = results.agent_frame
+
+    # Agent was "right" if: agreed with winning bet OR disagreed with losing bet
+    agent_correct = agents['agrees'] == agents['result'].eq('WIN')
+    strong = agents['score'] >= 70
+    counts = results.agent_counts(['agent', agent_correct, strong],
+                                  where=agents['signaled'] & agents['result'].isin(['WIN', 'LOSS']))
+
     agent_stats = defaultdict(lambda: {
         'correct_direction': 0,
         'wrong_direction': 0,
         'strong_correct': 0,  # score >= 70 and correct
         'strong_wrong': 0,    # score >= 70 and wrong
     })
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        for agent_name, agent_data in agents.items():
-            agent_dir = agent_data.get('direction', '').upper()
-            agent_score = agent_data.get('raw_score', 50)
-
-            if agent_dir in ('OVER', 'UNDER'):
-                # Did agent agree with final bet direction?
-                agreed = (agent_dir == final_direction)
-
-                # Was the final bet correct?
-                bet_correct = (result == 'WIN')
-
-                # Agent was "right" if: agreed with winning bet OR disagreed with losing bet
-                agent_correct = (agreed and bet_correct) or (not agreed and not bet_correct)
-
-                if agent_correct:
-                    agent_stats[agent_name]['correct_direction'] += 1
-                    if agent_score >= 70:
-                        agent_stats[agent_name]['strong_correct'] += 1
-                else:
-                    agent_stats[agent_name]['wrong_direction'] += 1
-                    if agent_score >= 70:
-                        agent_stats[agent_name]['strong_wrong'] += 1
+    for (agent_name, correct, is_strong), total in counts['total'].items():
+        agent_stats[agent_name]['correct_direction' if correct else 'wrong_direction'] += int(total)
+        if is_strong:
+            agent_stats[agent_name]['strong_correct' if correct else 'strong_wrong'] += int(total)
 
     return dict(agent_stats)
 
 
-def analyze_agent_agreement(results: List[dict]) -> Dict:
+def analyze_agent_agreement(results: GradedResults) -> Dict:
     """Analyze performance based on how many agents agree."""
-    agreement_stats = defaultdict(lambda: {'wins': 0, 'losses': 0})
-
-    for r in results:
-        agents = r.get('agents', {})
-        final_direction = r.get('bet_type', '').upper()
-        result = r.get('result', '').upper()
-
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        # Count agents agreeing with final direction
-        agreeing = 0
-        total_agents = 0
-
-        for agent_name, agent_data in agents.items():
-            agent_dir = agent_data.get('direction', '').upper()
-            if agent_dir in ('OVER', 'UNDER'):
-                total_agents += 1
-                if agent_dir == final_direction:
-                    agreeing += 1
+    # Count agents agreeing with final direction
+    agreeing, total_agents = results.agreement()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        agreement_pct = np.nan_to_num(agreeing / total_agents * 100).astype(int)
 
-        if total_agents > 0:
-            agreement_pct = int(agreeing / total_agents * 100)
-            bucket = f"{(agreement_pct // 20) * 20}-{(agreement_pct // 20) * 20 + 20}%"
+    bucket_start = pd.Series((agreement_pct // 20) * 20)
+    bucket = bucket_start.astype(str) + '-' + (bucket_start + 20).astype(str) + '%'
 
-            if result == 'WIN':
-                agreement_stats[bucket]['wins'] += 1
-            else:
-                agreement_stats[bucket]['losses'] += 1
-
-    return dict(agreement_stats)
+    counts = results.counts(bucket, where=results.decided & (total_agents > 0))
+    return count_dicts(counts)
 
 
-def analyze_line_ranges(results: List[dict]) -> Dict:
+def analyze_line_ranges(results: GradedResults) -> Dict:
     """Analyze performance by line value ranges."""
-    # Group by stat type and line range
-    line_stats = defaultdict(lambda: defaultdict(lambda: {'wins': 0, 'losses': 0}))
-
-    for r in results:
-        stat_type = r.get('stat_type', 'Unknown')
-        line = r.get('line', 0)
-        result = r.get('result', '').upper()
+    stat_type = results.frame['stat_type']
+
+    # Create line bucket based on stat type
+    bucket_size = np.select(
+        [stat_type.str.contains('Yards', regex=False),
+         stat_type.str.contains('Attempts|Receptions|Completions')],
+        [20, 5],
+        default=1
+    )
+    bucket_start = (results.frame['line'].fillna(0) // bucket_size).astype(int) * bucket_size
+    bucket = bucket_start.astype(str) + '-' + (bucket_start + bucket_size).astype(str)
 
-        if result not in ('WIN', 'LOSS'):
-            continue
-
-        # Create line bucket based on stat type
-        if 'Yards' in stat_type:
-            bucket_size = 20
-        elif 'Attempts' in stat_type or 'Receptions' in stat_type or 'Completions' in stat_type:
-            bucket_size = 5
-        else:
-            bucket_size = 1
-
-        bucket_start = int(line // bucket_size) * bucket_size
-        bucket = f"{bucket_start}-{bucket_start + bucket_size}"
-
-        if result == 'WIN':
-            line_stats[stat_type][bucket]['wins'] += 1
-        else:
-            line_stats[stat_type][bucket]['losses'] += 1
+    # Group by stat type and line range
+    line_stats = defaultdict(dict)
+    for (stat, line_bucket), data in count_dicts(results.counts(['stat_type', bucket],
+                                                                where=results.decided)).items():
+        line_stats[stat][line_bucket] = data
 
-    return {k: dict(v) for k, v in line_stats.items()}
+    return dict(line_stats)
 
 
 def print_stat_type_analysis(stats: Dict):
@@ -355,7 +274,7 @@ def main():
         weeks = [int(w) for w in args.weeks.split(',')]
 
     print(f"Loading data for weeks {weeks}...")
-    results = load_graded_results(weeks)
+    results = GradedResultsStore(project_root / "data" / "backtest_results").load(weeks)
     print(f"Loaded {len(results)} predictions\n")
 
     # Run analyses
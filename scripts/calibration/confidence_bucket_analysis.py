@@ -10,68 +10,47 @@ Usage:
     python scripts/calibration/confidence_bucket_analysis.py --weeks 11-16
 """
 
-import json
 import sys
 from pathlib import Path
-from collections import defaultdict
 from typing import Dict, List, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.backtesting.graded_store import GradedResults, GradedResultsStore, count_dicts
 
-def load_graded_results(weeks: List[int]) -> List[dict]:
+
+def load_graded_results(weeks: List[int]) -> GradedResults:
     """Load all graded results from specified weeks."""
-    results_dir = project_root / "data" / "backtest_results"
-    all_results = []
+    results = GradedResultsStore(project_root / "data" / "backtest_results").load(weeks)
+    week_counts = results.frame['week'].value_counts()
 
     for week in weeks:
-        graded_file = results_dir / f"graded_week_{week}.json"
-        if graded_file.exists():
-            with open(graded_file, 'r') as f:
-                week_results = json.load(f)
-                for r in week_results:
-                    r['week'] = week
-                all_results.extend(week_results)
-            print(f"  Loaded week {week}: {len(week_results)} predictions")
+        if week in week_counts.index:
+            print(f"  Loaded week {week}: {week_counts[week]} predictions")
         else:
             print(f"  Week {week}: No graded results found")
 
-    return all_results
+    return results
 
 
-def bucket_by_confidence(results: List[dict], bucket_size: int = 5) -> Dict[str, Dict]:
+def bucket_by_confidence(results: GradedResults, bucket_size: int = 5) -> Dict[str, Dict]:
     """
     Bucket results by confidence score.
 
     Args:
-        results: List of graded predictions
+        results: Graded predictions
         bucket_size: Size of each bucket (default 5%)
 
     Returns:
         Dict mapping bucket range to stats
     """
-    buckets = defaultdict(lambda: {'wins': 0, 'losses': 0, 'voids': 0, 'total': 0})
-
-    for r in results:
-        confidence = r.get('confidence', 0)
-        result = r.get('result', '').upper()
-
-        # Determine bucket
-        bucket_start = (confidence // bucket_size) * bucket_size
-        bucket_end = bucket_start + bucket_size
-        bucket_key = f"{bucket_start}-{bucket_end}"
-
-        buckets[bucket_key]['total'] += 1
-        if result == 'WIN':
-            buckets[bucket_key]['wins'] += 1
-        elif result == 'LOSS':
-            buckets[bucket_key]['losses'] += 1
-        elif result in ('VOID', 'PUSH'):
-            buckets[bucket_key]['voids'] += 1
-
-    return dict(buckets)
+    # Determine bucket
+    bucket_start = (results.frame['confidence'].fillna(0) // bucket_size * bucket_size).astype(int)
+    bucket_key = bucket_start.astype(str) + '-' + (bucket_start + bucket_size).astype(str)
+
+    return count_dicts(results.counts(bucket_key), ('wins', 'losses', 'voids', 'total'))
 
 
 def calculate_cumulative_stats(buckets: Dict[str, Dict]) -> List[Tuple[int, Dict]]:
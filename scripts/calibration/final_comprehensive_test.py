@@ -21,43 +21,23 @@ Fully Calibrated:
 """
 
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-
-def load_graded_results(weeks):
-    """Load graded results for validation."""
-    results_dir = project_root / "data" / "backtest_results"
-    all_results = []
-    for week in weeks:
-        graded_file = results_dir / f"graded_week_{week}.json"
-        if graded_file.exists():
-            with open(graded_file, 'r') as f:
-                week_results = json.load(f)
-                for r in week_results:
-                    r['week'] = week
-                all_results.extend(week_results)
-    return all_results
+from scripts.backtesting.graded_store import GradedResultsStore
 
 
 def grade_predictions(predictions, graded_results, week):
     """Grade predictions against actual results."""
     # Build lookup from graded results
-    actuals = {}
-    for r in graded_results:
-        if r.get('week') != week:
-            continue
-        key = (
-            r.get('player_name', '').lower(),
-            r.get('stat_type', ''),
-            r.get('line'),
-            r.get('bet_type', '').upper()
-        )
-        actuals[key] = r.get('result', '').upper()
+    graded = graded_results.frame[graded_results.frame['week'] == week]
+    actuals = dict(zip(
+        zip(graded['player_name'].str.lower(), graded['stat_type'], graded['line'], graded['bet_type']),
+        graded['result']
+    ))
 
     wins = losses = voids = 0
     for p in predictions:
@@ -110,37 +90,20 @@ def run_original_baseline(weeks, min_confidence, graded_results):
     # the baseline performance was (since those were graded with old system)
 
     # Filter graded results by confidence threshold
+    counts = graded_results.counts(
+        'week', where=graded_results.frame['confidence'] >= min_confidence
+    ).reindex(weeks, fill_value=0)
+
     total_wins = 0
     total_losses = 0
-    total_voids = 0
-
-    for week in weeks:
-        week_wins = 0
-        week_losses = 0
-        week_voids = 0
-        week_count = 0
-
-        for r in graded_results:
-            if r.get('week') != week:
-                continue
-
-            confidence = r.get('confidence', 0)
-            if confidence < min_confidence:
-                continue
-
-            result = r.get('result', '').upper()
-            week_count += 1
 
-            if result == 'WIN':
-                week_wins += 1
-            elif result == 'LOSS':
-                week_losses += 1
-            else:
-                week_voids += 1
+    for week, week_stats in counts.iterrows():
+        week_wins = int(week_stats['wins'])
+        week_losses = int(week_stats['losses'])
+        week_count = int(week_stats['total'])
 
         total_wins += week_wins
         total_losses += week_losses
-        total_voids += week_voids
 
         decided = week_wins + week_losses
         rate = week_wins / decided * 100 if decided > 0 else 0
@@ -317,7 +280,7 @@ def main():
 
     # Load graded results for baseline calculation
     print("\nLoading graded results...")
-    graded_results = load_graded_results(weeks)
+    graded_results = GradedResultsStore(project_root / "data" / "backtest_results").load(weeks)
     print(f"Loaded {len(graded_results)} graded predictions")
 
     # Run baseline (using historical graded data)
@@ -4,8 +4,6 @@ import logging
 import json
 import time
 from typing import Optional, Dict, Any
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +21,8 @@ class GeminiClient:
             return
 
         try:
+            # Imported here: the SDK is slow to import and only needed with a key
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             self.model_name = model_name
             self._model = genai.GenerativeModel(model_name)
@@ -49,6 +49,9 @@ class GeminiClient:
             # or rely on the newer SDK features if available.
             # Let's try to set it via the generation_config or just prepend it to prompt for maximum compatibility.
             
+            import google.generativeai as genai
+            from google.generativeai.types import HarmCategory, HarmBlockThreshold
+
             full_prompt = prompt
             if system_instruction:
                 full_prompt = f"System Instruction:\n{system_instruction}\n\nUser Request:\n{prompt}"
@@ -11,6 +11,7 @@ sys.path.insert(0, str(project_root))
 from scripts.analysis.data_loader import NFLDataLoader
 from scripts.analysis.agents.matchup_agent import MatchupAgent
 from scripts.analysis.models import PlayerProp
+from scripts.analysis.prop_features import features_for
 
 def debug_matchup():
     print("🔍 Debugging Matchup Agent for AJ Brown")
@@ -74,9 +75,8 @@ def debug_matchup():
     
     # Call the role classifier directly
     wr_role = matchup_agent._classify_wr_role(
-        aj_brown_prop.player_name, 
         aj_brown_prop.position, 
-        context
+        features_for(aj_brown_prop, context)
     )
     print(f"   Classified role: {wr_role}")
     
@@ -3,30 +3,65 @@ In-Memory Grader for Fast Weight Optimization
 
 Caches actual stats by week and grades predictions without file I/O.
 Returns win/loss counts directly for fast optimization iterations.
+
+Actuals are held as a player x stat array per week; predictions are encoded
+once into (player row, stat column, line, side) arrays and graded with a single
+NumPy expression. Passing a (configs x predictions) selection mask grades a
+whole batch of weight configurations in one call.
 """
 
 import sys
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# Import normalize_name function
-import importlib.util
-spec = importlib.util.spec_from_file_location(
-    "data_loader",
-    project_root / "scripts" / "analysis" / "data_loader.py"
-)
-data_loader_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_loader_module)
-normalize_name = data_loader_module.normalize_name
+from scripts.analysis.player_identity import player_id, player_registry
 
 logger = logging.getLogger(__name__)
 
+# Column order of the per-week actuals array
+STAT_KEYS = ['pass_yds', 'pass_td', 'pass_attempts', 'pass_completions',
+             'rush_yds', 'rush_attempts', 'rec_yds', 'receptions']
+STAT_INDEX = {key: i for i, key in enumerate(STAT_KEYS)}
+
+
+@dataclass
+class WeekActuals:
+    """Actual stats for one week: values[row, STAT_INDEX[stat]], rows keyed by player ID"""
+    rows: Dict[int, int]
+    values: np.ndarray
+
+    @classmethod
+    def from_stats(cls, stats_map: Dict[int, Dict[str, float]]) -> 'WeekActuals':
+        # Stats missing for a player who appears in any file count as 0 (didn't record one)
+        values = np.zeros((len(stats_map), len(STAT_KEYS)))
+        rows = {}
+        for row, (player, player_stats) in enumerate(stats_map.items()):
+            rows[player] = row
+            for stat_key, value in player_stats.items():
+                values[row, STAT_INDEX[stat_key]] = value
+        return cls(rows=rows, values=values)
+
+
+@dataclass
+class EncodedPredictions:
+    """Predictions as grading arrays; row -1 = player or stat type not gradeable"""
+    week: int
+    rows: np.ndarray
+    stats: np.ndarray
+    lines: np.ndarray
+    over: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
 
 class InMemoryGrader:
     """
@@ -54,6 +89,8 @@ class InMemoryGrader:
 
         # Cache of actual stats by week: {week: {player: {stat_key: value}}}
         self._stats_cache: Dict[int, Dict[str, Dict[str, float]]] = {}
+        self._actuals_cache: Dict[int, WeekActuals] = {}
+        self._stat_columns: Dict[str, int] = {}
 
     def _load_actual_stats(self, week: int) -> Dict[str, Dict[str, float]]:
         """
@@ -103,8 +140,8 @@ class InMemoryGrader:
                         continue
                     if 'BASIC' in str(row.get('Player')):
                         continue
-                    player = normalize_name(row.get('Player', ''))
-                    if not player:
+                    player = player_id(row.get('Player', ''))
+                    if player is None:
                         continue
 
                     if player not in stats_map:
@@ -127,7 +164,7 @@ class InMemoryGrader:
         Get actual stats for a week (cached).
 
         Returns:
-            Dict mapping player names to their stats
+            Dict mapping player IDs to their stats
         """
         if week not in self._stats_cache:
             self._stats_cache[week] = self._load_actual_stats(week)
@@ -161,59 +198,98 @@ class InMemoryGrader:
 
         return None
 
-    def grade_predictions(self, predictions: List[Dict], week: int) -> Tuple[int, int, int]:
+    def get_actuals(self, week: int) -> WeekActuals:
+        """Actual stats for a week as a player x stat array (cached)."""
+        if week not in self._actuals_cache:
+            self._actuals_cache[week] = WeekActuals.from_stats(self.get_actual_stats(week))
+        return self._actuals_cache[week]
+
+    def _stat_column(self, stat_type_raw: str) -> int:
+        column = self._stat_columns.get(stat_type_raw)
+        if column is None:
+            internal_key = self._map_stat_type(stat_type_raw)
+            column = STAT_INDEX[internal_key] if internal_key else -1
+            self._stat_columns[stat_type_raw] = column
+        return column
+
+    def encode_predictions(self, predictions: List[Dict], week: int) -> EncodedPredictions:
+        """
+        Encode prediction dicts (player_name, stat_type, line, bet_type) once for grading.
+        """
+        actual_rows = self.get_actuals(week).rows
+        player_rows: Dict[str, int] = {}
+
+        count = len(predictions)
+        rows = np.full(count, -1, dtype=np.int64)
+        stats = np.full(count, -1, dtype=np.int64)
+        lines = np.empty(count)
+        over = np.empty(count, dtype=bool)
+
+        for i, p in enumerate(predictions):
+            name = p['player_name']
+            row = player_rows.get(name)
+            if row is None:
+                row = actual_rows.get(player_id(name), -1)
+                player_rows[name] = row
+            stat = self._stat_column(p['stat_type'])
+            if stat >= 0:
+                rows[i] = row
+                stats[i] = stat
+            lines[i] = p['line']
+            over[i] = p['bet_type'].upper() == 'OVER'
+
+        rows[stats < 0] = -1
+        return EncodedPredictions(week=week, rows=rows, stats=stats, lines=lines, over=over)
+
+    def outcomes(self, predictions: Union[List[Dict], EncodedPredictions],
+                 week: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-prediction (won, lost) boolean arrays; neither for pushes and ungradeable bets.
+        """
+        if not isinstance(predictions, EncodedPredictions):
+            predictions = self.encode_predictions(predictions, week)
+        values = self.get_actuals(week).values
+
+        gradeable = predictions.rows >= 0
+        actual = np.full(len(predictions), np.nan)
+        actual[gradeable] = values[predictions.rows[gradeable], predictions.stats[gradeable]]
+
+        # Positive margin = the bet's side cleared the line (NaN never wins or loses)
+        margin = np.where(predictions.over, actual - predictions.lines, predictions.lines - actual)
+        return margin > 0, margin < 0
+
+    def grade_predictions(
+        self,
+        predictions: Union[List[Dict], EncodedPredictions],
+        week: int,
+        selected: Optional[np.ndarray] = None
+    ) -> Tuple:
         """
         Grade predictions against actual stats.
 
         Args:
             predictions: List of prediction dicts with keys:
                          player_name, stat_type, line, bet_type
+                         (or the result of encode_predictions)
             week: Week number to get actual stats
+            selected: Optional (configs x predictions) boolean mask of the
+                      predictions each configuration bets on
 
         Returns:
-            Tuple of (wins, losses, voids)
+            Tuple of (wins, losses, voids) - ints, or per-config arrays when
+            selected is given. Pushes and ungradeable bets count as voids.
         """
-        actuals = self.get_actual_stats(week)
-
-        wins = 0
-        losses = 0
-        voids = 0
+        if not isinstance(predictions, EncodedPredictions):
+            predictions = self.encode_predictions(predictions, week)
+        outcomes = np.stack(self.outcomes(predictions, week)).astype(np.int64)
 
-        for p in predictions:
-            player = normalize_name(p['player_name'])
-            stat_type_raw = p['stat_type']
-            line = p['line']
-            bet_type = p['bet_type']
-
-            internal_key = self._map_stat_type(stat_type_raw)
-            if not internal_key:
-                voids += 1
-                continue
-
-            # Get actual value
-            if player not in actuals:
-                voids += 1
-                continue
+        if selected is None:
+            wins, losses = (int(n) for n in outcomes.sum(axis=1))
+            return wins, losses, len(predictions) - wins - losses
 
-            actual_val = actuals[player].get(internal_key, 0.0)
-
-            # Grade the bet
-            if bet_type.upper() == 'OVER':
-                if actual_val > line:
-                    wins += 1
-                elif actual_val < line:
-                    losses += 1
-                else:
-                    voids += 1  # Push
-            else:  # UNDER
-                if actual_val < line:
-                    wins += 1
-                elif actual_val > line:
-                    losses += 1
-                else:
-                    voids += 1  # Push
-
-        return wins, losses, voids
+        selected = np.asarray(selected, dtype=np.int64)
+        wins, losses = (selected @ outcomes.T).T
+        return wins, losses, selected.sum(axis=1) - wins - losses
 
     def preload_weeks(self, weeks: List[int]):
         """
@@ -224,10 +300,12 @@ class InMemoryGrader:
             if week not in self._stats_cache:
                 self._stats_cache[week] = self._load_actual_stats(week)
                 logger.debug(f"Cached stats for week {week}: {len(self._stats_cache[week])} players")
+            self.get_actuals(week)
 
     def clear_cache(self):
         """Clear the stats cache."""
         self._stats_cache.clear()
+        self._actuals_cache.clear()
 
 
 if __name__ == "__main__":
@@ -240,4 +318,4 @@ if __name__ == "__main__":
 
     # Show sample
     for player, player_stats in list(stats.items())[:3]:
-        print(f"  {player}: {player_stats}")
+        print(f"  {player_registry.name(player)}: {player_stats}")
@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+"""
+Walk-Forward Validation - out-of-sample weights and confidence threshold
+
+WeightOptimizer scores every configuration on the same weeks it is picked on.
+Here each week N is a fold: the weight configuration and min_confidence that
+did best on the weeks before N are chosen, then scored on week N alone. Each
+fold reports the out-of-sample win rate, ROI at the props' actual odds and
+calibration error (how far confidence sits from the realized hit rate).
+
+Per week the agents run once per market (their scores don't depend on the
+weights); every configuration's confidences then come from one array
+expression over those cached scores (PropAnalyzer.over_confidence_matrix).
+Graded bets are binned into per-configuration histograms over the integer
+confidence 0-100, so the stats at any min_confidence are a reverse cumulative
+sum and the whole threshold sweep is one pass. Weeks are scored in parallel
+worker processes; folds only add up weekly histograms.
+
+Usage:
+    python scripts/optimization/walk_forward.py --weeks 11-16 --configs 200
+    python scripts/optimization/walk_forward.py --weeks 5-16 --thresholds 50-75 --objective roi
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.analysis.data_loader import NFLDataLoader
+from scripts.analysis.orchestrator import PropAnalyzer
+from scripts.optimization.in_memory_grader import InMemoryGrader
+from scripts.optimization.search_space import SearchSpace
+
+logger = logging.getLogger(__name__)
+
+CONFIDENCE_BINS = 101           # integer confidence 0-100
+CALIBRATION_BUCKET = 5          # confidence points per calibration bucket
+DEFAULT_ODDS = -110             # props without a price
+DEFAULT_THRESHOLDS = list(range(50, 81))
+OBJECTIVES = ('win_rate', 'roi')
+
+
+def american_payout(odds) -> float:
+    """Profit per unit staked on a win at American odds"""
+    try:
+        odds = float(odds)
+    except (TypeError, ValueError):
+        odds = DEFAULT_ODDS
+    if np.isnan(odds) or odds == 0:
+        odds = DEFAULT_ODDS
+    return odds / 100 if odds > 0 else 100 / -odds
+
+
+def _histogram(confidence: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Sum values into (configs x CONFIDENCE_BINS) by each config's confidence for the row"""
+    n_configs = confidence.shape[0]
+    index = (np.arange(n_configs)[:, None] * CONFIDENCE_BINS + confidence).ravel()
+    weights = np.broadcast_to(values, confidence.shape).ravel()
+    return np.bincount(index, weights=weights, minlength=n_configs * CONFIDENCE_BINS) \
+        .reshape(n_configs, CONFIDENCE_BINS)
+
+
+@dataclass
+class WeekSweep:
+    """One week's graded bets per weight config, binned by confidence (configs x CONFIDENCE_BINS)"""
+    week: int
+    bets: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    profit: np.ndarray
+    error: Optional[str] = None
+
+    @classmethod
+    def empty(cls, week: int, n_configs: int, error: Optional[str] = None) -> 'WeekSweep':
+        zeros = np.zeros((n_configs, CONFIDENCE_BINS))
+        return cls(week, zeros, zeros.copy(), zeros.copy(), zeros.copy(), error)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def combine(sweeps: Sequence[WeekSweep]) -> WeekSweep:
+    """Pool several weeks' histograms"""
+    return WeekSweep(
+        week=-1,
+        bets=sum(s.bets for s in sweeps),
+        wins=sum(s.wins for s in sweeps),
+        losses=sum(s.losses for s in sweeps),
+        profit=sum(s.profit for s in sweeps),
+    )
+
+
+@dataclass
+class SweepStats:
+    """Totals for every (config, min_confidence) pair, each array (configs x thresholds)"""
+    thresholds: np.ndarray
+    bets: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    profit: np.ndarray
+    calibration_error: np.ndarray
+
+    @property
+    def decided(self) -> np.ndarray:
+        return self.wins + self.losses
+
+    @property
+    def win_rate(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.wins / self.decided * 100
+
+    @property
+    def roi(self) -> np.ndarray:
+        """Profit per decided bet, in percent"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.profit / self.decided * 100
+
+
+def sweep_stats(sweep: WeekSweep, thresholds: Sequence[int]) -> SweepStats:
+    """Bets with confidence >= each threshold, for every config at once"""
+    thresholds = np.asarray(thresholds, dtype=int)
+    take = np.clip(thresholds, 0, CONFIDENCE_BINS)
+
+    def at_or_above(histogram):
+        # tail[:, v] = everything binned at confidence v or higher (tail[:, 101] = 0)
+        tail = np.cumsum(histogram[:, ::-1], axis=1)[:, ::-1]
+        tail = np.concatenate([tail, np.zeros((len(histogram), 1))], axis=1)
+        return tail[:, take]
+
+    # Calibration error: decided-weighted |mean confidence - hit rate| over 5-point buckets,
+    # i.e. sum over buckets of |sum(confidence)/100 - wins| / decided
+    decided = sweep.wins + sweep.losses
+    confidence = np.arange(CONFIDENCE_BINS)
+    selected = confidence[None, :] >= thresholds[:, None]                        # thresholds x bins
+    bucket_starts = np.arange(0, CONFIDENCE_BINS, CALIBRATION_BUCKET)
+    bucket_wins = np.add.reduceat(sweep.wins[:, None, :] * selected, bucket_starts, axis=2)
+    bucket_confidence = np.add.reduceat(decided[:, None, :] * confidence * selected, bucket_starts, axis=2)
+    total_decided = at_or_above(decided)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calibration_error = np.abs(bucket_confidence / 100 - bucket_wins).sum(axis=2) / total_decided
+
+    return SweepStats(
+        thresholds=thresholds,
+        bets=at_or_above(sweep.bets),
+        wins=at_or_above(sweep.wins),
+        losses=at_or_above(sweep.losses),
+        profit=at_or_above(sweep.profit),
+        calibration_error=calibration_error,
+    )
+
+
+def select_best(stats: SweepStats, objective: str = 'win_rate',
+                min_bets: int = 30) -> Optional[Tuple[int, int]]:
+    """(config index, threshold index) with the best objective and enough decided bets"""
+    score = getattr(stats, objective)
+    score = np.where((stats.decided >= min_bets) & ~np.isnan(score), score, -np.inf)
+    if not np.isfinite(score).any():
+        return None
+    config, threshold = np.unravel_index(np.argmax(score), score.shape)
+    return int(config), int(threshold)
+
+
+class WeekScorer:
+    """Loads a week, runs the agents once per market and sweeps a weight grid over them"""
+
+    def __init__(self, configs: List[Dict[str, float]], data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir else project_root / "data"
+        self.configs = configs
+        # Weight arrays over the configs; the analyzer's own weights never enter the sweep
+        self.weights = {name: np.array([c[name] for c in configs], dtype=float) for name in configs[0]}
+        self.loader = NFLDataLoader(data_dir=str(self.data_dir))
+        self.analyzer = PropAnalyzer(custom_weights=configs[0])
+        self.grader = InMemoryGrader(data_dir=self.data_dir)
+
+    def sweep(self, week: int) -> WeekSweep:
+        context = self.loader.load_all_data(week=week)
+        props = context.get('props') or []
+        if not props:
+            return WeekSweep.empty(week, len(self.configs), error="no props")
+
+        rows, agent_passes, _ = self.analyzer.score_markets(props, context)
+        if not rows:
+            return WeekSweep.empty(week, len(self.configs), error="no scoreable props")
+
+        stat_types = [None] * len(agent_passes)
+        for _, prop, market in rows:
+            stat_types[market] = prop.stat_type
+        over_confidence = self.analyzer.over_confidence_matrix(agent_passes, stat_types, self.weights)
+
+        # Each row's confidence per config: the market's OVER confidence, inverted for UNDER rows
+        markets = np.array([market for _, _, market in rows])
+        under = np.array([prop.bet_type == 'UNDER' for _, prop, _ in rows])
+        confidence = over_confidence[:, markets]
+        confidence = np.where(under, 100 - confidence, confidence)
+
+        predictions = [{'player_name': prop.player_name, 'stat_type': prop.stat_type,
+                        'line': prop.line, 'bet_type': prop.bet_type} for _, prop, _ in rows]
+        won, lost = self.grader.outcomes(predictions, week)
+        payout = np.array([american_payout(prop_data.get('odds')) for prop_data, _, _ in rows])
+        profit = np.where(won, payout, np.where(lost, -1.0, 0.0))
+
+        return WeekSweep(
+            week=week,
+            bets=_histogram(confidence, np.ones(len(rows))),
+            wins=_histogram(confidence, won.astype(float)),
+            losses=_histogram(confidence, lost.astype(float)),
+            profit=_histogram(confidence, profit),
+        )
+
+
+# Per-process scorer: loader (roster), analyzer and grader built once per worker
+_scorer: Optional[WeekScorer] = None
+
+
+def _init_worker(configs: List[Dict[str, float]], data_dir: Optional[str] = None):
+    global _scorer
+    logging.getLogger('scripts.analysis').setLevel(logging.WARNING)
+    _scorer = WeekScorer(configs, data_dir=data_dir)
+
+
+def _sweep_week(week: int) -> WeekSweep:
+    try:
+        return _scorer.sweep(week)
+    except Exception as e:
+        logger.error(f"❌ Week {week} failed: {e}")
+        return WeekSweep.empty(week, len(_scorer.configs), error=str(e))
+
+
+@dataclass
+class FoldResult:
+    """Weights and threshold fit on train_weeks, scored on test_week"""
+    test_week: int
+    train_weeks: List[int]
+    weights: Dict[str, float]
+    min_confidence: int
+    train_score: float
+    bets: int
+    wins: int
+    losses: int
+    win_rate: float
+    roi: float
+    calibration_error: float
+    # Default weights at the default threshold on the same week, for reference
+    baseline: Dict[str, float] = field(default_factory=dict)
+
+
+class WalkForwardValidator:
+    """
+    Walk-forward evaluation of agent weights and min_confidence.
+
+    For each week N (after the first min_train_weeks), picks the config and
+    threshold that maximize the objective on the earlier weeks and reports
+    how that choice does on week N.
+    """
+
+    def __init__(self,
+                 data_dir=None,
+                 weeks: List[int] = None,
+                 thresholds: Sequence[int] = None,
+                 configs: List[Dict[str, float]] = None,
+                 n_configs: int = 100,
+                 search_space: SearchSpace = None,
+                 objective: str = 'win_rate',
+                 min_train_weeks: int = 1,
+                 min_train_bets: int = 30,
+                 baseline_min_confidence: int = 50,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            data_dir: Path to data directory
+            weeks: Weeks in order (default: 11-16)
+            thresholds: min_confidence values to sweep (default: 50-80)
+            configs: Weight configs over the same agents (default: n_configs from
+                     the search space, baseline first)
+            objective: 'win_rate' or 'roi' on the training weeks
+            min_train_weeks: Earlier weeks required before a week is tested
+            min_train_bets: Decided training bets a (config, threshold) needs
+            baseline_min_confidence: Threshold for the default-weights reference
+            workers: Worker processes (default: one per week up to the CPU count; 1 = in-process)
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}")
+        self.data_dir = data_dir
+        self.weeks = weeks or list(range(11, 17))
+        self.thresholds = np.asarray(thresholds if thresholds is not None else DEFAULT_THRESHOLDS, dtype=int)
+        search_space = search_space or SearchSpace()
+        self.configs = configs or search_space.generate_random_configurations(n_configs, include_default=True)
+        self.objective = objective
+        self.min_train_weeks = min_train_weeks
+        self.min_train_bets = min_train_bets
+        self.baseline_min_confidence = baseline_min_confidence
+        self.workers = workers
+
+        self.sweeps: Dict[int, WeekSweep] = {}
+
+    def score_weeks(self) -> Dict[int, WeekSweep]:
+        """Sweep every week (in parallel worker processes when workers > 1)"""
+        workers = self.workers or min(len(self.weeks), os.cpu_count() or 1)
+        init_args = (self.configs, str(self.data_dir) if self.data_dir else None)
+
+        if workers <= 1 or len(self.weeks) <= 1:
+            _init_worker(*init_args)
+            sweeps = [_sweep_week(week) for week in self.weeks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+                sweeps = list(pool.map(_sweep_week, self.weeks))
+
+        self.sweeps = {s.week: s for s in sweeps}
+        for s in sweeps:
+            if not s.ok:
+                logger.warning(f"⚠️ Week {s.week} skipped: {s.error}")
+        return self.sweeps
+
+    def run(self) -> List[FoldResult]:
+        """Score the weeks, then fit and test one fold per eligible week"""
+        if not self.sweeps:
+            self.score_weeks()
+
+        folds = []
+        scored = [w for w in self.weeks if self.sweeps[w].ok]
+        for i, test_week in enumerate(scored):
+            train_weeks = scored[:i]
+            if len(train_weeks) < self.min_train_weeks:
+                continue
+
+            train = sweep_stats(combine([self.sweeps[w] for w in train_weeks]), self.thresholds)
+            best = select_best(train, self.objective, self.min_train_bets)
+            if best is None:
+                logger.warning(f"⚠️ Week {test_week}: no config with {self.min_train_bets}+ training bets")
+                continue
+            config, threshold = best
+
+            test = sweep_stats(self.sweeps[test_week], self.thresholds[[threshold]])
+            baseline = sweep_stats(self.sweeps[test_week], [self.baseline_min_confidence])
+            folds.append(FoldResult(
+                test_week=test_week,
+                train_weeks=train_weeks,
+                weights=self.configs[config],
+                min_confidence=int(self.thresholds[threshold]),
+                train_score=float(getattr(train, self.objective)[config, threshold]),
+                bets=int(test.bets[config, 0]),
+                wins=int(test.wins[config, 0]),
+                losses=int(test.losses[config, 0]),
+                win_rate=float(test.win_rate[config, 0]),
+                roi=float(test.roi[config, 0]),
+                calibration_error=float(test.calibration_error[config, 0]),
+                baseline={
+                    'win_rate': float(baseline.win_rate[0, 0]),
+                    'roi': float(baseline.roi[0, 0]),
+                    'decided': int(baseline.decided[0, 0]),
+                },
+            ))
+        return folds
+
+
+def _pct(value: float) -> str:
+    return f"{value:6.1f}%" if not np.isnan(value) else f"{'-':>7}"
+
+
+def format_walk_forward_report(folds: List[FoldResult], objective: str = 'win_rate') -> str:
+    """Per-fold out-of-sample table plus pooled totals"""
+    header = (f"{'Week':>4}  {'Train':>9}  {'MinConf':>7}  {'Train ' + objective:>14}  {'W-L':>9}  "
+              f"{'Win%':>7}  {'ROI':>7}  {'CalErr':>6}  {'Base Win%':>9}  {'Base ROI':>8}")
+    lines = [header, "-" * len(header)]
+    for f in folds:
+        train = f"{f.train_weeks[0]}-{f.train_weeks[-1]}"
+        lines.append(
+            f"{f.test_week:>4}  {train:>9}  {f.min_confidence:>7d}  {f.train_score:>13.1f}%  "
+            f"{f'{f.wins}-{f.losses}':>9}  {_pct(f.win_rate)}  {_pct(f.roi)}  "
+            f"{f'{f.calibration_error:.3f}' if f.wins + f.losses else '-':>6}  {_pct(f.baseline['win_rate']):>9}  {_pct(f.baseline['roi']):>8}"
+        )
+
+    wins = sum(f.wins for f in folds)
+    decided = sum(f.wins + f.losses for f in folds)
+    profit = sum(f.roi / 100 * (f.wins + f.losses) for f in folds if f.wins + f.losses)
+    base_decided = sum(f.baseline['decided'] for f in folds)
+    base_wins = sum(f.baseline['win_rate'] / 100 * f.baseline['decided'] for f in folds if f.baseline['decided'])
+    base_profit = sum(f.baseline['roi'] / 100 * f.baseline['decided'] for f in folds if f.baseline['decided'])
+    lines.append("-" * len(header))
+    if decided:
+        lines.append(f"Out-of-sample: {wins}W/{decided - wins}L = {wins / decided * 100:.1f}%, "
+                     f"ROI {profit / decided * 100:+.1f}%")
+    if base_decided:
+        lines.append(f"Baseline:      {base_wins / base_decided * 100:.1f}% win rate, "
+                     f"ROI {base_profit / base_decided * 100:+.1f}% ({base_decided} bets)")
+    return "\n".join(lines)
+
+
+def parse_range(value: str) -> List[int]:
+    """'11-16' or '11,12,14'"""
+    if '-' in value:
+        start, end = value.split('-')
+        return list(range(int(start), int(end) + 1))
+    return [int(v.strip()) for v in value.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Walk-forward validation of agent weights and min_confidence')
+    parser.add_argument('--weeks', '-w', type=str, default='11-16', help='Weeks in order (default: 11-16)')
+    parser.add_argument('--configs', '-n', type=int, default=100,
+                        help='Random weight configurations, baseline included (default: 100)')
+    parser.add_argument('--thresholds', type=str, default='50-80',
+                        help='min_confidence values to sweep (default: 50-80)')
+    parser.add_argument('--objective', choices=OBJECTIVES, default='win_rate',
+                        help='Training objective (default: win_rate)')
+    parser.add_argument('--min-train-weeks', type=int, default=1)
+    parser.add_argument('--min-train-bets', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per week, up to CPU count; 1 = in-process)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    logging.getLogger('scripts.analysis').setLevel(logging.WARNING)
+
+    validator = WalkForwardValidator(
+        weeks=parse_range(args.weeks),
+        thresholds=parse_range(args.thresholds),
+        n_configs=args.configs,
+        objective=args.objective,
+        min_train_weeks=args.min_train_weeks,
+        min_train_bets=args.min_train_bets,
+        workers=args.workers,
+    )
+
+    started = time.perf_counter()
+    folds = validator.run()
+    elapsed = time.perf_counter() - started
+
+    print(f"\nWalk-forward: {len(validator.configs)} configs x {len(validator.thresholds)} thresholds, "
+          f"objective {args.objective}")
+    print(format_walk_forward_report(folds, args.objective))
+    print(f"Completed in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
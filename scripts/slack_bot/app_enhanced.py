@@ -24,6 +24,7 @@ from scripts.analysis.orchestrator import PropAnalyzer
 from scripts.analysis.data_loader import NFLDataLoader
 from scripts.analysis.parlay_builder import ParlayBuilder
 from scripts.api.odds_api import OddsAPI
+from scripts.slack_bot.services.analysis_worker import AnalysisWorker
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -40,9 +41,17 @@ app = App(
 )
 
 # Initialize analysis system
+# Handlers only parse, ack and queue; the worker pool loads/analyzes weeks once,
+# keeps them warm and posts results back with say()
 data_loader = NFLDataLoader(data_dir=str(project_root / "data"))
 prop_analyzer = PropAnalyzer()
 parlay_builder = ParlayBuilder()
+analysis_worker = AnalysisWorker(data_loader, prop_analyzer,
+                                 max_workers=int(os.environ.get('SLACK_ANALYSIS_WORKERS', 4)))
+
+
+def _command_week(command) -> int:
+    return int(command.get('text') or os.environ.get('NFL_WEEK', 7))
 
 # ============================================================================
 # COMMAND: /analyze_props - Multi-Agent Analysis
@@ -55,56 +64,56 @@ def analyze_props_command(ack, say, command):
     
     try:
         # Get week from command text or use default
-        week = int(command.get('text', os.environ.get('NFL_WEEK', 7)))
+        week = _command_week(command)
         
         say(f"🧠 Analyzing Week {week} props using 8-agent system...")
-        
-        # Load all data
-        context = data_loader.load_all_data(week=week)
-        
-        # Analyze all props
-        all_analyses = prop_analyzer.analyze_all_props(context, min_confidence=60)
-        
-        # Get top 10 highest confidence
-        top_props = sorted(all_analyses, key=lambda x: x.final_confidence, reverse=True)[:10]
-        
-        # Format response
-        response = f"*🎯 TOP 10 PROPS - WEEK {week}*\n\n"
-        
-        for i, analysis in enumerate(top_props, 1):
-            prop = analysis.prop
-            conf = analysis.final_confidence
-            
-            # Confidence emoji
-            if conf >= 75:
-                emoji = "🔥"
-            elif conf >= 70:
-                emoji = "⭐"
-            elif conf >= 65:
-                emoji = "✅"
-            else:
-                emoji = "📊"
-            
-            response += f"{emoji} *{i}. {prop.player_name}* ({prop.team})\n"
-            response += f"   {prop.stat_type} OVER {prop.line}\n"
-            response += f"   Confidence: *{conf}* | vs {prop.opponent}\n"
-            
-            # Top 2 reasons
-            if analysis.rationale:
-                response += f"   • {analysis.rationale[0]}\n"
-                if len(analysis.rationale) > 1:
-                    response += f"   • {analysis.rationale[1]}\n"
-            response += "\n"
-        
-        response += f"\n💡 _Analyzed {len(all_analyses)} total props_"
-        
-        say(response)
+        analysis_worker.respond(("analyze_props", week), lambda: format_top_props(week),
+                                say, "❌ Error analyzing props")
         
     except Exception as e:
         logger.error(f"Error in analyze_props: {e}")
         say(f"❌ Error analyzing props: {str(e)}")
 
 
+def format_top_props(week: int) -> str:
+    """Top 10 props for a week (runs on the analysis worker)"""
+    all_analyses = analysis_worker.analyses(week, min_confidence=60)
+    
+    # Get top 10 highest confidence
+    top_props = sorted(all_analyses, key=lambda x: x.final_confidence, reverse=True)[:10]
+    
+    # Format response
+    response = f"*🎯 TOP 10 PROPS - WEEK {week}*\n\n"
+    
+    for i, analysis in enumerate(top_props, 1):
+        prop = analysis.prop
+        conf = analysis.final_confidence
+        
+        # Confidence emoji
+        if conf >= 75:
+            emoji = "🔥"
+        elif conf >= 70:
+            emoji = "⭐"
+        elif conf >= 65:
+            emoji = "✅"
+        else:
+            emoji = "📊"
+        
+        response += f"{emoji} *{i}. {prop.player_name}* ({prop.team})\n"
+        response += f"   {prop.stat_type} OVER {prop.line}\n"
+        response += f"   Confidence: *{conf}* | vs {prop.opponent}\n"
+        
+        # Top 2 reasons
+        if analysis.rationale:
+            response += f"   • {analysis.rationale[0]}\n"
+            if len(analysis.rationale) > 1:
+                response += f"   • {analysis.rationale[1]}\n"
+        response += "\n"
+    
+    response += f"\n💡 _Analyzed {len(all_analyses)} total props_"
+    return response
+
+
 # ============================================================================
 # COMMAND: /build_parlays - Parlay Generation
 # ============================================================================
@@ -115,54 +124,56 @@ def build_parlays_command(ack, say, command):
     ack()
     
     try:
-        week = int(command.get('text', os.environ.get('NFL_WEEK', 7)))
+        week = _command_week(command)
         
         say(f"🎯 Building optimal parlays for Week {week}...")
-        
-        # Load and analyze
-        context = data_loader.load_all_data(week=week)
-        all_analyses = prop_analyzer.analyze_all_props(context, min_confidence=60)
-        
-        # Diversify props
-        diversified = diversify_props(all_analyses)
-        
-        # Build parlays
-        parlays = parlay_builder.build_parlays(diversified, min_confidence=65)
-        
-        # Format response
-        response = f"*🎰 WEEK {week} PARLAYS*\n\n"
-        
-        for parlay_type in ['2-leg', '3-leg', '4-leg']:
-            parlay_list = parlays.get(parlay_type, [])
-            
-            if parlay_list:
-                response += f"*{parlay_type.upper()} PARLAYS:*\n"
-                
-                for i, parlay in enumerate(parlay_list, 1):
-                    response += f"\n*Parlay {i}* - {parlay.risk_level} RISK (Conf: {parlay.combined_confidence})\n"
-                    response += f"💰 Bet: {parlay.recommended_units} units\n"
-                    
-                    for j, leg in enumerate(parlay.legs, 1):
-                        response += f"  {j}. {leg['player']} - {leg['stat']} {leg['pick']} {leg['line']}\n"
-                
-                response += "\n"
-        
-        # Calculate total units
-        total_units = sum(
-            parlay.recommended_units 
-            for parlay_list in parlays.values() 
-            for parlay in parlay_list
-        )
-        
-        response += f"💸 *Total Investment:* {total_units:.1f} units (${total_units * 10:.0f} @ $10/unit)\n"
-        
-        say(response)
+        analysis_worker.respond(("build_parlays", week), lambda: format_parlays(week),
+                                say, "❌ Error building parlays")
         
     except Exception as e:
         logger.error(f"Error in build_parlays: {e}")
         say(f"❌ Error building parlays: {str(e)}")
 
 
+def format_parlays(week: int) -> str:
+    """Parlays for a week (runs on the analysis worker)"""
+    all_analyses = analysis_worker.analyses(week, min_confidence=60)
+    
+    # Diversify props
+    diversified = diversify_props(all_analyses)
+    
+    # Build parlays
+    parlays = parlay_builder.build_parlays(diversified, min_confidence=65)
+    
+    # Format response
+    response = f"*🎰 WEEK {week} PARLAYS*\n\n"
+    
+    for parlay_type in ['2-leg', '3-leg', '4-leg']:
+        parlay_list = parlays.get(parlay_type, [])
+        
+        if parlay_list:
+            response += f"*{parlay_type.upper()} PARLAYS:*\n"
+            
+            for i, parlay in enumerate(parlay_list, 1):
+                response += f"\n*Parlay {i}* - {parlay.risk_level} RISK (Conf: {parlay.combined_confidence})\n"
+                response += f"💰 Bet: {parlay.recommended_units} units\n"
+                
+                for j, leg in enumerate(parlay.legs, 1):
+                    response += f"  {j}. {leg['player']} - {leg['stat']} {leg['pick']} {leg['line']}\n"
+            
+            response += "\n"
+    
+    # Calculate total units
+    total_units = sum(
+        parlay.recommended_units 
+        for parlay_list in parlays.values() 
+        for parlay in parlay_list
+    )
+    
+    response += f"💸 *Total Investment:* {total_units:.1f} units (${total_units * 10:.0f} @ $10/unit)\n"
+    return response
+
+
 # ============================================================================
 # COMMAND: /check_confidence - Player Confidence Check
 # ============================================================================
@@ -182,56 +193,59 @@ def check_confidence_command(ack, say, command):
         week = int(os.environ.get('NFL_WEEK', 7))
         
         say(f"🔍 Checking confidence for *{player_name}* (Week {week})...")
-        
-        # Load and analyze
-        context = data_loader.load_all_data(week=week)
-        all_analyses = prop_analyzer.analyze_all_props(context, min_confidence=50)
-        
-        # Filter by player
-        player_props = [
-            a for a in all_analyses 
-            if player_name.lower() in a.prop.player_name.lower()
-        ]
-        
-        if not player_props:
-            say(f"❌ No props found for '{player_name}'")
-            return
-        
-        # Format response
-        response = f"*📊 {player_props[0].prop.player_name}* ({player_props[0].prop.team})\n\n"
-        
-        for analysis in sorted(player_props, key=lambda x: x.final_confidence, reverse=True):
-            prop = analysis.prop
-            conf = analysis.final_confidence
-            
-            # Confidence level
-            if conf >= 75:
-                level = "🔥 ELITE"
-            elif conf >= 70:
-                level = "⭐ HIGH"
-            elif conf >= 65:
-                level = "✅ GOOD"
-            elif conf >= 60:
-                level = "📊 MODERATE"
-            else:
-                level = "⚠️ LOW"
-            
-            response += f"{level} | *{prop.stat_type} OVER {prop.line}*\n"
-            response += f"Confidence: *{conf}* | vs {prop.opponent}\n"
-            
-            # Show all reasons
-            for reason in analysis.rationale[:3]:
-                response += f"  • {reason}\n"
-            
-            response += "\n"
-        
-        say(response)
+        analysis_worker.respond(("check_confidence", week, player_name.lower()),
+                                lambda: format_player_confidence(player_name, week),
+                                say, "❌ Error checking confidence")
         
     except Exception as e:
         logger.error(f"Error in check_confidence: {e}")
         say(f"❌ Error checking confidence: {str(e)}")
 
 
+def format_player_confidence(player_name: str, week: int) -> str:
+    """Confidence breakdown for one player's props (runs on the analysis worker)"""
+    all_analyses = analysis_worker.analyses(week, min_confidence=50)
+    
+    # Filter by player
+    player_props = [
+        a for a in all_analyses 
+        if player_name.lower() in a.prop.player_name.lower()
+    ]
+    
+    if not player_props:
+        return f"❌ No props found for '{player_name}'"
+    
+    # Format response
+    response = f"*📊 {player_props[0].prop.player_name}* ({player_props[0].prop.team})\n\n"
+    
+    for analysis in sorted(player_props, key=lambda x: x.final_confidence, reverse=True):
+        prop = analysis.prop
+        conf = analysis.final_confidence
+        
+        # Confidence level
+        if conf >= 75:
+            level = "🔥 ELITE"
+        elif conf >= 70:
+            level = "⭐ HIGH"
+        elif conf >= 65:
+            level = "✅ GOOD"
+        elif conf >= 60:
+            level = "📊 MODERATE"
+        else:
+            level = "⚠️ LOW"
+        
+        response += f"{level} | *{prop.stat_type} OVER {prop.line}*\n"
+        response += f"Confidence: *{conf}* | vs {prop.opponent}\n"
+        
+        # Show all reasons
+        for reason in analysis.rationale[:3]:
+            response += f"  • {reason}\n"
+        
+        response += "\n"
+    
+    return response
+
+
 # ============================================================================
 # COMMAND: /line_movement - Show Recent Movements
 # ============================================================================
@@ -349,6 +363,7 @@ def fetch_odds_command(ack, say, command):
             df = pd.DataFrame(props)
             output_file = project_root / "data" / f"betting_lines_wk_{week}_live.csv"
             df.to_csv(output_file, index=False)
+            analysis_worker.invalidate(week)
             
             say(f"✅ Fetched {len(props)} props and saved to database")
             
@@ -458,5 +473,8 @@ if __name__ == "__main__":
     logger.info("✅ Parlay builder integrated")
     logger.info("✅ The Odds API integrated")
     
+    # Warm the current week so the first Sunday-morning request is fast
+    analysis_worker.prefetch(int(os.environ.get('NFL_WEEK', 7)))
+    
     handler = SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"))
     handler.start()
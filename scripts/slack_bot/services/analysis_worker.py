@@ -0,0 +1,92 @@
+"""
+Analysis Worker - warm, shared analysis backend for the Slack bot
+
+Slash-command handlers must ack within 3 seconds, and running a full week
+analysis inline both misses that window and serializes users. Handlers hand
+work to this worker instead:
+
+- a long-lived thread pool builds responses off the handler thread
+- week contexts and full analyses stay warm in an AnalysisSession, so only
+  the first request for a week pays for loading and scoring
+- identical in-flight requests (same command + arguments) share one job;
+  every requester still gets the result posted back
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional
+
+from scripts.analysis.analysis_session import AnalysisSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+class AnalysisWorker:
+    """Background pool that keeps week analyses warm and dedupes requests"""
+
+    def __init__(self, loader, analyzer=None, max_workers: int = DEFAULT_WORKERS,
+                 session: Optional[AnalysisSession] = None):
+        self.session = session or AnalysisSession(loader, analyzer)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="slack-analysis")
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # AnalysisSession is not thread-safe; week loads/analyses run one at a time
+        # (they're CPU-bound anyway) while formatting and posting run in parallel
+        self._session_lock = threading.Lock()
+
+    def submit(self, key: Hashable, job: Callable[[], object]) -> Future:
+        """Run job in the pool, or join the identical job already in flight"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._pool.submit(job)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return future
+
+    def _forget(self, key: Hashable, future: Future):
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def analyses(self, week: int, min_confidence: int = 0) -> List:
+        """Full analysis for a week (cached), filtered; call from worker threads"""
+        with self._session_lock:
+            return self.session.get_analyses(week, min_confidence=min_confidence)
+
+    def context(self, week: int) -> Dict:
+        with self._session_lock:
+            return self.session.get_context(week)
+
+    def prefetch(self, week: int) -> Future:
+        """Warm a week in the background (e.g. the current week at startup)"""
+        return self.submit(("prefetch", week), lambda: len(self.analyses(week)))
+
+    def invalidate(self, week: Optional[int] = None):
+        with self._session_lock:
+            self.session.invalidate(week)
+
+    def respond(self, key: Hashable, build_response: Callable[[], str],
+                say: Callable[[str], object], error_prefix: str = "❌ Error") -> Future:
+        """Build a response in the background and post it with say() when ready"""
+        future = self.submit(key, build_response)
+
+        def post(done: Future):
+            try:
+                say(done.result())
+            except Exception as e:
+                logger.error(f"{error_prefix}: {e}")
+                try:
+                    say(f"{error_prefix}: {str(e)}")
+                except Exception as post_error:
+                    logger.error(f"Failed to post error to Slack: {post_error}")
+
+        future.add_done_callback(post)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
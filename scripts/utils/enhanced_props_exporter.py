@@ -6,14 +6,32 @@ Features:
 1. Correlation Clusters - Groups related props (same player, same game, etc.)
 2. Agent Breakdown Analysis - Detailed breakdown of each agent's reasoning
 3. Contradiction Detection - Identifies props that disagree with each other
+
+The export is streamed (write_with_clusters): each prop is encoded and written
+on its own, so the full list of prop records is never held in memory.
 """
 
+import io
 import json
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, TextIO
 from datetime import datetime
 from collections import defaultdict
 from scripts.analysis.models import PropAnalysis
 
+AGENTS = ['DVOA', 'Matchup', 'Volume', 'Injury', 'Trend', 'GameScript', 'Variance', 'Weather']
+
+
+def _agent_score(value) -> float:
+    """agent_breakdown values are either raw scores or dicts with a raw_score"""
+    if isinstance(value, dict):
+        return value.get('raw_score', 50)
+    return value if isinstance(value, (int, float)) else 50
+
+
+def _nested_json(value, level: int = 1) -> str:
+    """json.dumps(indent=2) of a value that sits `level` deep in the export"""
+    return json.dumps(value, indent=2).replace('\n', '\n' + '  ' * level)
+
 
 class EnhancedPropsExporter:
     """Advanced props exporter with clustering and contradiction detection"""
@@ -166,21 +184,15 @@ class EnhancedPropsExporter:
             'agreement_rate': 0
         })
         
-        agents = ['DVOA', 'Matchup', 'Volume', 'Injury', 'Trend', 'GameScript', 'Variance', 'Weather']
-        
-        for agent in agents:
+        for agent in AGENTS:
+            profile = agent_profiles[agent]
+            agreements = 0
             for prop in props:
-                score_raw = prop.agent_breakdown.get(agent, 50)
-                # Handle case where agent_breakdown returns a dict instead of a number
-                if isinstance(score_raw, dict):
-                    score = score_raw.get('raw_score', 50)
-                else:
-                    score = score_raw if isinstance(score_raw, (int, float)) else 50
-                
-                agent_profiles[agent]['scores'].append(score)
+                score = _agent_score(prop.agent_breakdown.get(agent, 50))
+                profile['scores'].append(score)
                 
                 if score > 65:
-                    agent_profiles[agent]['bullish_props'].append({
+                    profile['bullish_props'].append({
                         'player': prop.prop.player_name,
                         'stat': prop.prop.stat_type,
                         'bet': prop.prop.bet_type,
@@ -188,7 +200,7 @@ class EnhancedPropsExporter:
                         'final_confidence': prop.final_confidence
                     })
                 elif score < 35:
-                    agent_profiles[agent]['bearish_props'].append({
+                    profile['bearish_props'].append({
                         'player': prop.prop.player_name,
                         'stat': prop.prop.stat_type,
                         'bet': prop.prop.bet_type,
@@ -196,69 +208,48 @@ class EnhancedPropsExporter:
                         'final_confidence': prop.final_confidence
                     })
                 else:
-                    agent_profiles[agent]['neutral_props'].append(prop.prop.player_name)
+                    profile['neutral_props'].append(prop.prop.player_name)
+                
+                final_conf = prop.final_confidence
+                if (score > 60 and final_conf > 60) or (score < 40 and final_conf < 40):
+                    agreements += 1
             
-            scores = agent_profiles[agent]['scores']
+            scores = profile['scores']
             if scores:
-                avg_score = sum(scores) / len(scores)
-                agreements = 0
-                for prop in props:
-                    score_raw = prop.agent_breakdown.get(agent, 50)
-                    # Handle case where agent_breakdown returns a dict instead of a number
-                    if isinstance(score_raw, dict):
-                        agent_score = score_raw.get('raw_score', 50)
-                    else:
-                        agent_score = score_raw if isinstance(score_raw, (int, float)) else 50
-                    
-                    final_conf = prop.final_confidence
-                    if (agent_score > 60 and final_conf > 60) or (agent_score < 40 and final_conf < 40):
-                        agreements += 1
-                
-                agreement_rate = (agreements / len(props) * 100) if props else 0
-                
-                agent_profiles[agent]['average_score'] = avg_score
-                agent_profiles[agent]['agreement_rate'] = agreement_rate
-                agent_profiles[agent]['active'] = len(scores) > 0
+                profile['average_score'] = sum(scores) / len(scores)
+                profile['agreement_rate'] = agreements / len(props) * 100
+                profile['active'] = True
         
         return dict(agent_profiles)
 
     @staticmethod
-    def export_with_clusters(props: List[PropAnalysis], num_props: Optional[int] = None) -> str:
-        """Export props WITH correlation clusters and contradiction detection"""
-        # Only slice if num_props is an integer and is less than len(props)
-        if isinstance(num_props, int) and num_props > 0:
-            props = props[:num_props]
-        
-        clusters = EnhancedPropsExporter.analyze_correlations(props)
-        contradictions = EnhancedPropsExporter.detect_contradictions(props)
-        agent_profiles = EnhancedPropsExporter.create_agent_profiles(props)
-        
-        props_data = []
-        for prop in props:
-            # Safely process agent_breakdown
-            agent_breakdown_output = {}
-            for agent, value in prop.agent_breakdown.items():
-                if isinstance(value, dict):
-                    score = value.get('raw_score', 50)
-                else:
-                    score = value if isinstance(value, (int, float)) else 50
-                agent_breakdown_output[agent] = round(score, 1)
-            
-            prop_dict = {
-                "player": prop.prop.player_name,
-                "position": prop.prop.position,
-                "team": prop.prop.team,
-                "opponent": prop.prop.opponent,
-                "stat_type": prop.prop.stat_type,
-                "line": prop.prop.line,
-                "bet_type": prop.prop.bet_type,
-                "confidence": round(prop.final_confidence, 1),
-                "recommendation": prop.recommendation,
-                "agent_breakdown": agent_breakdown_output,
-                "rationale": prop.rationale[:3] if prop.rationale else [],
-            }
-            props_data.append(prop_dict)
-        
+    def _analyze(props: List[PropAnalysis]) -> Tuple[Dict, List[Dict], Dict]:
+        """Clusters, contradictions and agent profiles for one prop set"""
+        return (EnhancedPropsExporter.analyze_correlations(props),
+                EnhancedPropsExporter.detect_contradictions(props),
+                EnhancedPropsExporter.create_agent_profiles(props))
+
+    @staticmethod
+    def _prop_record(prop: PropAnalysis) -> Dict:
+        """One exported prop"""
+        return {
+            "player": prop.prop.player_name,
+            "position": prop.prop.position,
+            "team": prop.prop.team,
+            "opponent": prop.prop.opponent,
+            "stat_type": prop.prop.stat_type,
+            "line": prop.prop.line,
+            "bet_type": prop.prop.bet_type,
+            "confidence": round(prop.final_confidence, 1),
+            "recommendation": prop.recommendation,
+            "agent_breakdown": {agent: round(_agent_score(value), 1)
+                                for agent, value in prop.agent_breakdown.items()},
+            "rationale": prop.rationale[:3] if prop.rationale else [],
+        }
+
+    @staticmethod
+    def _summaries(clusters: Dict, contradictions: List[Dict], agent_profiles: Dict) -> Tuple[Dict, List[Dict], Dict]:
+        """Exported summaries of the clusters, contradictions and agent profiles"""
         clusters_data = {}
         for cluster_type, cluster_list in clusters.items():
             clusters_data[cluster_type] = {
@@ -294,20 +285,52 @@ class EnhancedPropsExporter:
                 'bearish_count': len(profile['bearish_props']),
             }
         
-        export_data = {
-            "metadata": {
-                "export_timestamp": datetime.now().isoformat(),
-                "total_props": len(props_data),
-                "clusters_detected": sum(len(v['clusters']) for v in clusters_data.values()),
-                "contradictions_detected": len(contradictions_data),
-            },
-            "props": props_data,
-            "correlation_clusters": clusters_data,
-            "contradictions": contradictions_data,
-            "agent_analysis": agent_profiles_data,
+        return clusters_data, contradictions_data, agent_profiles_data
+
+    @staticmethod
+    def write_with_clusters(props: List[PropAnalysis], out: TextIO, num_props: Optional[int] = None,
+                            analysis: Optional[Tuple[Dict, List[Dict], Dict]] = None) -> None:
+        """
+        Stream the clustered export to a text file object, one prop at a time.
+        Writes exactly what export_with_clusters returns.
+        """
+        # Only slice if num_props is an integer and is less than len(props)
+        if isinstance(num_props, int) and num_props > 0:
+            props = props[:num_props]
+        
+        clusters, contradictions, agent_profiles = analysis or EnhancedPropsExporter._analyze(props)
+        clusters_data, contradictions_data, agent_profiles_data = EnhancedPropsExporter._summaries(
+            clusters, contradictions, agent_profiles)
+        
+        metadata = {
+            "export_timestamp": datetime.now().isoformat(),
+            "total_props": len(props),
+            "clusters_detected": sum(len(v['clusters']) for v in clusters_data.values()),
+            "contradictions_detected": len(contradictions_data),
         }
+        out.write('{\n  "metadata": ' + _nested_json(metadata) + ',\n  "props": ')
         
-        return json.dumps(export_data, indent=2)
+        if props:
+            out.write('[')
+            for i, prop in enumerate(props):
+                out.write((',' if i else '') + '\n    ' + _nested_json(EnhancedPropsExporter._prop_record(prop), 2))
+            out.write('\n  ]')
+        else:
+            out.write('[]')
+        
+        for key, value in (("correlation_clusters", clusters_data),
+                           ("contradictions", contradictions_data),
+                           ("agent_analysis", agent_profiles_data)):
+            out.write(f',\n  "{key}": ' + _nested_json(value))
+        out.write('\n}')
+
+    @staticmethod
+    def export_with_clusters(props: List[PropAnalysis], num_props: Optional[int] = None,
+                             analysis: Optional[Tuple[Dict, List[Dict], Dict]] = None) -> str:
+        """Export props WITH correlation clusters and contradiction detection"""
+        buffer = io.StringIO()
+        EnhancedPropsExporter.write_with_clusters(props, buffer, num_props, analysis)
+        return buffer.getvalue()
 
     @staticmethod
     def export_with_clusters_formatted(props: List[PropAnalysis], num_props: Optional[int] = None) -> Tuple[str, str]:
@@ -316,9 +339,8 @@ class EnhancedPropsExporter:
         if isinstance(num_props, int) and num_props > 0:
             props = props[:num_props]
         
-        clusters = EnhancedPropsExporter.analyze_correlations(props)
-        contradictions = EnhancedPropsExporter.detect_contradictions(props)
-        agent_profiles = EnhancedPropsExporter.create_agent_profiles(props)
+        analysis = EnhancedPropsExporter._analyze(props)
+        clusters, contradictions, agent_profiles = analysis
         
         summary_lines = [
             "\n" + "="*80,
@@ -350,7 +372,7 @@ class EnhancedPropsExporter:
         
         summary_lines.append("\n" + "="*80)
         
-        json_export = EnhancedPropsExporter.export_with_clusters(props, num_props)
+        json_export = EnhancedPropsExporter.export_with_clusters(props, analysis=analysis)
         summary_text = "\n".join(summary_lines)
         
         return json_export, summary_text
@@ -0,0 +1,84 @@
+"""
+Test per-week agent stats: recorded in the DB, merged across weeks, refreshed on regrading
+"""
+
+import json
+import os
+
+from scripts.backtesting.calibration_analyzer import CalibrationAnalyzer
+
+
+def _agent(score, direction):
+    return {'raw_score': score, 'direction': direction, 'rationale': [], 'weight': 1.0}
+
+
+def _prediction(bet_type, result, agents):
+    return {'player_name': 'travis kelce', 'stat_type': 'Rec Yds', 'line': 60.5, 'bet_type': bet_type,
+            'confidence': 65, 'result': result, 'agents': agents}
+
+
+WEEKS = {
+    11: [_prediction('OVER', 'WIN', {'DVOA': _agent(75, 'OVER'), 'Injury': _agent(40, 'UNDER')}),
+         _prediction('UNDER', 'LOSS', {'DVOA': _agent(60, 'UNDER')}),
+         _prediction('OVER', 'VOID', {'DVOA': _agent(80, 'OVER')})],
+    12: [_prediction('UNDER', 'WIN', {'Volume': _agent(55, 'UNDER'), 'DVOA': _agent(52, 'OVER')})],
+}
+
+
+def _write_week(results_dir, week, graded):
+    path = results_dir / f"graded_week_{week}.json"
+    path.write_text(json.dumps(graded))
+    # Make sure a rewrite within the same clock tick still looks changed
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + week))
+
+
+def _analyzer(tmp_path):
+    return CalibrationAnalyzer(data_dir=str(tmp_path), db_path=str(tmp_path / "bets.db"))
+
+
+def test_merged_week_stats_match_a_full_pass(tmp_path):
+    results_dir = tmp_path / "backtest_results"
+    results_dir.mkdir()
+    for week, graded in WEEKS.items():
+        _write_week(results_dir, week, graded)
+
+    analyzer = _analyzer(tmp_path)
+    full = analyzer.analyze_agent_performance(analyzer.load_graded_results([11, 12]))
+    merged = _analyzer(tmp_path).load_agent_stats([11, 12])
+
+    assert list(merged) == ['DVOA', 'Injury', 'Volume']
+    assert merged == full
+    assert (merged['DVOA'].wins, merged['DVOA'].losses, merged['DVOA'].contrarian_wrong) == (1, 1, 1)
+    assert merged['DVOA'].total_confidence_sum == 135.0
+    assert set(analyzer.weight_manager.get_week_stats_sources()) == {11, 12}
+    assert _analyzer(tmp_path).load_agent_stats([12])['DVOA'].total_predictions == 1
+
+
+def test_regraded_week_replaces_its_stats(tmp_path):
+    results_dir = tmp_path / "backtest_results"
+    results_dir.mkdir()
+    _write_week(results_dir, 11, WEEKS[11])
+    assert _analyzer(tmp_path).load_agent_stats([11])['DVOA'].aligned_predictions == 2
+
+    _write_week(results_dir, 11, WEEKS[11][:1])
+    assert _analyzer(tmp_path).load_agent_stats([11])['DVOA'].aligned_predictions == 1
+
+    # Stats stay available after the graded files are cleaned up
+    (results_dir / "graded_week_11.json").unlink()
+    assert _analyzer(tmp_path).load_agent_stats([11])['Injury'].contrarian_wrong == 1
+
+
+def test_weeks_without_decided_predictions_are_recorded_once(tmp_path, monkeypatch):
+    results_dir = tmp_path / "backtest_results"
+    results_dir.mkdir()
+    _write_week(results_dir, 11, WEEKS[11][2:])  # VOID only
+    _write_week(results_dir, 12, [])
+
+    analyzer = _analyzer(tmp_path)
+    assert analyzer.load_agent_stats([11, 12]) == {}
+    assert set(analyzer.weight_manager.get_week_stats_sources()) == {11, 12}
+
+    recorded = []
+    monkeypatch.setattr(CalibrationAnalyzer, 'record_week_stats', lambda self, *a, **k: recorded.append(a))
+    assert _analyzer(tmp_path).load_agent_stats([11, 12]) == {}
+    assert recorded == []
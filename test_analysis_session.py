@@ -0,0 +1,65 @@
+"""
+Test the interactive-session analysis cache
+"""
+
+from types import SimpleNamespace
+
+from scripts.analysis.analysis_session import AnalysisSession
+
+
+class FakeLoader:
+    def __init__(self):
+        self.loads = 0
+
+    def load_all_data(self, week, preferred_book=None):
+        self.loads += 1
+        return {'week': week, 'props': []}
+
+
+class FakeWeights:
+    def __init__(self):
+        self.weights = {'DVOA': 2.0}
+
+    def get_current_weights(self):
+        return dict(self.weights)
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.runs = 0
+        self.weight_manager = FakeWeights()
+        self.agents = {'DVOA': SimpleNamespace(weight=1.0)}
+
+    def analyze_all_props(self, context, min_confidence=0):
+        self.runs += 1
+        return [SimpleNamespace(final_confidence=c) for c in (80, 65, 55, 40)]
+
+
+def test_commands_are_views_over_one_analysis():
+    loader, analyzer = FakeLoader(), FakeAnalyzer()
+    session = AnalysisSession(loader, analyzer)
+
+    assert [a.final_confidence for a in session.get_analyses(12, min_confidence=60)] == [80, 65]
+    assert len(session.get_analyses(12, min_confidence=50)) == 3
+    session.get_context(12)
+
+    assert loader.loads == 1
+    assert analyzer.runs == 1
+    assert analyzer.agents['DVOA'].weight == 2.0
+
+
+def test_weight_change_and_invalidate_recompute():
+    loader, analyzer = FakeLoader(), FakeAnalyzer()
+    session = AnalysisSession(loader, analyzer)
+    session.get_analyses(12)
+
+    analyzer.weight_manager.weights['DVOA'] = 3.5
+    session.get_analyses(12)
+    assert analyzer.runs == 2
+    assert loader.loads == 1  # weights don't require reloading data
+    assert analyzer.agents['DVOA'].weight == 3.5
+
+    session.invalidate(12)
+    session.get_analyses(12)
+    assert loader.loads == 2
+    assert analyzer.runs == 3
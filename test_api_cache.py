@@ -0,0 +1,121 @@
+"""
+Test the API cache layer against the local in-memory store (no Redis needed)
+"""
+
+import asyncio
+
+from api.core import cache
+
+
+def test_week_invalidation_is_version_bump():
+    async def run():
+        cache.use_local_store()
+        await cache.cache_set("props_conf_60", "payload", week=12)
+        await cache.cache_set("props_conf_60", "other-week", week=13)
+        assert await cache.cache_get("props_conf_60", week=12) == "payload"
+
+        await cache.cache_invalidate_week(12)
+
+        assert await cache.cache_get("props_conf_60", week=12) is None
+        assert await cache.cache_get("props_conf_60", week=13) == "other-week"
+
+    asyncio.run(run())
+
+
+def test_single_flight_computes_once():
+    async def run():
+        cache.use_local_store()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "expensive"
+
+        results = await asyncio.gather(*(
+            cache.cache_get_or_compute("slate", compute, expire=60, week=5)
+            for _ in range(20)
+        ))
+
+        assert results == ["expensive"] * 20
+        assert calls == 1
+
+        # Served from cache afterwards
+        assert await cache.cache_get_or_compute("slate", compute, expire=60, week=5) == "expensive"
+        assert calls == 1
+
+    asyncio.run(run())
+
+
+def test_l1_lru_evicts_oldest():
+    l1 = cache.L1Cache(max_entries=2, ttl=60)
+    l1.set("a", 1)
+    l1.set("b", 2)
+    l1.get("a")
+    l1.set("c", 3)
+
+    assert l1.get("a") == 1
+    assert l1.get("b") is None
+    assert l1.get("c") == 3
+
+
+def test_cancelled_leader_hands_off_to_waiters():
+    async def run():
+        cache.use_local_store()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return f"value-{calls}"
+
+        leader = asyncio.create_task(cache.cache_get_or_compute("slate", compute, expire=60, week=7))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.cache_get_or_compute("slate", compute, expire=60, week=7))
+                   for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await asyncio.wait_for(asyncio.gather(*waiters), timeout=2)
+
+        assert leader.cancelled()
+        assert results == ["value-2"] * 3
+        assert calls == 2
+        assert not cache._inflight
+
+    asyncio.run(run())
+
+
+def test_redis_is_retried_after_backoff(monkeypatch):
+    class FlakyRedis(cache.LocalStore):
+        def __init__(self):
+            super().__init__()
+            self.pings = 0
+
+        async def ping(self):
+            self.pings += 1
+            if self.pings == 1:
+                raise ConnectionError("redis starting")
+            return True
+
+    redis = FlakyRedis()
+    monkeypatch.setattr(cache, "redis_client", redis)
+    monkeypatch.setattr(cache, "_store", None)
+    monkeypatch.setattr(cache, "_redis_retry_at", 0.0)
+    monkeypatch.setattr(cache, "_redis_retry_delay", cache.REDIS_RETRY_MIN_SECONDS)
+
+    async def run():
+        assert await cache.get_store() is cache._local_store
+        # Within the backoff: no new ping
+        assert await cache.get_store() is cache._local_store
+        assert redis.pings == 1
+
+        assert cache._redis_retry_delay == 2 * cache.REDIS_RETRY_MIN_SECONDS
+        cache._redis_retry_at = 0.0  # backoff elapsed
+        assert await cache.get_store() is redis
+        assert await cache.get_store() is redis
+        assert redis.pings == 2
+
+    asyncio.run(run())
@@ -0,0 +1,86 @@
+"""
+Test the async database path: get_async_db's session lifecycle and a run_sync route end to end on aiosqlite
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api import database
+from api.database import Base, BookOdds, Player, get_async_db
+from api.routers import odds, players
+
+
+@pytest.fixture
+def async_db(tmp_path, monkeypatch):
+    """A seeded SQLite file served to get_async_db through aiosqlite"""
+    url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Player(id=1, name="Travis Kelce", team="KC", position="TE"))
+    db.add_all([BookOdds(player_id=1, week=12, stat_type="rec_yds", bookmaker=book, line=line,
+                         over_price=over, under_price=under)
+                for book, line, over, under in [("draftkings", 55.5, -110, -110), ("fanduel", 56.5, -105, -115)]])
+    db.commit()
+    db.close()
+    engine.dispose()
+
+    async_engine = create_async_engine(database._async_database_url(url))
+    monkeypatch.setattr(database, "AsyncSessionLocal",
+                        async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False))
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+def test_session_is_closed_after_the_request_and_on_errors(async_db):
+    async def run():
+        requests = get_async_db()
+        db = await requests.__anext__()
+        assert isinstance(db, AsyncSession)
+        assert (await db.execute(text("select count(*) from book_odds"))).scalar() == 2
+        assert async_db.pool.checkedout() == 1
+        with pytest.raises(StopAsyncIteration):
+            await requests.__anext__()
+        assert async_db.pool.checkedout() == 0
+
+        failing = get_async_db()
+        db = await failing.__anext__()
+        await db.execute(text("select 1"))
+        with pytest.raises(ValueError):
+            await failing.athrow(ValueError("route failed"))
+        assert async_db.pool.checkedout() == 0
+
+    asyncio.run(run())
+
+
+def test_async_dependency_needs_a_driver(monkeypatch):
+    monkeypatch.setattr(database, "AsyncSessionLocal", None)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(get_async_db().__anext__())
+
+
+def test_converted_routes_end_to_end(async_db):
+    app = FastAPI()
+    app.include_router(odds.router, prefix="/api/odds")
+    app.include_router(players.router, prefix="/api/players")
+
+    with TestClient(app) as client:
+        best = client.get("/api/odds/best-prices", params={"player_id": 1, "stat_type": "rec_yds", "week": 12})
+        assert best.status_code == 200
+        assert best.json()["best_over"] == {"bookmaker": "fanduel", "line": 56.5, "price": -105}
+        assert best.json()["best_under"] == {"bookmaker": "draftkings", "line": 55.5, "price": -110}
+
+        player_odds = client.get("/api/odds/player/1", params={"week": 12})
+        assert sorted(o["bookmaker"] for o in player_odds.json()) == ["draftkings", "fanduel"]
+
+        assert client.get("/api/players/1").json()["name"] == "Travis Kelce"
+        assert client.get("/api/players/2").status_code == 404
+
+    assert async_db.pool.checkedout() == 0
@@ -0,0 +1,67 @@
+"""
+Test the columnar betting-line pipeline: market mapping, roster teams, book dedup
+"""
+
+import pandas as pd
+
+from scripts.analysis.data_loader import deduplicate_props, props_from_betting_lines, transform_betting_lines_to_props
+from scripts.analysis.player_identity import player_id
+
+
+def _lines():
+    rows = []
+    for book, kelce_line, odds in (('DraftKings', 60.5, -110), ('fanduel', 62.5, -115), ('BetMGM', 58.5, -105)):
+        for side in ('Over', 'Under'):
+            rows.append(('Kansas City Chiefs', 'Buffalo Bills', book, 'player_reception_yds', 'Travis Kelce',
+                         kelce_line, side, odds))
+    rows += [
+        # Refetched duplicate of the first DraftKings offer
+        ('Kansas City Chiefs', 'Buffalo Bills', 'DraftKings', 'player_reception_yds', 'Travis Kelce', 60.5, 'Over', -110),
+        # Unrostered player: assumed on the home team of their first game
+        ('Kansas City Chiefs', 'Buffalo Bills', 'draftkings', 'player_rush_yds', 'Practice Squad Back', 12.5, 'Over', 100),
+        ('Kansas City Chiefs', 'Buffalo Bills', 'draftkings', 'player_anytime_td', 'Travis Kelce', 0.5, 'Over', 150),
+        ('Kansas City Chiefs', 'Buffalo Bills', 'draftkings', 'h2h', 'Travis Kelce', 0.5, 'Over', 150),
+        # Roster team isn't in this game
+        ('Dallas Cowboys', 'New York Giants', 'draftkings', 'player_receptions', 'Josh Allen', 1.5, 'Over', -120),
+    ]
+    return pd.DataFrame(rows, columns=['home_team', 'away_team', 'bookmaker', 'market', 'player_name',
+                                       'line', 'direction', 'odds'])
+
+
+def _roster():
+    return {player_id('Travis Kelce'): 'KC', player_id('Josh Allen'): 'BUF'}
+
+
+def test_transform_maps_markets_and_teams_without_touching_roster():
+    roster = _roster()
+
+    props = transform_betting_lines_to_props(_lines(), 12, roster)
+
+    assert roster == _roster()
+    assert len(props) == 8
+    assert [p['stat_type'] for p in props[-2:]] == ['Rush Yds', 'player_anytime_td']
+    kelce = props[0]
+    assert kelce == {
+        'player_name': 'travis kelce', 'player_id': player_id('Travis Kelce'), 'team': 'KC', 'opponent': 'BUF',
+        'position': 'WR', 'stat_type': 'Rec Yds', 'line': 60.5, 'bet_type': 'Over', 'game_total': 44.5,
+        'spread': 0.0, 'is_home': True, 'week': 12, 'bookmaker': 'draftkings', 'odds': -110.0,
+    }
+    assert (props[-2]['team'], props[-2]['opponent'], props[-2]['position']) == ('KC', 'BUF', 'RB')
+
+
+def test_dedup_picks_median_or_preferred_book():
+    roster = _roster()
+
+    median = props_from_betting_lines(_lines(), 12, roster)
+    preferred = props_from_betting_lines(_lines(), 12, roster, preferred_book='FanDuel ')
+
+    assert [(p['stat_type'], p['bet_type']) for p in median] == \
+        [('Rec Yds', 'Over'), ('Rec Yds', 'Under'), ('Rush Yds', 'Over'), ('player_anytime_td', 'Over')]
+    assert (median[0]['line'], median[0]['bookmaker']) == (60.5, 'draftkings')
+    assert median[0]['all_books'] == [{'bookmaker': 'draftkings', 'line': 60.5, 'odds': -110.0},
+                                      {'bookmaker': 'fanduel', 'line': 62.5, 'odds': -115.0},
+                                      {'bookmaker': 'betmgm', 'line': 58.5, 'odds': -105.0}]
+    assert (preferred[1]['line'], preferred[1]['bookmaker']) == (62.5, 'fanduel')
+
+    # The list API selects the same props
+    assert deduplicate_props(transform_betting_lines_to_props(_lines(), 12, roster), 'fanduel') == preferred
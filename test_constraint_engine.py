@@ -0,0 +1,66 @@
+"""
+Test compiled constraint filtering and change-driven invalidation in ConstraintEngine
+"""
+
+import sqlite3
+from datetime import datetime
+
+from scripts.assistant.constraint_engine import ConstraintEngine, ConstraintType
+from scripts.assistant.init_db_schema import extend_database_schema
+
+
+def _engine(tmp_path):
+    db_path = str(tmp_path / "assistant.db")
+    extend_database_schema(db_path)
+    return ConstraintEngine(db_path=db_path), db_path
+
+
+def test_rules_and_exclusions_filter_in_rule_order(tmp_path):
+    engine, _ = _engine(tmp_path)
+    engine.mark_player_unavailable("Patrick Mahomes", source="user")
+    engine.create_constraint_rule(ConstraintType.PROP_TYPE_EXCLUDED, {'excluded_types': ['Pass TDs']})
+    engine.create_constraint_rule(ConstraintType.MIN_LINE_THRESHOLD, {'min_line': 1.5})
+    engine.create_constraint_rule(ConstraintType.MAX_LINE_THRESHOLD, {'max_line': 300})
+
+    props = [
+        {'player_name': 'Patrick Mahomes ', 'stat_type': 'Pass Yds', 'line': 275.5},
+        {'player_name': 'Josh Allen', 'stat_type': 'Pass TDs', 'line': 0.5},
+        {'player_name': 'Josh Allen', 'stat_type': 'Pass Yds', 'line': 310.5},
+        {'player_name': 'Travis Kelce', 'stat_type': 'Receptions', 'line': 0.5},
+        {'player_name': 'Travis Kelce', 'stat_type': 'Rec Yds', 'line': 60.5},
+        {'player_name': 'Rashee Rice', 'stat_type': 'Rec Yds', 'line': 55},
+    ]
+
+    filtered, reasons = engine.apply_constraints_to_props(props, extra_excluded_players=['rashee rice'])
+
+    assert filtered == [props[4]]
+    assert reasons[0] == "Excluded Patrick Mahomes (unavailable on pick6)"
+    assert reasons[1].startswith("Excluded Pass TDs (rule: ")
+    assert reasons[2] == "Excluded Josh Allen Pass Yds (line 310.5 > 300)"
+    assert reasons[3] == "Excluded Travis Kelce Receptions (line 0.5 < 1.5)"
+    assert reasons[4] == "Excluded Rashee Rice (unavailable on pick6)"
+
+
+def test_compiled_constraints_reused_until_data_changes(tmp_path):
+    engine, db_path = _engine(tmp_path)
+    engine.mark_player_unavailable("Derrick Henry", prop_type="Rush Yds", notes="Week 15")
+
+    compiled = engine.compile()
+    assert engine.compile() is compiled
+    assert engine.is_player_available("Derrick Henry", "Rush Yds") == \
+        (False, "Marked unavailable by user (Week 15)")
+    assert engine.is_player_available("Derrick Henry", "Receptions") == (True, None)
+
+    # A write from another process/connection is picked up via PRAGMA data_version
+    other = sqlite3.connect(db_path)
+    other.execute("""
+        INSERT INTO pick6_availability (player_name, prop_type, platform, is_available, last_updated, source)
+        VALUES ('Lamar Jackson', '*', 'pick6', 0, ?, 'scraper')
+    """, (datetime.now().isoformat(),))
+    other.commit()
+    other.close()
+
+    assert engine.compile() is not compiled
+    assert sorted(engine.get_excluded_players()) == ['Derrick Henry', 'Lamar Jackson']
+    assert engine.is_player_available("Lamar Jackson", "Pass Yds")[0] is False
+    engine.close()
@@ -0,0 +1,102 @@
+"""
+Test pair-level dependency verdicts: shared pairs are asked once, batched, and persisted
+"""
+
+import json
+import re
+from types import SimpleNamespace
+
+from scripts.analysis.dependency_analyzer import DEFAULT_PAIR_CACHE, DependencyAnalyzer, project_root
+from scripts.analysis.models import Parlay, PlayerProp, PropAnalysis
+
+
+class FakeClaude:
+    """messages.create stand-in: same-player pairs are dependent (-3)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.pairs_asked = 0
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, model, max_tokens, messages):
+        self.requests += 1
+        prompt = messages[0]["content"]
+        entries = []
+        for pair_id, a, b in re.findall(r"Pair (\d+):\n  A: (\S+ \S+).*\n  B: (\S+ \S+)", prompt):
+            self.pairs_asked += 1
+            same = a == b
+            entries.append({"id": int(pair_id), "dependent": same,
+                            "adjustment_value": -3 if same else 0,
+                            "reasoning": "Same player" if same else ""})
+        text = "```json\n" + json.dumps({"pairs": entries}) + "\n```"
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def _leg(player, team, opponent, stat='Rec Yds', confidence=70):
+    prop = PlayerProp(player_name=player, team=team, opponent=opponent, position='WR',
+                      stat_type=stat, line=50.5, week=12)
+    return PropAnalysis(prop=prop, final_confidence=confidence, recommendation='OVER',
+                        rationale=[], agent_breakdown={}, edge_explanation='')
+
+
+def _parlay(*legs):
+    return Parlay(legs=list(legs), parlay_type=f"{len(legs)}-leg", risk_level="LOW", rationale="")
+
+
+def test_shared_pairs_are_asked_once_and_persisted(tmp_path):
+    kelce_yds = _leg('Travis Kelce', 'KC', 'BUF')
+    kelce_rec = _leg('Travis Kelce', 'KC', 'BUF', stat='Receptions')
+    rice = _leg('Rashee Rice', 'KC', 'BUF')
+    lamb = _leg('CeeDee Lamb', 'DAL', 'NYG')
+    parlays = {
+        '2-leg': [_parlay(kelce_yds, rice), _parlay(rice, lamb)],
+        '3-leg': [_parlay(kelce_yds, rice, lamb), _parlay(kelce_yds, kelce_rec, lamb)],
+    }
+    cache_path = str(tmp_path / "pairs.json")
+    client = FakeClaude()
+
+    result = DependencyAnalyzer(client=client, cache_path=cache_path, pairs_per_request=1) \
+        .analyze_all_parlays(parlays)
+
+    # Same-game pairs go to the API once each; cross-game pairs never do
+    assert client.pairs_asked == 2
+    assert client.requests == 2
+    same_player = result['3-leg'][1]['dependency_analysis']
+    assert same_player['recommendation'] == 'MODIFY'
+    assert same_player['correlation_adjustment']['adjustment_value'] == -3
+    assert same_player['adjusted_confidence'] == parlays['3-leg'][1].combined_confidence - 3
+    assert result['2-leg'][1]['dependency_analysis']['recommendation'] == 'ACCEPT'
+
+    # A new analyzer (next run) answers from disk, including for a new parlay of known pairs
+    rerun_client = FakeClaude()
+    rerun = DependencyAnalyzer(client=rerun_client, cache_path=cache_path)
+    verdict = rerun.analyze_parlay_dependencies(_parlay(kelce_rec, kelce_yds))
+    assert rerun_client.requests == 0
+    assert verdict['correlation_adjustment']['adjustment_value'] == -3
+
+
+def test_penalty_is_capped_and_avoids():
+    legs = [_leg('Travis Kelce', 'KC', 'BUF', stat=s) for s in ('Rec Yds', 'Receptions', 'Longest Rec')]
+    analyzer = DependencyAnalyzer(client=FakeClaude(), cache_path=None)
+
+    verdict = analyzer.analyze_parlay_dependencies(_parlay(*legs))
+
+    assert verdict['correlation_adjustment']['adjustment_value'] == -5
+    assert verdict['recommendation'] == 'AVOID'
+    assert len(verdict['dependency_chains']) == 3
+
+
+def test_pair_keys_survive_a_new_player_registry():
+    analyzer = DependencyAnalyzer(client=FakeClaude(), cache_path=None)
+    kelce, rice = _leg('Travis Kelce', 'KC', 'BUF'), _leg('Rashee Rice', 'KC', 'BUF')
+    key = analyzer._pair_key(kelce, rice)
+
+    # Another process may intern the same players under different IDs
+    kelce.prop.player_id, rice.prop.player_id = 901, 902
+    assert analyzer._pair_key(rice, kelce) == key
+    assert analyzer._pair_key(_leg('Travis Kelce Jr.', 'KC', 'BUF'), rice) == key
+
+
+def test_default_cache_is_anchored_at_the_project_root():
+    assert DEFAULT_PAIR_CACHE == str(project_root / "data" / "cache" / "dependency_pairs.json")
+    assert (project_root / "scripts" / "analysis" / "dependency_analyzer.py").exists()
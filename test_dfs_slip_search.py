@@ -0,0 +1,85 @@
+"""
+Test the correlation-aware DFS slip search
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.database import get_db
+from api.dependencies import get_api_key
+from api.routers import dfs
+from api.services.dfs_service import MAX_SLIP_SIZE, DFSService, _hit_distribution, _penalized_distribution
+
+
+def _pick(i, confidence, team, drivers=("Volume", "Trend")):
+    breakdown = {agent: {"weight": 2.0 - n * 0.5, "raw_score": 60} for n, agent in enumerate(drivers)}
+    return {
+        "player_name": f"Player {i}",
+        "team": team,
+        "position": "WR",
+        "stat_type": "rec_yds",
+        "confidence": confidence,
+        "agent_breakdown": breakdown,
+    }
+
+
+def test_hit_distribution_sums_to_one():
+    dist = _hit_distribution([0.6, 0.55, 0.7])
+    assert len(dist) == 4
+    assert abs(sum(dist) - 1.0) < 1e-9
+    assert abs(dist[3] - 0.6 * 0.55 * 0.7) < 1e-9
+
+
+def test_search_respects_overlap_and_size():
+    service = DFSService()
+    candidates = [_pick(i, 60 + i % 15, f"T{i % 6}") for i in range(40)]
+
+    slips = service.search_slips(candidates, 4, count=3, max_overlap=1)
+
+    assert len(slips) == 3
+    player_sets = [{p["player_name"] for p in s["picks"]} for s in slips]
+    for s in player_sets:
+        assert len(s) == 4
+    for i in range(len(player_sets)):
+        for j in range(i + 1, len(player_sets)):
+            assert len(player_sets[i] & player_sets[j]) <= 1
+    evs = [s["expected_value"] for s in slips]
+    assert evs == sorted(evs, reverse=True)
+
+
+def test_search_avoids_correlated_pair():
+    """Two equally confident picks: the one sharing drivers with the slip loses"""
+    service = DFSService()
+    candidates = [
+        _pick(1, 70, "KC", drivers=("DVOA", "Matchup")),
+        _pick(2, 68, "BUF", drivers=("DVOA", "Matchup")),
+        _pick(3, 68, "DAL", drivers=("Weather", "Variance")),
+    ]
+
+    slips = service.search_slips(candidates, 2, count=1, play_type="power")
+
+    names = {p["player_name"] for p in slips[0]["picks"]}
+    assert names == {"Player 1", "Player 3"}
+
+
+def test_penalty_applies_once_to_the_joint_probability():
+    probs = [0.6, 0.55, 0.7, 0.65]
+    plain = _hit_distribution(probs)
+    dist = _penalized_distribution(probs, -10.0)
+
+    assert abs(sum(dist) - 1.0) < 1e-9
+    assert dist[:3] == plain[:3]
+    assert abs(dist[4] - plain[4] * 0.9) < 1e-9
+    assert _penalized_distribution(probs, 0.0) == plain
+
+
+def test_slip_size_is_bounded_by_the_payout_tables():
+    app = FastAPI()
+    app.include_router(dfs.router, prefix="/api/dfs")
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_api_key] = lambda: "test"
+    client = TestClient(app)
+
+    assert MAX_SLIP_SIZE == 6
+    response = client.get("/api/dfs/suggestions", params={"week": 12, "slip_size": MAX_SLIP_SIZE + 1})
+    assert response.status_code == 422
@@ -0,0 +1,122 @@
+"""
+Test the games table: week-correct upserts from the odds feed, the grouped slate query and cached slate invalidation
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.core import cache
+from api.database import Base, Game, Player, PlayerProjection
+from api.services.game_service import game_service, season_week
+from api.services.odds_service import odds_service
+
+
+def _event(event_id, home, away, commence, spread=None, total=None):
+    markets = []
+    if spread is not None:
+        markets.append({"key": "spreads", "outcomes": [{"name": home, "point": spread},
+                                                        {"name": away, "point": -spread}]})
+    if total is not None:
+        markets.append({"key": "totals", "outcomes": [{"name": "Over", "point": total},
+                                                       {"name": "Under", "point": total}]})
+    return {"id": event_id, "home_team": home, "away_team": away, "commence_time": commence,
+            "bookmakers": [{"key": "draftkings", "markets": markets}]}
+
+
+EVENTS = [
+    _event("kc-buf", "Kansas City Chiefs", "Buffalo Bills", "2024-11-21T01:15:00Z", spread=-2.5, total=47.5),
+    # Monday night kickoff is past midnight UTC but still week 12
+    _event("phi-lar", "Philadelphia Eagles", "Los Angeles Rams", "2024-11-26T01:15:00Z", total=49.5),
+    _event("det-chi", "Detroit Lions", "Chicago Bears", "2024-11-28T17:30:00Z", spread=-10.0, total=48.0),
+    _event("preseason", "Dallas Cowboys", "Las Vegas Raiders", "2024-08-17T20:00:00Z"),
+]
+
+
+def _sessions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slate.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for name, team, conf, pass_yds in [("Patrick Mahomes", "KC", 70.0, 260.0), ("Josh Allen", "BUF", 60.0, 240.0)]:
+        player = Player(name=name, team=team, position="QB")
+        db.add(player)
+        db.flush()
+        db.add(PlayerProjection(player_id=player.id, week=12, stat_type="pass_yds",
+                                engine_projection=pass_yds, confidence=conf))
+    db.commit()
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'slate.db'}")
+    return engine, db, async_engine, async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+def test_season_week_calendar():
+    # Naive kickoff times (as SQLite returns them) are read as UTC
+    assert season_week(datetime(2024, 9, 6, 0, 20)) == 1
+    assert season_week(datetime(2024, 12, 25, 18, 0, tzinfo=timezone.utc)) == 17
+    assert season_week(datetime(2025, 1, 5, 18, 0, tzinfo=timezone.utc)) == 18
+    assert season_week(datetime(2025, 2, 9, 23, 30, tzinfo=timezone.utc)) == 23
+    assert season_week(datetime(2025, 8, 10, 0, 0, tzinfo=timezone.utc)) is None
+
+
+def test_upsert_stamps_each_game_with_its_own_week(tmp_path):
+    _, db, async_engine, _ = _sessions(tmp_path)
+    cache.use_local_store()
+
+    stored = asyncio.run(odds_service.store_game_lines(db, EVENTS, 12))
+
+    assert stored == 3
+    assert {g.id: g.week for g in db.query(Game)} == {"kc-buf": 12, "phi-lar": 12, "det-chi": 13}
+
+    # Re-fetch updates in place; a market missing from the refresh keeps its last value
+    asyncio.run(odds_service.store_game_lines(db, [_event("kc-buf", "Kansas City Chiefs", "Buffalo Bills",
+                                                          "2024-11-21T01:15:00Z", spread=-3.0)], 12))
+    db.expire_all()
+    game = db.get(Game, "kc-buf")
+    assert (db.query(Game).count(), game.spread, game.total) == (3, -3.0, 47.5)
+    asyncio.run(async_engine.dispose())
+
+
+def test_slate_is_one_grouped_query_with_team_fallback(tmp_path):
+    engine, db, async_engine, _ = _sessions(tmp_path)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    # No games stored yet: one row per team with projections
+    fallback = game_service.get_week_slate(db, 12)
+    assert [(g["home_team"], g["away_team"]) for g in fallback] == [("KC", None), ("BUF", None)]
+
+    odds_service._store_games_from_events(db, EVENTS, 12)
+    statements.clear()
+    slate = game_service.get_week_slate(db, 12)
+
+    assert len(statements) == 1
+    assert [(g["home_team"], g["away_team"]) for g in slate] == [("PHI", "LAR"), ("KC", "BUF")]
+    kc = slate[1]
+    assert (kc["home_avg_confidence"], kc["away_avg_confidence"]) == (70.0, 60.0)
+    assert (kc["home_implied_total"], kc["away_implied_total"]) == (25.0, 22.5)
+    assert slate[0]["spread"] is None and slate[0]["implied_total"] == 49.5
+    asyncio.run(async_engine.dispose())
+
+
+def test_cached_slate_is_dropped_when_games_are_upserted(tmp_path):
+    _, db, async_engine, AsyncSession = _sessions(tmp_path)
+    cache.use_local_store()
+
+    async def slate():
+        async with AsyncSession() as session:
+            return await game_service.get_cached_week_slate(session, 12)
+
+    async def run():
+        assert [g["away_team"] for g in await slate()] == [None, None]
+
+        odds_service._store_games_from_events(db, EVENTS[:1], 12)
+        # Written behind the cache's back: still the cached slate
+        assert [g["away_team"] for g in await slate()] == [None, None]
+
+        await odds_service.store_game_lines(db, EVENTS, 12)
+        assert [g["away_team"] for g in await slate()] == ["LAR", "BUF"]
+        await async_engine.dispose()
+
+    asyncio.run(run())
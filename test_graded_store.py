@@ -0,0 +1,70 @@
+"""
+Test the columnar graded-results store and its grouped aggregations
+"""
+
+import json
+
+import numpy as np
+
+from scripts.backtesting.graded_store import GradedResultsStore, count_dicts
+
+
+def _agent(score, direction):
+    return {'raw_score': score, 'direction': direction, 'rationale': [], 'weight': 1.0}
+
+
+def _graded():
+    return [
+        {'player_name': 'travis kelce', 'stat_type': 'Rec Yds', 'line': 60.5, 'bet_type': 'OVER',
+         'confidence': 72, 'result': 'WIN', 'actual_value': 71.0,
+         'agents': {'DVOA': _agent(75, 'OVER'), 'Injury': _agent(0, 'AVOID')}},
+        {'player_name': 'josh allen', 'stat_type': 'Pass Yds', 'line': 245.5, 'bet_type': 'UNDER',
+         'confidence': 64, 'result': 'LOSS', 'actual_value': 260.0,
+         'agents': {'DVOA': _agent(60, 'OVER'), 'Injury': _agent(50, 'UNDER')}},
+        {'player_name': 'james cook', 'stat_type': 'Rush Yds', 'line': 70.5, 'bet_type': 'OVER',
+         'confidence': 58, 'result': 'VOID', 'actual_value': 0,
+         'agents': {'DVOA': _agent(55, 'OVER')}},
+    ]
+
+
+def _write_week(results_dir, week, graded):
+    (results_dir / f"graded_week_{week}.json").write_text(json.dumps(graded))
+
+
+def test_flattens_agents_into_typed_columns_and_aggregates(tmp_path):
+    store = GradedResultsStore(tmp_path)
+    _write_week(tmp_path, 12, _graded())
+    store.append(12, _graded())
+
+    results = GradedResultsStore(tmp_path).load([12, 13])
+
+    assert len(results) == 3 and results.agents == ['DVOA', 'Injury']
+    assert results.frame['DVOA_direction'].dtype == np.int8
+    assert np.isnan(results.scores()[2, 1])
+    assert [a.tolist() for a in results.agreement()] == [[1, 1, 1], [1, 2, 1]]
+
+    by_stat = results.counts('stat_type')
+    assert by_stat.index.tolist() == ['Rec Yds', 'Pass Yds', 'Rush Yds']
+    assert count_dicts(by_stat, ('wins', 'losses', 'voids'))['Rush Yds'] == {'wins': 0, 'losses': 0, 'voids': 1}
+
+    agents = results.agent_frame
+    assert agents['agent'].tolist() == ['DVOA', 'DVOA', 'DVOA', 'Injury', 'Injury']
+    agreement = results.agent_counts(['agent', 'agrees'], where=agents['signaled'])
+    assert count_dicts(agreement, ('wins', 'losses', 'total')) == {
+        ('DVOA', True): {'wins': 1, 'losses': 0, 'total': 2},
+        ('DVOA', False): {'wins': 0, 'losses': 1, 'total': 1},
+        ('Injury', True): {'wins': 0, 'losses': 1, 'total': 1},
+    }
+
+
+def test_rebuilds_a_week_only_when_its_json_changes(tmp_path):
+    _write_week(tmp_path, 12, _graded())
+    store = GradedResultsStore(tmp_path)
+
+    assert len(store.load()) == 3
+    assert (tmp_path / "graded_week_12.pkl").exists()
+
+    # Regraded outside the store: the stale partition is replaced
+    _write_week(tmp_path, 12, _graded()[:1])
+    assert len(store.load([12])) == 1
+    assert len(GradedResultsStore(tmp_path).load([12])) == 1
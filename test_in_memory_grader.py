@@ -0,0 +1,54 @@
+"""
+Test array-based grading in InMemoryGrader, single and batched over configs
+"""
+
+import numpy as np
+
+from scripts.optimization.in_memory_grader import InMemoryGrader
+
+
+def _grader(tmp_path):
+    (tmp_path / "wk12_passing_base.csv").write_text(
+        "Rk,Player,Tm,COM,ATT,YDS,TD\n1,Josh Allen,BUF,22,31,262,2\n")
+    (tmp_path / "wk12_rushing_base.csv").write_text(
+        "Rk,Player,Tm,ATT,YDS\n1,Josh Allen,BUF,6,41\n2,James Cook,BUF,15,70\n")
+    (tmp_path / "wk12_receiving_base.csv").write_text(
+        "Rk,Player,Tm,REC,YDS\n1,Travis Kelce,KC,6,71\n")
+    return InMemoryGrader(data_dir=tmp_path)
+
+
+PREDICTIONS = [
+    {'player_name': 'Josh Allen', 'stat_type': 'Pass Yds', 'line': 245.5, 'bet_type': 'Over'},     # win
+    {'player_name': 'josh allen', 'stat_type': 'player_pass_tds', 'line': 1.5, 'bet_type': 'Under'},  # loss
+    {'player_name': 'James Cook', 'stat_type': 'Rush Yds', 'line': 70, 'bet_type': 'Over'},        # push
+    {'player_name': 'James Cook', 'stat_type': 'Rec Yds', 'line': 9.5, 'bet_type': 'Under'},       # win (0 yds)
+    {'player_name': 'Travis Kelce', 'stat_type': 'Longest Rec', 'line': 20.5, 'bet_type': 'Over'},  # unmapped
+    {'player_name': 'Nobody Here', 'stat_type': 'Rec Yds', 'line': 10.5, 'bet_type': 'Over'},      # not played
+]
+
+
+def test_grades_wins_losses_and_voids(tmp_path):
+    grader = _grader(tmp_path)
+
+    assert grader.grade_predictions(PREDICTIONS, 12) == (2, 1, 3)
+    assert grader.get_actuals(12).values.shape == (3, 8)
+
+
+def test_mask_grades_a_batch_of_configs(tmp_path):
+    grader = _grader(tmp_path)
+    encoded = grader.encode_predictions(PREDICTIONS, 12)
+    selected = np.array([
+        [1, 1, 1, 1, 1, 1],
+        [1, 0, 0, 1, 0, 0],
+        [0, 1, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ], dtype=bool)
+
+    wins, losses, voids = grader.grade_predictions(encoded, 12, selected=selected)
+
+    assert wins.tolist() == [2, 2, 0, 0]
+    assert losses.tolist() == [1, 0, 1, 0]
+    assert voids.tolist() == [3, 0, 1, 0]
+    for config, mask in enumerate(selected):
+        subset = [p for p, chosen in zip(PREDICTIONS, mask) if chosen]
+        assert grader.grade_predictions(subset, 12) == (wins[config], losses[config], voids[config])
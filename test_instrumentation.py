@@ -0,0 +1,118 @@
+"""
+Test opt-in instrumentation: no-op when off, stage/agent timers, counters, cache hit rates, worker merge
+"""
+
+import importlib
+from functools import lru_cache
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.config import settings
+from scripts.analysis import instrumentation
+
+
+@pytest.fixture
+def profiling():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.enable()
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.reset()
+    if not was_enabled:
+        instrumentation.disable()
+
+
+def test_nothing_is_recorded_when_disabled():
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.disable()
+    instrumentation.reset()
+    try:
+        with instrumentation.timer('load'):
+            pass
+        instrumentation.timed('parlays.build')(lambda: None)()
+        instrumentation.count('props.analyzed', 10)
+        instrumentation.cache_hit('roster_index')
+        laps = instrumentation.laps('analyze')
+        laps.lap('score_markets')
+        laps.done()
+
+        report = instrumentation.report()
+        assert report.stages == [] and report.counters == {} and report.caches == []
+    finally:
+        if was_enabled:
+            instrumentation.enable()
+
+
+def test_report_collects_stages_counters_caches_and_rates(profiling):
+    @lru_cache(maxsize=None)
+    def lookup(key):
+        return key
+
+    lookup('warm')
+    profiling.register_cache('lookup', lookup.cache_info)
+
+    @profiling.timed('parlays.build')
+    def build():
+        return 'built'
+
+    assert build() == 'built'
+    laps = profiling.laps('analyze')
+    laps.lap('score_markets')
+    laps.lap('filter')
+    laps.done()
+    profiling.record_time('load', 2.0)
+    profiling.count('props.analyzed', 50)
+    profiling.count('lines.loaded', 400)
+    profiling.cache_lookups('agent_pass', hits=3, misses=1)
+    lookup('warm'), lookup('cold')
+
+    report = profiling.report()
+    stages = {s.name: s for s in report.stages}
+    assert set(stages) == {'analyze', 'analyze.filter', 'analyze.score_markets', 'load', 'parlays.build'}
+    assert stages['load'].calls == 1 and stages['load'].mean == 2.0
+    assert report.counters == {'props.analyzed': 50, 'lines.loaded': 400}
+    caches = {c.name: c for c in report.caches}
+    assert caches['agent_pass'].hit_rate == 0.75
+    # Only lookups since registration count
+    assert (caches['lookup'].hits, caches['lookup'].misses) == (1, 1)
+    assert report.rates['lines_per_sec'] == 200.0 and 'props_per_sec' in report.rates
+
+    text = report.format()
+    assert 'analyze.score_markets' in text and '75.0% hit' in text
+    metrics = profiling.report().prometheus()
+    assert 'nfl_stage_calls_total{stage="load"} 1' in metrics
+    assert 'nfl_cache_hits_total{cache="agent_pass"} 3' in metrics
+    assert 'nfl_events_total{event="props.analyzed"} 50' in metrics
+
+
+def test_worker_snapshots_merge_into_parent(profiling):
+    profiling.record_time('batch.load', 1.0)
+    profiling.count('props.analyzed', 5)
+    worker = profiling.snapshot()
+
+    profiling.reset()
+    profiling.record_time('batch.load', 3.0)
+    profiling.merge(worker)
+    profiling.merge(worker)
+
+    report = profiling.report()
+    load = report.stages[0]
+    assert (load.name, load.calls, load.total, load.max) == ('batch.load', 3, 5.0, 3.0)
+    assert report.counters == {'props.analyzed': 10}
+    assert report.to_dict()['stages']['batch.load']['calls'] == 3
+
+
+def test_metrics_route_is_only_served_when_enabled(monkeypatch):
+    try:
+        monkeypatch.setattr(settings, 'metrics_enabled', False)
+        assert TestClient(importlib.reload(main).app).get('/metrics').status_code == 404
+
+        monkeypatch.setattr(settings, 'metrics_enabled', True)
+        response = TestClient(importlib.reload(main).app).get('/metrics')
+        assert response.status_code == 200
+        assert 'nfl_instrumentation_enabled' in response.text
+    finally:
+        monkeypatch.undo()
+        importlib.reload(main)
@@ -0,0 +1,77 @@
+"""
+Test the exact lineup optimizer in FantasyService
+"""
+
+from api.services.fantasy_service import FantasyService, _max_weight_assignment
+
+
+def _proj(pid, position, points, floor=None):
+    return {
+        "player_id": pid,
+        "player_name": f"Player {pid}",
+        "position": position,
+        "fantasy_points": points,
+        "floor": floor if floor is not None else points,
+    }
+
+
+def test_flex_before_rb_slot():
+    """FLEX listed first must not steal the only RB that can fill RB"""
+    service = FantasyService()
+    projections = [
+        _proj(1, "RB", 20.0),
+        _proj(2, "WR", 15.0),
+        _proj(3, "WR", 10.0),
+    ]
+    result = service._solve_lineup(projections, ["FLEX", "RB", "WR"], 0.0, "ppr")
+
+    slots = {p["slot"]: p["player_id"] for p in result["lineup"]}
+    assert slots == {"RB": 1, "FLEX": 3, "WR": 2} or slots == {"RB": 1, "FLEX": 2, "WR": 3}
+    assert result["projected_total"] == 45.0
+    assert result["bench"] == []
+
+
+def test_empty_slot_when_no_eligible_player():
+    """Slots without eligible players stay empty"""
+    service = FantasyService()
+    projections = [_proj(1, "QB", 18.0), _proj(2, "QB", 12.0)]
+    result = service._solve_lineup(projections, ["QB", "K"], 0.0, "ppr")
+
+    assert [p["slot"] for p in result["lineup"]] == ["QB"]
+    assert result["lineup"][0]["player_id"] == 1
+    assert [p["player_id"] for p in result["bench"]] == [2]
+
+
+def test_risk_aversion_prefers_safe_floor():
+    """With full risk aversion the higher floor wins the slot"""
+    service = FantasyService()
+    projections = [
+        _proj(1, "WR", 16.0, floor=8.0),
+        _proj(2, "WR", 14.0, floor=12.0),
+    ]
+    raw = service._solve_lineup(projections, ["WR"], 0.0, "ppr")
+    safe = service._solve_lineup(projections, ["WR"], 1.0, "ppr")
+
+    assert raw["lineup"][0]["player_id"] == 1
+    assert safe["lineup"][0]["player_id"] == 2
+    assert safe["risk_adjusted_total"] == 12.0
+
+
+def test_assignment_matches_brute_force():
+    """Hungarian solver agrees with exhaustive search on a small matrix"""
+    from itertools import permutations
+
+    weights = [
+        [7.0, None, 3.0, 9.0],
+        [2.0, 8.0, None, 6.0],
+        [None, 5.0, 4.0, 1.0],
+    ]
+    assignment = _max_weight_assignment(weights)
+    total = sum(weights[i][j] for i, j in enumerate(assignment) if j is not None)
+
+    best = 0.0
+    for cols in permutations(range(4), 3):
+        if all(weights[i][c] is not None for i, c in enumerate(cols)):
+            best = max(best, sum(weights[i][c] for i, c in enumerate(cols)))
+
+    assert total == best
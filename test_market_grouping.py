@@ -0,0 +1,54 @@
+"""
+Test that PropAnalyzer scores each market once and derives both sides from it
+"""
+
+from scripts.analysis.orchestrator import PropAnalyzer
+
+
+class CountingAgent:
+    weight = 2.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, prop, context):
+        self.calls += 1
+        assert prop.bet_type == 'OVER'
+        return 70, 'OVER', [f"{prop.player_name} trending up"]
+
+
+def _prop(player, side, line=50.5):
+    return {
+        'player_name': player, 'team': 'KC', 'opponent': 'BUF', 'position': 'WR',
+        'stat_type': 'Rec Yds', 'line': line, 'bet_type': side, 'week': 12,
+    }
+
+
+def test_over_and_under_share_one_agent_pass():
+    analyzer = PropAnalyzer(use_dynamic_weights=False, apply_calibration=False)
+    agent = CountingAgent()
+    analyzer.agents = {'Counting': agent}
+
+    props = [_prop('A', 'Over'), _prop('A', 'Under'), _prop('B', 'Over'), _prop('B', 'Under', line=40.5)]
+    results = analyzer.analyze_all_props({'props': props}, min_confidence=0)
+
+    assert agent.calls == 3
+    by_side = {(r.prop.player_name, r.prop.line, r.prop.bet_type): r for r in results}
+    over, under = by_side[('A', 50.5, 'OVER')], by_side[('A', 50.5, 'UNDER')]
+    assert over.final_confidence + under.final_confidence == 100
+
+    # Sides must not share mutable state
+    over.rationale.append('extra')
+    assert 'extra' not in under.rationale
+    assert over.agent_breakdown is not under.agent_breakdown
+
+
+def test_analyze_prop_matches_grouped_path():
+    analyzer = PropAnalyzer(use_dynamic_weights=False, apply_calibration=False)
+    analyzer.agents = {'Counting': CountingAgent()}
+
+    single = analyzer.analyze_prop(_prop('A', 'Under'), {})
+    grouped = [r for r in analyzer.analyze_all_props({'props': [_prop('A', 'Under')]}, min_confidence=0)]
+
+    assert grouped[0].final_confidence == single.final_confidence
+    assert grouped[0].edge_explanation == single.edge_explanation
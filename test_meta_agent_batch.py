@@ -0,0 +1,105 @@
+"""
+Test batched MetaAgent review: concurrency, on-disk cache and token budget (stub client, no API)
+"""
+
+import threading
+import time
+from pathlib import Path
+
+from scripts.analysis.agents.meta_agent import MetaAgent, MetaAgentConfig, StubMetaClient
+from scripts.analysis.models import PlayerProp, PropAnalysis
+
+
+def _analysis(player, confidence, line=50.5):
+    prop = PlayerProp(player_name=player, team='KC', opponent='BUF', position='WR',
+                      stat_type='Rec Yds', line=line, week=12)
+    breakdown = {
+        'DVOA': {'raw_score': 70, 'direction': 'OVER', 'rationale': [], 'weight': 2.0},
+        'Volume': {'raw_score': 40, 'direction': 'UNDER', 'rationale': [], 'weight': 1.0},
+    }
+    return PropAnalysis(prop=prop, final_confidence=confidence, recommendation='OVER',
+                        rationale=[], agent_breakdown=breakdown, edge_explanation='')
+
+
+def test_batch_runs_concurrently_and_caches(tmp_path):
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_review(prompt):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return {"adjustment": 3, "rationale": "Revenge game."}
+
+    config = MetaAgentConfig(max_concurrency=4, cache_dir=str(tmp_path))
+    client = StubMetaClient(slow_review)
+    analyses = [_analysis(f"Player {i}", 70) for i in range(8)]
+
+    results = MetaAgent(config, client=client).review_batch(analyses, {})
+
+    assert client.calls == 8
+    assert 1 < peak <= 4
+    assert [r.adjusted_confidence for r in results] == [73] * 8
+    assert all(r.meta_rationale == "Revenge game." for r in results)
+
+    # A fresh agent (new run) is served entirely from disk
+    rerun_client = StubMetaClient()
+    rerun = MetaAgent(config, client=rerun_client).review_batch(analyses, {})
+    assert rerun_client.calls == 0
+    assert [r.adjusted_confidence for r in rerun] == [73] * 8
+
+
+def test_token_budget_reviews_highest_confidence_first(tmp_path):
+    config = MetaAgentConfig(cache_dir=None)
+    agent = MetaAgent(config, client=StubMetaClient({"adjustment": -5}))
+    analyses = [_analysis("Low", 66), _analysis("High", 80), _analysis("Mid", 70)]
+    one_call = agent._estimate_tokens(agent._build_system_prompt(), "x" * 2000)
+    agent.config.run_token_budget = 2 * one_call
+
+    low, high, mid = agent.review_batch(analyses, {})
+
+    assert agent.client.calls == 2
+    assert (high.adjusted_confidence, mid.adjusted_confidence) == (75, 65)
+    assert low.adjusted_confidence == 66
+    assert low.meta_rationale == "Meta-agent token budget exhausted"
+
+
+def test_analyze_all_props_reviews_slate_before_filtering():
+    from scripts.analysis.orchestrator import PropAnalyzer
+
+    class FixedAgent:
+        weight = 1.0
+
+        def analyze(self, prop, context):
+            return 90, 'OVER', []
+
+    analyzer = PropAnalyzer(use_dynamic_weights=False, apply_calibration=False)
+    analyzer.agents = {'Fixed': FixedAgent()}
+    client = StubMetaClient({"adjustment": -10, "rationale": "Backup QB starting."})
+    analyzer.meta_agent = MetaAgent(MetaAgentConfig(cache_dir=None), client=client)
+    props = [{'player_name': 'A', 'team': 'KC', 'opponent': 'BUF', 'position': 'WR',
+              'stat_type': 'Rec Yds', 'line': 50.5, 'bet_type': side, 'week': 12}
+             for side in ('Over', 'Under')]
+
+    baseline = analyzer.analyze_all_props({'props': props}, min_confidence=0)
+    over = next(a for a in baseline if a.prop.bet_type == 'OVER')
+
+    reviewed = analyzer.analyze_all_props({'props': props}, min_confidence=over.final_confidence,
+                                          use_meta_agent=True)
+
+    # Only the OVER side qualified for review, and the downgrade drops it below the cut
+    assert client.calls == 1
+    assert reviewed == []
+
+
+def test_default_cache_dir_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    cache_dir = Path(MetaAgentConfig().cache_dir)
+
+    assert cache_dir.is_absolute()
+    assert cache_dir == Path(__file__).resolve().parent / "data" / "cache" / "meta_agent"
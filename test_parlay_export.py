@@ -0,0 +1,80 @@
+"""
+Test streamed calibration exports: merged JSON + database parlays, one database pass for all weeks
+"""
+
+import csv
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base
+from scripts.analysis import export_parlays, performance_tracker
+from scripts.analysis.export_parlays import EXPORT_COLUMNS, WeeklyParlayExporter
+from scripts.analysis.parlay_tracker import ParlayTracker
+
+
+def _props(*players):
+    return [{'player': p, 'team': 'KC', 'stat_type': 'Rec Yds', 'line': 55.5, 'direction': 'OVER',
+             'confidence': 70, 'is_home': True, 'agent_scores': {'DVOA': {'raw_score': 72.0}}}
+            for p in players]
+
+
+def _exporter(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bets.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(performance_tracker, 'SessionLocal', sessionmaker(bind=engine))
+    monkeypatch.setattr(performance_tracker, 'init_db', lambda: None)
+    perf = performance_tracker.PerformanceTracker()
+
+    tracker = ParlayTracker(str(tmp_path / "parlay_tracking.json"))
+    json_ids = [
+        tracker.add_parlay(week=week, year=2024, parlay_type='custom', props=_props('Travis Kelce', 'Rashee Rice'),
+                           raw_confidence=61.2, effective_confidence=60.04, correlations=[],
+                           payout_odds=264, kelly_bet_size=1.0)
+        for week in (12, 13)
+    ]
+    db_ids = [
+        perf.log_parlay({'confidence': 0.64, 'agent_scores': {'DVOA': 70},
+                         'legs': [{'player': 'Josh Allen', 'team': 'BUF', 'prop_type': 'Pass Yds',
+                                   'line': 245.5, 'agent_scores': {'Volume': 66}}]}, week=week)
+        for week in (12, 13, 14)
+    ]
+    return WeeklyParlayExporter(tracker, perf, output_dir=str(tmp_path / "calibration")), json_ids, db_ids
+
+
+def _rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_week_export_streams_both_sources_into_leg_rows(tmp_path, monkeypatch):
+    exporter, json_ids, db_ids = _exporter(tmp_path, monkeypatch)
+    monkeypatch.setattr(export_parlays, 'CHUNK_SIZE', 1)
+
+    rows = _rows(exporter.export_week(12, overwrite=True))
+
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert [(r['parlay_id'], r['leg_number'], r['player_name']) for r in rows] == [
+        (json_ids[0], '1', 'Travis Kelce'), (json_ids[0], '2', 'Rashee Rice'), (db_ids[0], '1', 'Josh Allen')]
+    assert rows[0]['home_away'] == 'HOME' and rows[0]['dvoa_score'] == '7.2'
+    assert rows[2]['leg_confidence'] == '64.0' and rows[2]['volume_score'] == '66.0'
+
+    # A parlay in both sources is exported once, from the JSON tracker
+    merged = list(exporter._iter_merged_parlays(exporter.tracker.get_parlays_by_week(12),
+                                                exporter._load_parlays_from_sqlite(12) * 2))
+    assert [p['parlay_id'] for p in merged] == [json_ids[0], db_ids[0]]
+    assert exporter.export_week(15, overwrite=True) is None
+
+
+def test_all_weeks_read_the_database_once(tmp_path, monkeypatch):
+    exporter, json_ids, db_ids = _exporter(tmp_path, monkeypatch)
+    sessions = []
+    get_session = exporter.perf_tracker.get_session
+    monkeypatch.setattr(exporter.perf_tracker, 'get_session', lambda: sessions.append(1) or get_session())
+
+    files = exporter.export_all_weeks(overwrite=True)
+
+    assert len(sessions) == 1
+    assert [[r['parlay_id'] for r in _rows(path)] for path in files] == [
+        [json_ids[0], json_ids[0], db_ids[0]], [json_ids[1], json_ids[1], db_ids[1]]]
+    assert not list((tmp_path / "calibration").glob("*.tmp"))
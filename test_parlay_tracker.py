@@ -0,0 +1,98 @@
+"""
+Test the parlay tracker's append-only journal, compaction and indexed lookups
+"""
+
+import json
+
+from scripts.analysis.parlay_tracker import ParlayTracker
+
+
+def _props(*players):
+    return [{'player': p, 'stat_type': 'Rec Yds', 'line': 55.5, 'direction': 'OVER', 'confidence': 70}
+            for p in players]
+
+
+def _add(tracker, week, players, parlay_type='traditional'):
+    return tracker.add_parlay(week=week, year=2024, parlay_type=parlay_type, props=_props(*players),
+                              raw_confidence=61.2, effective_confidence=60.04, correlations=[],
+                              payout_odds=264, kelly_bet_size=1.234)
+
+
+def test_changes_append_to_journal_and_replay_on_load(tmp_path):
+    tracking_file = tmp_path / "parlay_tracking.json"
+    tracker = ParlayTracker(str(tracking_file))
+
+    first = _add(tracker, 12, ['Travis Kelce', 'Rashee Rice'])
+    again = _add(tracker, 12, ['Rashee Rice', 'Travis Kelce'])   # same props -> next version
+    other = _add(tracker, 13, ['Josh Allen'], 'enhanced')
+    assert first.endswith('_v1') and again.endswith('_v2') and other.startswith('ENHA_W13_')
+    assert tracker.mark_bet(first, 10) and tracker.mark_result(first, 'won')
+    assert not tracker.mark_bet('TRAD_W12_missing_v1', 5)
+
+    # The snapshot was written once to anchor the journal; every change is one journal line
+    assert [p['parlay_id'] for p in json.loads(tracking_file.read_text())['parlays']] == [first]
+    header, *records = tracker.journal_file.read_text().splitlines()
+    assert json.loads(header) == {'generation': tracker.data['metadata']['journal_generation']}
+    assert len(records) == 5
+
+    reloaded = ParlayTracker(str(tracking_file))
+    assert reloaded.data == tracker.data
+    assert reloaded.get_parlay_by_id(first)['actual_payout'] == 36.4
+    assert [p['parlay_id'] for p in reloaded.get_parlays_by_week(12)] == [first, again]
+    assert [p['parlay_id'] for p in reloaded.get_pending_parlays(week=12)] == [again]
+    assert reloaded.get_completed_parlays(week=12)[0]['parlay_id'] == first
+    assert _add(reloaded, 12, ['Travis Kelce', 'Rashee Rice']).endswith('_v3')
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    tracking_file = tmp_path / "parlay_tracking.json"
+    tracker = ParlayTracker(str(tracking_file))
+    tracker.COMPACT_AFTER = 3
+    ids = [_add(tracker, 12, [f'Player {i}']) for i in range(4)]
+
+    # Third record triggered compaction; the fourth is in a fresh journal
+    assert len(json.loads(tracking_file.read_text())['parlays']) == 3
+    assert len(tracker.journal_file.read_text().splitlines()) == 2
+
+    # A torn last line (crash mid-write) is skipped
+    with open(tracker.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"update": "TRAD')
+    reloaded = ParlayTracker(str(tracking_file))
+    assert [p['parlay_id'] for p in reloaded.data['parlays']] == ids
+    assert reloaded.data['metadata']['total_parlays_generated'] == 4
+
+    reloaded.compact()
+    assert not reloaded.journal_file.exists()
+    assert ParlayTracker(str(tracking_file)).data == reloaded.data
+
+
+def test_journal_of_a_deleted_or_replaced_snapshot_is_discarded(tmp_path):
+    tracking_file = tmp_path / "parlay_tracking.json"
+    tracker = ParlayTracker(str(tracking_file))
+    _add(tracker, 12, ['Travis Kelce'])
+    _add(tracker, 12, ['Rashee Rice'])
+    stale_snapshot = tracking_file.read_text()
+
+    tracking_file.unlink()
+    fresh = ParlayTracker(str(tracking_file))
+    assert fresh.data['parlays'] == [] and not fresh.journal_file.exists()
+    assert _add(fresh, 12, ['Travis Kelce']).endswith('_v1')
+
+    # A compaction moves the snapshot to a new generation; restoring the old file orphans the journal
+    fresh.compact()
+    _add(fresh, 12, ['Rashee Rice'])
+    tracking_file.write_text(stale_snapshot)
+    restored = ParlayTracker(str(tracking_file))
+    assert [p['player'] for p in restored.data['parlays'][0]['props']] == ['Travis Kelce']
+    assert len(restored.data['parlays']) == 1 and not restored.journal_file.exists()
+
+
+def test_close_folds_the_journal_into_the_snapshot(tmp_path):
+    tracking_file = tmp_path / "parlay_tracking.json"
+    tracker = ParlayTracker(str(tracking_file))
+    ids = [_add(tracker, 12, [f'Player {i}']) for i in range(3)]
+
+    tracker.close()
+
+    assert not tracker.journal_file.exists()
+    assert [p['parlay_id'] for p in json.loads(tracking_file.read_text())['parlays']] == ids
@@ -0,0 +1,34 @@
+"""
+Test the canonical player identity registry
+"""
+
+from scripts.analysis.models import PlayerProp
+from scripts.analysis.player_identity import PlayerTable, canonical_key, player_id, player_registry
+
+
+def test_variants_share_one_id():
+    assert player_id("A.J. Brown") == player_id("AJ  Brown") == player_id("aj brown")
+    assert player_id("Michael Pittman Jr.") == player_id("Michael Pittman")
+    assert player_id("Ja'Marr Chase") == player_id("JaMarr Chase")
+    assert player_id("Hollywood Brown") == player_id("Marquise Brown")
+    assert player_id("A.J. Brown") != player_id("Marquise Brown")
+    assert canonical_key("Amon-Ra St. Brown") == "amon ra st brown"
+
+
+def test_table_reads_by_id_or_name_without_registering():
+    table = PlayerTable()
+    table["Travis Etienne Jr."] = {"snap_share_pct": 61.0}
+
+    pid = player_id("travis etienne")
+    assert table[pid] == {"snap_share_pct": 61.0}
+    assert "Travis Etienne" in table
+
+    before = len(player_registry)
+    assert table.get("Nobody Heardof") is None
+    assert len(player_registry) == before
+
+
+def test_prop_gets_player_id():
+    prop = PlayerProp(player_name="Patrick Mahomes II", team="KC", opponent="BUF",
+                      position="QB", stat_type="Pass Yds", line=250.5)
+    assert prop.player_id == player_id("Patrick Mahomes")
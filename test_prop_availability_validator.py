@@ -0,0 +1,99 @@
+"""
+Test compiled validation rules: batch snapshots of rules/availability, buffered trigger counts
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.database import Base, PropValidationRule
+from scripts.analysis import prop_availability_validator as pav
+from scripts.analysis.models import PlayerProp, PropAnalysis
+from scripts.analysis.parlay_rebuilder import ParlayRebuilder
+
+
+def _validator(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bets.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(pav, 'SessionLocal', sessionmaker(bind=engine))
+    monkeypatch.setattr(pav, 'init_db', lambda: None)
+    return pav.PropAvailabilityValidator()
+
+
+def _leg(player, stat_type, bet_type, line=25.5, team='KC'):
+    prop = PlayerProp(player_name=player, team=team, opponent='LV', position='QB',
+                      stat_type=stat_type, line=line, bet_type=bet_type, week=12)
+    return PropAnalysis(prop=prop, final_confidence=70, recommendation=bet_type, rationale=[],
+                        agent_breakdown={}, edge_explanation='')
+
+
+def _count_sessions(validator, monkeypatch):
+    opened = []
+    get_session = validator.get_session
+    monkeypatch.setattr(validator, 'get_session', lambda: opened.append(1) or get_session())
+    return opened
+
+
+def _times_triggered(validator):
+    session = validator.get_session()
+    try:
+        return {r.rule_id: r.times_triggered for r in session.query(PropValidationRule).all() if r.times_triggered}
+    finally:
+        session.close()
+
+
+def test_batch_validates_without_database_calls_and_flushes_counts_once(tmp_path, monkeypatch):
+    validator = _validator(tmp_path, monkeypatch)
+    violating = [_leg('Patrick Mahomes', 'Completions', 'UNDER'),
+                 _leg('Patrick Mahomes', 'Passing Yards', 'UNDER', line=275.5)]
+    clean = [_leg('Patrick Mahomes', 'Completions', 'OVER'), _leg('Travis Kelce', 'Receptions', 'UNDER')]
+
+    opened = _count_sessions(validator, monkeypatch)
+    with validator.batch():
+        loaded = len(opened)
+        results = [validator.validate_parlay_props(violating if i % 2 else clean) for i in range(1000)]
+        assert len(opened) == loaded == 1
+
+    assert results[0] == (True, [])
+    assert results[1] == (False, ["❌ Patrick Mahomes: Passing Yards UNDER + Completions UNDER "
+                                  "(Same player: UNDER passing yards + UNDER completions)"])
+    assert len(opened) == 2   # one load + one flush
+    assert _times_triggered(validator) == {'same_player_under_passing_completions': 500}
+
+    # Outside a batch each triggering call is written straight away
+    validator.validate_parlay_props(violating)
+    assert _times_triggered(validator) == {'same_player_under_passing_completions': 501}
+
+
+def test_availability_comes_from_the_cached_signatures(tmp_path, monkeypatch):
+    validator = _validator(tmp_path, monkeypatch)
+    rebuilder = ParlayRebuilder()
+    rebuilder.validator = validator
+    kelce = _leg('Travis Kelce', 'Receptions', 'OVER', line=5.5)
+    rice = _leg('Rashee Rice', 'Rec Yds', 'OVER', line=55.5)
+
+    validator.mark_prop_available(kelce.prop, is_available=False)
+    assert validator.filter_available_props([kelce, rice]) == [rice]
+
+    parlay = type('Parlay', (), {'legs': [kelce, rice]})()
+    assert rebuilder.extract_valid_props_from_rejected_parlays([{'parlay': parlay}]) == [rice]
+
+    validator.mark_prop_available(kelce.prop, is_available=True)
+    assert validator.is_prop_available(kelce.prop)
+
+
+def test_writes_from_another_validator_are_seen_outside_a_batch(tmp_path, monkeypatch):
+    validator = _validator(tmp_path, monkeypatch)
+    other = pav.PropAvailabilityValidator()
+    kelce = _leg('Travis Kelce', 'Receptions', 'OVER', line=5.5)
+    parlay = [_leg('Travis Kelce', 'Rec Yds', 'OVER'), _leg('Travis Kelce', 'Receptions', 'OVER')]
+    assert validator.is_prop_available(kelce.prop) and validator.validate_parlay_props(parlay)[0]
+
+    with validator.batch():
+        other.mark_prop_available(kelce.prop, is_available=False)
+        other.add_custom_rule("Same player: OVER receiving yards + OVER receptions", "same_player_props",
+                              {"player": "same", "bet_types": ["OVER", "OVER"], "prop_types": ["Rec Yds", "Receptions"]})
+        # The batch keeps the snapshot it started with
+        assert validator.is_prop_available(kelce.prop) and validator.validate_parlay_props(parlay)[0]
+
+    assert not validator.is_prop_available(kelce.prop)
+    assert not validator.validate_parlay_props(parlay)[0]
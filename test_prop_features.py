@@ -0,0 +1,76 @@
+"""
+Test the pre-joined per-prop feature table and the agents reading from it
+"""
+
+from scripts.analysis.agents.dvoa_agent import DVOAAgent
+from scripts.analysis.agents.injury_agent import InjuryAgent
+from scripts.analysis.agents.volume_agent import VolumeAgent
+from scripts.analysis.models import PlayerProp
+from scripts.analysis.player_identity import PlayerTable, player_id
+from scripts.analysis.prop_features import PropFeatureTable, features_for
+
+INJURIES = "Player,Team,Pos,Injury,Status,Est. Return\nTravis Kelce,KC,TE,Ankle,Questionable,Week 13\n"
+
+
+def _context():
+    usage = PlayerTable()
+    usage['Travis Kelce'] = {'target_share_pct': 24.5, 'trend': 'increasing'}
+    alignment = PlayerTable()
+    alignment['Travis Kelce'] = {'slot_pct': 55.0}
+    return {
+        'props': [
+            {'player_name': 'Travis Kelce', 'player_id': player_id('Travis Kelce'), 'team': 'KC',
+             'opponent': 'BUF', 'stat_type': 'Rec Yds', 'line': 60.5, 'game_total': '47.5', 'spread': -3},
+            {'player_name': 'Rashee Rice', 'player_id': player_id('Rashee Rice'), 'team': 'KC',
+             'opponent': 'BUF', 'stat_type': 'Rec Yds', 'line': 55.5},
+        ],
+        'dvoa_offensive': {'KC': {'offense_dvoa': 12.0, 'passing_dvoa': 22.0, 'rushing_dvoa': -3.0}},
+        'dvoa_defensive': {'BUF': {'defense_dvoa': 4.0, 'pass_defense_dvoa': 11.0, 'rush_defense_dvoa': 2.0}},
+        'defensive_vs_receiver': {'BUF': {'vs_te_dvoa': 18.0}},
+        'usage': usage,
+        'alignment': alignment,
+        'qb_analytics': {},
+        'injuries': INJURIES,
+    }
+
+
+def test_frame_has_one_joined_row_per_prop():
+    context = _context()
+    frame = PropFeatureTable.build(context).frame
+
+    assert len(frame) == 2
+    kelce, rice = frame.to_dict('records')
+    assert (kelce['passing_dvoa'], kelce['pass_defense_dvoa'], kelce['vs_te_dvoa']) == (22.0, 11.0, 18.0)
+    assert (kelce['target_share_pct'], kelce['slot_pct'], kelce['trend']) == (24.5, 55.0, 'increasing')
+    assert (kelce['game_total'], kelce['spread']) == (47.5, -3)
+    assert (kelce['injury_status'], kelce['injury_code']) == ('questionable', 3)
+
+    # Missing source rows fall back to the agents' defaults and clear the has_* flag
+    assert not rice['has_usage'] and rice['target_share_pct'] == 0 and rice['trend'] == 'stable'
+    assert rice['primary_alignment'] == 'UNKNOWN'
+    assert (rice['injury_status'], rice['injury_code']) == ('', 0)
+
+
+def test_agents_read_features_and_rebuild_when_sources_change():
+    context = _context()
+    kelce = PlayerProp(player_name='Travis Kelce', team='KC', opponent='BUF', position='TE',
+                       stat_type='Rec Yds', line=60.5, week=12)
+
+    assert DVOAAgent().analyze(kelce, context)[0] == 50 + 23 + 16 + 12
+    assert VolumeAgent().analyze(kelce, context)[2] == ["✅ Volume strongly supports OVER",
+                                                        "🎯 High volume: 24.5% targets",
+                                                        "📈 Usage trending UP"]
+    injury_agent = InjuryAgent()
+    assert injury_agent.analyze(kelce, context)[0] == 0
+    table = context['prop_features']
+    assert features_for(kelce, context) is table.row(kelce)
+
+    # Next week's report replaces the text: the same agent sees the new status
+    context['injuries'] = "Player,Team,Pos,Injury,Status,Est. Return\nRashee Rice,KC,WR,Knee,Out,Week 14\n"
+    assert injury_agent.analyze(kelce, context)[0] == 50
+    assert context['prop_features'] is not table
+
+    # Props that weren't on the slate still get a row
+    lamb = PlayerProp(player_name='CeeDee Lamb', team='DAL', opponent='NYG', position='WR',
+                      stat_type='Rec Yds', line=70.5, week=12)
+    assert DVOAAgent().analyze(lamb, context) == (50, "AVOID", ["⚠️ DVOA data not available"])
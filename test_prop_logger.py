@@ -0,0 +1,39 @@
+"""
+Test batched prop logging: one transaction, duplicates ignored, batched result updates
+"""
+
+import sqlite3
+from types import SimpleNamespace
+
+import prop_logger
+from migrate_analyzed_props import migrate_database
+
+
+def _analysis(player, line, confidence, bet_type='OVER'):
+    prop = SimpleNamespace(player_name=player, team='KC', opponent='BUF', stat_type='Rec Yds',
+                           bet_type=bet_type, line=line)
+    return SimpleNamespace(prop=prop, final_confidence=confidence,
+                           agent_breakdown={'DVOA': {'raw_score': 70, 'weight': 1.0}, 'Notes': 'n/a'})
+
+
+def test_logs_in_one_batch_and_skips_duplicates(tmp_path):
+    db_path = tmp_path / "bets.db"
+    migrate_database(db_path)
+    analyses = [_analysis('Travis Kelce', 60.5, 72), _analysis('Rashee Rice', 55.5, 65),
+                _analysis('Travis Kelce', 60.5, 58, bet_type='UNDER')]
+
+    assert prop_logger.log_analyzed_props(analyses, week=12, db_path=db_path) == (3, 0)
+    # Re-logging the week plus one new prop: only the new one is inserted
+    analyses.append(_analysis('Xavier Worthy', 30.5, 61))
+    assert prop_logger.log_analyzed_props(analyses, week=12, db_path=db_path, top_n=3) == (1, 2)
+    assert prop_logger.log_analyzed_props(analyses, week=12, db_path=db_path) == (0, 4)
+
+    props = prop_logger.get_analyzed_props(12, db_path)
+    assert [p['confidence'] for p in props] == [72, 65, 61, 58]
+    assert props[0]['agent_scores'] == '{"DVOA": 70}'
+    assert sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    updated = prop_logger.update_prop_results_batch(
+        [(props[0]['prop_id'], 1, 71.0), (props[1]['prop_id'], 0, 40.0), ('prop_missing', 1, 0.0)], db_path)
+    assert updated == 2
+    assert prop_logger.get_props_summary(12, db_path)['scored'] == 2
@@ -0,0 +1,84 @@
+"""
+Test the shared roster index: parsed once per content version, read-only, inferred teams kept per week
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from scripts.analysis import roster_index
+from scripts.analysis.data_loader import NFLDataLoader, _load_roster_data, props_from_betting_lines
+from scripts.analysis.player_identity import player_id
+from scripts.analysis.roster_index import ROSTER_FILENAME, InferredRoster
+
+
+def _write_roster(data_dir, rows, mtime_ns=None):
+    path = data_dir / ROSTER_FILENAME
+    path.write_text("Player,Team\n" + "".join(f"{p},{t}\n" for p, t in rows))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_index_is_shared_and_versioned_by_content(tmp_path, monkeypatch):
+    roster_index.clear_roster_cache()
+    parsed = []
+    parse_roster = roster_index.parse_roster
+    monkeypatch.setattr(roster_index, 'parse_roster', lambda content: parsed.append(1) or parse_roster(content))
+    _write_roster(tmp_path, [('A.J. Brown', 'PHI'), ('Calvin Ridley', 'JAX')], mtime_ns=10**18)
+
+    index = _load_roster_data(tmp_path)
+    assert _load_roster_data(tmp_path) is index and len(parsed) == 1
+    assert index['aj brown'] == 'PHI' and index.get(player_id('Calvin Ridley')) == 'JAC'
+    with pytest.raises(TypeError):
+        index[player_id('Calvin Ridley')] = 'TEN'
+
+    # Touched but unchanged: same version, nothing re-parsed
+    _write_roster(tmp_path, [('A.J. Brown', 'PHI'), ('Calvin Ridley', 'JAX')], mtime_ns=2 * 10**18)
+    assert _load_roster_data(tmp_path) is index and len(parsed) == 1
+
+    _write_roster(tmp_path, [('A.J. Brown', 'PHI'), ('Calvin Ridley', 'TEN')], mtime_ns=3 * 10**18)
+    updated = _load_roster_data(tmp_path)
+    assert updated.version != index.version and updated['Calvin Ridley'] == 'TEN' and len(parsed) == 2
+
+    assert len(_load_roster_data(tmp_path / "missing")) == 0
+
+
+def test_inferred_teams_stay_in_their_week():
+    roster = {player_id('Travis Kelce'): 'KC'}
+    lines = pd.DataFrame([
+        ('Kansas City Chiefs', 'Buffalo Bills', 'draftkings', 'player_reception_yds', 'Travis Kelce', 60.5, 'Over', -110),
+        ('Kansas City Chiefs', 'Buffalo Bills', 'draftkings', 'player_rush_yds', 'Practice Squad Back', 12.5, 'Over', 100),
+    ], columns=['home_team', 'away_team', 'bookmaker', 'market', 'player_name', 'line', 'direction', 'odds'])
+
+    week12 = InferredRoster(12)
+    props = props_from_betting_lines(lines, 12, roster, inferred_roster=week12)
+
+    assert [p['team'] for p in props] == ['KC', 'KC']
+    assert dict(week12) == {player_id('Practice Squad Back'): 'KC'}
+    assert roster == {player_id('Travis Kelce'): 'KC'}
+    assert len(NFLDataLoader(data_dir="data").inferred_roster(13)) == 0
+
+
+def test_only_current_versions_are_kept(tmp_path):
+    roster_index.clear_roster_cache()
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    _write_roster(tmp_path, [('A.J. Brown', 'PHI')], mtime_ns=10**18)
+    _write_roster(other_dir, [('A.J. Brown', 'PHI')], mtime_ns=10**18)
+    first = _load_roster_data(tmp_path)
+    assert _load_roster_data(other_dir) is first
+
+    # Still the other source's version: kept
+    _write_roster(tmp_path, [('A.J. Brown', 'DAL')], mtime_ns=2 * 10**18)
+    second = _load_roster_data(tmp_path)
+    assert set(roster_index._indexes) == {first.version, second.version}
+
+    # Each edit replaces the source's version; unreferenced ones are dropped
+    for n, team in enumerate(['NYG', 'WAS', 'DAL'], start=3):
+        _write_roster(tmp_path, [('A.J. Brown', team)], mtime_ns=n * 10**18)
+        _load_roster_data(tmp_path)
+    _write_roster(other_dir, [('A.J. Brown', 'KC')], mtime_ns=2 * 10**18)
+    latest = _load_roster_data(other_dir)
+    assert set(roster_index._indexes) == {second.version, latest.version}
+    assert first['A.J. Brown'] == 'PHI'
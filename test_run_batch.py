@@ -0,0 +1,72 @@
+"""
+Test the in-process batch backtest: shared engine, streamed grading, stage timings
+"""
+
+import json
+from pathlib import Path
+
+from scripts.analysis import instrumentation
+from scripts.analysis.agent_weight_manager import AgentWeightManager
+from scripts.backtesting import run_batch
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+def _data_dir(tmp_path):
+    # Results are written under data_dir/backtest_results, so point at a linked copy
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for source in DATA_DIR.iterdir():
+        if source.is_file():
+            (data_dir / source.name).symlink_to(source)
+    return data_dir
+
+
+def test_weeks_share_one_engine_and_grade_without_reloading(tmp_path):
+    data_dir = _data_dir(tmp_path)
+
+    runs = run_batch.run_weeks([12, 99], workers=1, data_dir=data_dir, db_path=tmp_path / "stats.db")
+
+    week12, week99 = runs
+    assert week12.ok and week12.predictions > 0
+    assert set(week12.timings) == set(run_batch.STAGES)
+    assert 0 < week12.decided <= week12.predictions
+    assert (week99.error, week99.timings.keys()) == ("no props", {'load'})
+
+    # Streamed grading matches grading the saved predictions file
+    results_dir = data_dir / "backtest_results"
+    graded = json.loads((results_dir / "graded_week_12.json").read_text())
+    run_batch._grader.grade_week(12)
+    assert json.loads((results_dir / "graded_week_12.json").read_text()) == graded
+    assert sum(1 for g in graded if g['result'] == 'WIN') == week12.wins
+
+    # Agent stats recorded once, by the parent, for the weeks that graded
+    stats = AgentWeightManager(str(tmp_path / "stats.db"))
+    assert list(stats.get_week_stats_sources()) == [12]
+    assert stats.merge_week_stats([12])
+
+    report = run_batch.format_timing_report(runs, 1.0)
+    assert "no props" in report and report.endswith("Wall time: 1.00s")
+
+
+def test_early_exits_still_ship_the_weeks_profile(monkeypatch):
+    class NoProps:
+        def load_week(self, week):
+            return None
+
+    was_enabled = instrumentation.is_enabled()
+    instrumentation.enable()
+    instrumentation.reset()
+    monkeypatch.setattr(run_batch, '_engine', NoProps())
+    monkeypatch.setattr(run_batch, '_ship_profile', True)
+    try:
+        run = run_batch._run_week(99)
+
+        assert run.error == "no props"
+        assert run.profile['timers']['batch.load'][0] == 1
+        # Nothing left behind for the worker's next week
+        assert instrumentation.snapshot()['timers'] == {}
+    finally:
+        instrumentation.reset()
+        if not was_enabled:
+            instrumentation.disable()
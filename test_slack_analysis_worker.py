@@ -0,0 +1,74 @@
+"""
+Test the Slack bot's analysis worker: warm weeks, deduped in-flight requests, async posting
+"""
+
+import threading
+import time
+
+from scripts.slack_bot.services.analysis_worker import AnalysisWorker
+
+
+class FakeAnalysis:
+    def __init__(self, confidence):
+        self.final_confidence = confidence
+
+
+class SlowAnalyzer:
+    def __init__(self):
+        self.runs = 0
+        self.agents = {}
+
+    def analyze_all_props(self, context, min_confidence=0):
+        self.runs += 1
+        time.sleep(0.05)
+        return [FakeAnalysis(c) for c in (72, 64, 55)]
+
+
+class FakeLoader:
+    def __init__(self):
+        self.loads = 0
+
+    def load_all_data(self, week, preferred_book=None):
+        self.loads += 1
+        return {'week': week, 'props': []}
+
+
+def test_identical_requests_share_one_job_and_all_get_posted():
+    loader, analyzer = FakeLoader(), SlowAnalyzer()
+    worker = AnalysisWorker(loader, analyzer, max_workers=4)
+    builds, posted = [], []
+    done = threading.Event()
+
+    def build():
+        builds.append(1)
+        return f"{len(worker.analyses(12, min_confidence=60))} props"
+
+    def say(text):
+        posted.append(text)
+        if len(posted) == 3:
+            done.set()
+
+    futures = [worker.respond(("analyze_props", 12), build, say) for _ in range(3)]
+
+    assert done.wait(2)
+    assert futures[0] is futures[1] is futures[2]
+    assert len(builds) == 1
+    assert posted == ["2 props"] * 3
+
+    # Later requests for the week (any filter) reuse the warm analysis
+    assert len(worker.submit(("check", 12), lambda: worker.analyses(12, 50)).result()) == 3
+    assert (loader.loads, analyzer.runs) == (1, 1)
+    worker.shutdown()
+
+
+def test_errors_are_posted_back():
+    worker = AnalysisWorker(FakeLoader(), SlowAnalyzer(), max_workers=1)
+    posted = []
+
+    def build():
+        raise ValueError("no data for week 99")
+
+    worker.respond(("analyze_props", 99), build, posted.append, "❌ Error analyzing props")
+    worker.shutdown(wait=True)
+
+    assert posted == ["❌ Error analyzing props: no data for week 99"]
@@ -0,0 +1,57 @@
+"""
+Test the walk-forward sweep: histogram thresholds, calibration error and fold selection
+"""
+
+import numpy as np
+
+from scripts.optimization.walk_forward import (
+    WalkForwardValidator, WeekSweep, _histogram, american_payout,
+    select_best, sweep_stats,
+)
+
+
+def _sweep(week, confidence, won, lost, odds=-110):
+    confidence = np.asarray(confidence)
+    won, lost = np.asarray(won, dtype=bool), np.asarray(lost, dtype=bool)
+    profit = np.where(won, american_payout(odds), np.where(lost, -1.0, 0.0))
+    return WeekSweep(week, _histogram(confidence, np.ones(confidence.shape[1])),
+                     _histogram(confidence, won.astype(float)), _histogram(confidence, lost.astype(float)),
+                     _histogram(confidence, profit))
+
+
+def test_threshold_sweep_matches_direct_counts():
+    # 2 configs x 4 bets: win, loss, win, push
+    confidence = np.array([[55, 60, 72, 80], [65, 51, 52, 90]])
+    won, lost = [1, 0, 1, 0], [0, 1, 0, 0]
+    stats = sweep_stats(_sweep(12, confidence, won, lost, odds=150), [50, 60, 73, 101])
+
+    assert stats.bets.tolist() == [[4, 3, 1, 0], [4, 2, 1, 0]]
+    assert stats.wins.tolist() == [[2, 1, 0, 0], [2, 1, 0, 0]]
+    assert stats.losses.tolist() == [[1, 1, 0, 0], [1, 0, 0, 0]]
+    assert np.allclose(stats.profit[:, :2], [[2.0, 0.5], [2.0, 1.5]])
+    assert stats.roi[1, 1] == 150.0 and np.isnan(stats.win_rate[0, 2])
+
+    # Config 0 at 60+: buckets 60-64 (0.60 vs 0 wins) and 70-74 (0.72 vs 1 win)
+    assert np.isclose(stats.calibration_error[0, 1], (0.60 + 0.28) / 2)
+    assert select_best(stats, 'win_rate', min_bets=1) == (1, 1)
+    assert select_best(stats, 'win_rate', min_bets=5) is None
+    assert american_payout(None) == american_payout(-110) == 100 / 110
+
+
+def test_folds_fit_on_earlier_weeks_only():
+    configs = [{'DVOA': 1.0}, {'DVOA': 2.0}]
+    validator = WalkForwardValidator(weeks=[11, 12, 13], thresholds=[50, 70], configs=configs,
+                                     min_train_bets=1, baseline_min_confidence=50)
+    # Outcomes per config: config 1 is perfect in week 11, then loses everything in week 12
+    validator.sweeps = {
+        11: _sweep(11, [[55, 55], [75, 75]], [[1, 0], [1, 1]], [[0, 1], [0, 0]]),
+        12: _sweep(12, [[60, 60, 60], [80, 50, 50]], [[1, 1, 1], [0, 0, 0]], [[0, 0, 0], [1, 1, 1]]),
+        13: _sweep(13, [[90, 90], [50, 50]], [1, 0], [0, 1]),
+    }
+
+    week12, week13 = validator.run()
+
+    assert (week12.train_weeks, week12.weights, week12.min_confidence) == ([11], {'DVOA': 2.0}, 50)
+    assert (week12.wins, week12.losses, week12.baseline['win_rate']) == (0, 3, 100.0)
+    assert (week13.train_weeks, week13.weights, week13.min_confidence) == ([11, 12], {'DVOA': 1.0}, 50)
+    assert (week13.bets, week13.wins, week13.losses, week13.win_rate) == (2, 1, 1, 50.0)